@@ -6,6 +6,10 @@ from typing import Any, Dict
 
 from openclaw.adapters import V49Adapter
 from openclaw.services.backtest_credibility_service import build_backtest_credibility_audit
+from openclaw.services.strategy_backtest_diagnostic_service import (
+    WindowDiagnosticsAggregator,
+    build_strategy_backtest_diagnostics,
+)
 from risk.trading_cost import estimate_round_trip_cost
 
 
@@ -48,6 +52,11 @@ class BacktestEngine:
         failed = []
         global_budget = _optional_positive_int(params.get("max_evaluations_global"))
         remaining_budget = int(global_budget or 0)
+        # Only test windows (including failed ones) feed the diagnostics summary: train windows are
+        # in-sample fits and must not count toward test diagnostics. Per-window backtest_diagnostics
+        # stay off the rows unless keep_window_diagnostics=True (off by default) to bound memory.
+        window_diagnostics = WindowDiagnosticsAggregator()
+        keep_window_diagnostics = bool(params.get("keep_window_diagnostics", False))
 
         for idx, w in enumerate(windows):
             if global_budget is not None and remaining_budget <= 0:
@@ -60,11 +69,13 @@ class BacktestEngine:
                 run_params["max_evaluations"] = min(per_window_limit or remaining_budget, remaining_budget)
             bt = self.adapter.run_backtest(strategy=strategy, date_from=w.date_from, date_to=w.date_to, params=run_params)
             diagnostics = _extract_backtest_diagnostics(bt)
+            if w.role == "test":
+                window_diagnostics.add(diagnostics)
             if global_budget is not None:
                 remaining_budget = max(0, remaining_budget - _diagnostic_evaluated_count(diagnostics))
             if bt.get("status") != "success":
                 failed_row = {"window": idx, "role": w.role, "error": bt.get("error", "unknown")}
-                if diagnostics:
+                if diagnostics and keep_window_diagnostics:
                     failed_row["backtest_diagnostics"] = diagnostics
                 failed.append(failed_row)
                 continue
@@ -76,8 +87,7 @@ class BacktestEngine:
                 "date_to": w.date_to,
                 "summary": summary,
             }
-            diagnostics = _extract_backtest_diagnostics(bt)
-            if diagnostics:
+            if diagnostics and keep_window_diagnostics:
                 row["backtest_diagnostics"] = diagnostics
             if w.role == "train":
                 train_rows.append(row)
@@ -125,6 +135,13 @@ class BacktestEngine:
             param_runs=int(params.get("param_runs", 1) or 1),
             failed_runs=[],
         )
+        out["strategy_backtest_diagnostics"] = build_strategy_backtest_diagnostics(
+            strategy=strategy,
+            rows=[{"status": status, **test_agg, "rolling_test_windows": len(test_rows)}],
+            errors=[{"error": error}] if error else [],
+            backtest_credibility=out["backtest_credibility"],
+            diagnostic_aggregator=window_diagnostics,
+        )
         return out
 
     def _enrich_summary(self, summary: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
@@ -19,7 +19,7 @@ from openclaw.services.ensemble_execution_cost_service import build_ensemble_exe
 from openclaw.services.ensemble_shadow_portfolio_service import build_ensemble_shadow_portfolio
 from openclaw.services.ensemble_walk_forward_benchmark_service import (
     FORMAL_POOL_BENCHMARK_STRATEGIES,
-    build_ensemble_walk_forward_shadow_benchmark,
+    append_walk_forward_window,
 )
 from openclaw.services.formal_pool_benchmark_service import build_formal_pool_benchmark_return_series
 from openclaw.services.rejected_backtest_artifact_ledger_service import append_rejected_backtest_artifact
@@ -461,19 +461,21 @@ def _ensemble_core_research_only_result(*, db_path: str, as_of_date: str) -> Jso
             holding_days=5,
             top_n_per_strategy=5,
         )
-    finally:
-        conn.close()
-    alpha_rebuild_lab = build_ensemble_alpha_rebuild_lab(fact_chain)
-    walk_forward_benchmark = build_ensemble_walk_forward_shadow_benchmark(
-        [
+        # The daily run contributes one walk-forward window; the stored
+        # accumulator folds it into the ensemble's history.
+        walk_forward_benchmark = append_walk_forward_window(
+            conn,
+            "ensemble_core",
             {
                 "as_of_date": str(as_of_date or ""),
                 "shadow_portfolio": shadow_portfolio,
                 "execution_cost_replay": execution_cost_replay,
                 "formal_pool_benchmark": formal_pool_benchmark,
-            }
-        ]
-    )
+            },
+        )
+    finally:
+        conn.close()
+    alpha_rebuild_lab = build_ensemble_alpha_rebuild_lab(fact_chain)
     contract = build_ensemble_core_contract_review(
         {
             "alpha_sleeves": [
@@ -2,15 +2,245 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import glob
+import hashlib
 import json
 import os
+import shutil
 import sqlite3
-from typing import Any, Callable, Dict, List, Tuple
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
-_BACKTEST_HISTORY_CACHE: Dict[str, Any] = {}
+# Loaded history panels keyed by (db path, db mtime, start date). A request is
+# served from any live entry whose start date covers it, so shorter windows
+# never re-run the daily × stock_basic JOIN.
+_BACKTEST_HISTORY_CACHE: Dict[Tuple[str, float, str], Dict[str, Any]] = {}
+_BACKTEST_HISTORY_CACHE_LOCK = threading.Lock()
+_SHARED_PANEL_MANIFEST = "manifest.json"
+_PUBLISH_PREFIX = ".publish_"
+# Half-written publish directories older than this were left by a crashed writer.
+_STALE_PUBLISH_SEC = 3600
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(float(os.getenv(name, str(default)) or default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split(".", 1)[0]) >= 3:
+        return True
+    return bool(getattr(pd.options.mode, "copy_on_write", False) is True)
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    try:
+        return int(df.memory_usage(index=True, deep=False).sum())
+    except Exception:
+        return 0
+
+
+def _read_only_view(df: pd.DataFrame, start_date: str, cached_start_date: str) -> pd.DataFrame:
+    """Return the requested window without exposing the cached frame to writes.
+
+    Under copy-on-write a shallow copy is a zero-copy view whose writes never
+    reach the cache; older pandas without CoW gets a defensive deep copy.
+    """
+    if start_date > cached_start_date and "trade_date" in df.columns:
+        trade_dates = df["trade_date"]
+        bound: Any = int(start_date) if pd.api.types.is_numeric_dtype(trade_dates) else start_date
+        df = df.loc[trade_dates >= bound].reset_index(drop=True)
+    return df.copy(deep=not _copy_on_write_enabled())
+
+
+def _lookup_cached_history(
+    db_path: str,
+    db_mtime: float,
+    start_date: str,
+    current_ts: float,
+    ttl_sec: int,
+) -> Optional[Tuple[pd.DataFrame, str]]:
+    with _BACKTEST_HISTORY_CACHE_LOCK:
+        best: Optional[Dict[str, Any]] = None
+        for (path, mtime, cached_start), entry in list(_BACKTEST_HISTORY_CACHE.items()):
+            if path != db_path:
+                continue
+            if abs(mtime - db_mtime) >= 1e-6 or (current_ts - float(entry.get("created_at", 0.0) or 0.0)) > ttl_sec:
+                _BACKTEST_HISTORY_CACHE.pop((path, mtime, cached_start), None)
+                continue
+            if cached_start <= start_date and (best is None or cached_start > best["start_date"]):
+                best = entry
+        if best is None:
+            return None
+        best["last_used"] = current_ts
+        return best["df"], best["start_date"]
+
+
+def _store_cached_history(db_path: str, db_mtime: float, start_date: str, df: pd.DataFrame, current_ts: float) -> None:
+    max_entries = max(1, _env_int("OPENCLAW_BACKTEST_HISTORY_CACHE_MAX_ENTRIES", 4))
+    max_bytes = _env_int("OPENCLAW_BACKTEST_HISTORY_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+    with _BACKTEST_HISTORY_CACHE_LOCK:
+        for key in list(_BACKTEST_HISTORY_CACHE):
+            path, mtime, cached_start = key
+            if path == db_path and abs(mtime - db_mtime) < 1e-6 and cached_start >= start_date:
+                _BACKTEST_HISTORY_CACHE.pop(key)
+        _BACKTEST_HISTORY_CACHE[(db_path, db_mtime, start_date)] = {
+            "df": df,
+            "start_date": start_date,
+            "created_at": current_ts,
+            "last_used": current_ts,
+            "nbytes": _frame_nbytes(df),
+        }
+        by_lru = sorted(_BACKTEST_HISTORY_CACHE, key=lambda key: float(_BACKTEST_HISTORY_CACHE[key]["last_used"]))
+        total = sum(int(entry["nbytes"]) for entry in _BACKTEST_HISTORY_CACHE.values())
+        for key in by_lru:
+            if len(_BACKTEST_HISTORY_CACHE) <= 1 or (len(_BACKTEST_HISTORY_CACHE) <= max_entries and total <= max_bytes):
+                break
+            total -= int(_BACKTEST_HISTORY_CACHE.pop(key)["nbytes"])
+
+
+def clear_backtest_history_cache() -> None:
+    with _BACKTEST_HISTORY_CACHE_LOCK:
+        _BACKTEST_HISTORY_CACHE.clear()
+
+
+# ── shared panels for sibling worker processes ───────────────────────────
+
+def _shared_panel_root(permanent_db_path: str) -> str:
+    base = os.getenv("OPENCLAW_BACKTEST_HISTORY_SHARED_DIR", "").strip() or os.path.join(
+        tempfile.gettempdir(), "openclaw_backtest_history"
+    )
+    digest = hashlib.md5(os.path.abspath(permanent_db_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base, digest)
+
+
+def publish_backtest_history_panel(
+    df: pd.DataFrame,
+    *,
+    permanent_db_path: str,
+    db_mtime: float,
+    start_date: str,
+    created_at: float,
+) -> Optional[str]:
+    """Write ``df`` as per-column ``.npy`` files that siblings can memory-map.
+
+    String columns are stored as factorized codes plus a JSON vocabulary;
+    datetime columns keep their dtype (tz-aware ones are stored as UTC).
+    Panels larger than ``OPENCLAW_BACKTEST_HISTORY_SHARED_MAX_BYTES`` are not
+    published. Panels for older DB versions of the same database are removed.
+    """
+    max_bytes = _env_int("OPENCLAW_BACKTEST_HISTORY_SHARED_MAX_BYTES", 1024 * 1024 * 1024)
+    if _frame_nbytes(df) > max_bytes:
+        return None
+    root = _shared_panel_root(permanent_db_path)
+    name = f"{int(round(db_mtime * 1e6))}_{start_date}"
+    target = os.path.join(root, name)
+    tmp_dir: Optional[str] = None
+    try:
+        os.makedirs(root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=root, prefix=_PUBLISH_PREFIX)
+        columns: List[Dict[str, Any]] = []
+        for idx, column in enumerate(df.columns):
+            values = df[column]
+            filename = f"c{idx}.npy"
+            if isinstance(values.dtype, pd.DatetimeTZDtype):
+                utc = values.dt.tz_convert("UTC").dt.tz_localize(None)
+                np.save(os.path.join(tmp_dir, filename), utc.to_numpy())
+                columns.append({"name": str(column), "file": filename, "kind": "datetime_tz", "tz": str(values.dt.tz)})
+                continue
+            if (
+                pd.api.types.is_numeric_dtype(values)
+                or pd.api.types.is_bool_dtype(values)
+                or pd.api.types.is_datetime64_dtype(values)
+                or pd.api.types.is_timedelta64_dtype(values)
+            ):
+                np.save(os.path.join(tmp_dir, filename), values.to_numpy())
+                columns.append({"name": str(column), "file": filename, "kind": "array"})
+                continue
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            np.save(os.path.join(tmp_dir, filename), codes.astype(np.int32, copy=False))
+            columns.append(
+                {"name": str(column), "file": filename, "kind": "factorized", "vocabulary": [str(item) for item in uniques]}
+            )
+        manifest = {
+            "db_path": os.path.abspath(permanent_db_path),
+            "db_mtime": db_mtime,
+            "start_date": start_date,
+            "created_at": created_at,
+            "rows": int(len(df)),
+            "columns": columns,
+        }
+        with open(os.path.join(tmp_dir, _SHARED_PANEL_MANIFEST), "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, ensure_ascii=False)
+        if not os.path.isdir(target):
+            os.replace(tmp_dir, target)
+            tmp_dir = None
+        prefix = f"{int(round(db_mtime * 1e6))}_"
+        for entry in os.listdir(root):
+            path = os.path.join(root, entry)
+            if entry.startswith(_PUBLISH_PREFIX):
+                if time.time() - os.path.getmtime(path) > _STALE_PUBLISH_SEC:
+                    shutil.rmtree(path, ignore_errors=True)
+            elif not entry.startswith(prefix) and not entry.startswith("."):
+                shutil.rmtree(path, ignore_errors=True)
+        return target
+    except Exception:
+        return None
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def attach_backtest_history_panel(
+    *,
+    permanent_db_path: str,
+    db_mtime: float,
+    start_date: str,
+    current_ts: float,
+    ttl_sec: int,
+) -> Optional[Tuple[pd.DataFrame, str]]:
+    """Attach the smallest covering panel published for this DB version.
+
+    Numeric and naive datetime columns are read-only memory maps; string
+    columns are rebuilt from their vocabularies with one take.
+    """
+    root = _shared_panel_root(permanent_db_path)
+    prefix = f"{int(round(db_mtime * 1e6))}_"
+    try:
+        candidates = sorted(
+            (entry for entry in os.listdir(root) if entry.startswith(prefix) and entry[len(prefix):] <= start_date),
+            reverse=True,
+        )
+    except OSError:
+        return None
+    for entry in candidates:
+        panel_dir = os.path.join(root, entry)
+        try:
+            with open(os.path.join(panel_dir, _SHARED_PANEL_MANIFEST), "r", encoding="utf-8") as handle:
+                manifest = json.load(handle) or {}
+            if (current_ts - float(manifest.get("created_at", 0.0) or 0.0)) > ttl_sec:
+                continue
+            data: Dict[str, Any] = {}
+            for column in manifest.get("columns") or []:
+                values = np.load(os.path.join(panel_dir, column["file"]), mmap_mode="r")
+                if column.get("kind") == "factorized":
+                    vocabulary = np.asarray(list(column.get("vocabulary") or []) + [None], dtype=object)
+                    values = vocabulary.take(np.where(values < 0, len(vocabulary) - 1, values))
+                elif column.get("kind") == "datetime_tz":
+                    values = pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(column.get("tz") or "UTC")
+                data[column["name"]] = values
+            df = pd.DataFrame(data, copy=False)
+            return df, str(manifest.get("start_date") or entry[len(prefix):])
+        except Exception:
+            continue
+    return None
 
 
 def load_backtest_history_df(
@@ -26,6 +256,7 @@ def load_backtest_history_df(
     from data.dao import DataAccessError, detect_daily_table  # type: ignore
 
     cache_ttl_sec = int(os.getenv("OPENCLAW_BACKTEST_HISTORY_CACHE_TTL", "300"))
+    share_panels = os.getenv("OPENCLAW_BACKTEST_HISTORY_SHARED", "0") == "1"
     safe_days = max(30, int(days))
     db_mtime = 0.0
     try:
@@ -33,19 +264,21 @@ def load_backtest_history_df(
     except Exception:
         db_mtime = 0.0
     current_ts = now_ts()
+    start_date = (datetime.now() - timedelta(days=safe_days)).strftime("%Y%m%d")
     if use_cache:
-        cached_df = _BACKTEST_HISTORY_CACHE.get("df")
-        cached_at = float(_BACKTEST_HISTORY_CACHE.get("created_at", 0.0) or 0.0)
-        cached_days = int(_BACKTEST_HISTORY_CACHE.get("days", 0) or 0)
-        cached_db_mtime = float(_BACKTEST_HISTORY_CACHE.get("db_mtime", 0.0) or 0.0)
-        if (
-            isinstance(cached_df, pd.DataFrame)
-            and not cached_df.empty
-            and cached_days == safe_days
-            and abs(cached_db_mtime - db_mtime) < 1e-6
-            and (current_ts - cached_at) <= cache_ttl_sec
-        ):
-            return cached_df.copy()
+        cached = _lookup_cached_history(permanent_db_path, db_mtime, start_date, current_ts, cache_ttl_sec)
+        if cached is None and share_panels:
+            cached = attach_backtest_history_panel(
+                permanent_db_path=permanent_db_path,
+                db_mtime=db_mtime,
+                start_date=start_date,
+                current_ts=current_ts,
+                ttl_sec=cache_ttl_sec,
+            )
+            if cached is not None and not cached[0].empty:
+                _store_cached_history(permanent_db_path, db_mtime, cached[1], cached[0], current_ts)
+        if cached is not None and not cached[0].empty:
+            return _read_only_view(cached[0], start_date, cached[1])
 
     conn = connect_permanent_db()
     try:
@@ -53,7 +286,6 @@ def load_backtest_history_df(
             daily_table = detect_daily_table(conn)
         except DataAccessError as exc:
             raise RuntimeError(f"无法识别日线数据表: {exc}")
-        start_date = (datetime.now() - timedelta(days=safe_days)).strftime("%Y%m%d")
         query = f"""
             SELECT dtd.ts_code, sb.name, sb.industry, dtd.trade_date,
                    dtd.open_price, dtd.high_price, dtd.low_price,
@@ -66,10 +298,16 @@ def load_backtest_history_df(
         df = pd.read_sql_query(query, conn, params=(start_date,))
         out = ensure_price_aliases(df)
         if use_cache and isinstance(out, pd.DataFrame) and not out.empty:
-            _BACKTEST_HISTORY_CACHE["created_at"] = current_ts
-            _BACKTEST_HISTORY_CACHE["db_mtime"] = db_mtime
-            _BACKTEST_HISTORY_CACHE["days"] = safe_days
-            _BACKTEST_HISTORY_CACHE["df"] = out.copy()
+            _store_cached_history(permanent_db_path, db_mtime, start_date, out, current_ts)
+            if share_panels:
+                publish_backtest_history_panel(
+                    out,
+                    permanent_db_path=permanent_db_path,
+                    db_mtime=db_mtime,
+                    start_date=start_date,
+                    created_at=current_ts,
+                )
+            return _read_only_view(out, start_date, start_date)
         return out
     finally:
         conn.close()
@@ -401,7 +401,7 @@ def render_data_ops_core_page(
         ):
             if not airivo_guard_action("admin", "optimize_database", target="database", reason="manual_database_optimize"):
                 st.stop()
-            with st.spinner("正在优化数据库（清理重复数据、重建索引）..."):
+            with st.spinner("正在在线维护数据库（增量回收空间、更新统计信息，不影响读取）..."):
                 result = db_manager.optimize_database()
                 if result.get("success"):
                     airivo_append_action_audit("optimize_database", True, target="database", detail=str(result.get("message") or "ok"))
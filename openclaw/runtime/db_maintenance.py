@@ -0,0 +1,119 @@
+"""Online maintenance for the permanent SQLite DB.
+
+Work is split into short transactions (incremental vacuum slices, per-table
+ANALYZE, passive WAL checkpoints) under a wall-clock budget, so WAL readers
+(dashboard, scans) keep running while it progresses.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("openclaw.db_maintenance")
+
+AUTO_VACUUM_INCREMENTAL = 2
+DEFAULT_MAINTENANCE_BUDGET_SECONDS = 20.0
+DEFAULT_VACUUM_PAGES_PER_STEP = 2000
+DEFAULT_ANALYSIS_LIMIT = 1000
+
+
+def _pragma_int(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute(f"PRAGMA {name}").fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def _file_bytes(path: Optional[str]) -> int:
+    total = 0
+    for suffix in ("", "-wal"):
+        try:
+            total += os.path.getsize(f"{path}{suffix}") if path else 0
+        except OSError:
+            pass
+    return total
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is not None
+
+
+def checkpoint_wal(conn: sqlite3.Connection, mode: str = "PASSIVE") -> Dict[str, int]:
+    """``wal_checkpoint``; PASSIVE never waits on readers or writers."""
+    busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return {"busy": int(busy), "log_frames": int(log_frames), "checkpointed": int(checkpointed)}
+
+
+def enable_incremental_auto_vacuum(conn: sqlite3.Connection) -> bool:
+    """Request auto_vacuum=INCREMENTAL; True when it is already in effect.
+
+    On an existing non-empty DB the mode only takes effect after the next full
+    VACUUM, which online maintenance never runs on its own.
+    """
+    if _pragma_int(conn, "auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+        return True
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    return _pragma_int(conn, "auto_vacuum") == AUTO_VACUUM_INCREMENTAL
+
+
+def run_online_maintenance(
+    conn: sqlite3.Connection,
+    *,
+    hot_tables: Sequence[str],
+    db_path: Optional[str] = None,
+    budget_seconds: float = DEFAULT_MAINTENANCE_BUDGET_SECONDS,
+    pages_per_step: int = DEFAULT_VACUUM_PAGES_PER_STEP,
+    analysis_limit: int = DEFAULT_ANALYSIS_LIMIT,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[str, Any]:
+    """Reclaim free pages, refresh planner stats and checkpoint within ``budget_seconds``.
+
+    Returns duration, reclaimed pages/bytes, the tables analyzed and whether
+    the budget ran out before the free list was drained.
+    """
+    started = clock()
+    deadline = started + max(0.0, float(budget_seconds))
+    page_size = _pragma_int(conn, "page_size")
+    freelist_before = _pragma_int(conn, "freelist_count")
+    bytes_before = _file_bytes(db_path)
+    incremental = enable_incremental_auto_vacuum(conn)
+
+    vacuum_steps = 0
+    checkpoints: List[Dict[str, int]] = []
+    if incremental:
+        while _pragma_int(conn, "freelist_count") > 0 and clock() < deadline:
+            conn.execute(f"PRAGMA incremental_vacuum({max(1, int(pages_per_step))})").fetchall()
+            vacuum_steps += 1
+            checkpoints.append(checkpoint_wal(conn))
+
+    analyzed: List[str] = []
+    conn.execute(f"PRAGMA analysis_limit={max(0, int(analysis_limit))}")
+    for table in hot_tables:
+        if clock() >= deadline:
+            break
+        if _table_exists(conn, table):
+            conn.execute(f"ANALYZE {table}")
+            analyzed.append(table)
+            checkpoints.append(checkpoint_wal(conn))
+    conn.execute("PRAGMA optimize")
+    checkpoints.append(checkpoint_wal(conn))
+
+    freelist_after = _pragma_int(conn, "freelist_count")
+    reclaimed_pages = max(0, freelist_before - freelist_after)
+    return {
+        "duration_seconds": round(clock() - started, 3),
+        "incremental_auto_vacuum": incremental,
+        "needs_full_vacuum": not incremental and freelist_before > 0,
+        "vacuum_steps": vacuum_steps,
+        "freelist_before": freelist_before,
+        "freelist_after": freelist_after,
+        "reclaimed_pages": reclaimed_pages,
+        "reclaimed_bytes": reclaimed_pages * page_size,
+        "file_bytes_before": bytes_before,
+        "file_bytes_after": _file_bytes(db_path),
+        "analyzed_tables": analyzed,
+        "timed_out": freelist_after > 0 and incremental and clock() >= deadline,
+        "last_checkpoint": checkpoints[-1] if checkpoints else {},
+    }
@@ -0,0 +1,314 @@
+"""Row-count metadata for the permanent DB so status pages avoid full-table scans.
+
+``db_table_stats`` holds one row count / date range / ``MAX(rowid)`` per
+table and ``db_trade_date_stats`` one row count per (table, trade_date) for
+tables with a ``trade_date`` column. Readers only read: a table whose current
+``MAX(rowid)`` differs from the recorded one marks the summary stale, and the
+caller schedules ``sync_db_metadata`` off the read path. Any writer that
+appends or upserts-by-replace moves ``MAX(rowid)``, so backfills and writers
+outside this process are picked up without having to call in here; rows
+appended since the recorded ``MAX(rowid)`` tell the sync which trade dates to
+recount. Pure deletes and in-place updates leave the fingerprint unchanged and
+are only reconciled by ``rebuild_db_metadata`` (the full verification).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("openclaw.db_metadata")
+
+TABLE_STATS_TABLE = "db_table_stats"
+TRADE_DATE_STATS_TABLE = "db_trade_date_stats"
+METADATA_TABLES = (TABLE_STATS_TABLE, TRADE_DATE_STATS_TABLE)
+
+_SYNC_LOCK = threading.Lock()
+_SYNC_THREADS: Dict[str, threading.Thread] = {}
+
+
+def _now_text() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def has_db_metadata_tables(conn: sqlite3.Connection) -> bool:
+    rows = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
+        METADATA_TABLES,
+    ).fetchone()
+    return bool(rows and rows[0] == 2)
+
+
+def ensure_db_metadata_tables(conn: sqlite3.Connection) -> None:
+    with conn:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TABLE_STATS_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                min_date TEXT,
+                max_date TEXT,
+                updated_at TEXT,
+                verified_at TEXT,
+                max_rowid INTEGER
+            )
+            """
+        )
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_STATS_TABLE})").fetchall()}
+        if "max_rowid" not in columns:
+            conn.execute(f"ALTER TABLE {TABLE_STATS_TABLE} ADD COLUMN max_rowid INTEGER")
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TRADE_DATE_STATS_TABLE} (
+                table_name TEXT NOT NULL,
+                trade_date TEXT NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT,
+                PRIMARY KEY (table_name, trade_date)
+            )
+            """
+        )
+
+
+def tracked_tables(conn: sqlite3.Connection) -> List[str]:
+    """Every user table except SQLite internals and the metadata tables themselves."""
+    return [
+        str(row[0])
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        if str(row[0]) not in METADATA_TABLES
+    ]
+
+
+def table_fingerprint(conn: sqlite3.Connection, table: str) -> Optional[int]:
+    """``MAX(rowid)`` (a b-tree seek); None for WITHOUT ROWID tables or unreadable ones."""
+    try:
+        row = conn.execute(f"SELECT MAX(rowid) FROM {_quote(table)}").fetchone()
+    except sqlite3.Error:
+        return None
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def _has_trade_date(conn: sqlite3.Connection, table: str) -> bool:
+    return any(str(row[1]) == "trade_date" for row in conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall())
+
+
+def _stored_stats(conn: sqlite3.Connection) -> Dict[str, Optional[int]]:
+    return {
+        str(name): (int(max_rowid) if max_rowid is not None else None)
+        for name, max_rowid in conn.execute(f"SELECT table_name, max_rowid FROM {TABLE_STATS_TABLE}").fetchall()
+    }
+
+
+def _write_table_stats(
+    conn: sqlite3.Connection,
+    table: str,
+    *,
+    fingerprint: Optional[int],
+    row_count: Optional[int] = None,
+    verified: bool = False,
+) -> None:
+    if row_count is None:
+        total, min_date, max_date = conn.execute(
+            f"""
+            SELECT COALESCE(SUM(row_count), 0), MIN(trade_date), MAX(trade_date)
+            FROM {TRADE_DATE_STATS_TABLE}
+            WHERE table_name = ? AND row_count > 0
+            """,
+            (table,),
+        ).fetchone()
+    else:
+        total, min_date, max_date = row_count, None, None
+    now = _now_text()
+    conn.execute(
+        f"""
+        INSERT INTO {TABLE_STATS_TABLE} (table_name, row_count, min_date, max_date, updated_at, verified_at, max_rowid)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(table_name) DO UPDATE SET
+            row_count = excluded.row_count,
+            min_date = excluded.min_date,
+            max_date = excluded.max_date,
+            updated_at = excluded.updated_at,
+            verified_at = COALESCE(excluded.verified_at, {TABLE_STATS_TABLE}.verified_at),
+            max_rowid = excluded.max_rowid
+        """,
+        (table, int(total or 0), min_date, max_date, now, now if verified else None, fingerprint),
+    )
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str) -> None:
+    fingerprint = table_fingerprint(conn, table)
+    if not _has_trade_date(conn, table):
+        count = int(conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0] or 0)
+        with conn:
+            _write_table_stats(conn, table, fingerprint=fingerprint, row_count=count, verified=True)
+        return
+    rows = conn.execute(f"SELECT trade_date, COUNT(*) FROM {_quote(table)} GROUP BY trade_date").fetchall()
+    now = _now_text()
+    with conn:
+        conn.execute(f"DELETE FROM {TRADE_DATE_STATS_TABLE} WHERE table_name = ?", (table,))
+        conn.executemany(
+            f"INSERT INTO {TRADE_DATE_STATS_TABLE} (table_name, trade_date, row_count, updated_at) VALUES (?, ?, ?, ?)",
+            [(table, str(trade_date), int(count), now) for trade_date, count in rows if trade_date is not None],
+        )
+        _write_table_stats(conn, table, fingerprint=fingerprint, verified=True)
+
+
+def _recount_trade_dates(conn: sqlite3.Connection, table: str, trade_dates: Iterable[str], fingerprint: Optional[int]) -> None:
+    stored = {
+        str(d): int(c)
+        for d, c in conn.execute(
+            f"SELECT trade_date, row_count FROM {TRADE_DATE_STATS_TABLE} WHERE table_name = ?", (table,)
+        ).fetchall()
+    }
+    changed = []
+    for trade_date in sorted({str(d) for d in trade_dates if d}):
+        count = int(
+            conn.execute(f"SELECT COUNT(*) FROM {_quote(table)} WHERE trade_date = ?", (trade_date,)).fetchone()[0] or 0
+        )
+        if stored.get(trade_date) != count:
+            changed.append((table, trade_date, count))
+    now = _now_text()
+    with conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {TRADE_DATE_STATS_TABLE} (table_name, trade_date, row_count, updated_at) VALUES (?, ?, ?, ?)",
+            [row + (now,) for row in changed],
+        )
+        _write_table_stats(conn, table, fingerprint=fingerprint)
+
+
+def sync_db_metadata(conn: sqlite3.Connection, *, tables: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Bring the summary of ``tables`` (default: every table) up to date; returns the action per touched table.
+
+    Tables without a summary row are counted in full; tables whose
+    ``MAX(rowid)`` grew recount only the trade dates of the rows appended since
+    (``WHERE rowid > recorded``); unchanged tables are not touched.
+    """
+    ensure_db_metadata_tables(conn)
+    existing = tracked_tables(conn)
+    targets = existing if tables is None else [table for table in tables if table in set(existing)]
+    stored = _stored_stats(conn)
+    actions: Dict[str, str] = {}
+    for table in targets:
+        fingerprint = table_fingerprint(conn, table)
+        recorded = stored.get(table)
+        if table in stored and fingerprint == recorded:
+            continue
+        if recorded is None or fingerprint is None or fingerprint < recorded:
+            _rebuild_table(conn, table)
+            actions[table] = "rebuilt"
+        elif _has_trade_date(conn, table):
+            dates = [
+                row[0]
+                for row in conn.execute(f"SELECT DISTINCT trade_date FROM {_quote(table)} WHERE rowid > ?", (recorded,))
+            ]
+            _recount_trade_dates(conn, table, dates, fingerprint)
+            actions[table] = "synced"
+        else:
+            count = int(conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0] or 0)
+            with conn:
+                _write_table_stats(conn, table, fingerprint=fingerprint, row_count=count)
+            actions[table] = "synced"
+    if tables is None:
+        dropped = sorted(set(stored) - set(existing))
+        if dropped:
+            with conn:
+                for table in dropped:
+                    conn.execute(f"DELETE FROM {TABLE_STATS_TABLE} WHERE table_name = ?", (table,))
+                    conn.execute(f"DELETE FROM {TRADE_DATE_STATS_TABLE} WHERE table_name = ?", (table,))
+                    actions[table] = "dropped"
+    return actions
+
+
+def rebuild_db_metadata(conn: sqlite3.Connection, *, tables: Optional[Iterable[str]] = None) -> List[str]:
+    """Full verification: recount ``tables`` (default: every table) from scratch."""
+    ensure_db_metadata_tables(conn)
+    existing = tracked_tables(conn)
+    targets = existing if tables is None else [table for table in tables if table in set(existing)]
+    for table in targets:
+        _rebuild_table(conn, table)
+    return targets
+
+
+def read_db_summary(conn: sqlite3.Connection, *, daily_table: str, recent_window: int = 3) -> Optional[Dict[str, Any]]:
+    """Status fields from the metadata tables, or None when no summary exists yet. Never writes.
+
+    ``stale`` is set when any table's ``MAX(rowid)`` moved since its summary
+    was recorded, or a table has no summary yet.
+    """
+    if not has_db_metadata_tables(conn):
+        return None
+    try:
+        rows = conn.execute(
+            f"SELECT table_name, row_count, min_date, max_date, updated_at, verified_at, max_rowid FROM {TABLE_STATS_TABLE}"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        # Summary written before max_rowid was tracked.
+        return None
+    stats = {str(row[0]): row[1:] for row in rows}
+    if daily_table not in stats:
+        return None
+    row_count, min_date, max_date, updated_at, verified_at, _ = stats[daily_table]
+    stale_tables = sorted(
+        table
+        for table in tracked_tables(conn)
+        if table not in stats or table_fingerprint(conn, table) != stats[table][5]
+    )
+    recent = conn.execute(
+        f"""
+        SELECT trade_date, row_count FROM {TRADE_DATE_STATS_TABLE}
+        WHERE table_name = ? AND row_count > 0
+        ORDER BY trade_date DESC LIMIT ?
+        """,
+        (daily_table, max(1, int(recent_window))),
+    ).fetchall()
+    recent_counts = {str(d): int(c) for d, c in recent}
+    return {
+        "daily_table": daily_table,
+        "total_records": int(row_count or 0),
+        "min_date": str(min_date) if min_date else "",
+        "max_date": str(max_date) if max_date else "",
+        "records_last_trade_date": recent_counts.get(str(max_date), 0) if max_date else 0,
+        "recent_counts": recent_counts,
+        "table_counts": {table: int(values[0] or 0) for table, values in sorted(stats.items())},
+        "stale": bool(stale_tables),
+        "stale_tables": stale_tables,
+        "metadata_updated_at": updated_at or "",
+        "metadata_verified_at": verified_at or "",
+    }
+
+
+def start_background_sync(key: str, connect: Callable[[], sqlite3.Connection], *, full: bool = False) -> bool:
+    """Run ``sync_db_metadata`` (or ``rebuild_db_metadata`` when ``full``) on a daemon thread.
+
+    One run per ``key`` at a time; returns False when one is already running.
+    """
+    with _SYNC_LOCK:
+        running = _SYNC_THREADS.get(key)
+        if running is not None and running.is_alive():
+            return False
+
+        def _run() -> None:
+            conn = connect()
+            try:
+                if full:
+                    rebuild_db_metadata(conn)
+                else:
+                    sync_db_metadata(conn)
+            except sqlite3.Error as exc:
+                logger.warning("db metadata %s failed for %s: %s", "verification" if full else "sync", key, exc)
+            finally:
+                conn.close()
+
+        thread = threading.Thread(target=_run, name=f"db-metadata-sync:{key}", daemon=True)
+        _SYNC_THREADS[key] = thread
+        thread.start()
+        return True
@@ -0,0 +1,90 @@
+"""Fork-based process pools whose workers inherit a per-call task.
+
+The task callable (and everything it closes over: loaded histories,
+evaluators, prepared panels) is installed in each worker by the pool
+initializer. With the ``fork`` start method the initializer arguments are
+inherited rather than pickled, so only the items and results cross the
+process boundary, and concurrent calls never share module state.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+import multiprocessing
+import os
+import sys
+
+# Task of the current worker process; set by the pool initializer, never in the parent.
+_WORKER_TASK: Optional[Callable[[Any], Any]] = None
+
+
+def fork_supported() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def inside_streamlit() -> bool:
+    """Whether this process is serving a Streamlit app (a threaded server that must not fork)."""
+    runtime = sys.modules.get("streamlit.runtime")
+    try:
+        return bool(runtime is not None and runtime.exists())
+    except Exception:
+        return False
+
+
+def default_workers(env_name: str, cap: int) -> int:
+    """Worker count from ``env_name``, else ``min(cap, cpu)``; 1 inside Streamlit unless set explicitly."""
+    raw = os.getenv(env_name, "").strip()
+    if raw:
+        return max(1, int(raw))
+    if inside_streamlit():
+        return 1
+    return max(1, min(int(cap), os.cpu_count() or 1))
+
+
+def _install_task(task: Callable[[Any], Any]) -> None:
+    global _WORKER_TASK
+    _WORKER_TASK = task
+
+
+def _run_task(item: Any) -> Any:
+    if _WORKER_TASK is None:
+        raise RuntimeError("fork pool worker started without a task")
+    return _WORKER_TASK(item)
+
+
+def fork_map(
+    task: Callable[[Any], Any],
+    items: Iterable[Any],
+    *,
+    workers: int,
+    on_result: Optional[Callable[[Any, Any], None]] = None,
+) -> List[Any]:
+    """``[task(item) for item in items]`` across forked workers, in item order.
+
+    At most ``workers`` items are in flight; ``on_result(item, result)`` runs
+    in the parent as each result is collected in order. Pool failures
+    (``BrokenProcessPool``, ``OSError``) propagate so callers can fall back
+    to a serial run.
+    """
+    pending = deque(items)
+    max_workers = max(1, min(int(workers), len(pending)))
+    results: List[Any] = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_install_task,
+        initargs=(task,),
+    ) as executor:
+        in_flight: deque = deque()
+        while pending or in_flight:
+            while pending and len(in_flight) < max_workers:
+                item = pending.popleft()
+                in_flight.append((item, executor.submit(_run_task, item)))
+            item, future = in_flight.popleft()
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(item, result)
+    return results
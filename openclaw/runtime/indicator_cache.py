@@ -0,0 +1,339 @@
+"""Persistent per-stock rolling-indicator cache for the v49 signal scorers.
+
+Series are computed once per stock over the whole cleaned history and kept
+in memory (LRU) and, optionally, on disk as ``.npz`` files. Requests are
+aligned on their first trade date, so a rolling window that starts later
+than the cached history is served by slicing (rolling warm-up rows masked,
+the cheap EMAs recomputed) and a history that gained new trade dates extends
+the cached series from its tail instead of recomputing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger("openclaw.indicator_cache")
+
+INDICATOR_CACHE_VERSION = 1
+INDICATOR_WINDOWS: Dict[str, Sequence[int]] = {
+    "ma": (5, 10, 20, 60),
+    "vol_ma": (5, 10, 20),
+    "momentum": (5, 10),
+    "volatility": (10,),
+    "macd": (12, 26, 9),
+}
+DEFAULT_INDICATOR_CACHE_MAX_ENTRIES = 1000
+# Rows of overlap needed to extend every rolling window from a cached tail.
+_TAIL_ROWS = max(max(windows) for key, windows in INDICATOR_WINDOWS.items() if key != "macd")
+# Leading rows a fresh computation leaves NaN, per rolling field.
+_WARMUP_ROWS = {
+    **{f"ma{w}": w - 1 for w in INDICATOR_WINDOWS["ma"]},
+    **{f"vol_ma{w}": w - 1 for w in INDICATOR_WINDOWS["vol_ma"]},
+    **{f"momentum_{w}": w - 1 for w in INDICATOR_WINDOWS["momentum"]},
+    "volatility": INDICATOR_WINDOWS["volatility"][0] - 1,
+}
+_SERIES_FIELDS = (
+    "ma5",
+    "ma10",
+    "ma20",
+    "ma60",
+    "vol_ma5",
+    "vol_ma10",
+    "vol_ma20",
+    "momentum_5",
+    "momentum_10",
+    "volatility",
+    "ema12",
+    "ema26",
+    "dea",
+)
+
+
+def indicator_window_key() -> str:
+    payload = json.dumps({"version": INDICATOR_CACHE_VERSION, "windows": INDICATOR_WINDOWS}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def indicator_cache_max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("INDICATOR_CACHE_MAX_ENTRIES", str(DEFAULT_INDICATOR_CACHE_MAX_ENTRIES))))
+    except ValueError:
+        return DEFAULT_INDICATOR_CACHE_MAX_ENTRIES
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1 :] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def _momentum(close: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(len(close), np.nan)
+    if len(close) >= lag:
+        base = close[: len(close) - lag + 1]
+        out[lag - 1 :] = (close[lag - 1 :] - base) / (base + 0.0001) * 100
+    return out
+
+
+def _volatility(close: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(close), np.nan)
+    if len(close) >= window:
+        windows = sliding_window_view(close, window)
+        mean = windows.mean(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[window - 1 :] = np.where(mean > 0, windows.std(axis=1) / np.where(mean > 0, mean, 1.0) * 100, 0.0)
+    return out
+
+
+def _ema(values: np.ndarray, span: int, prior: Optional[float] = None) -> np.ndarray:
+    """``ewm(span, adjust=False)``; seeding with ``prior`` continues an earlier run."""
+    if prior is None:
+        return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    seeded = np.concatenate(([prior], values))
+    return pd.Series(seeded).ewm(span=span, adjust=False).mean().to_numpy()[1:]
+
+
+def compute_indicator_arrays(
+    close: np.ndarray,
+    volume: np.ndarray,
+    *,
+    prior_ema: Optional[Dict[str, float]] = None,
+) -> Dict[str, np.ndarray]:
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    fast, slow, signal = INDICATOR_WINDOWS["macd"]
+    prior_ema = prior_ema or {}
+    ema12 = _ema(close, fast, prior_ema.get("ema12"))
+    ema26 = _ema(close, slow, prior_ema.get("ema26"))
+    arrays = {f"ma{w}": _rolling_mean(close, w) for w in INDICATOR_WINDOWS["ma"]}
+    arrays.update({f"vol_ma{w}": _rolling_mean(volume, w) for w in INDICATOR_WINDOWS["vol_ma"]})
+    arrays.update({f"momentum_{w}": _momentum(close, w) for w in INDICATOR_WINDOWS["momentum"]})
+    arrays["volatility"] = _volatility(close, INDICATOR_WINDOWS["volatility"][0])
+    arrays["ema12"] = ema12
+    arrays["ema26"] = ema26
+    arrays["dea"] = _ema(ema12 - ema26, signal, prior_ema.get("dea"))
+    return arrays
+
+
+@dataclass
+class IndicatorSeries:
+    """Indicator arrays aligned with one stock's cleaned, date-sorted history."""
+
+    ts_code: str
+    trade_dates: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    arrays: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.trade_dates)
+
+    @property
+    def last_trade_date(self) -> str:
+        return str(self.trade_dates[-1]) if len(self.trade_dates) else ""
+
+    def head(self, rows: int) -> "IndicatorSeries":
+        if rows >= len(self):
+            return self
+        return IndicatorSeries(
+            ts_code=self.ts_code,
+            trade_dates=self.trade_dates[:rows],
+            close=self.close[:rows],
+            volume=self.volume[:rows],
+            arrays={name: values[:rows] for name, values in self.arrays.items()},
+        )
+
+    def window(self, start: int, rows: int) -> "IndicatorSeries":
+        """Rows ``[start, start + rows)`` as a fresh computation over just those rows would give them."""
+        if start == 0:
+            return self.head(rows)
+        end = start + rows
+        close = self.close[start:end]
+        arrays = {name: self.arrays[name][start:end].copy() for name in _WARMUP_ROWS}
+        for name, warmup in _WARMUP_ROWS.items():
+            arrays[name][:warmup] = np.nan
+        fast, slow, signal = INDICATOR_WINDOWS["macd"]
+        arrays["ema12"] = _ema(close, fast)
+        arrays["ema26"] = _ema(close, slow)
+        arrays["dea"] = _ema(arrays["ema12"] - arrays["ema26"], signal)
+        return IndicatorSeries(
+            ts_code=self.ts_code,
+            trade_dates=self.trade_dates[start:end],
+            close=close,
+            volume=self.volume[start:end],
+            arrays=arrays,
+        )
+
+    def row(self, i: int) -> Dict[str, float]:
+        """Indicator values for the window ending at row ``i`` (0 when not enough rows)."""
+        values = {}
+        for name in ("ma5", "ma10", "ma20", "ma60", "vol_ma5", "vol_ma10", "vol_ma20", "momentum_5", "momentum_10", "volatility"):
+            value = self.arrays[name][i]
+            values[name] = 0 if np.isnan(value) else float(value)
+        return values
+
+    @property
+    def dif(self) -> np.ndarray:
+        return self.arrays["ema12"] - self.arrays["ema26"]
+
+    @property
+    def dea(self) -> np.ndarray:
+        return self.arrays["dea"]
+
+    def extended(self, trade_dates: np.ndarray, close: np.ndarray, volume: np.ndarray) -> "IndicatorSeries":
+        """Append the rows past ``len(self)``, recomputing only a short overlapping tail."""
+        start = len(self)
+        overlap = max(0, start - (_TAIL_ROWS - 1))
+        tail = compute_indicator_arrays(
+            close[overlap:],
+            volume[overlap:],
+            prior_ema={name: float(self.arrays[name][overlap - 1]) for name in ("ema12", "ema26", "dea")} if overlap else None,
+        )
+        skip = start - overlap
+        return IndicatorSeries(
+            ts_code=self.ts_code,
+            trade_dates=trade_dates,
+            close=close,
+            volume=volume,
+            arrays={name: np.concatenate((self.arrays[name], tail[name][skip:])) for name in _SERIES_FIELDS},
+        )
+
+
+def build_indicator_series(ts_code: str, trade_dates, close, volume) -> IndicatorSeries:
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    return IndicatorSeries(
+        ts_code=str(ts_code),
+        trade_dates=np.asarray(trade_dates).astype(str),
+        close=close,
+        volume=volume,
+        arrays=compute_indicator_arrays(close, volume),
+    )
+
+
+def _same_row(series: IndicatorSeries, cached_row: int, trade_dates: np.ndarray, close: np.ndarray, row: int) -> bool:
+    return str(series.trade_dates[cached_row]) == str(trade_dates[row]) and series.close[cached_row] == close[row]
+
+
+def _request_offset(series: IndicatorSeries, trade_dates: np.ndarray, close: np.ndarray) -> Optional[int]:
+    """Cached row of the request's first trade date, if that row matches."""
+    start = int(np.searchsorted(series.trade_dates, trade_dates[0]))
+    if start < len(series) and _same_row(series, start, trade_dates, close, 0):
+        return start
+    return None
+
+
+class IndicatorCache:
+    """Rolling-indicator series per (ts_code, window set), validated against the last trade date."""
+
+    def __init__(self, directory: Optional[str] = None, *, max_entries: Optional[int] = None) -> None:
+        self.directory = directory
+        self.max_entries = max_entries or indicator_cache_max_entries()
+        self.window_key = indicator_window_key()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, IndicatorSeries]" = OrderedDict()
+
+    def _path(self, ts_code: str) -> Optional[Path]:
+        if not self.directory:
+            return None
+        return Path(self.directory) / self.window_key / f"{re.sub(r'[^0-9A-Za-z._-]', '_', ts_code)}.npz"
+
+    def _load(self, ts_code: str) -> Optional[IndicatorSeries]:
+        path = self._path(ts_code)
+        if path is None or not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return IndicatorSeries(
+                    ts_code=ts_code,
+                    trade_dates=data["trade_dates"],
+                    close=data["close"],
+                    volume=data["volume"],
+                    arrays={name: data[name] for name in _SERIES_FIELDS},
+                )
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("indicator cache entry unreadable, rebuilding %s: %s", path, exc)
+            return None
+
+    def _save(self, series: IndicatorSeries) -> None:
+        path = self._path(series.ts_code)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, trade_dates=series.trade_dates, close=series.close, volume=series.volume, **series.arrays)
+                os.replace(tmp, str(path))
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as exc:
+            logger.warning("indicator cache write failed for %s: %s", series.ts_code, exc)
+
+    def _remember(self, series: IndicatorSeries) -> None:
+        self._entries[series.ts_code] = series
+        self._entries.move_to_end(series.ts_code)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, ts_code: str, trade_dates, close, volume) -> IndicatorSeries:
+        """Series for this history: cached, sliced, extended or freshly computed.
+
+        The request is aligned on its first trade date; only a changed cached
+        entry (extension or recompute) is written back, outside the lock.
+        """
+        ts_code = str(ts_code)
+        trade_dates = np.asarray(trade_dates).astype(str)
+        close = np.asarray(close, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        n = len(trade_dates)
+        with self._lock:
+            cached = self._entries.get(ts_code)
+        if cached is None:
+            cached = self._load(ts_code)
+        start = _request_offset(cached, trade_dates, close) if cached is not None and n and len(cached) else None
+        if start is not None:
+            covered = len(cached) - start
+            if covered >= n and _same_row(cached, start + n - 1, trade_dates, close, n - 1):
+                with self._lock:
+                    self._remember(cached)
+                return cached.window(start, n)
+            if covered < n and _same_row(cached, len(cached) - 1, trade_dates, close, covered - 1):
+                series = cached.extended(
+                    np.concatenate((cached.trade_dates[:start], trade_dates)),
+                    np.concatenate((cached.close[:start], close)),
+                    np.concatenate((cached.volume[:start], volume)),
+                )
+                with self._lock:
+                    self._remember(series)
+                self._save(series)
+                return series.window(start, n)
+        series = build_indicator_series(ts_code, trade_dates, close, volume)
+        with self._lock:
+            self._remember(series)
+        self._save(series)
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
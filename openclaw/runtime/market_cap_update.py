@@ -0,0 +1,180 @@
+"""Incremental circulating / total market-cap refresh for ``stock_basic``.
+
+Per-date ``daily_basic`` slices are kept in ``stock_market_cap_daily``; a run
+fetches only trade dates newer than the latest stored one and rewrites
+``stock_basic`` caps only for codes whose ``mv_date`` lags that date.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Protocol, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger("openclaw.market_cap_update")
+
+MARKET_CAP_DAILY_TABLE = "stock_market_cap_daily"
+MARKET_CAP_FIELDS = "ts_code,trade_date,close,circ_mv,total_mv"
+DEFAULT_MARKET_CAP_MAX_DATES = 5
+
+
+class MarketCapProvider(Protocol):
+    def daily_basic(self, trade_date: str) -> pd.DataFrame:
+        """One trade date's ts_code / trade_date / circ_mv / total_mv rows (empty if unpublished)."""
+
+
+class TushareMarketCapProvider:
+    """``daily_basic`` through a Tushare Pro client, pausing between calls like the old loop."""
+
+    def __init__(self, pro: Any, *, pause_seconds: float = 0.1) -> None:
+        self.pro = pro
+        self.pause_seconds = pause_seconds
+
+    def daily_basic(self, trade_date: str) -> pd.DataFrame:
+        try:
+            df = self.pro.daily_basic(trade_date=trade_date, fields=MARKET_CAP_FIELDS)
+        except Exception as exc:
+            logger.warning("daily_basic(%s) failed: %s", trade_date, exc)
+            return pd.DataFrame()
+        finally:
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+        return df if df is not None else pd.DataFrame()
+
+
+class StaticMarketCapProvider:
+    """Local provider serving pre-built frames by trade date; records every request."""
+
+    def __init__(self, frames: Mapping[str, pd.DataFrame]) -> None:
+        self.frames = {str(date): frame for date, frame in frames.items()}
+        self.requested: List[str] = []
+
+    def daily_basic(self, trade_date: str) -> pd.DataFrame:
+        self.requested.append(str(trade_date))
+        return self.frames.get(str(trade_date), pd.DataFrame()).copy()
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [str(row[1]) for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def ensure_market_cap_schema(conn: sqlite3.Connection) -> None:
+    with conn:
+        existing = _columns(conn, "stock_basic")
+        for column, ddl in (("circ_mv", "REAL DEFAULT 0"), ("total_mv", "REAL DEFAULT 0"), ("mv_date", "TEXT")):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE stock_basic ADD COLUMN {column} {ddl}")
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {MARKET_CAP_DAILY_TABLE} (
+                ts_code TEXT NOT NULL,
+                trade_date TEXT NOT NULL,
+                circ_mv REAL,
+                total_mv REAL,
+                PRIMARY KEY (ts_code, trade_date)
+            )
+            """
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{MARKET_CAP_DAILY_TABLE}_date ON {MARKET_CAP_DAILY_TABLE}(trade_date)"
+        )
+
+
+def latest_market_cap_date(conn: sqlite3.Connection) -> str:
+    row = conn.execute(f"SELECT MAX(trade_date) FROM {MARKET_CAP_DAILY_TABLE}").fetchone()
+    return str(row[0]) if row and row[0] else ""
+
+
+def missing_market_cap_dates(
+    latest_stored: str,
+    candidate_dates: Iterable[str],
+    *,
+    max_dates: int = DEFAULT_MARKET_CAP_MAX_DATES,
+) -> List[str]:
+    """Candidate dates newer than ``latest_stored``, newest ``max_dates`` of them, newest first."""
+    newer = sorted({str(d) for d in candidate_dates if d and str(d) > latest_stored}, reverse=True)
+    return newer[: max(1, int(max_dates))]
+
+
+def _cap_rows(frame: pd.DataFrame, trade_date: str, local_codes: set) -> List[tuple]:
+    if frame is None or frame.empty or "ts_code" not in frame.columns:
+        return []
+    frame = frame[frame["ts_code"].isin(local_codes)]
+    circ = pd.to_numeric(frame.get("circ_mv"), errors="coerce").fillna(0.0)
+    total = pd.to_numeric(frame.get("total_mv"), errors="coerce").fillna(0.0)
+    dates = frame["trade_date"].astype(str) if "trade_date" in frame.columns else pd.Series(trade_date, index=frame.index)
+    return list(zip(frame["ts_code"].astype(str), dates, circ.astype(float), total.astype(float)))
+
+
+def update_market_cap_incremental(
+    conn: sqlite3.Connection,
+    provider: MarketCapProvider,
+    *,
+    candidate_dates: Sequence[str],
+    max_dates: int = DEFAULT_MARKET_CAP_MAX_DATES,
+) -> Dict[str, Any]:
+    """Fetch caps for missing trade dates and refresh stale ``stock_basic`` rows.
+
+    ``candidate_dates`` are recent trade dates (any order). Dates at or before
+    the newest stored cap date are never requested again; with nothing stored
+    yet, only the newest date that returns data is kept.
+    """
+    ensure_market_cap_schema(conn)
+    local_codes = {str(r[0]) for r in conn.execute("SELECT ts_code FROM stock_basic").fetchall()}
+    latest_stored = latest_market_cap_date(conn)
+    fetched: List[str] = []
+    rows: List[tuple] = []
+    for trade_date in missing_market_cap_dates(latest_stored, candidate_dates, max_dates=max_dates):
+        date_rows = _cap_rows(provider.daily_basic(trade_date), trade_date, local_codes)
+        if date_rows:
+            fetched.append(trade_date)
+            rows.extend(date_rows)
+            if not latest_stored:
+                break
+
+    with conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {MARKET_CAP_DAILY_TABLE} (ts_code, trade_date, circ_mv, total_mv) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        latest = latest_market_cap_date(conn)
+        updated = 0
+        if latest:
+            updated = conn.execute(
+                f"""
+                UPDATE stock_basic
+                SET circ_mv = mv.circ_mv, total_mv = mv.total_mv, mv_date = mv.trade_date
+                FROM {MARKET_CAP_DAILY_TABLE} mv
+                WHERE mv.ts_code = stock_basic.ts_code
+                  AND mv.trade_date = ?
+                  AND (stock_basic.mv_date IS NULL OR stock_basic.mv_date < mv.trade_date)
+                """,
+                (latest,),
+            ).rowcount
+    return {
+        "latest_date": latest,
+        "previous_date": latest_stored,
+        "fetched_dates": sorted(fetched),
+        "stored_rows": len(rows),
+        "updated_count": int(updated),
+    }
+
+
+def market_cap_distribution(conn: sqlite3.Connection) -> Dict[str, int]:
+    row = conn.execute(
+        """
+        SELECT
+            COUNT(*) as total,
+            SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 >= 100 AND circ_mv/10000 <= 500 THEN 1 ELSE 0 END) as count_100_500,
+            SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 >= 50 AND circ_mv/10000 < 100 THEN 1 ELSE 0 END) as count_50_100,
+            SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 < 50 THEN 1 ELSE 0 END) as count_below_50,
+            SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 > 500 THEN 1 ELSE 0 END) as count_above_500
+        FROM stock_basic
+        WHERE circ_mv > 0
+        """
+    ).fetchone()
+    keys = ("total", "count_100_500", "count_50_100", "count_below_50", "count_above_500")
+    return {key: int(value or 0) for key, value in zip(keys, row)}
@@ -0,0 +1,179 @@
+"""Per-scan market context shared by the v49 fusion evaluator."""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+
+UNKNOWN_INDUSTRY_HEAT: Dict[str, Any] = {"heat_score": 0, "heat_level": "未知", "industry_return": 0}
+INDUSTRY_HEAT_MIN_ROWS = 5
+
+
+def classify_market_environment(index_data: Optional[pd.DataFrame]) -> str:
+    """'bull' / 'bear' / 'oscillation' from the latest 20 index rows (newest first)."""
+    if index_data is None or len(index_data) < 20:
+        return "oscillation"
+    index_return_20 = (index_data["close_price"].iloc[0] - index_data["close_price"].iloc[-1]) / index_data["close_price"].iloc[-1]
+    index_volatility = index_data["pct_chg"].std()
+    if index_return_20 > 0.10 and index_volatility < 2.0:
+        return "bull"
+    if index_return_20 < -0.10:
+        return "bear"
+    return "oscillation"
+
+
+def score_industry_heat(*, rows: int, avg_return: float, limit_up_count: int, avg_volume: float) -> Dict[str, Any]:
+    """Heat score (0-20) for one industry's latest-day aggregates."""
+    if rows < INDUSTRY_HEAT_MIN_ROWS:
+        return dict(UNKNOWN_INDUSTRY_HEAT)
+    heat_score = 0
+    if avg_return > 3:
+        heat_score += 10
+    elif avg_return > 1:
+        heat_score += 7
+    elif avg_return > 0:
+        heat_score += 4
+
+    limit_up_ratio = limit_up_count / rows
+    if limit_up_ratio > 0.05:
+        heat_score += 5
+    elif limit_up_ratio > 0.02:
+        heat_score += 3
+
+    if avg_volume > 100000:
+        heat_score += 5
+    elif avg_volume > 50000:
+        heat_score += 3
+
+    if heat_score >= 15:
+        heat_level = " 高热"
+    elif heat_score >= 10:
+        heat_level = "⭐ 热门"
+    elif heat_score >= 5:
+        heat_level = " 温和"
+    else:
+        heat_level = " 冷门"
+    return {
+        "heat_score": min(20, heat_score),
+        "heat_level": heat_level,
+        "industry_return": round(avg_return, 2),
+        "limit_up_ratio": round(limit_up_ratio * 100, 1) if limit_up_count > 0 else 0,
+    }
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def load_industry_heat_map(conn: sqlite3.Connection, *, daily_table: str, trade_date: str) -> Dict[str, Dict[str, Any]]:
+    """Heat for every industry on ``trade_date`` from one grouped query."""
+    rows = conn.execute(
+        f"""
+        SELECT sb.industry,
+               COUNT(*),
+               AVG(dtd.pct_chg),
+               SUM(CASE WHEN dtd.pct_chg > 9.5 THEN 1 ELSE 0 END),
+               AVG(dtd.vol)
+        FROM {daily_table} dtd
+        INNER JOIN stock_basic sb ON dtd.ts_code = sb.ts_code
+        WHERE dtd.trade_date = ?
+          AND sb.industry IS NOT NULL
+        GROUP BY sb.industry
+        """,
+        (trade_date,),
+    ).fetchall()
+    return {
+        str(industry): score_industry_heat(
+            rows=int(count or 0),
+            avg_return=_as_float(avg_return),
+            limit_up_count=int(limit_up or 0),
+            avg_volume=_as_float(avg_volume),
+        )
+        for industry, count, avg_return, limit_up, avg_volume in rows
+    }
+
+
+@dataclass(frozen=True)
+class MarketContextSnapshot:
+    """Market-wide inputs that are identical for every stock of one scan date."""
+
+    trade_date: str
+    market_env: str
+    weights: Dict[str, float]
+    industry_heat: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # False when the index or industry data could not be loaded; such snapshots are never cached.
+    complete: bool = True
+
+    def heat_for(self, industry: Any) -> Dict[str, Any]:
+        if industry is None or pd.isna(industry) or not industry:
+            return dict(UNKNOWN_INDUSTRY_HEAT)
+        return dict(self.industry_heat.get(str(industry), UNKNOWN_INDUSTRY_HEAT))
+
+
+def build_market_context_snapshot(
+    *,
+    conn: sqlite3.Connection,
+    trade_date: str,
+    daily_table: str,
+    index_data: Optional[pd.DataFrame],
+    dynamic_weights: Callable[[str], Dict[str, float]],
+) -> MarketContextSnapshot:
+    market_env = classify_market_environment(index_data)
+    industry_heat: Dict[str, Dict[str, Any]] = {}
+    if trade_date and daily_table:
+        industry_heat = load_industry_heat_map(conn, daily_table=daily_table, trade_date=trade_date)
+    return MarketContextSnapshot(
+        trade_date=str(trade_date or ""),
+        market_env=market_env,
+        weights=dict(dynamic_weights(market_env)),
+        industry_heat=industry_heat,
+        complete=index_data is not None and not index_data.empty and bool(industry_heat),
+    )
+
+
+class MarketContextCache:
+    """One complete snapshot per latest trade date; a new trade date rebuilds it.
+
+    ``recent`` returns the cached snapshot without re-reading the latest trade
+    date while it was confirmed less than ``recheck_seconds`` ago, so callers
+    that do not pass a snapshot still check the DB at most once per interval.
+    """
+
+    def __init__(self, *, recheck_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: Optional[MarketContextSnapshot] = None
+        self._checked_at = 0.0
+        self._recheck_seconds = float(recheck_seconds)
+        self._clock = clock
+
+    def recent(self) -> Optional[MarketContextSnapshot]:
+        with self._lock:
+            if self._snapshot is not None and self._clock() - self._checked_at < self._recheck_seconds:
+                return self._snapshot
+            return None
+
+    def get(self, trade_date: str, build: Callable[[], MarketContextSnapshot]) -> MarketContextSnapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.trade_date != str(trade_date or ""):
+                snapshot = build()
+                if not snapshot.complete:
+                    return snapshot
+                self._snapshot = snapshot
+            self._checked_at = self._clock()
+            return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
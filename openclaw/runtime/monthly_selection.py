@@ -0,0 +1,461 @@
+"""Shared-feature monthly target selection (``select_monthly_target_stocks_v3``).
+
+Per-stock features are computed once from contiguous ``ts_code`` slices of
+the sorted frame; each relaxation stage is then a set of masks over that
+feature table plus scoring of the surviving candidates, so stages are cheap
+enough to evaluate side by side.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+LIMIT_UP_GROWTH_BOARD = 0.195
+LIMIT_UP_MAIN_BOARD = 0.095
+GROWTH_BOARD_PREFIXES = ("300", "301", "688")
+ST_NAME_TAGS = ("ST", "退", "*")
+VOL_PERCENTILE_LOOKBACK = 120
+VOL_PERCENTILE_MIN_ROWS = 80
+VOL_WINDOW = 20
+
+FEATURE_COLUMNS = (
+    "last_close",
+    "today_pct",
+    "ret_20",
+    "ret_5",
+    "avg_amount_20",
+    "avg_amount_20_yi",
+    "limit_up_days",
+    "vol_percentile",
+    "max_drawdown",
+    "volatility",
+    "bias",
+    "pullback_confirm",
+    "vol_ratio",
+)
+
+STAGE_STAT_KEYS = (
+    "skip_history",
+    "skip_st",
+    "skip_len_data",
+    "skip_limitup",
+    "skip_amount",
+    "skip_mcap",
+    "skip_turnover",
+    "skip_ret20_gate",
+    "skip_industry_weak",
+    "skip_vol_percentile",
+    "candidates",
+    "skip_drawdown",
+    "skip_volatility",
+    "skip_pullback",
+    "skip_bias",
+    "skip_score",
+    "results",
+)
+
+
+def limit_up_thresholds(ts_codes: Sequence[str]) -> np.ndarray:
+    """Daily limit-up threshold per code: 19.5% on ChiNext/STAR, 9.5% elsewhere."""
+    codes = pd.Series(ts_codes, dtype=object).astype(str).str.split(".").str[0]
+    return np.where(codes.str.startswith(GROWTH_BOARD_PREFIXES), LIMIT_UP_GROWTH_BOARD, LIMIT_UP_MAIN_BOARD)
+
+
+def _numeric(frame: pd.DataFrame, column: str) -> np.ndarray:
+    return pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+
+
+def _stock_features(
+    close: np.ndarray, vol: np.ndarray, amount: np.ndarray, pct: np.ndarray, limit_up_pct: float
+) -> Dict[str, Any]:
+    close = close[~np.isnan(close)]
+    vol = vol[~np.isnan(vol)]
+    amount = amount[~np.isnan(amount)]
+    if len(close) < 20 or len(vol) < 20 or len(amount) < 20:
+        return {"enough_data": False}
+
+    last_close = float(close[-1])
+    avg_amount_20 = float(amount[-20:].mean())
+    features: Dict[str, Any] = {
+        "enough_data": True,
+        "last_close": last_close,
+        "today_pct": float(pct[-1]),
+        "ret_20": last_close / float(close[-21]) - 1 if len(close) >= 21 else 0,
+        "ret_5": last_close / float(close[-6]) - 1 if len(close) >= 6 else 0,
+        "avg_amount_20": avg_amount_20,
+        "avg_amount_20_yi": avg_amount_20 / 1e5,  # Tushare amount为千元，这里转换为亿元
+        "limit_up_days": int((pct[-10:] >= limit_up_pct).sum()),
+    }
+
+    vol_percentile = np.nan
+    if len(pct) >= VOL_PERCENTILE_MIN_ROWS:
+        first = max(0, len(pct) - VOL_PERCENTILE_LOOKBACK)
+        stds = sliding_window_view(pct, VOL_WINDOW)[first:].std(axis=1, ddof=1)
+        samples = stds[stds > 0]
+        if len(samples):
+            cur_vol = float(pct[-VOL_WINDOW:].std(ddof=1))
+            vol_percentile = float((samples <= cur_vol).sum()) / len(samples)
+    features["vol_percentile"] = vol_percentile
+
+    recent_close = close[-20:]
+    features["max_drawdown"] = abs(float((recent_close / np.maximum.accumulate(recent_close) - 1).min()))
+    features["volatility"] = float(pct[-20:].std(ddof=1))
+
+    ma10 = float(close[-10:].mean())
+    ma20 = float(close[-20:].mean())
+    bias = (last_close - ma20) / ma20 if ma20 > 0 else 0
+    prev_close = float(close[-2])
+    features["bias"] = bias
+    features["pullback_confirm"] = bool((prev_close < ma10 and last_close >= ma10) or (-0.03 <= bias <= 0.05))
+
+    recent_vol = float(vol[-3:].mean())
+    hist_vol = float(vol[-10:].mean()) if len(vol) >= 10 else float(vol.mean())
+    features["vol_ratio"] = recent_vol / hist_vol if hist_vol > 0 else 1.0
+    return features
+
+
+def build_monthly_features(df: pd.DataFrame) -> pd.DataFrame:
+    """One row of selection features per ``ts_code`` (``df`` sorted by ts_code, trade_date).
+
+    Stocks whose features cannot be computed (e.g. a zero reference close)
+    are flagged ``feature_error`` and dropped silently by every stage, as the
+    per-stock ``try/except`` did.
+    """
+    codes = df["ts_code"].to_numpy()
+    if len(codes) == 0:
+        return pd.DataFrame()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    ts_codes = codes[starts]
+    limits = limit_up_thresholds(ts_codes)
+
+    close = _numeric(df, "close_price")
+    vol = _numeric(df, "vol")
+    amount = _numeric(df, "amount")
+    pct = np.nan_to_num(_numeric(df, "pct_chg"), nan=0.0) / 100
+    last_rows = ends - 1
+    names = df["name"].to_numpy()[last_rows] if "name" in df.columns else ts_codes
+    industries = df["industry"].to_numpy()[last_rows] if "industry" in df.columns else np.full(len(ts_codes), "未知", dtype=object)
+    circ_mv = _numeric(df, "circ_mv")[last_rows] if "circ_mv" in df.columns else np.full(len(ts_codes), np.nan)
+
+    rows: List[Dict[str, Any]] = []
+    for k, (start, end) in enumerate(zip(starts, ends)):
+        name = names[k]
+        row: Dict[str, Any] = {
+            "ts_code": ts_codes[k],
+            "name": name,
+            "industry": industries[k],
+            "has_industry": bool(industries[k]),
+            "history_days": int(end - start),
+            "is_st": isinstance(name, str) and any(tag in name for tag in ST_NAME_TAGS),
+            "limit_up_pct": float(limits[k]),
+            "circ_mv": circ_mv[k],
+            "feature_error": False,
+        }
+        try:
+            row.update(_stock_features(close[start:end], vol[start:end], amount[start:end], pct[start:end], limits[k]))
+        except (ZeroDivisionError, IndexError, ValueError):
+            row.update(enough_data=True, feature_error=True)
+        rows.append(row)
+
+    features = pd.DataFrame(rows)
+    # Keep the raw label objects; string-dtype inference would turn None into NaN.
+    for column, values in (("ts_code", ts_codes), ("name", names), ("industry", industries)):
+        features[column] = pd.Series(values, dtype=object)
+    for column in FEATURE_COLUMNS:
+        if column not in features.columns:
+            features[column] = np.nan
+    valid_cap = features["circ_mv"].notna() & (features["circ_mv"] > 0)
+    features["circ_mv_yi"] = features["circ_mv"].where(valid_cap) / 10000
+    # amount为千元，circ_mv为万元 -> 统一为元
+    features["avg_turnover"] = (features["avg_amount_20"] * 1000) / (features["circ_mv"].where(valid_cap) * 10000)
+    features.attrs["has_circ_mv"] = "circ_mv" in df.columns
+    return features
+
+
+def _score_candidate(
+    row: Mapping[str, Any],
+    params: Mapping[str, Any],
+    *,
+    target_return: float,
+    min_amount: float,
+    vol_limit: float,
+) -> tuple:
+    score = 0
+    reasons: List[str] = []
+    ret_20 = row["ret_20"]
+    circ_mv_yi = row["circ_mv_yi"]
+
+    # 市值分层（中盘 / 大盘）
+    tier = None
+    if circ_mv_yi is not None:
+        if params["mid_cap_min"] <= circ_mv_yi <= params["mid_cap_max"]:
+            tier = "mid"
+        elif params["large_cap_min"] <= circ_mv_yi <= params["large_cap_max"]:
+            tier = "large"
+
+    # 适度动量
+    if ret_20 >= target_return:
+        score += 25
+        reasons.append(f"20日达标{ret_20*100:.1f}%")
+    elif ret_20 >= target_return * 0.6:
+        score += 18
+        reasons.append(f"20日稳健{ret_20*100:.1f}%")
+    elif ret_20 >= 0.05:
+        score += 12
+        reasons.append(f"20日向上{ret_20*100:.1f}%")
+    elif ret_20 >= 0:
+        score += 6
+
+    if tier == "mid":
+        score += 6
+        reasons.append("中盘优势")
+    elif tier == "large":
+        score += 4
+        reasons.append("大盘稳健")
+
+    if row["pullback_confirm"]:
+        score += 20
+        reasons.append("回踩确认")
+
+    max_drawdown = row["max_drawdown"]
+    if max_drawdown <= params["drawdown_good"]:
+        score += 15
+        reasons.append(f"回撤{max_drawdown*100:.1f}%")
+    else:
+        score += 8
+
+    if row["volatility"] <= vol_limit * 0.7:
+        score += 10
+        reasons.append("波动低")
+    else:
+        score += 6
+
+    # 行业强度（行业中位数 + 上涨占比）
+    industry_median = row["industry_median"]
+    if industry_median >= 0.08:
+        score += 14
+        reasons.append("行业强势")
+    elif industry_median >= 0.03:
+        score += 8
+        reasons.append("行业偏强")
+    elif industry_median <= -0.02:
+        score -= 5
+
+    if row["industry_pos_ratio"] >= 0.6:
+        score += 7
+    elif row["industry_pos_ratio"] <= 0.4:
+        score -= 3
+
+    # 龙头/次龙结构识别
+    if row["industry_rank"] == 1:
+        score += 10
+        reasons.append("行业龙头")
+    elif row["industry_rank"] == 2:
+        score += 6
+        reasons.append("行业次龙")
+
+    vol_percentile = row["vol_percentile"]
+    if vol_percentile is not None:
+        if vol_percentile <= 0.35:
+            score += 8
+            reasons.append("波动低位")
+        elif vol_percentile <= 0.55:
+            score += 4
+        elif vol_percentile >= 0.8:
+            score -= 4
+
+    sector_heat = min(row["sector_count"] * params["sector_weight"], params["sector_cap"])
+    score += sector_heat
+    if sector_heat >= params["sector_strong"]:
+        reasons.append("板块共振")
+
+    if row["avg_amount_20_yi"] >= min_amount * 1.5:
+        score += 8
+        reasons.append("成交活跃")
+    else:
+        score += 4
+
+    avg_turnover = row["avg_turnover"]
+    if avg_turnover is not None:
+        if 0.01 <= avg_turnover <= 0.08:
+            score += 8
+            reasons.append("换手健康")
+        elif 0.005 <= avg_turnover <= 0.12:
+            score += 4
+
+    # 当日涨幅（避免追高）
+    today_pct = row["today_pct"]
+    if -0.01 <= today_pct <= 0.04:
+        score += 6
+        reasons.append("温和走强")
+    elif 0.04 < today_pct < row["limit_up_pct"]:
+        score += 3
+
+    bias = row["bias"]
+    if params["bias_min"] <= bias <= params["bias_max"]:
+        score += 6
+    elif abs(bias) <= params["bias_soft_max"]:
+        score += 3
+    return score, reasons, tier
+
+
+def _none_if_nan(value: Any) -> Any:
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def evaluate_monthly_stage(
+    features: pd.DataFrame,
+    params: Mapping[str, Any],
+    *,
+    target_return: float,
+    min_amount: float,
+    max_volatility: float,
+    min_market_cap: float,
+    max_market_cap: float,
+    market_status: str,
+    market_multiplier: float,
+) -> Dict[str, Any]:
+    """Result rows and skip counters of one relaxation stage over shared features.
+
+    Gates apply in the order of the original per-stock loop, so each skipped
+    stock is counted under the first gate it fails.
+    """
+    stats: Dict[str, Any] = {"stage": params.get("stage_name", "unknown"), "total_stocks": len(features)}
+    stats.update({key: 0 for key in STAGE_STAT_KEYS})
+    if features.empty:
+        return {"results": [], "stats": stats}
+    alive = np.ones(len(features), dtype=bool)
+
+    def gate(key: str, fail: Any) -> None:
+        fail = np.asarray(fail, dtype=bool)
+        stats[key] += int((alive & fail).sum())
+        alive[:] = alive & ~fail
+
+    gate("skip_history", features["history_days"] < params["min_history_days"])
+    gate("skip_st", features["is_st"])
+    gate("skip_len_data", ~features["enough_data"].astype(bool))
+    alive &= ~features["feature_error"].to_numpy(dtype=bool)
+
+    # 行业强度基础统计（非ST且有足够数据）
+    pool = features[alive & features["has_industry"].to_numpy(dtype=bool)]
+    by_industry = pool.groupby("industry", dropna=False, sort=False)["ret_20"]
+    industry_median = by_industry.transform("median")
+    industry_pos_ratio = by_industry.transform(lambda rets: (rets > 0).sum() / max(len(rets), 1))
+    industry_rank = by_industry.rank(method="first", ascending=False)
+
+    gate("skip_limitup", (features["today_pct"] >= features["limit_up_pct"]) | (features["limit_up_days"] >= params["limit_up_days_limit"]))
+    gate("skip_amount", features["avg_amount_20_yi"] < min_amount * params["min_amount_factor"])
+    circ_mv_yi = features["circ_mv_yi"]
+    gate("skip_mcap", circ_mv_yi.notna() & ((circ_mv_yi < min_market_cap) | (circ_mv_yi > max_market_cap)))
+    turnover = features["avg_turnover"]
+    gate("skip_turnover", turnover.notna() & ((turnover < params["turnover_min"]) | (turnover > params["turnover_max"])))
+    ret20_gate = max(target_return * params["ret20_factor"], params["ret20_floor"])
+    gate("skip_ret20_gate", ~(features["ret_20"] >= ret20_gate))
+
+    candidates = features[alive].copy()
+    stats["candidates"] = len(candidates)
+    candidates["industry_median"] = industry_median.reindex(candidates.index).fillna(0)
+    candidates["industry_pos_ratio"] = industry_pos_ratio.reindex(candidates.index).fillna(0)
+    candidates["industry_rank"] = industry_rank.reindex(candidates.index)
+    candidates["sector_count"] = candidates.groupby("industry", dropna=False, sort=False)["ts_code"].transform("size")
+
+    vol_limit = max_volatility * params["volatility_factor"]
+    weak_market = market_status == " 弱势"
+    survivors = np.ones(len(candidates), dtype=bool)
+    alive = survivors
+    gate("skip_industry_weak", weak_market & (candidates["industry_median"] < -0.02))
+    gate("skip_vol_percentile", candidates["vol_percentile"] >= params["vol_percentile_max"])
+    gate("skip_drawdown", candidates["max_drawdown"] > params["max_drawdown"])
+    gate("skip_volatility", candidates["volatility"] > vol_limit)
+    if params["require_pullback"]:
+        gate("skip_pullback", ~candidates["pullback_confirm"].astype(bool))
+    bias = candidates["bias"]
+    gate(
+        "skip_bias",
+        ~(((params["bias_min"] <= bias) & (bias <= params["bias_max"])) | (bias.abs() <= params["bias_soft_max"])),
+    )
+
+    has_circ_mv = features.attrs.get("has_circ_mv", False)
+    results: List[Dict[str, Any]] = []
+    for row in candidates[alive].to_dict("records"):
+        row = {key: _none_if_nan(value) for key, value in row.items()}
+        score, reasons, tier = _score_candidate(
+            row, params, target_return=target_return, min_amount=min_amount, vol_limit=vol_limit
+        )
+        score = score * market_multiplier
+        if score < params["score_threshold"]:
+            stats["skip_score"] += 1
+            continue
+        ret_20 = row["ret_20"]
+        predicted_return = max(ret_20 * 0.9, 0.05)
+        if score >= 70:
+            grade = " 强烈推荐"
+        elif score >= 50:
+            grade = " 推荐"
+        elif score >= 35:
+            grade = " 关注"
+        else:
+            grade = "观察"
+        reasons.insert(0, grade)
+        if market_status != "正常":
+            reasons.append(market_status)
+        avg_turnover = row["avg_turnover"]
+        circ_mv = row["circ_mv"] if row["circ_mv"] is not None else np.nan
+        results.append(
+            {
+                "股票代码": row["ts_code"],
+                "股票名称": row["name"],
+                "行业": row["industry"],
+                "最新价格": f"{row['last_close']:.2f}",
+                "20日涨幅%": f"{ret_20*100:.2f}",
+                "5日涨幅%": f"{row['ret_5']*100:.2f}",
+                "预测潜力%": f"{predicted_return*100:.1f}",
+                "放量倍数": f"{row['vol_ratio']:.2f}",
+                "近20日成交额(亿)": f"{row['avg_amount_20_yi']:.2f}",
+                "换手率%": f"{avg_turnover*100:.2f}" if avg_turnover is not None else "-",
+                "回撤%": f"{row['max_drawdown']*100:.1f}",
+                "波动率%": f"{row['volatility']*100:.2f}",
+                "行业强度%": f"{row['industry_median']*100:.1f}",
+                "市值层级": "中盘" if tier == "mid" else ("大盘" if tier == "large" else "-"),
+                "评分": round(score, 1),
+                "筛选理由": " · ".join(reasons),
+                "流通市值(亿)": f"{circ_mv/10000:.1f}" if has_circ_mv else "-",
+            }
+        )
+    stats["results"] = len(results)
+    return {"results": results, "stats": stats}
+
+
+def run_monthly_stages(
+    features: pd.DataFrame,
+    stages: Sequence[Mapping[str, Any]],
+    *,
+    workers: int = 1,
+    **stage_kwargs: Any,
+) -> Dict[str, Any]:
+    """Evaluate relaxation stages concurrently; keep the first stage with results.
+
+    ``debug_runs`` lists the stages up to and including the one that produced
+    results (or all of them), matching the sequential fallback chain.
+    """
+    if int(workers) > 1 and len(stages) > 1:
+        with ThreadPoolExecutor(max_workers=min(int(workers), len(stages))) as executor:
+            runs = list(executor.map(lambda params: evaluate_monthly_stage(features, params, **stage_kwargs), stages))
+    else:
+        runs = []
+        for params in stages:
+            runs.append(evaluate_monthly_stage(features, params, **stage_kwargs))
+            if runs[-1]["results"]:
+                break
+    debug_runs: List[Dict[str, Any]] = []
+    for run in runs:
+        debug_runs.append(run["stats"])
+        if run["results"]:
+            return {"results": run["results"], "debug_runs": debug_runs}
+    return {"results": [], "debug_runs": debug_runs}
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 import os
 import sqlite3
 
+import numpy as np
 import pandas as pd
 
+from openclaw.runtime.fork_pool import fork_map, fork_supported
+
 
 def get_db_last_trade_date(db_path: str) -> str:
     try:
@@ -122,3 +126,112 @@ def postprocess_scan_results(
     if results_df is None or results_df.empty:
         return None, {"candidate_count": candidate_count, "filter_failed": 0}
     return results_df.reset_index(drop=True), {"candidate_count": candidate_count, "filter_failed": 0}
+
+
+def resolve_history_table(
+    conn: sqlite3.Connection,
+    candidates: Tuple[str, ...] = ("daily_trading_history", "daily_trading_data", "daily_data"),
+) -> str:
+    """First existing daily table, in the order the per-stock loader tries them."""
+    try:
+        tables = {str(r[0]) for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
+    except Exception:
+        return candidates[0]
+    for table in candidates:
+        if table in tables:
+            return table
+    return candidates[0]
+
+
+def stack_history_panel(histories: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """Long-format (``ts_code``, ``trade_date``) panel from per-stock frames."""
+    frames = [
+        hist.drop(columns=["ts_code"], errors="ignore").assign(ts_code=str(code))
+        for code, hist in histories.items()
+        if hist is not None and not hist.empty
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def industry_return_strength(
+    histories: Mapping[str, pd.DataFrame],
+    industry_by_code: Mapping[str, Any],
+    *,
+    window: int = 20,
+    price_col: str = "close_price",
+) -> Dict[str, float]:
+    """Mean ``window``-row return (%) per industry from one history panel.
+
+    Matches the per-stock loop it replaces: closes are forward-filled per
+    stock, stocks need more than ``window + 1`` rows, and an industry with any
+    undefined member return scores NaN.
+    """
+    frames = [
+        hist[[price_col]].assign(ts_code=str(code))
+        for code, hist in histories.items()
+        if hist is not None and price_col in hist.columns and str(code) in industry_by_code
+    ]
+    if not frames:
+        return {}
+    panel = pd.concat(frames, ignore_index=True)
+    grouped = panel.groupby("ts_code", sort=False)
+    close = pd.to_numeric(panel[price_col], errors="coerce").groupby(panel["ts_code"], sort=False).ffill()
+    rows_from_end = grouped.cumcount(ascending=False)
+    sizes = grouped["ts_code"].transform("size")
+    eligible = sizes > window + 1
+    last = close[eligible & (rows_from_end == 0)].set_axis(panel.loc[eligible & (rows_from_end == 0), "ts_code"])
+    base = close[eligible & (rows_from_end == window)].set_axis(panel.loc[eligible & (rows_from_end == window), "ts_code"])
+    returns = (last / base.reindex(last.index) - 1.0) * 100
+    if returns.empty:
+        return {}
+    industries = returns.index.map(lambda code: str(industry_by_code[code]))
+    by_industry = returns.groupby(industries, sort=False)
+    means = by_industry.mean()
+    means[returns.isna().groupby(industries, sort=False).any()] = np.nan
+    return {str(ind): float(val) for ind, val in means.items()}
+
+
+def run_stock_scan_pipeline_parallel(
+    *,
+    run_pipeline: Callable[..., List[Dict[str, Any]]],
+    stocks_df: pd.DataFrame,
+    tag: str,
+    workers: int,
+    chunk_size: int = 100,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    logger: Any = None,
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Run ``run_pipeline`` over ``stocks_df`` in chunks across forked workers.
+
+    Workers inherit the loaded histories and evaluators through fork, so only
+    chunk bounds and result rows are pickled, and at most ``workers`` chunks
+    are in flight. Row order matches a serial run. Without fork support, with
+    a single worker, or when the pool breaks, the scan runs serially.
+    """
+    total = len(stocks_df)
+    chunk_size = max(1, int(chunk_size))
+    serial_kwargs = dict(kwargs, tag=tag, on_progress=on_progress)
+    if int(workers) <= 1 or total <= chunk_size or not fork_supported():
+        return run_pipeline(stocks_df=stocks_df, **serial_kwargs)
+
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    frame = stocks_df.reset_index(drop=True)
+    chunk_kwargs = dict(kwargs, tag=tag)
+
+    def run_chunk(chunk_bounds: Tuple[int, int]) -> List[Dict[str, Any]]:
+        return run_pipeline(stocks_df=frame.iloc[chunk_bounds[0] : chunk_bounds[1]], **chunk_kwargs)
+
+    def report(chunk_bounds: Tuple[int, int], _rows: List[Dict[str, Any]]) -> None:
+        if on_progress:
+            on_progress(tag, chunk_bounds[1] - 1, total)
+
+    try:
+        chunks = fork_map(run_chunk, bounds, workers=workers, on_result=report)
+        return [row for rows in chunks for row in rows]
+    except (BrokenProcessPool, OSError) as exc:
+        if logger is not None:
+            logger.warning(f"[offline:{tag}] parallel scan failed, falling back to serial: {exc}")
+        return run_pipeline(stocks_df=stocks_df, **serial_kwargs)
@@ -0,0 +1,260 @@
+"""Panel backtests for ``CompleteVolumePriceAnalyzer``.
+
+The sampled histories are split out of the frame in one grouped pass, signal
+inputs are computed as arrays per stock, and holding-period returns come from
+shifted close arrays instead of per-signal lookups. Row order, sampling and
+output columns match the per-stock loops they replace.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.fork_pool import fork_map, fork_supported
+from openclaw.runtime.strategy_sweep import VOLUME_PRICE_MIN_ROWS, volume_price_signal_components
+
+VOLUME_PRICE_SIGNAL_COLUMNS = [
+    "trade_date",
+    "close",
+    "vol",
+    "pct_chg",
+    "signal_strength",
+    "reasons",
+    "vol_ratio",
+    "future_return",
+    "ts_code",
+    "name",
+    "industry",
+]
+EVALUATOR_MIN_ROWS = 60
+EVALUATOR_FIRST_ROW = 30
+
+
+def group_stock_histories(df: pd.DataFrame, sample_codes: Sequence[Any]) -> Dict[Any, pd.DataFrame]:
+    """Histories of ``sample_codes`` from a single groupby, in original row order."""
+    subset = df[df["ts_code"].isin(set(sample_codes))]
+    return {code: frame for code, frame in subset.groupby("ts_code", sort=False)}
+
+
+def forward_returns(close: np.ndarray, holding_days: int) -> np.ndarray:
+    """Percent return from row ``i`` to row ``i + holding_days``; NaN past the end."""
+    close = np.asarray(close, dtype=float)
+    out = np.full(len(close), np.nan)
+    h = int(holding_days)
+    if 0 < h < len(close):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[:-h] = (close[h:] - close[:-h]) / close[:-h] * 100
+    return out
+
+
+def _volume_price_reasons(vol_ratio: float, pct: float, position: float, up_days: int, above_ma5: bool) -> str:
+    reasons = []
+    if vol_ratio >= 2.0:
+        reasons.append(f"放量{vol_ratio:.1f}倍")
+    elif vol_ratio >= 1.5:
+        reasons.append(f"温和放量{vol_ratio:.1f}倍")
+    elif vol_ratio >= 1.2:
+        reasons.append(f"微量放量{vol_ratio:.1f}倍")
+    if pct >= 5:
+        reasons.append(f"大涨{pct:.1f}%")
+    elif pct >= 3:
+        reasons.append(f"中涨{pct:.1f}%")
+    elif pct >= 1:
+        reasons.append(f"小涨{pct:.1f}%")
+    elif pct > 0:
+        reasons.append(f"微涨{pct:.1f}%")
+    if position < 30:
+        reasons.append(f"底部位置{position:.0f}%")
+    elif position < 50:
+        reasons.append(f"低位{position:.0f}%")
+    elif position < 70:
+        reasons.append(f"中位{position:.0f}%")
+    if up_days >= 4:
+        reasons.append(f"{up_days}连阳")
+    elif up_days >= 3:
+        reasons.append(f"{up_days}天上涨")
+    if above_ma5:
+        reasons.append("站上MA5")
+    return ", ".join(reasons)
+
+
+def _volume_price_stock_signals(ts_code: Any, frame: pd.DataFrame, *, min_score: float, holding_days: int) -> pd.DataFrame:
+    n = len(frame)
+    close_raw = frame["close"].to_numpy(dtype=float)
+    order = np.argsort(frame["trade_date"].to_numpy(), kind="stable")
+    close = close_raw[order]
+    vol = frame["vol"].to_numpy(dtype=float)[order]
+    components = volume_price_signal_components(close, vol, frame["pct_chg"].to_numpy(dtype=float)[order])
+
+    hit = components["score"] >= min_score
+    rows = components["rows"].astype(int)[hit]
+    # Sell prices follow the unsorted history, exactly like the per-signal lookup did.
+    sell_pos = order[rows] + int(holding_days)
+    keep = sell_pos < n
+    if not keep.any():
+        return pd.DataFrame()
+    rows, sell_pos = rows[keep], sell_pos[keep]
+    picked = {name: values[hit][keep] for name, values in components.items() if name != "rows"}
+
+    buy = close[rows]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        future_return = (close_raw[sell_pos] - buy) / buy * 100
+    reasons = [
+        _volume_price_reasons(ratio, pct, position, int(up), bool(ma5))
+        for ratio, pct, position, up, ma5 in zip(
+            picked["vol_ratio"], picked["pct"], picked["price_position"], picked["up_days"], picked["above_ma5"]
+        )
+    ]
+    signals = pd.DataFrame(
+        {
+            "trade_date": frame["trade_date"].to_numpy()[order][rows],
+            "close": buy,
+            "vol": vol[rows],
+            "pct_chg": picked["pct"],
+            "signal_strength": picked["score"].astype(np.int64),
+            "reasons": reasons,
+            "vol_ratio": np.where(picked["avg_vol"] > 0, picked["vol_ratio"], 1.0),
+            "future_return": future_return,
+        }
+    )
+    signals["ts_code"] = ts_code
+    signals["name"] = frame["name"].iloc[0] if "name" in frame.columns else ts_code
+    signals["industry"] = frame["industry"].iloc[0] if "industry" in frame.columns else "未知"
+    return signals
+
+
+def volume_price_backtest_signals(
+    df: pd.DataFrame,
+    *,
+    sample_codes: Sequence[Any],
+    min_score: float,
+    holding_days: int,
+) -> pd.DataFrame:
+    """Every volume/price signal with its holding-period return for the sampled stocks.
+
+    ``df`` uses ``close`` / ``vol`` / ``pct_chg`` names. Stocks with fewer than
+    120 rows (or ``30 + holding_days``) are skipped as in the per-stock loop;
+    the result is ordered by ``sample_codes`` then trade date.
+    """
+    histories = group_stock_histories(df, sample_codes)
+    min_rows = max(VOLUME_PRICE_MIN_ROWS, 30 + int(holding_days))
+    frames = []
+    for ts_code in sample_codes:
+        frame = histories.get(ts_code)
+        if frame is None or len(frame) < min_rows:
+            continue
+        signals = _volume_price_stock_signals(ts_code, frame, min_score=min_score, holding_days=holding_days)
+        if not signals.empty:
+            frames.append(signals)
+    if not frames:
+        return pd.DataFrame(columns=VOLUME_PRICE_SIGNAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def first_evaluator_signal(
+    ts_code: Any,
+    frame: pd.DataFrame,
+    *,
+    holding_days: int,
+    evaluate: Callable[[pd.DataFrame, Any], Dict[str, Any]],
+    min_score: float,
+    max_score: float,
+    extra_fields: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    skip_failed_days: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """First day whose evaluator score falls in ``[min_score, max_score]``, with its return.
+
+    The evaluator still sees each expanding window, but candidate days past
+    the return horizon are never scored and the return is read from a shifted
+    close array. A raising evaluator drops the stock unless ``skip_failed_days``.
+    """
+    h = int(holding_days)
+    if len(frame) < EVALUATOR_MIN_ROWS + h:
+        return None
+    close_col = "close_price" if "close_price" in frame.columns else "close"
+    close = frame[close_col].to_numpy()
+    returns = forward_returns(close, h)
+    for i in range(EVALUATOR_FIRST_ROW, len(frame) - h - 1):
+        try:
+            result = evaluate(frame.iloc[: i + 1].copy(), ts_code)
+        except Exception:
+            if skip_failed_days:
+                continue
+            return None
+        if not result["success"]:
+            continue
+        score = result["final_score"]
+        if not min_score <= score <= max_score:
+            continue
+        signal = {
+            "ts_code": ts_code,
+            "name": frame["name"].iloc[0] if "name" in frame.columns else ts_code,
+            "industry": frame["industry"].iloc[0] if "industry" in frame.columns else "未知",
+            "trade_date": frame["trade_date"].iloc[i],
+            "close": close[i],
+            "signal_strength": score,
+            "grade": result.get("grade", ""),
+            "reasons": result.get("signal_reasons", ""),
+            "future_return": returns[i],
+        }
+        if extra_fields is not None:
+            signal.update(extra_fields(result))
+        return signal
+    return None
+
+
+def evaluator_backtest_signals(
+    df: pd.DataFrame,
+    *,
+    sample_codes: Sequence[Any],
+    holding_days: int,
+    evaluate: Callable[[pd.DataFrame, Any], Dict[str, Any]],
+    min_score: float,
+    max_score: float,
+    extra_fields: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    skip_failed_days: bool = False,
+    workers: int = 1,
+    chunk_size: int = 25,
+    logger: Any = None,
+) -> List[Dict[str, Any]]:
+    """First in-range evaluator signal per sampled stock, in ``sample_codes`` order.
+
+    Stocks are spread over forked workers in chunks (the evaluator is
+    inherited, only signals are pickled); with one worker, no fork support or
+    a broken pool the stocks run serially.
+    """
+    histories = group_stock_histories(df, sample_codes)
+    codes = [code for code in sample_codes if code in histories]
+
+    def job(code: Any, frame: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        return first_evaluator_signal(
+            code,
+            frame,
+            holding_days=holding_days,
+            evaluate=evaluate,
+            min_score=min_score,
+            max_score=max_score,
+            extra_fields=extra_fields,
+            skip_failed_days=skip_failed_days,
+        )
+
+    def serial() -> List[Dict[str, Any]]:
+        return [signal for signal in (job(code, histories[code]) for code in codes) if signal is not None]
+
+    def run_chunk(chunk: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        return [job(code, histories[code]) for code in chunk]
+
+    if int(workers) <= 1 or len(codes) <= chunk_size or not fork_supported():
+        return serial()
+    chunks = [codes[i : i + chunk_size] for i in range(0, len(codes), chunk_size)]
+    try:
+        results = fork_map(run_chunk, chunks, workers=workers)
+        return [signal for part in results for signal in part if signal is not None]
+    except (BrokenProcessPool, OSError) as exc:
+        if logger is not None:
+            logger.warning(f"parallel evaluator backtest failed, falling back to serial: {exc}")
+        return serial()
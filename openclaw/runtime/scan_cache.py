@@ -1,4 +1,15 @@
-"""Scan cache with atomic file writes to prevent partial-read corruption."""
+"""Scan cache with atomic file writes to prevent partial-read corruption.
+
+Result tables are stored as Parquet (or Feather) when pyarrow is available and
+as CSV otherwise. A compact ``scan_cache_index.json`` tracks every entry's meta,
+size and last access so lookups never glob the directory, and least-recently
+used entries are evicted once the cache exceeds its byte budget.
+
+Index read-modify-writes hold an ``flock`` on ``scan_cache_index.lock`` so
+separate processes do not lose each other's updates. Cache hits never rewrite
+the index: they bump the data file's atime, which eviction folds into the
+entry's recorded ``last_access_ts``.
+"""
 
 from __future__ import annotations
 
@@ -8,14 +19,36 @@ import logging
 import os
 import glob
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401
+
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover - depends on optional dependency
+    _HAS_PYARROW = False
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
 logger = logging.getLogger("openclaw.scan_cache")
 
+SCAN_CACHE_INDEX_FILENAME = "scan_cache_index.json"
+SCAN_CACHE_INDEX_LOCK_FILENAME = "scan_cache_index.lock"
+SCAN_CACHE_INDEX_VERSION = 1
+DEFAULT_SCAN_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+_DATA_SUFFIXES = (".parquet", ".feather", ".csv")
+_INDEX_LOCK = threading.Lock()
+
 
 def cache_dir() -> str:
     try:
@@ -26,6 +59,22 @@ def cache_dir() -> str:
         return os.getenv("AIRIVO_CACHE_DIR", str(default_dir))
 
 
+def cache_max_bytes() -> int:
+    try:
+        return max(int(float(os.getenv("AIRIVO_SCAN_CACHE_MAX_BYTES", DEFAULT_SCAN_CACHE_MAX_BYTES))), 0)
+    except (TypeError, ValueError):
+        return DEFAULT_SCAN_CACHE_MAX_BYTES
+
+
+def cache_format() -> str:
+    requested = os.getenv("AIRIVO_SCAN_CACHE_FORMAT", "").strip().lower()
+    if requested in {"parquet", "feather"} and _HAS_PYARROW:
+        return requested
+    if requested == "csv" or not _HAS_PYARROW:
+        return "csv"
+    return "parquet"
+
+
 def _atomic_write_text(path: str, content: str) -> None:
     """Write to a temp file then atomically rename to avoid partial reads."""
     target = Path(path)
@@ -43,13 +92,21 @@ def _atomic_write_text(path: str, content: str) -> None:
         raise
 
 
-def _atomic_write_csv(path: str, df: pd.DataFrame) -> None:
+# ── typed frame storage + index ─────────────────────────────────────────
+
+def _atomic_write_frame(path: str, df: pd.DataFrame, fmt: str) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
     try:
         os.close(fd)
-        df.to_csv(tmp, index=False)
+        frame = df.reset_index(drop=True)
+        if fmt == "parquet":
+            frame.to_parquet(tmp, index=False)
+        elif fmt == "feather":
+            frame.to_feather(tmp)
+        else:
+            frame.to_csv(tmp, index=False)
         os.replace(tmp, str(target))
     except BaseException:
         try:
@@ -59,6 +116,251 @@ def _atomic_write_csv(path: str, df: pd.DataFrame) -> None:
         raise
 
 
+def _read_frame(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def _data_path_for(base: str, name: str) -> Optional[str]:
+    """Return the stored data file for ``name``, preferring typed formats."""
+    for suffix in _DATA_SUFFIXES:
+        candidate = os.path.join(base, f"{name}{suffix}")
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _index_path(base: str) -> str:
+    return os.path.join(base, SCAN_CACHE_INDEX_FILENAME)
+
+
+@contextmanager
+def _index_lock(base: str) -> Iterator[None]:
+    """Serialize index access across threads and, where flock exists, processes."""
+    with _INDEX_LOCK:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(base, exist_ok=True)
+        with open(os.path.join(base, SCAN_CACHE_INDEX_LOCK_FILENAME), "a+b") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _file_size(path: Optional[str]) -> int:
+    try:
+        return int(os.path.getsize(path)) if path else 0
+    except OSError:
+        return 0
+
+
+def _rebuild_index(base: str) -> Dict[str, Dict[str, Any]]:
+    entries: Dict[str, Dict[str, Any]] = {}
+    for meta_path in glob.glob(os.path.join(base, "*.meta.json")):
+        name = os.path.basename(meta_path)[: -len(".meta.json")]
+        data_path = _data_path_for(base, name)
+        if data_path is None:
+            continue
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f) or {}
+        except Exception:
+            continue
+        if not isinstance(meta, dict):
+            continue
+        mtime = os.path.getmtime(meta_path)
+        entries[name] = {
+            "data_file": os.path.basename(data_path),
+            "strategy": str(meta.get("strategy") or name.rsplit("_", 1)[0]),
+            "db_last": str(meta.get("db_last") or ""),
+            "bytes": _file_size(data_path) + _file_size(meta_path),
+            "created_ts": mtime,
+            "last_access_ts": mtime,
+            "meta": meta,
+        }
+    return entries
+
+
+def _load_index(base: str) -> Dict[str, Dict[str, Any]]:
+    path = _index_path(base)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f) or {}
+        if isinstance(payload, dict) and int(payload.get("version", 0) or 0) == SCAN_CACHE_INDEX_VERSION:
+            entries = payload.get("entries") or {}
+            if isinstance(entries, dict):
+                return entries
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.warning("scan cache index unreadable, rebuilding: %s", exc)
+    entries = _rebuild_index(base)
+    if entries:
+        _write_index(base, entries)
+    return entries
+
+
+def _write_index(base: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    payload = {"version": SCAN_CACHE_INDEX_VERSION, "entries": entries}
+    _atomic_write_text(_index_path(base), json.dumps(payload, ensure_ascii=False, default=str))
+
+
+def _remove_entry_files(base: str, name: str, entry: Optional[Dict[str, Any]] = None) -> None:
+    files = {f"{name}.meta.json"} | {f"{name}{suffix}" for suffix in _DATA_SUFFIXES}
+    if entry and entry.get("data_file"):
+        files.add(str(entry["data_file"]))
+    for filename in files:
+        try:
+            os.unlink(os.path.join(base, filename))
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("scan cache eviction could not remove %s: %s", filename, exc)
+
+
+def _last_access_ts(base: str, entry: Dict[str, Any]) -> float:
+    recorded = float(entry.get("last_access_ts", 0) or 0)
+    try:
+        return max(recorded, os.stat(os.path.join(base, str(entry.get("data_file") or ""))).st_atime)
+    except OSError:
+        return recorded
+
+
+def _evict(base: str, entries: Dict[str, Dict[str, Any]], keep: str, max_bytes: int) -> list:
+    total = sum(int(entry.get("bytes", 0) or 0) for entry in entries.values())
+    evicted = []
+    if max_bytes <= 0 or total <= max_bytes:
+        return evicted
+    for name, entry in entries.items():
+        entry["last_access_ts"] = _last_access_ts(base, entry)
+    by_lru = sorted(
+        (name for name in entries if name != keep),
+        key=lambda name: float(entries[name].get("last_access_ts", 0) or 0),
+    )
+    for name in by_lru:
+        if total <= max_bytes:
+            break
+        entry = entries.pop(name)
+        total -= int(entry.get("bytes", 0) or 0)
+        _remove_entry_files(base, name, entry)
+        evicted.append(name)
+    return evicted
+
+
+def _save_entry(name: str, strategy: str, db_last: str, df: pd.DataFrame, meta_out: Dict[str, Any]) -> None:
+    base = cache_dir()
+    os.makedirs(base, exist_ok=True)
+    fmt = cache_format()
+    data_path = os.path.join(base, f"{name}.{fmt}")
+    try:
+        _atomic_write_frame(data_path, df, fmt)
+    except Exception as exc:
+        if fmt == "csv":
+            raise
+        logger.warning("scan cache %s write failed for %s, falling back to csv: %s", fmt, name, exc)
+        fmt = "csv"
+        data_path = os.path.join(base, f"{name}.csv")
+        _atomic_write_frame(data_path, df, fmt)
+    meta_out = dict(meta_out)
+    meta_out["storage_format"] = fmt
+    meta_path = os.path.join(base, f"{name}.meta.json")
+    _atomic_write_text(meta_path, json.dumps(meta_out, ensure_ascii=False, indent=2, default=str))
+    for suffix in _DATA_SUFFIXES:
+        stale = os.path.join(base, f"{name}{suffix}")
+        if stale != data_path and os.path.exists(stale):
+            os.unlink(stale)
+    now = time.time()
+    with _index_lock(base):
+        entries = _load_index(base)
+        entries[name] = {
+            "data_file": os.path.basename(data_path),
+            "strategy": strategy,
+            "db_last": str(db_last or ""),
+            "bytes": _file_size(data_path) + _file_size(meta_path),
+            "created_ts": now,
+            "last_access_ts": now,
+            "meta": meta_out,
+        }
+        evicted = _evict(base, entries, name, cache_max_bytes())
+        _write_index(base, entries)
+    if evicted:
+        logger.info("scan cache evicted %d entries to stay under %d bytes", len(evicted), cache_max_bytes())
+
+
+def _load_entry(name: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+    base = cache_dir()
+    with _index_lock(base):
+        entries = _load_index(base)
+        entry = entries.get(name)
+    data_path = os.path.join(base, str(entry["data_file"])) if entry else _data_path_for(base, name)
+    meta_path = os.path.join(base, f"{name}.meta.json")
+    if not data_path or not os.path.exists(data_path):
+        return None, {}
+    if entry:
+        meta = dict(entry.get("meta") or {})
+    elif os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f) or {}
+    else:
+        return None, {}
+    df = _read_frame(data_path)
+    if entry:
+        _touch_data_file(data_path)
+    else:
+        _adopt_entry(base, name, data_path, meta_path, meta)
+    return df, meta if isinstance(meta, dict) else {}
+
+
+def _touch_data_file(data_path: str) -> None:
+    """Record a hit as the data file's atime, keeping its mtime and the index untouched."""
+    try:
+        os.utime(data_path, ns=(time.time_ns(), os.stat(data_path).st_mtime_ns))
+    except OSError as exc:
+        logger.warning("scan cache access touch failed for %s: %s", data_path, exc)
+
+
+def _adopt_entry(base: str, name: str, data_path: str, meta_path: str, meta: Dict[str, Any]) -> None:
+    try:
+        with _index_lock(base):
+            entries = _load_index(base)
+            if name not in entries:
+                entries[name] = {
+                    "data_file": os.path.basename(data_path),
+                    "strategy": str(meta.get("strategy") or name.rsplit("_", 1)[0]),
+                    "db_last": str(meta.get("db_last") or ""),
+                    "bytes": _file_size(data_path) + _file_size(meta_path),
+                    "created_ts": os.path.getmtime(data_path),
+                    "last_access_ts": time.time(),
+                    "meta": meta,
+                }
+                _write_index(base, entries)
+    except Exception as exc:
+        logger.warning("scan cache index adopt failed for %s: %s", name, exc)
+
+
+def evict_scan_cache(max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Drop least-recently used entries until the cache fits ``max_bytes``."""
+    base = cache_dir()
+    budget = cache_max_bytes() if max_bytes is None else max(int(max_bytes), 0)
+    with _index_lock(base):
+        entries = _load_index(base)
+        live = {name: entry for name, entry in entries.items() if os.path.exists(os.path.join(base, str(entry.get("data_file") or "")))}
+        evicted = _evict(base, live, "", budget)
+        _write_index(base, live)
+    return {
+        "evicted": evicted,
+        "entries": len(live),
+        "total_bytes": sum(int(entry.get("bytes", 0) or 0) for entry in live.values()),
+        "max_bytes": budget,
+    }
+
+
 # ── v7-specific helpers (kept for backward compat) ──────────────────────
 
 def v7_cache_key(params: Dict[str, Any], db_last: str) -> str:
@@ -77,13 +379,7 @@ def v7_cache_paths(params: Dict[str, Any], db_last: str) -> Tuple[str, str]:
 
 def load_v7_cache(params: Dict[str, Any], db_last: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
     try:
-        csv_path, meta_path = v7_cache_paths(params, db_last)
-        if not (os.path.exists(csv_path) and os.path.exists(meta_path)):
-            return None, {}
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f) or {}
-        df = pd.read_csv(csv_path)
-        return df, meta
+        return _load_entry(f"v7_scan_{v7_cache_key(params, db_last)}")
     except Exception as exc:
         logger.warning("load_v7_cache failed: %s", exc)
         return None, {}
@@ -91,15 +387,13 @@ def load_v7_cache(params: Dict[str, Any], db_last: str) -> Tuple[Optional[pd.Dat
 
 def save_v7_cache(params: Dict[str, Any], db_last: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
     try:
-        csv_path, meta_path = v7_cache_paths(params, db_last)
         meta_out = {
             "params": params,
             "db_last": db_last,
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
         meta_out.update(meta or {})
-        _atomic_write_csv(csv_path, df)
-        _atomic_write_text(meta_path, json.dumps(meta_out, ensure_ascii=False, indent=2))
+        _save_entry(f"v7_scan_{v7_cache_key(params, db_last)}", "v7_scan", db_last, df, meta_out)
     except Exception as exc:
         logger.warning("save_v7_cache failed: %s", exc)
 
@@ -122,13 +416,7 @@ def scan_cache_paths(strategy: str, params: Dict[str, Any], db_last: str) -> Tup
 
 def load_scan_cache(strategy: str, params: Dict[str, Any], db_last: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
     try:
-        csv_path, meta_path = scan_cache_paths(strategy, params, db_last)
-        if not (os.path.exists(csv_path) and os.path.exists(meta_path)):
-            return None, {}
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f) or {}
-        df = pd.read_csv(csv_path)
-        return df, meta
+        return _load_entry(f"{strategy}_{scan_cache_key(strategy, params, db_last)}")
     except Exception as exc:
         logger.warning("load_scan_cache(%s) failed: %s", strategy, exc)
         return None, {}
@@ -136,11 +424,13 @@ def load_scan_cache(strategy: str, params: Dict[str, Any], db_last: str) -> Tupl
 
 def load_scan_cache_meta_from_paths(csv_path: str, meta_path: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
     try:
-        if not (os.path.exists(csv_path) and os.path.exists(meta_path)):
+        base, filename = os.path.split(csv_path)
+        data_path = _data_path_for(base, os.path.splitext(filename)[0])
+        if not (data_path and os.path.exists(meta_path)):
             return None, {}
         with open(meta_path, "r", encoding="utf-8") as f:
             meta = json.load(f) or {}
-        df = pd.read_csv(csv_path)
+        df = _read_frame(data_path)
         return df, meta if isinstance(meta, dict) else {}
     except Exception as exc:
         logger.warning("load_scan_cache_meta_from_paths failed: %s", exc)
@@ -154,25 +444,24 @@ def find_recent_scan_cache(
 ) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
     try:
         base = cache_dir()
+        with _index_lock(base):
+            entries = _load_index(base)
         candidates = sorted(
-            glob.glob(os.path.join(base, f"{strategy}_*.meta.json")),
-            key=os.path.getmtime,
+            (
+                (name, entry)
+                for name, entry in entries.items()
+                if entry.get("strategy") == strategy and str(entry.get("db_last") or "") == str(db_last)
+            ),
+            key=lambda item: float(item[1].get("created_ts", 0) or 0),
             reverse=True,
         )
-        for meta_path in candidates:
-            try:
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    meta = json.load(f) or {}
-            except Exception:
-                continue
+        for name, entry in candidates:
+            meta = entry.get("meta") or {}
             if not isinstance(meta, dict):
                 continue
-            if str(meta.get("db_last") or "") != str(db_last):
-                continue
             if predicate and not predicate(meta):
                 continue
-            csv_path = meta_path.replace(".meta.json", ".csv")
-            df, loaded_meta = load_scan_cache_meta_from_paths(csv_path, meta_path)
+            df, loaded_meta = _load_entry(name)
             if isinstance(df, pd.DataFrame) and not df.empty:
                 return df, loaded_meta
         return None, {}
@@ -183,7 +472,6 @@ def find_recent_scan_cache(
 
 def save_scan_cache(strategy: str, params: Dict[str, Any], db_last: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
     try:
-        csv_path, meta_path = scan_cache_paths(strategy, params, db_last)
         meta_out = {
             "strategy": strategy,
             "params": params,
@@ -191,7 +479,6 @@ def save_scan_cache(strategy: str, params: Dict[str, Any], db_last: str, df: pd.
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
         meta_out.update(meta or {})
-        _atomic_write_csv(csv_path, df)
-        _atomic_write_text(meta_path, json.dumps(meta_out, ensure_ascii=False, indent=2))
+        _save_entry(f"{strategy}_{scan_cache_key(strategy, params, db_last)}", strategy, db_last, df, meta_out)
     except Exception as exc:
         logger.warning("save_scan_cache(%s) failed: %s", strategy, exc)
@@ -0,0 +1,191 @@
+"""SQLite-backed cache for v5/v6 analyzer scan results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+SCAN_RESULT_CACHE_VERSIONS = ("v5", "v6")
+SCAN_RESULT_CACHE_PARAMS_TABLE = "scan_cache_params"
+DEFAULT_SCAN_RESULT_CACHE_RETENTION_DAYS = 14
+
+
+def scan_result_cache_retention_days() -> int:
+    try:
+        return max(1, int(os.getenv("SCAN_RESULT_CACHE_RETENTION_DAYS", str(DEFAULT_SCAN_RESULT_CACHE_RETENTION_DAYS))))
+    except ValueError:
+        return DEFAULT_SCAN_RESULT_CACHE_RETENTION_DAYS
+
+
+def scan_params_text(scan_params: Dict[str, Any]) -> str:
+    return json.dumps(scan_params, ensure_ascii=False, sort_keys=True)
+
+
+def scan_params_hash(scan_params: Dict[str, Any]) -> str:
+    return hashlib.sha1(scan_params_text(scan_params).encode("utf-8")).hexdigest()[:16]
+
+
+def _table_for(version: str) -> str:
+    if version not in SCAN_RESULT_CACHE_VERSIONS:
+        raise ValueError(f"unsupported scan cache version: {version}")
+    return f"scan_cache_{version}"
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [str(row[1]) for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _backfill_params_hash(conn: sqlite3.Connection, table: str) -> None:
+    legacy = conn.execute(
+        f"SELECT DISTINCT scan_params FROM {table} WHERE params_hash IS NULL AND scan_params IS NOT NULL"
+    ).fetchall()
+    for (text,) in legacy:
+        try:
+            key = scan_params_hash(json.loads(text))
+        except (TypeError, ValueError):
+            key = hashlib.sha1(str(text).encode("utf-8")).hexdigest()[:16]
+        conn.execute(
+            f"INSERT OR IGNORE INTO {SCAN_RESULT_CACHE_PARAMS_TABLE} (params_hash, scan_params) VALUES (?, ?)",
+            (key, text),
+        )
+        conn.execute(f"UPDATE {table} SET params_hash = ? WHERE params_hash IS NULL AND scan_params = ?", (key, text))
+
+
+def ensure_scan_result_cache_tables(conn: sqlite3.Connection) -> None:
+    """Create the cache tables, upgrading legacy ones keyed by the params JSON."""
+    with conn:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SCAN_RESULT_CACHE_PARAMS_TABLE} (
+                params_hash TEXT PRIMARY KEY,
+                scan_params TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        for version in SCAN_RESULT_CACHE_VERSIONS:
+            table = _table_for(version)
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_date TEXT NOT NULL,
+                    ts_code TEXT NOT NULL,
+                    stock_name TEXT,
+                    industry TEXT,
+                    latest_price REAL,
+                    circ_mv REAL,
+                    final_score REAL,
+                    dim_scores TEXT,
+                    scan_params TEXT,
+                    params_hash TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            if "params_hash" not in _columns(conn, table):
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN params_hash TEXT")
+            _backfill_params_hash(conn, table)
+            conn.execute(f"DROP INDEX IF EXISTS idx_{table}_date")
+            conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_key ON {table}(scan_date, params_hash, ts_code)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_lookup ON {table}(scan_date, params_hash, final_score)"
+            )
+
+
+def _result_rows(results: Iterable[Dict[str, Any]], scan_date: str, params_key: str) -> List[tuple]:
+    return [
+        (
+            scan_date,
+            result.get("股票代码", ""),
+            result.get("股票名称", ""),
+            result.get("行业", ""),
+            result.get("最新价", 0),
+            result.get("流通市值(亿)", 0),
+            result.get("综合评分", 0),
+            json.dumps(result.get("dim_scores", {}), ensure_ascii=False) if "dim_scores" in result else "{}",
+            params_key,
+        )
+        for result in results
+    ]
+
+
+def save_scan_results(
+    conn: sqlite3.Connection,
+    *,
+    version: str,
+    results: List[Dict[str, Any]],
+    scan_params: Dict[str, Any],
+    scan_date: str,
+) -> int:
+    """Write one scan's rows in a single transaction; returns rows written."""
+    table = _table_for(version)
+    params_key = scan_params_hash(scan_params)
+    rows = _result_rows(results, scan_date, params_key)
+    with conn:
+        conn.execute(
+            f"INSERT OR IGNORE INTO {SCAN_RESULT_CACHE_PARAMS_TABLE} (params_hash, scan_params) VALUES (?, ?)",
+            (params_key, scan_params_text(scan_params)),
+        )
+        conn.executemany(
+            f"""
+            INSERT OR REPLACE INTO {table}
+            (scan_date, ts_code, stock_name, industry, latest_price, circ_mv, final_score, dim_scores, params_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def load_scan_results(
+    conn: sqlite3.Connection,
+    *,
+    version: str,
+    scan_params: Dict[str, Any],
+    scan_date: str,
+) -> pd.DataFrame:
+    table = _table_for(version)
+    return pd.read_sql_query(
+        f"""
+        SELECT ts_code, stock_name, industry, latest_price, circ_mv,
+               final_score, dim_scores
+        FROM {table}
+        WHERE scan_date = ? AND params_hash = ?
+        ORDER BY final_score DESC
+        """,
+        conn,
+        params=(scan_date, scan_params_hash(scan_params)),
+    )
+
+
+def prune_scan_results(
+    conn: sqlite3.Connection,
+    *,
+    keep_days: Optional[int] = None,
+    today: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Drop scan dates older than ``keep_days`` and parameter sets nothing references."""
+    days = scan_result_cache_retention_days() if keep_days is None else max(1, int(keep_days))
+    cutoff = ((today or datetime.now()) - timedelta(days=days)).strftime("%Y%m%d")
+    removed: Dict[str, int] = {}
+    with conn:
+        for version in SCAN_RESULT_CACHE_VERSIONS:
+            table = _table_for(version)
+            removed[table] = conn.execute(f"DELETE FROM {table} WHERE scan_date < ?", (cutoff,)).rowcount
+        referenced = " UNION ".join(
+            f"SELECT params_hash FROM {_table_for(version)} WHERE params_hash IS NOT NULL" for version in SCAN_RESULT_CACHE_VERSIONS
+        )
+        removed[SCAN_RESULT_CACHE_PARAMS_TABLE] = conn.execute(
+            f"DELETE FROM {SCAN_RESULT_CACHE_PARAMS_TABLE} WHERE params_hash NOT IN ({referenced})"
+        ).rowcount
+    return removed
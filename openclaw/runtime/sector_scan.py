@@ -0,0 +1,145 @@
+"""Industry x trade-date panel and lifecycle staging for the sector scan."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SECTOR_STAGE_CATEGORIES = ("emerging", "launching", "exploding", "declining", "transitioning")
+SECTOR_MIN_ROWS = 30
+SECTOR_RECENT_DAYS = 5
+SECTOR_GAP_DAYS = 10
+
+_STAGE_LABELS = {
+    "emerging": "萌芽期",
+    "launching": "启动期",
+    "exploding": "加速期",
+    "declining": "衰退期",
+    "transitioning": "过渡期",
+}
+
+
+def empty_sector_results() -> Dict[str, List[Dict[str, Any]]]:
+    return {category: [] for category in SECTOR_STAGE_CATEGORIES}
+
+
+def load_sector_panel(conn: sqlite3.Connection, *, daily_table: str, start_date: str) -> pd.DataFrame:
+    """Per-industry daily aggregates since ``start_date`` from one grouped query.
+
+    Columns: industry, trade_date, rows, vol (mean per stock), pct_chg (mean).
+    """
+    return pd.read_sql_query(
+        f"""
+        SELECT sb.industry AS industry,
+               dtd.trade_date AS trade_date,
+               COUNT(*) AS rows,
+               AVG(dtd.vol) AS vol,
+               AVG(dtd.pct_chg) AS pct_chg
+        FROM {daily_table} dtd
+        INNER JOIN stock_basic sb ON dtd.ts_code = sb.ts_code
+        WHERE dtd.trade_date >= ? AND sb.industry IS NOT NULL
+        GROUP BY sb.industry, dtd.trade_date
+        ORDER BY sb.industry, dtd.trade_date
+        """,
+        conn,
+        params=(start_date,),
+    )
+
+
+def sector_lifecycle_frame(panel: pd.DataFrame) -> pd.DataFrame:
+    """Volume ratio, recent price change and stage for every industry at once.
+
+    The recent window is the last 5 trade dates; the historical baseline is
+    every date except the last 10. Industries with fewer than 30 stock-day
+    rows in the window are dropped.
+    """
+    if panel.empty:
+        return pd.DataFrame(columns=["industry", "vol_ratio", "price_change", "category"])
+    panel = panel.sort_values(["industry", "trade_date"])
+    grouped = panel.groupby("industry", sort=False)
+    from_end = grouped.cumcount(ascending=False)
+    total_rows = grouped["rows"].sum()
+
+    recent = panel[from_end < SECTOR_RECENT_DAYS].groupby("industry", sort=False)
+    historical_vol = panel[from_end >= SECTOR_GAP_DAYS].groupby("industry", sort=False)["vol"].mean()
+    frame = pd.DataFrame(
+        {
+            "price_change": recent["pct_chg"].mean(),
+            "recent_vol": recent["vol"].mean(),
+        }
+    )
+    frame["historical_vol"] = historical_vol.reindex(frame.index)
+    frame = frame[total_rows.reindex(frame.index) >= SECTOR_MIN_ROWS]
+
+    historical = frame["historical_vol"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol_ratio = np.where(historical > 0, frame["recent_vol"].to_numpy(dtype=float) / np.where(historical > 0, historical, 1.0), 1.0)
+    price_change = frame["price_change"].to_numpy(dtype=float)
+    category = np.select(
+        [
+            (vol_ratio < 0.8) & (price_change > -1) & (price_change < 2),
+            (vol_ratio > 2.0) & (price_change > 5),
+            (vol_ratio > 1.3) & (vol_ratio <= 2.0) & (price_change > 2) & (price_change <= 5),
+            (vol_ratio < 1.0) & (price_change < -2),
+        ],
+        ["emerging", "exploding", "launching", "declining"],
+        "transitioning",
+    )
+    return pd.DataFrame(
+        {
+            "industry": frame.index.to_numpy(),
+            "vol_ratio": vol_ratio,
+            "price_change": price_change,
+            "category": category,
+        }
+    )
+
+
+def classify_sector_lifecycle(panel: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    """``scan_all_sectors`` result buckets from an industry x trade-date panel."""
+    results = empty_sector_results()
+    for row in sector_lifecycle_frame(panel).itertuples(index=False):
+        stage = _STAGE_LABELS[row.category]
+        results[row.category].append(
+            {
+                "sector_name": row.industry,
+                "stage": stage,
+                "score": 75 if row.category == "emerging" else 50,
+                "signals": [f"成交量{row.vol_ratio:.1f}倍", f"涨幅{row.price_change:.1f}%"],
+            }
+        )
+    for key in results:
+        results[key] = sorted(results[key], key=lambda x: x["score"], reverse=True)
+    return results
+
+
+class SectorPanelCache:
+    """Sector panels keyed by (db, window start), reused until the latest trade date moves."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._panels: Dict[Tuple[str, str], Tuple[str, pd.DataFrame]] = {}
+
+    def get(
+        self,
+        key: Tuple[str, str],
+        latest_trade_date: str,
+        build: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        with self._lock:
+            cached = self._panels.get(key)
+            if cached is not None and cached[0] == str(latest_trade_date or ""):
+                return cached[1]
+            panel = build()
+            self._panels = {k: v for k, v in self._panels.items() if k[0] != key[0]}
+            self._panels[key] = (str(latest_trade_date or ""), panel)
+            return panel
+
+    def clear(self) -> None:
+        with self._lock:
+            self._panels.clear()
@@ -0,0 +1,219 @@
+"""Prepared-data parameter sweeps for the legacy StrategyOptimizer."""
+
+from __future__ import annotations
+
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from openclaw.runtime.fork_pool import fork_map, fork_supported
+
+
+VOLUME_PRICE_LOOKBACK = 20
+VOLUME_PRICE_TAIL = 5
+VOLUME_PRICE_MIN_ROWS = 120
+
+
+def _window_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """NaN-skipping mean of ``values[j:j + window]`` for every start ``j``."""
+    windows = sliding_window_view(values, window)
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, windows, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.where(counts > 0, counts, 1), np.nan)
+
+
+def volume_price_signal_components(close: np.ndarray, vol: np.ndarray, pct: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-row inputs and score of ``_identify_volume_price_signals`` for scoreable rows.
+
+    ``rows`` are the positions ``20 .. n-6`` of a date-sorted history; every
+    other array is aligned with ``rows``.
+    """
+    close = np.asarray(close, dtype=float)
+    vol = np.asarray(vol, dtype=float)
+    pct = np.asarray(pct, dtype=float)
+    n = len(close)
+    lookback = VOLUME_PRICE_LOOKBACK
+    if n < 30 or n - VOLUME_PRICE_TAIL <= lookback:
+        empty = np.empty(0)
+        return {name: empty for name in ("rows", "score", "avg_vol", "vol_ratio", "pct", "price_position", "up_days", "above_ma5")}
+    rows = np.arange(lookback, n - VOLUME_PRICE_TAIL)
+    starts = rows - lookback
+
+    cur_close = close[rows]
+    cur_vol = vol[rows]
+    cur_pct = pct[rows]
+    score = np.zeros(len(rows))
+
+    avg_vol_20 = _window_mean(vol, lookback)[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol_ratio = cur_vol / np.where(avg_vol_20 > 0, avg_vol_20, np.nan)
+    score += np.select([vol_ratio >= 2.0, vol_ratio >= 1.5, vol_ratio >= 1.2], [30, 20, 10], 0)
+
+    score += np.select([cur_pct >= 5, cur_pct >= 3, cur_pct >= 1, cur_pct > 0], [25, 20, 15, 10], 0)
+
+    close_windows = sliding_window_view(close, lookback)[starts]
+    max_close_20 = np.fmax.reduce(close_windows, axis=1)
+    min_close_20 = np.fmin.reduce(close_windows, axis=1)
+    spread = max_close_20 > min_close_20
+    with np.errstate(invalid="ignore", divide="ignore"):
+        price_position = (cur_close - min_close_20) / np.where(spread, max_close_20 - min_close_20, np.nan) * 100
+    score += np.select([price_position < 30, price_position < 50, price_position < 70], [20, 15, 10], 0)
+
+    up_days = sliding_window_view(pct > 0, VOLUME_PRICE_TAIL).sum(axis=1)[rows - (VOLUME_PRICE_TAIL - 1)]
+    score += np.select([up_days >= 4, up_days >= 3], [15, 10], 0)
+
+    ma5 = _window_mean(close, 5)[rows - 5]
+    above_ma5 = cur_close > ma5
+    score += np.where(above_ma5, 10, 0)
+
+    return {
+        "rows": rows,
+        "score": score,
+        "avg_vol": avg_vol_20,
+        "vol_ratio": vol_ratio,
+        "pct": cur_pct,
+        "price_position": price_position,
+        "up_days": up_days,
+        "above_ma5": above_ma5,
+    }
+
+
+def volume_price_signal_scores(close: np.ndarray, vol: np.ndarray, pct: np.ndarray) -> np.ndarray:
+    """Volume/price signal strength (0-100) for every scoreable row of one stock.
+
+    Mirrors ``CompleteVolumePriceAnalyzer._identify_volume_price_signals`` for
+    rows ``20 .. n-6`` of a date-sorted history; other rows are NaN.
+    """
+    scores = np.full(len(close), np.nan)
+    components = volume_price_signal_components(close, vol, pct)
+    scores[components["rows"].astype(int)] = components["score"]
+    return scores
+
+
+@dataclass
+class VolumePriceSweepPanel:
+    """Signal scores and forward returns for a fixed stock sample, computed once."""
+
+    analyzed_stocks: int
+    scores: np.ndarray
+    forward_returns: Dict[int, np.ndarray] = field(default_factory=dict)
+
+    def returns_for(self, min_score: float, holding_days: int) -> np.ndarray:
+        forward = self.forward_returns[int(holding_days)]
+        mask = (self.scores >= float(min_score)) & ~np.isnan(forward)
+        return forward[mask]
+
+
+def _price_column(df: pd.DataFrame) -> str:
+    return "close_price" if "close_price" in df.columns else "close"
+
+
+def build_volume_price_sweep(
+    df: pd.DataFrame,
+    *,
+    sample_codes: Sequence[str],
+    holding_days_grid: Sequence[int],
+) -> VolumePriceSweepPanel:
+    """Score every sampled stock once and attach forward returns per holding period."""
+    price_col = _price_column(df)
+    grid = sorted({int(h) for h in holding_days_grid})
+    groups = {str(code): g for code, g in df.groupby("ts_code", sort=False)}
+    score_parts: List[np.ndarray] = []
+    forward_parts: Dict[int, List[np.ndarray]] = {h: [] for h in grid}
+    for code in sample_codes:
+        g = groups.get(str(code))
+        if g is None or len(g) < VOLUME_PRICE_MIN_ROWS:
+            continue
+        g = g.sort_values("trade_date")
+        close = pd.to_numeric(g[price_col], errors="coerce").to_numpy(dtype=float)
+        scores = volume_price_signal_scores(
+            close,
+            pd.to_numeric(g["vol"], errors="coerce").to_numpy(dtype=float),
+            pd.to_numeric(g["pct_chg"], errors="coerce").to_numpy(dtype=float),
+        )
+        score_parts.append(scores)
+        n = len(close)
+        for h in grid:
+            forward = np.full(n, np.nan)
+            if n > h and len(g) >= 30 + h:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    forward[: n - h] = (close[h:] - close[: n - h]) / close[: n - h] * 100
+            forward_parts[h].append(forward)
+    return VolumePriceSweepPanel(
+        analyzed_stocks=len(sample_codes),
+        scores=np.concatenate(score_parts) if score_parts else np.empty(0),
+        forward_returns={h: (np.concatenate(parts) if parts else np.empty(0)) for h, parts in forward_parts.items()},
+    )
+
+
+def sweep_return_stats(returns: np.ndarray, *, analyzed_stocks: int, holding_days: int) -> Dict[str, Any]:
+    """Headline stats ``backtest_strategy_complete`` reports, from a return vector."""
+    series = pd.Series(returns, dtype=float)
+    if series.empty:
+        return {
+            "total_signals": 0,
+            "avg_return": 0,
+            "win_rate": 0,
+            "sharpe_ratio": 0,
+            "analyzed_stocks": int(analyzed_stocks),
+        }
+    stats: Dict[str, Any] = {
+        "total_signals": int(len(series)),
+        "analyzed_stocks": int(analyzed_stocks),
+        "avg_return": float(series.mean()),
+        "median_return": float(series.median()),
+        "win_rate": float((series > 0).sum() / len(series) * 100),
+        "max_return": float(series.max()),
+        "min_return": float(series.min()),
+        "avg_holding_days": int(holding_days),
+    }
+    winning = series[series > 0]
+    losing = series[series <= 0]
+    stats["avg_win"] = float(winning.mean()) if len(winning) > 0 else 0
+    stats["avg_loss"] = float(losing.mean()) if len(losing) > 0 else 0
+    std_return = series.std()
+    stats["sharpe_ratio"] = float(stats["avg_return"] / std_return) if std_return > 0 else 0
+    if stats["avg_loss"] != 0:
+        stats["profit_loss_ratio"] = float(abs(stats["avg_win"] / stats["avg_loss"]))
+    else:
+        stats["profit_loss_ratio"] = float("inf") if stats["avg_win"] > 0 else 0
+    return stats
+
+
+def optimizer_score(stats: Mapping[str, Any]) -> float:
+    return (
+        stats.get("avg_return", 0) * 0.4
+        + stats.get("win_rate", 0) * 0.3
+        + stats.get("sharpe_ratio", 0) * 10 * 0.2
+        + min(stats.get("total_signals", 0) / 100, 1) * 10 * 0.1
+    )
+
+
+def run_sweeps_parallel(
+    tasks: Mapping[str, Callable[[], Any]],
+    *,
+    workers: int,
+    logger: Any = None,
+) -> Dict[str, Any]:
+    """Run named sweep callables across forked workers, keyed like ``tasks``.
+
+    Workers inherit prepared data through fork; only results are pickled.
+    Without fork support, with a single worker or task, or when the pool
+    breaks, the tasks run serially in order.
+    """
+    names = list(tasks)
+    if int(workers) <= 1 or len(names) <= 1 or not fork_supported():
+        return {name: tasks[name]() for name in names}
+    tasks = dict(tasks)
+    try:
+        return dict(zip(names, fork_map(lambda name: tasks[name](), names, workers=workers)))
+    except (BrokenProcessPool, OSError) as exc:
+        if logger is not None:
+            logger.warning(f"parallel strategy sweep failed, falling back to serial: {exc}")
+        return {name: tasks[name]() for name in names}
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Union
 
+import numpy as np
 import pandas as pd
 
 from openclaw.runtime.dataframe_utils import ensure_price_aliases
 
 
+V9_MIN_HISTORY_ROWS = 80
+
+
 def calculate_v9_score_from_history(hist: pd.DataFrame, *, industry_strength: float = 0.0) -> Dict[str, Any]:
-    if hist is None or hist.empty or len(hist) < 80:
+    if hist is None or hist.empty or len(hist) < V9_MIN_HISTORY_ROWS:
         return {"score": 0.0, "details": {}}
 
     h = ensure_price_aliases(hist).sort_values("trade_date")
@@ -83,3 +87,121 @@ def calculate_v9_score_from_history(hist: pd.DataFrame, *, industry_strength: fl
             "vol_20": round(vol_20 * 100, 2),
         },
     }
+
+
+def _bounded(values: Any, low: float, high: float) -> np.ndarray:
+    # Same NaN handling as ``max(low, min(high, value))`` on scalars.
+    capped = np.where(values < high, values, high)
+    return np.where(capped > low, capped, low)
+
+
+def calculate_v9_scores_panel(
+    panel: pd.DataFrame,
+    *,
+    industry_strength: Union[float, Mapping[str, float]] = 0.0,
+) -> Dict[str, Dict[str, Any]]:
+    """Score every stock of a long-format history panel in one pass.
+
+    ``panel`` holds one row per (``ts_code``, ``trade_date``). The result maps
+    each code to the same payload :func:`calculate_v9_score_from_history`
+    returns for that stock's rows; ``industry_strength`` is either one value
+    for the whole panel or a per-code mapping (missing codes score 0.0).
+    """
+    if panel is None or panel.empty or "ts_code" not in panel.columns:
+        return {}
+    h = ensure_price_aliases(panel)
+    h["ts_code"] = h["ts_code"].astype(str)
+    h = h.sort_values(["ts_code", "trade_date"], kind="mergesort").reset_index(drop=True)
+    codes = h["ts_code"]
+    sizes = codes.groupby(codes, sort=False).transform("size")
+    out: Dict[str, Dict[str, Any]] = {
+        str(code): {"score": 0.0, "details": {}} for code in codes[sizes < V9_MIN_HISTORY_ROWS].unique()
+    }
+    close_col = "close_price" if "close_price" in h.columns else ("close" if "close" in h.columns else "")
+    if not close_col:
+        out.update({str(code): {"score": 0.0, "details": {}} for code in codes.unique()})
+        return out
+    h = h[sizes >= V9_MIN_HISTORY_ROWS].reset_index(drop=True)
+    if h.empty:
+        return out
+    codes = h["ts_code"]
+    by_code = codes.groupby(codes, sort=False)
+    from_end = by_code.cumcount(ascending=False).to_numpy()
+
+    def _numeric(col: str) -> pd.Series:
+        if col in h.columns:
+            return pd.to_numeric(h[col], errors="coerce")
+        return pd.Series(np.nan, index=h.index, dtype=float)
+
+    close = _numeric(close_col).groupby(codes, sort=False).ffill()
+    vol = _numeric("vol").fillna(0.0)
+    amount = _numeric("amount").fillna(0.0)
+    pct = _numeric("pct_chg")
+    pct_missing = pct.isna().groupby(codes, sort=False).transform("all")
+    if pct_missing.any():
+        pct = pct.where(~pct_missing, close.groupby(codes, sort=False).pct_change() * 100)
+
+    def _at(series: pd.Series, rows_from_end: int) -> np.ndarray:
+        return series.to_numpy(dtype=float)[from_end == rows_from_end]
+
+    def _tail(series: pd.Series, rows: int) -> np.ndarray:
+        return series.to_numpy(dtype=float)[from_end < rows].reshape(-1, rows)
+
+    close_by_code = close.groupby(codes, sort=False)
+    ma20 = close_by_code.rolling(20).mean().droplevel(0)
+    ma60 = close_by_code.rolling(60).mean().droplevel(0)
+    ma120 = close_by_code.rolling(120).mean().droplevel(0)
+    trend_strong = (_at(ma20, 0) > _at(ma60, 0)) & (_at(ma60, 0) > _at(ma120, 0))
+    trend_ok = (_at(ma20, 0) > _at(ma60, 0)) & (_at(ma20, 0) > _at(ma20, 4)) & (_at(ma60, 0) >= _at(ma60, 4))
+
+    last_close = _at(close, 0)
+    momentum_20 = last_close / _at(close, 20) - 1.0
+    momentum_60 = last_close / _at(close, 60) - 1.0
+    vol_mean = _tail(vol, 20).mean(axis=1)
+    vol_ratio = np.where(vol_mean > 0, _at(vol, 0) / np.where(vol_mean > 0, vol_mean, 1.0), 0.0)
+
+    flow_sign = np.sign(pct.fillna(0))
+    flow_val = _tail(amount * flow_sign, 20).sum(axis=1)
+    amount_sum = _tail(amount, 20).sum(axis=1)
+    flow_ratio = flow_val / np.where(amount_sum > 0, amount_sum, 1.0)
+
+    vol_20 = pd.DataFrame(_tail(pct, 20)).std(axis=1).to_numpy() / 100.0
+
+    stock_codes = codes.to_numpy()[from_end == 0]
+    if isinstance(industry_strength, Mapping):
+        strength = np.array([float(industry_strength.get(code, 0.0)) for code in stock_codes])
+    else:
+        strength = np.full(len(stock_codes), float(industry_strength))
+
+    fund_score = _bounded((flow_ratio + 0.03) / 0.12 * 20.0, 0.0, 20.0)
+    volume_score = _bounded((vol_ratio - 0.5) / 1.0 * 15.0, 0.0, 15.0)
+    momentum_score = _bounded(momentum_20 * 100 / 8.0 * 8.0, 0.0, 8.0) + _bounded(momentum_60 * 100 / 16.0 * 7.0, 0.0, 7.0)
+    sector_score = _bounded((strength + 2.0) / 6.0 * 15.0, 0.0, 15.0)
+    volatility_score = np.select([vol_20 <= 0.03, vol_20 <= 0.06, vol_20 <= 0.10], [12.0, 15.0, 8.0], 0.0)
+    trend_score = np.where(trend_strong, 15.0, np.where(trend_ok, 10.0, 0.0))
+
+    peak = close_by_code.cummax()
+    max_dd = pd.DataFrame(_tail((peak - close) / peak, 60)).max(axis=1).to_numpy()
+    dd_penalty = np.where(max_dd > 0.15, np.minimum(10.0, (max_dd - 0.15) / 0.15 * 10.0), 0.0)
+
+    total_score = fund_score + volume_score + momentum_score + sector_score + volatility_score + trend_score - dd_penalty
+    total_score = np.where(total_score < 0, 0.0, total_score)
+
+    for idx, code in enumerate(stock_codes):
+        out[str(code)] = {
+            "score": round(float(total_score[idx]), 2),
+            "details": {
+                "fund_score": round(float(fund_score[idx]), 2),
+                "volume_score": round(float(volume_score[idx]), 2),
+                "momentum_score": round(float(momentum_score[idx]), 2),
+                "sector_score": round(float(sector_score[idx]), 2),
+                "volatility_score": round(float(volatility_score[idx]), 2),
+                "trend_score": round(float(trend_score[idx]), 2),
+                "flow_ratio": round(float(flow_ratio[idx]), 4),
+                "vol_ratio": round(float(vol_ratio[idx]), 3),
+                "momentum_20": round(float(momentum_20[idx] * 100), 2),
+                "momentum_60": round(float(momentum_60[idx] * 100), 2),
+                "vol_20": round(float(vol_20[idx] * 100), 2),
+            },
+        }
+    return out
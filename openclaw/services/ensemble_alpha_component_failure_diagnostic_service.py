@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, Sequence
 
-from openclaw.services.ensemble_alpha_gate_contrast_service import _pearson, _spearman
 from openclaw.services.ensemble_alpha_rebuild_lab_service import _candidate_score
+from openclaw.services.statistics_kernel_service import pearson, pearson_many, spearman, spearman_many
 
 
 JsonDict = Dict[str, Any]
@@ -36,10 +36,7 @@ def build_ensemble_alpha_component_failure_diagnostic(
     bucket_size = max(1, len(scored) // 5) if scored else 0
     top_bucket = scored[:bucket_size] if bucket_size else []
     bottom_bucket = scored[-bucket_size:] if bucket_size else []
-    component_reviews = {
-        component: _component_review(component, rows=rows, top_bucket=top_bucket, bottom_bucket=bottom_bucket)
-        for component in HARD_COMPONENTS
-    }
+    component_reviews = _component_reviews(rows=rows, top_bucket=top_bucket, bottom_bucket=bottom_bucket)
     return {
         "diagnostic_version": "ensemble_alpha_component_failure_diagnostic.v1",
         "research_only": True,
@@ -47,8 +44,8 @@ def build_ensemble_alpha_component_failure_diagnostic(
         "candidate": candidate,
         "horizon_days": int(horizon),
         "sample_count": len(rows),
-        "candidate_ic": _pearson([float(row.get("candidate_score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
-        "candidate_rank_ic": _spearman([float(row.get("candidate_score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
+        "candidate_ic": pearson([float(row.get("candidate_score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
+        "candidate_rank_ic": spearman([float(row.get("candidate_score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
         "top_score_bucket": _bucket_review(top_bucket),
         "bottom_score_bucket": _bucket_review(bottom_bucket),
         "component_reviews": component_reviews,
@@ -92,16 +89,25 @@ def _hard_components(item: JsonDict) -> JsonDict:
     return out
 
 
-def _component_review(component: str, *, rows: Sequence[JsonDict], top_bucket: Sequence[JsonDict], bottom_bucket: Sequence[JsonDict]) -> JsonDict:
-    values = [float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in rows]
+def _component_reviews(*, rows: Sequence[JsonDict], top_bucket: Sequence[JsonDict], bottom_bucket: Sequence[JsonDict]) -> JsonDict:
     returns = [float(row.get("return_pct", 0.0) or 0.0) for row in rows]
+    values = {
+        component: [float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in rows]
+        for component in HARD_COMPONENTS
+    }
+    samples = [(values[component], returns) for component in HARD_COMPONENTS]
+    ics = pearson_many(samples)
+    rank_ics = spearman_many(samples)
     return {
-        "component": component,
-        "ic": _pearson(values, returns),
-        "rank_ic": _spearman(values, returns),
-        "avg": _avg(values),
-        "top_score_bucket_avg": _avg([float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in top_bucket]),
-        "bottom_score_bucket_avg": _avg([float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in bottom_bucket]),
+        component: {
+            "component": component,
+            "ic": ic,
+            "rank_ic": rank_ic,
+            "avg": _avg(values[component]),
+            "top_score_bucket_avg": _avg([float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in top_bucket]),
+            "bottom_score_bucket_avg": _avg([float((row.get("components") or {}).get(component, 0.0) or 0.0) for row in bottom_bucket]),
+        }
+        for component, ic, rank_ic in zip(HARD_COMPONENTS, ics, rank_ics)
     }
 
 
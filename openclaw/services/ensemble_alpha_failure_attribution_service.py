@@ -7,6 +7,8 @@ from openclaw.services.ensemble_alpha_rebuild_lab_service import (
     build_ensemble_alpha_rebuild_multi_window_lab,
     _candidate_score,
 )
+from openclaw.services.schema_catalog_service import table_exists
+from openclaw.services.statistics_kernel_service import pearson, spearman
 
 
 JsonDict = Dict[str, Any]
@@ -104,8 +106,8 @@ def _window_diagnostic(
     return {
         "as_of_date": as_of,
         "sample_count": len(rows),
-        "candidate_ic": _pearson([row["score"] for row in rows], [row["return_pct"] for row in rows]),
-        "candidate_rank_ic": _spearman([row["score"] for row in rows], [row["return_pct"] for row in rows]),
+        "candidate_ic": pearson([row["score"] for row in rows], [row["return_pct"] for row in rows]),
+        "candidate_rank_ic": spearman([row["score"] for row in rows], [row["return_pct"] for row in rows]),
         "top_score_bucket_return": _bucket_return(rows, top=True),
         "bottom_score_bucket_return": _bucket_return(rows, top=False),
         "market_regime": regime,
@@ -136,7 +138,7 @@ def _hard_components(item: JsonDict) -> JsonDict:
 
 
 def _market_regime(conn: sqlite3.Connection, as_of: str) -> JsonDict:
-    if not _table_exists(conn, "daily_trading_data"):
+    if not table_exists(conn, "daily_trading_data"):
         return {"available": False, "blocking_reasons": ["missing_daily_trading_data"]}
     try:
         rows = conn.execute(
@@ -339,48 +341,3 @@ def _failure_drivers(successful: Sequence[JsonDict], failed: Sequence[JsonDict],
 def _avg(values: Sequence[float]) -> float:
     clean = [float(value) for value in values if value is not None]
     return round(sum(clean) / float(len(clean)), 6) if clean else 0.0
-
-
-def _pearson(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    mean_l = sum(left) / len(left)
-    mean_r = sum(right) / len(right)
-    cov = sum((a - mean_l) * (b - mean_r) for a, b in zip(left, right))
-    var_l = sum((a - mean_l) ** 2 for a in left)
-    var_r = sum((b - mean_r) ** 2 for b in right)
-    if var_l <= 0.0 or var_r <= 0.0:
-        return None
-    return round(cov / ((var_l * var_r) ** 0.5), 6)
-
-
-def _spearman(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    return _pearson(_ranks(left), _ranks(right))
-
-
-def _ranks(values: Sequence[float]) -> list[float]:
-    indexed = sorted(enumerate(float(value) for value in values), key=lambda item: item[1])
-    ranks = [0.0] * len(indexed)
-    idx = 0
-    while idx < len(indexed):
-        end = idx
-        while end + 1 < len(indexed) and indexed[end + 1][1] == indexed[idx][1]:
-            end += 1
-        rank = (idx + end + 2) / 2.0
-        for pos in range(idx, end + 1):
-            ranks[indexed[pos][0]] = rank
-        idx = end + 1
-    return ranks
-
-
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    try:
-        row = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (str(table),),
-        ).fetchone()
-    except sqlite3.Error:
-        return False
-    return bool(row)
@@ -5,6 +5,7 @@ from typing import Any, Callable, Dict, Sequence
 
 from openclaw.services.ensemble_alpha_failure_attribution_service import _market_regime
 from openclaw.services.ensemble_alpha_rebuild_lab_service import _candidate_score
+from openclaw.services.statistics_kernel_service import pearson, pearson_many, spearman, spearman_many
 
 
 JsonDict = Dict[str, Any]
@@ -88,9 +89,9 @@ def _scenario_review(rows: Sequence[JsonDict], *, keep: Callable[[JsonDict], boo
     kept = [row for row in rows if keep(row)]
     dropped = [row for row in rows if not keep(row)]
     windows = sorted({str(row.get("as_of_date") or "") for row in kept})
-    window_reviews = [_window_review(window, [row for row in kept if row.get("as_of_date") == window]) for window in windows]
-    ic = _pearson([float(row.get("score", 0.0) or 0.0) for row in kept], [float(row.get("return_pct", 0.0) or 0.0) for row in kept])
-    rank_ic = _spearman([float(row.get("score", 0.0) or 0.0) for row in kept], [float(row.get("return_pct", 0.0) or 0.0) for row in kept])
+    window_reviews = _window_reviews(windows, kept)
+    ic = pearson([float(row.get("score", 0.0) or 0.0) for row in kept], [float(row.get("return_pct", 0.0) or 0.0) for row in kept])
+    rank_ic = spearman([float(row.get("score", 0.0) or 0.0) for row in kept], [float(row.get("return_pct", 0.0) or 0.0) for row in kept])
     positive_windows = [
         row
         for row in window_reviews
@@ -119,14 +120,31 @@ def _scenario_review(rows: Sequence[JsonDict], *, keep: Callable[[JsonDict], boo
     }
 
 
-def _window_review(as_of: str, rows: Sequence[JsonDict]) -> JsonDict:
-    return {
-        "as_of_date": as_of,
-        "sample_count": len(rows),
-        "ic": _pearson([float(row.get("score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
-        "rank_ic": _spearman([float(row.get("score", 0.0) or 0.0) for row in rows], [float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
-        "avg_return_pct": _avg([float(row.get("return_pct", 0.0) or 0.0) for row in rows]),
-    }
+def _window_reviews(windows: Sequence[str], rows: Sequence[JsonDict]) -> list[JsonDict]:
+    by_window: dict[str, list[JsonDict]] = {window: [] for window in windows}
+    for row in rows:
+        bucket = by_window.get(row.get("as_of_date"))
+        if bucket is not None:
+            bucket.append(row)
+    samples = [
+        (
+            [float(row.get("score", 0.0) or 0.0) for row in by_window[window]],
+            [float(row.get("return_pct", 0.0) or 0.0) for row in by_window[window]],
+        )
+        for window in windows
+    ]
+    ics = pearson_many(samples)
+    rank_ics = spearman_many(samples)
+    return [
+        {
+            "as_of_date": window,
+            "sample_count": len(by_window[window]),
+            "ic": ic,
+            "rank_ic": rank_ic,
+            "avg_return_pct": _avg(returns),
+        }
+        for window, (_, returns), ic, rank_ic in zip(windows, samples, ics, rank_ics)
+    ]
 
 
 def _scenario_passed(review: JsonDict) -> bool:
@@ -161,37 +179,3 @@ def _best_scenario_name(reviews: dict[str, JsonDict]) -> str:
 def _avg(values: Sequence[float]) -> float:
     clean = [float(value) for value in values]
     return round(sum(clean) / float(len(clean)), 6) if clean else 0.0
-
-
-def _pearson(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    mean_l = sum(left) / len(left)
-    mean_r = sum(right) / len(right)
-    cov = sum((a - mean_l) * (b - mean_r) for a, b in zip(left, right))
-    var_l = sum((a - mean_l) ** 2 for a in left)
-    var_r = sum((b - mean_r) ** 2 for b in right)
-    if var_l <= 0.0 or var_r <= 0.0:
-        return None
-    return round(cov / ((var_l * var_r) ** 0.5), 6)
-
-
-def _spearman(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    return _pearson(_ranks(left), _ranks(right))
-
-
-def _ranks(values: Sequence[float]) -> list[float]:
-    indexed = sorted(enumerate(float(value) for value in values), key=lambda item: item[1])
-    ranks = [0.0] * len(indexed)
-    idx = 0
-    while idx < len(indexed):
-        end = idx
-        while end + 1 < len(indexed) and indexed[end + 1][1] == indexed[idx][1]:
-            end += 1
-        rank = (idx + end + 2) / 2.0
-        for pos in range(idx, end + 1):
-            ranks[indexed[pos][0]] = rank
-        idx = end + 1
-    return ranks
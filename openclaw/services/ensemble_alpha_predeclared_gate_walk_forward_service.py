@@ -4,8 +4,8 @@ import sqlite3
 from typing import Any, Dict, Sequence
 
 from openclaw.services.ensemble_alpha_failure_attribution_service import _market_regime
-from openclaw.services.ensemble_alpha_gate_contrast_service import _pearson, _spearman
 from openclaw.services.ensemble_alpha_rebuild_lab_service import _candidate_score
+from openclaw.services.statistics_kernel_service import pearson, pearson_many, spearman, spearman_many
 
 
 JsonDict = Dict[str, Any]
@@ -41,7 +41,7 @@ def build_ensemble_alpha_predeclared_gate_walk_forward(
     excluded = [row for row in rows if not _keep_by_gate(row, gate_name=gate_name)]
     retained_windows = sorted({str(row.get("as_of_date") or "") for row in retained})
     excluded_windows = sorted({str(row.get("as_of_date") or "") for row in excluded})
-    retained_reviews = [_window_review(window, [row for row in retained if row.get("as_of_date") == window]) for window in retained_windows]
+    retained_reviews = _window_reviews(retained_windows, retained)
     excluded_reviews = [_excluded_window_review(window, [row for row in excluded if row.get("as_of_date") == window]) for window in excluded_windows]
     positive_windows = [
         review
@@ -60,8 +60,8 @@ def build_ensemble_alpha_predeclared_gate_walk_forward(
         "retained_window_count": len(retained_windows),
         "excluded_window_count": len(excluded_windows),
         "positive_retained_window_count": len(positive_windows),
-        "ic": _pearson([float(row.get("score", 0.0) or 0.0) for row in retained], [float(row.get("return_pct", 0.0) or 0.0) for row in retained]),
-        "rank_ic": _spearman([float(row.get("score", 0.0) or 0.0) for row in retained], [float(row.get("return_pct", 0.0) or 0.0) for row in retained]),
+        "ic": pearson([float(row.get("score", 0.0) or 0.0) for row in retained], [float(row.get("return_pct", 0.0) or 0.0) for row in retained]),
+        "rank_ic": spearman([float(row.get("score", 0.0) or 0.0) for row in retained], [float(row.get("return_pct", 0.0) or 0.0) for row in retained]),
         "retained_window_reviews": retained_reviews,
         "excluded_window_reviews": excluded_reviews,
     }
@@ -139,17 +139,35 @@ def _keep_by_gate(row: JsonDict, *, gate_name: str) -> bool:
     return str(row.get("market_regime_label") or "") != "risk_off"
 
 
-def _window_review(as_of: str, rows: Sequence[JsonDict]) -> JsonDict:
-    scores = [float(row.get("score", 0.0) or 0.0) for row in rows]
-    returns = [float(row.get("return_pct", 0.0) or 0.0) for row in rows]
-    return {
-        "as_of_date": as_of,
-        "sample_count": len(rows),
-        "market_regime_label": str((rows[0].get("market_regime") or {}).get("label") or "unknown") if rows else "unknown",
-        "ic": _pearson(scores, returns),
-        "rank_ic": _spearman(scores, returns),
-        "avg_return_pct": _avg(returns),
-    }
+def _window_reviews(windows: Sequence[str], rows: Sequence[JsonDict]) -> list[JsonDict]:
+    by_window: dict[str, list[JsonDict]] = {window: [] for window in windows}
+    for row in rows:
+        bucket = by_window.get(row.get("as_of_date"))
+        if bucket is not None:
+            bucket.append(row)
+    samples = [
+        (
+            [float(row.get("score", 0.0) or 0.0) for row in by_window[window]],
+            [float(row.get("return_pct", 0.0) or 0.0) for row in by_window[window]],
+        )
+        for window in windows
+    ]
+    ics = pearson_many(samples)
+    rank_ics = spearman_many(samples)
+    out: list[JsonDict] = []
+    for window, (_, returns), ic, rank_ic in zip(windows, samples, ics, rank_ics):
+        window_rows = by_window[window]
+        out.append(
+            {
+                "as_of_date": window,
+                "sample_count": len(window_rows),
+                "market_regime_label": str((window_rows[0].get("market_regime") or {}).get("label") or "unknown") if window_rows else "unknown",
+                "ic": ic,
+                "rank_ic": rank_ic,
+                "avg_return_pct": _avg(returns),
+            }
+        )
+    return out
 
 
 def _excluded_window_review(as_of: str, rows: Sequence[JsonDict]) -> JsonDict:
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import math
-from typing import Any, Dict, Sequence
+import hashlib
+import threading
+from concurrent.futures import Executor
+from typing import Any, Dict, Mapping, Sequence
+
+from openclaw.services.statistics_kernel_service import group_percentiles, pearson_many, percentiles, spearman_many
 
 
 JsonDict = Dict[str, Any]
+CandidateScores = Dict[str, list[float]]
 
 
 REBUILD_CANDIDATES = (
@@ -16,7 +21,51 @@ REBUILD_CANDIDATES = (
     "reversal_exhaustion_quality_guard",
     "hard_event_alpha_candidate",
 )
+# Candidates scored against the whole cross-section; pooled scores cannot be
+# stitched together from per-window scores.
+CROSS_SECTIONAL_CANDIDATES = frozenset({"industry_neutral_quality_momentum"})
 DECAY_HORIZONS = (1, 3, 5, 10, 20)
+# Bump whenever a candidate recipe changes so cached window scores are not reused.
+REBUILD_RULE_VERSION = "ensemble_alpha_rebuild_rules.v1"
+
+
+class RebuildScoreCache:
+    """Per-window candidate scores keyed by ``(window_id, items_fingerprint, rule_version)``.
+
+    The items fingerprint (sample count and ordered ``ts_code`` list) keeps a
+    window rebuilt with a different top-N or signal set from reusing scores
+    that no longer line up with its items; rewriting sleeve scores in place
+    under the same codes still needs a new rule version or ``clear()``.  The
+    cache is thread-safe so one instance can back concurrent lab runs.
+    """
+
+    def __init__(self) -> None:
+        self._scores: Dict[tuple[str, str, str], Dict[str, tuple[float, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, window_id: str, rule_version: str, items_fingerprint: str = "") -> CandidateScores:
+        with self._lock:
+            cached = self._scores.get((str(window_id), str(items_fingerprint), str(rule_version))) or {}
+        return {candidate: list(values) for candidate, values in cached.items()}
+
+    def put(
+        self,
+        window_id: str,
+        rule_version: str,
+        scores: Mapping[str, Sequence[float]],
+        items_fingerprint: str = "",
+    ) -> None:
+        frozen = {candidate: tuple(values) for candidate, values in scores.items()}
+        with self._lock:
+            self._scores.setdefault((str(window_id), str(items_fingerprint), str(rule_version)), {}).update(frozen)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._scores)
 
 
 def build_ensemble_alpha_rebuild_lab(
@@ -33,43 +82,7 @@ def build_ensemble_alpha_rebuild_lab(
     """
 
     payload = fact_chain if isinstance(fact_chain, dict) else {}
-    items = payload.get("sample_facts") if isinstance(payload.get("sample_facts"), list) else []
-    as_of = str(payload.get("as_of_date") or "")
-    research_window_count = len({as_of} if as_of else set())
-    reviews = {
-        candidate: _candidate_review(
-            candidate=candidate,
-            items=items,
-            min_samples=int(min_samples),
-            research_window_count=research_window_count,
-            min_research_windows=int(min_research_windows),
-        )
-        for candidate in REBUILD_CANDIDATES
-    }
-    candidate_alpha = [
-        name
-        for name, review in reviews.items()
-        if review.get("recommended_use") == "positive_alpha_candidate"
-    ]
-    return {
-        "lab_version": "ensemble_alpha_rebuild_lab.v1",
-        "research_only": True,
-        "candidate_recipes": list(REBUILD_CANDIDATES),
-        "research_window_count": research_window_count,
-        "min_research_windows": int(min_research_windows),
-        "candidate_reviews": reviews,
-        "candidate_alpha_sleeves": candidate_alpha,
-        "blocking_reasons": (
-            []
-            if candidate_alpha
-            else ["no_rebuilt_alpha_candidate_passed_policy"]
-        ),
-        "hard_boundaries": [
-            "do_not_promote_rebuilt_sleeves_from_single_window_ic",
-            "do_not_replace_sleeve_policy_audit_with_lab_metrics",
-            "do_not_feed_rebuilt_candidates_into_portfolio_until_walk_forward_validated",
-        ],
-    }
+    return _window_lab(payload, min_samples=min_samples, min_research_windows=min_research_windows)
 
 
 def build_ensemble_alpha_rebuild_multi_window_lab(
@@ -77,30 +90,57 @@ def build_ensemble_alpha_rebuild_multi_window_lab(
     *,
     min_samples: int = 30,
     min_research_windows: int = 5,
+    executor: Executor | None = None,
+    score_cache: RebuildScoreCache | None = None,
+    rule_version: str = REBUILD_RULE_VERSION,
 ) -> JsonDict:
-    """Evaluate rebuilt candidates across independent as-of windows."""
+    """Evaluate rebuilt candidates across independent as-of windows.
+
+    Windows are scored independently, concurrently when an ``executor`` is
+    given (task functions are module-level, so process pools work too), and
+    merged in chain order; a later chain with the same as-of date replaces the
+    earlier window review.  With a ``score_cache``, per-window candidate scores
+    are reused across runs under the window id (the chain's ``window_id`` or
+    its as-of date), its items fingerprint and ``rule_version``; ids repeated
+    within one call are never cached.  Pooled reviews run in this process so
+    the pooled samples are not shipped to a worker once per candidate.
+    """
 
     chains = [item for item in (fact_chains or []) if isinstance(item, dict)]
     window_dates = sorted({str(item.get("as_of_date") or "") for item in chains if str(item.get("as_of_date") or "")})
     research_window_count = len(window_dates)
+    run = executor.map if executor is not None else map
+
+    window_ids = [_window_id(chain) for chain in chains]
+    cacheable = [bool(window_id) and window_ids.count(window_id) == 1 for window_id in window_ids]
+    fingerprints = [_items_fingerprint(_sample_facts(chain)) if score_cache is not None else "" for chain in chains]
+    cached = [
+        score_cache.get(window_id, rule_version, fingerprint) if score_cache is not None and ok else {}
+        for window_id, fingerprint, ok in zip(window_ids, fingerprints, cacheable)
+    ]
+    evaluated = list(run(_evaluate_window, [(chain, hits, min_samples) for chain, hits in zip(chains, cached)]))
+
     all_items: list[JsonDict] = []
+    pooled_scores: CandidateScores = {candidate: [] for candidate in REBUILD_CANDIDATES}
     window_reviews: dict[str, JsonDict] = {}
-    for chain in chains:
-        as_of = str(chain.get("as_of_date") or "")
-        items = chain.get("sample_facts") if isinstance(chain.get("sample_facts"), list) else []
-        all_items.extend(items)
-        if as_of:
-            window_reviews[as_of] = build_ensemble_alpha_rebuild_lab(
-                chain,
-                min_samples=min_samples,
-                min_research_windows=1,
-            )
-
+    for chain, window_id, fingerprint, ok, hits, (scores, review) in zip(
+        chains, window_ids, fingerprints, cacheable, cached, evaluated
+    ):
+        all_items.extend(_sample_facts(chain))
+        for candidate in REBUILD_CANDIDATES:
+            pooled_scores[candidate].extend(scores[candidate])
+        if score_cache is not None and ok and len(hits) < len(scores):
+            score_cache.put(window_id, rule_version, scores, fingerprint)
+        if review is not None:
+            window_reviews[str(chain.get("as_of_date") or "")] = review
+
+    pooled_min_samples = int(min_samples) * max(1, int(min_research_windows))
     reviews = {
         candidate: _candidate_review(
             candidate=candidate,
             items=all_items,
-            min_samples=int(min_samples) * max(1, int(min_research_windows)),
+            scores=None if candidate in CROSS_SECTIONAL_CANDIDATES else pooled_scores[candidate],
+            min_samples=pooled_min_samples,
             research_window_count=research_window_count,
             min_research_windows=int(min_research_windows),
         )
@@ -144,6 +184,78 @@ def build_ensemble_alpha_rebuild_multi_window_lab(
     }
 
 
+def _window_lab(
+    payload: JsonDict,
+    *,
+    min_samples: int,
+    min_research_windows: int,
+    scores: Mapping[str, Sequence[float]] | None = None,
+) -> JsonDict:
+    items = _sample_facts(payload)
+    as_of = str(payload.get("as_of_date") or "")
+    research_window_count = len({as_of} if as_of else set())
+    reviews = {
+        candidate: _candidate_review(
+            candidate=candidate,
+            items=items,
+            scores=None if scores is None else scores[candidate],
+            min_samples=int(min_samples),
+            research_window_count=research_window_count,
+            min_research_windows=int(min_research_windows),
+        )
+        for candidate in REBUILD_CANDIDATES
+    }
+    candidate_alpha = [
+        name
+        for name, review in reviews.items()
+        if review.get("recommended_use") == "positive_alpha_candidate"
+    ]
+    return {
+        "lab_version": "ensemble_alpha_rebuild_lab.v1",
+        "research_only": True,
+        "candidate_recipes": list(REBUILD_CANDIDATES),
+        "research_window_count": research_window_count,
+        "min_research_windows": int(min_research_windows),
+        "candidate_reviews": reviews,
+        "candidate_alpha_sleeves": candidate_alpha,
+        "blocking_reasons": (
+            []
+            if candidate_alpha
+            else ["no_rebuilt_alpha_candidate_passed_policy"]
+        ),
+        "hard_boundaries": [
+            "do_not_promote_rebuilt_sleeves_from_single_window_ic",
+            "do_not_replace_sleeve_policy_audit_with_lab_metrics",
+            "do_not_feed_rebuilt_candidates_into_portfolio_until_walk_forward_validated",
+        ],
+    }
+
+
+def _evaluate_window(task: tuple[JsonDict, CandidateScores, int]) -> tuple[CandidateScores, JsonDict | None]:
+    chain, cached, min_samples = task
+    items = _sample_facts(chain)
+    scores = {
+        candidate: cached[candidate] if candidate in cached else _candidate_scores(candidate, items)
+        for candidate in REBUILD_CANDIDATES
+    }
+    if not str(chain.get("as_of_date") or ""):
+        return scores, None
+    return scores, _window_lab(chain, min_samples=min_samples, min_research_windows=1, scores=scores)
+
+
+def _window_id(chain: JsonDict) -> str:
+    return str(chain.get("window_id") or chain.get("as_of_date") or "")
+
+
+def _items_fingerprint(items: Sequence[JsonDict]) -> str:
+    codes = "\n".join(str(item.get("ts_code") or "") if isinstance(item, dict) else "" for item in items)
+    return f"{len(items)}:{hashlib.sha1(codes.encode('utf-8')).hexdigest()}"
+
+
+def _sample_facts(payload: JsonDict) -> list[JsonDict]:
+    return payload.get("sample_facts") if isinstance(payload.get("sample_facts"), list) else []
+
+
 def _candidate_review(
     *,
     candidate: str,
@@ -151,10 +263,11 @@ def _candidate_review(
     min_samples: int,
     research_window_count: int,
     min_research_windows: int,
+    scores: Sequence[float] | None = None,
 ) -> JsonDict:
-    scores = _candidate_scores(candidate, items)
-    active = [score for score in scores if score > 0.0]
-    multi = _multi_horizon_attribution(candidate=candidate, items=items)
+    score_values = list(scores) if scores is not None else _candidate_scores(candidate, items)
+    active = [score for score in score_values if score > 0.0]
+    multi = _multi_horizon_attribution(candidate=candidate, items=items, scores=score_values)
     h5 = multi.get("horizons", {}).get("5", {})
     recommended = _recommended_use(
         active_count=len(active),
@@ -226,19 +339,15 @@ def _legacy_candidate_score(candidate: str, item: JsonDict) -> float:
 
 def _industry_neutral_quality_momentum_scores(items: Sequence[JsonDict]) -> list[float]:
     momentum_values = [_item_score(item, "momentum") for item in items]
-    global_pct = _percentiles(momentum_values)
-    industry_indices: dict[str, list[int]] = {}
-    for idx, item in enumerate(items):
-        industry_indices.setdefault(_industry(item), []).append(idx)
-
-    industry_pct = [global_pct[idx] for idx in range(len(items))]
-    for indices in industry_indices.values():
-        if len(indices) < 3:
-            continue
-        local_values = [momentum_values[idx] for idx in indices]
-        local_pct = _percentiles(local_values)
-        for pos, idx in enumerate(indices):
-            industry_pct[idx] = local_pct[pos]
+    industries = [_industry(item) for item in items]
+    global_pct = percentiles(momentum_values)
+    local_pct = group_percentiles(momentum_values, industries)
+    industry_sizes: dict[str, int] = {}
+    for industry in industries:
+        industry_sizes[industry] = industry_sizes.get(industry, 0) + 1
+    industry_pct = [
+        local_pct[idx] if industry_sizes[industry] >= 3 else global_pct[idx] for idx, industry in enumerate(industries)
+    ]
 
     out: list[float] = []
     for idx, item in enumerate(items):
@@ -443,24 +552,33 @@ def hard_event_neutral_noise_turnover_veto(
     }
 
 
-def _multi_horizon_attribution(*, candidate: str, items: Sequence[JsonDict]) -> JsonDict:
+def _multi_horizon_attribution(
+    *,
+    candidate: str,
+    items: Sequence[JsonDict],
+    scores: Sequence[float] | None = None,
+) -> JsonDict:
     horizons: JsonDict = {}
-    score_values = _candidate_scores(candidate, items)
-    scores_by_item = {id(item): score_values[idx] for idx, item in enumerate(items)}
+    score_values = list(scores) if scores is not None else _candidate_scores(candidate, items)
+    samples: list[tuple[list[float], list[float]]] = []
+    sample_counts: list[int] = []
     for horizon in DECAY_HORIZONS:
         scores: list[float] = []
         returns: list[float] = []
-        for item in items:
+        for idx, item in enumerate(items):
             forward = (item.get("forward_returns") or {}).get(str(horizon), {})
             if forward.get("available") is not True:
                 continue
-            scores.append(scores_by_item.get(id(item), 0.0))
+            scores.append(score_values[idx])
             returns.append(float(forward.get("return_pct", 0.0) or 0.0))
-        ic = _pearson(scores, returns) if len(scores) >= 3 else None
-        rank_ic = _spearman(scores, returns) if len(scores) >= 3 else None
+        samples.append((scores, returns) if len(scores) >= 3 else ([], []))
+        sample_counts.append(len(scores))
+    ics = pearson_many(samples)
+    rank_ics = spearman_many(samples)
+    for horizon, sample_count, ic, rank_ic in zip(DECAY_HORIZONS, sample_counts, ics, rank_ics):
         horizons[str(horizon)] = {
             "horizon_days": horizon,
-            "sample_count": len(scores),
+            "sample_count": sample_count,
             "ic": ic,
             "rank_ic": rank_ic,
             "available": ic is not None or rank_ic is not None,
@@ -528,46 +646,3 @@ def _industry(item: JsonDict) -> str:
     features = item.get("tushare_pro_alpha_features") if isinstance(item.get("tushare_pro_alpha_features"), dict) else {}
     evidence = features.get("evidence") if isinstance(features.get("evidence"), dict) else {}
     return str(evidence.get("industry") or "UNKNOWN")
-
-
-def _percentiles(values: Sequence[float]) -> list[float]:
-    if not values:
-        return []
-    ranks = _ranks(values)
-    if len(values) == 1:
-        return [50.0]
-    return [100.0 * (rank - 1.0) / float(len(values) - 1) for rank in ranks]
-
-
-def _pearson(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    mean_l = sum(left) / len(left)
-    mean_r = sum(right) / len(right)
-    cov = sum((a - mean_l) * (b - mean_r) for a, b in zip(left, right))
-    var_l = sum((a - mean_l) ** 2 for a in left)
-    var_r = sum((b - mean_r) ** 2 for b in right)
-    if var_l <= 0.0 or var_r <= 0.0:
-        return None
-    return round(cov / math.sqrt(var_l * var_r), 6)
-
-
-def _spearman(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    return _pearson(_ranks(left), _ranks(right))
-
-
-def _ranks(values: Sequence[float]) -> list[float]:
-    indexed = sorted(enumerate(float(value) for value in values), key=lambda item: item[1])
-    ranks = [0.0] * len(indexed)
-    idx = 0
-    while idx < len(indexed):
-        end = idx
-        while end + 1 < len(indexed) and indexed[end + 1][1] == indexed[idx][1]:
-            end += 1
-        rank = (idx + end + 2) / 2.0
-        for pos in range(idx, end + 1):
-            ranks[indexed[pos][0]] = rank
-        idx = end + 1
-    return ranks
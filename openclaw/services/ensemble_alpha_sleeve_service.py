@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import json
-import math
 import sqlite3
 from typing import Any, Dict, Iterable, Sequence
 
 from openclaw.services.ensemble_core_contract_service import REQUIRED_ALPHA_SLEEVES
 from openclaw.services.ensemble_sleeve_policy_audit_service import build_ensemble_sleeve_policy_audit
-from openclaw.services.tushare_pro_alpha_feature_service import build_tushare_pro_alpha_features
+from openclaw.services.scan_run_index_service import (
+    INDEXED_RUN_TYPES,
+    ScanRunIndex,
+    data_version_trade_date,
+    scan_run_index,
+)
+from openclaw.services.schema_catalog_service import table_exists
+from openclaw.services.signal_item_forward_return_service import materialized_forward_returns
+from openclaw.services.statistics_kernel_service import correlation_matrix, pearson, pearson_many, spearman_many
+from openclaw.services.tushare_pro_alpha_feature_service import (
+    build_tushare_pro_alpha_features,
+    build_tushare_pro_alpha_features_batch,
+)
 
 
 JsonDict = Dict[str, Any]
@@ -33,12 +44,15 @@ def build_ensemble_alpha_sleeve_fact_chain(
     strategies: Sequence[str],
     holding_days: int = 5,
     top_n_per_strategy: int = 20,
+    scan_index: ScanRunIndex | None = None,
 ) -> JsonDict:
     """Build a point-in-time alpha sleeve fact chain from existing signals.
 
     The output is research evidence only.  It explains which sleeves can be
     reconstructed from current signal facts and whether simple forward-return
     attribution is replayable.  It does not produce portfolio weights.
+    Scan runs and items come from ``scan_index`` (default: the shared index of
+    ``conn``'s database).
     """
 
     normalized_date = _compact_date(as_of_date)
@@ -52,7 +66,7 @@ def build_ensemble_alpha_sleeve_fact_chain(
         blocking.append("invalid_holding_days")
     if blocking:
         return _blocked(normalized_date, strategy_list, int(holding_days or 0), blocking)
-    if not _table_exists(conn, "signal_runs") or not _table_exists(conn, "signal_items"):
+    if not table_exists(conn, "signal_runs") or not table_exists(conn, "signal_items"):
         return _blocked(
             normalized_date,
             strategy_list,
@@ -60,43 +74,51 @@ def build_ensemble_alpha_sleeve_fact_chain(
             ["missing_signal_lineage_tables"],
         )
 
-    runs = [_latest_scan_run(conn, strategy=strategy, as_of_date=normalized_date) for strategy in strategy_list]
+    index = scan_index if scan_index is not None else scan_run_index(conn)
+    runs = [_latest_scan_run(index, strategy=strategy, as_of_date=normalized_date) for strategy in strategy_list]
     runs = [run for run in runs if run]
     missing_runs = [strategy for strategy in strategy_list if strategy not in {run["strategy"] for run in runs}]
     if missing_runs:
         blocking.append("missing_source_scan_runs:" + ",".join(missing_runs))
 
+    if int(top_n_per_strategy or 0) > 0:
+        index.preload_items(conn, [str(run["run_id"]) for run in runs])
+    run_items = [
+        (run, item)
+        for run in runs
+        for item in _signal_items(conn, index, run_id=str(run["run_id"]), limit=int(top_n_per_strategy or 0))
+    ]
+    pit_feature_map = build_tushare_pro_alpha_features_batch(
+        conn,
+        ts_codes=[str(item.get("ts_code") or "") for _, item in run_items],
+        as_of_date=normalized_date,
+    )
+    replays = _forward_returns_pct(
+        conn,
+        ts_codes=[str(item.get("ts_code") or "") for _, item in run_items],
+        as_of_date=normalized_date,
+        holding_days=int(holding_days),
+        horizons=DECAY_HORIZONS,
+    )
     items: list[JsonDict] = []
-    for run in runs:
-        for item in _signal_items(conn, run_id=str(run["run_id"]), limit=int(top_n_per_strategy or 0)):
-            forward = _forward_return_pct(
-                conn,
-                ts_code=str(item.get("ts_code") or ""),
-                as_of_date=normalized_date,
-                holding_days=int(holding_days),
-            )
-            forward_returns = _forward_returns_pct(
-                conn,
-                ts_code=str(item.get("ts_code") or ""),
-                as_of_date=normalized_date,
-                horizons=DECAY_HORIZONS,
-            )
-            pit_features = build_tushare_pro_alpha_features(
-                conn,
-                ts_code=str(item.get("ts_code") or ""),
-                as_of_date=normalized_date,
-            )
-            sleeve_scores = _sleeve_scores(item, pit_features=pit_features)
-            items.append(
-                {
-                    **item,
-                    **run,
-                    "forward_return": forward,
-                    "forward_returns": forward_returns,
-                    "tushare_pro_alpha_features": pit_features,
-                    "sleeve_scores": sleeve_scores,
-                }
-            )
+    for (run, item), (forward, forward_returns) in zip(run_items, replays):
+        ts_code = str(item.get("ts_code") or "")
+        pit_features = pit_feature_map.get(ts_code) or build_tushare_pro_alpha_features(
+            conn,
+            ts_code=ts_code,
+            as_of_date=normalized_date,
+        )
+        sleeve_scores = _sleeve_scores(item, pit_features=pit_features)
+        items.append(
+            {
+                **item,
+                **run,
+                "forward_return": forward,
+                "forward_returns": forward_returns,
+                "tushare_pro_alpha_features": pit_features,
+                "sleeve_scores": sleeve_scores,
+            }
+        )
 
     if not items:
         blocking.append("missing_signal_items_for_alpha_sleeves")
@@ -168,62 +190,34 @@ def _blocked(as_of_date: str, strategies: list[str], holding_days: int, blocking
     }
 
 
-def _latest_scan_run(conn: sqlite3.Connection, *, strategy: str, as_of_date: str) -> JsonDict:
-    columns = _columns(conn, "signal_runs")
-    data_version_expr = "data_version" if "data_version" in columns else "'' AS data_version"
-    try:
-        rows = conn.execute(
-            f"""
-            SELECT run_id, strategy, trade_date, created_at, {data_version_expr}
-            FROM signal_runs
-            WHERE run_type IN ('scan', 'experiment')
-              AND strategy = ?
-              AND status = 'success'
-              AND trade_date != ''
-            ORDER BY REPLACE(trade_date, '-', '') DESC, created_at DESC
-            """,
-            (str(strategy),),
-        ).fetchall()
-    except sqlite3.Error:
-        return {}
-    rows = [row for row in rows if _run_visible_as_of(trade_date=row[2], data_version=row[4], as_of_date=as_of_date)]
-    if not rows:
+def _latest_scan_run(index: ScanRunIndex, *, strategy: str, as_of_date: str) -> JsonDict:
+    run = index.latest_run(
+        str(strategy),
+        str(as_of_date or ""),
+        run_types=INDEXED_RUN_TYPES,
+        data_version_visibility=True,
+    )
+    if run is None:
         return {}
-    row = rows[0]
     return {
-        "run_id": str(row[0] or ""),
-        "strategy": str(row[1] or ""),
-        "run_trade_date": str(row[2] or ""),
-        "visible_as_of_date": _run_visible_date(trade_date=row[2], data_version=row[4]),
-        "visibility_source": "data_version" if _data_version_trade_date(row[4]) else "run_trade_date",
+        "run_id": run.run_id,
+        "strategy": run.strategy,
+        "run_trade_date": run.trade_date,
+        "visible_as_of_date": run.visible_date,
+        "visibility_source": "data_version" if data_version_trade_date(run.data_version) else "run_trade_date",
     }
 
 
-def _signal_items(conn: sqlite3.Connection, *, run_id: str, limit: int) -> list[JsonDict]:
-    if limit <= 0:
-        return []
-    columns = _columns(conn, "signal_items")
-    reason_expr = "reason_codes" if "reason_codes" in columns else "'' AS reason_codes"
-    raw_expr = "raw_payload_json" if "raw_payload_json" in columns else "'{}' AS raw_payload_json"
-    rows = conn.execute(
-        f"""
-        SELECT ts_code, score, rank_idx, {reason_expr}, {raw_expr}
-        FROM signal_items
-        WHERE run_id = ?
-        ORDER BY COALESCE(rank_idx, 999999), score DESC, ts_code
-        LIMIT ?
-        """,
-        (str(run_id), int(limit)),
-    ).fetchall()
+def _signal_items(conn: sqlite3.Connection, index: ScanRunIndex, *, run_id: str, limit: int) -> list[JsonDict]:
     return [
         {
-            "ts_code": str(row[0] or ""),
-            "score": float(row[1] or 0.0),
-            "rank_idx": int(row[2] or 0),
-            "reason_codes": _safe_json_loads(row[3], []),
-            "raw_payload": _safe_json_loads(row[4], {}),
+            "ts_code": str(item.ts_code or ""),
+            "score": float(item.score or 0.0),
+            "rank_idx": int(item.rank_idx or 0),
+            "reason_codes": _safe_json_loads(item.reason_codes, []),
+            "raw_payload": _safe_json_loads(item.raw_payload_json, {}),
         }
-        for row in rows
+        for item in index.top_items(conn, str(run_id), int(limit), null_rank_last=True)
     ]
 
 
@@ -276,7 +270,7 @@ def _sleeve_review(*, sleeve: str, items: list[JsonDict]) -> JsonDict:
         if (item.get("forward_return") or {}).get("available") is True
     ]
     active = [score for score in scores if score > 0.0]
-    ic = _pearson(aligned_scores, returns) if len(aligned_scores) >= 3 else None
+    ic = pearson(aligned_scores, returns) if len(aligned_scores) >= 3 else None
     multi = _multi_horizon_attribution(sleeve=sleeve, items=items)
     recommended_use = _recommended_sleeve_use(
         sleeve=sleeve,
@@ -310,6 +304,8 @@ def _sleeve_review(*, sleeve: str, items: list[JsonDict]) -> JsonDict:
 
 def _multi_horizon_attribution(*, sleeve: str, items: list[JsonDict]) -> JsonDict:
     horizons: JsonDict = {}
+    samples: list[tuple[list[float], list[float]]] = []
+    sample_counts: list[int] = []
     for horizon in DECAY_HORIZONS:
         scores: list[float] = []
         returns: list[float] = []
@@ -319,11 +315,14 @@ def _multi_horizon_attribution(*, sleeve: str, items: list[JsonDict]) -> JsonDic
                 continue
             scores.append(float((item.get("sleeve_scores") or {}).get(sleeve, {}).get("score", 0.0) or 0.0))
             returns.append(float(forward.get("return_pct", 0.0) or 0.0))
-        ic = _pearson(scores, returns) if len(scores) >= 3 else None
-        rank_ic = _spearman(scores, returns) if len(scores) >= 3 else None
+        samples.append((scores, returns) if len(scores) >= 3 else ([], []))
+        sample_counts.append(len(scores))
+    ics = pearson_many(samples)
+    rank_ics = spearman_many(samples)
+    for horizon, sample_count, ic, rank_ic in zip(DECAY_HORIZONS, sample_counts, ics, rank_ics):
         horizons[str(horizon)] = {
             "horizon_days": horizon,
-            "sample_count": len(scores),
+            "sample_count": sample_count,
             "ic": ic,
             "rank_ic": rank_ic,
             "available": ic is not None or rank_ic is not None,
@@ -375,137 +374,48 @@ def _recommended_sleeve_use(
 
 
 def _sleeve_correlation(items: list[JsonDict]) -> JsonDict:
-    out: JsonDict = {}
-    for left in REQUIRED_ALPHA_SLEEVES:
-        out[left] = {}
-        left_scores = [float((item.get("sleeve_scores") or {}).get(left, {}).get("score", 0.0) or 0.0) for item in items]
-        for right in REQUIRED_ALPHA_SLEEVES:
-            right_scores = [float((item.get("sleeve_scores") or {}).get(right, {}).get("score", 0.0) or 0.0) for item in items]
-            out[left][right] = _pearson(left_scores, right_scores) if len(items) >= 3 else None
-    return out
-
-
-def _forward_return_pct(conn: sqlite3.Connection, *, ts_code: str, as_of_date: str, holding_days: int) -> JsonDict:
-    if not _table_exists(conn, "daily_trading_data"):
-        return {"available": False, "blocking_reason": "missing_daily_trading_data_table"}
-    try:
-        rows = conn.execute(
-            """
-            SELECT trade_date, close_price
-            FROM daily_trading_data
-            WHERE ts_code = ?
-              AND trade_date >= ?
-              AND close_price IS NOT NULL
-            ORDER BY trade_date ASC
-            LIMIT ?
-            """,
-            (str(ts_code), str(as_of_date), int(holding_days) + 1),
-        ).fetchall()
-    except sqlite3.Error:
-        return {"available": False, "blocking_reason": "forward_return_query_failed"}
-    if len(rows) < int(holding_days) + 1:
-        return {"available": False, "blocking_reason": "insufficient_forward_price_window", "price_count": len(rows)}
-    entry = float(rows[0][1] or 0.0)
-    exit_price = float(rows[int(holding_days)][1] or 0.0)
-    if entry <= 0.0 or exit_price <= 0.0:
-        return {"available": False, "blocking_reason": "invalid_forward_price"}
-    return {
-        "available": True,
-        "entry_trade_date": str(rows[0][0] or ""),
-        "exit_trade_date": str(rows[int(holding_days)][0] or ""),
-        "return_pct": (exit_price / entry - 1.0) * 100.0,
-    }
+    sleeves = list(REQUIRED_ALPHA_SLEEVES)
+    if len(items) < 3:
+        return {left: {right: None for right in sleeves} for left in sleeves}
+    matrix = correlation_matrix(
+        [[float((item.get("sleeve_scores") or {}).get(sleeve, {}).get("score", 0.0) or 0.0) for item in items] for sleeve in sleeves]
+    )
+    return {left: dict(zip(sleeves, row)) for left, row in zip(sleeves, matrix)}
 
 
 def _forward_returns_pct(
     conn: sqlite3.Connection,
     *,
-    ts_code: str,
+    ts_codes: Sequence[str],
     as_of_date: str,
+    holding_days: int,
     horizons: Sequence[int],
-) -> JsonDict:
-    if not _table_exists(conn, "daily_trading_data"):
-        return {
-            str(horizon): {"available": False, "blocking_reason": "missing_daily_trading_data_table"}
-            for horizon in horizons
-        }
-    max_horizon = max(int(horizon) for horizon in horizons if int(horizon) > 0)
+) -> list[tuple[JsonDict, JsonDict]]:
+    """Holding-period return and per-horizon decay returns for each code, from one batched read."""
+    if not table_exists(conn, "daily_trading_data"):
+        blocked = {"available": False, "blocking_reason": "missing_daily_trading_data_table"}
+        return [(dict(blocked), {str(horizon): dict(blocked) for horizon in horizons}) for _ in ts_codes]
+    requests = []
+    for code in ts_codes:
+        requests.append((code, as_of_date, (int(holding_days),)))
+        requests.append((code, as_of_date, [int(horizon) for horizon in horizons]))
     try:
-        rows = conn.execute(
-            """
-            SELECT trade_date, close_price
-            FROM daily_trading_data
-            WHERE ts_code = ?
-              AND trade_date >= ?
-              AND close_price IS NOT NULL
-            ORDER BY trade_date ASC
-            LIMIT ?
-            """,
-            (str(ts_code), str(as_of_date), max_horizon + 1),
-        ).fetchall()
+        replays = materialized_forward_returns(conn, requests)
     except sqlite3.Error:
-        return {
-            str(horizon): {"available": False, "blocking_reason": "forward_return_query_failed"}
-            for horizon in horizons
-        }
-    out: JsonDict = {}
-    for horizon in horizons:
-        h = int(horizon)
-        if len(rows) < h + 1:
-            out[str(h)] = {
-                "available": False,
-                "blocking_reason": "insufficient_forward_price_window",
-                "price_count": len(rows),
-            }
-            continue
-        entry = float(rows[0][1] or 0.0)
-        exit_price = float(rows[h][1] or 0.0)
-        if entry <= 0.0 or exit_price <= 0.0:
-            out[str(h)] = {"available": False, "blocking_reason": "invalid_forward_price"}
-            continue
-        out[str(h)] = {
-            "available": True,
-            "entry_trade_date": str(rows[0][0] or ""),
-            "exit_trade_date": str(rows[h][0] or ""),
-            "return_pct": (exit_price / entry - 1.0) * 100.0,
-        }
+        failed = {"available": False, "blocking_reason": "forward_return_query_failed"}
+        return [(dict(failed), {str(horizon): dict(failed) for horizon in horizons}) for _ in ts_codes]
+    out = []
+    for idx in range(len(ts_codes)):
+        single, multi = replays[2 * idx], replays[2 * idx + 1]
+        forward = _forward_fields(single[int(holding_days)])
+        out.append((forward, {str(int(horizon)): _forward_fields(multi[int(horizon)]) for horizon in horizons}))
     return out
 
 
-def _pearson(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    lx = [float(item) for item in left]
-    ry = [float(item) for item in right]
-    mean_l = sum(lx) / len(lx)
-    mean_r = sum(ry) / len(ry)
-    cov = sum((a - mean_l) * (b - mean_r) for a, b in zip(lx, ry))
-    var_l = sum((a - mean_l) ** 2 for a in lx)
-    var_r = sum((b - mean_r) ** 2 for b in ry)
-    if var_l <= 0.0 or var_r <= 0.0:
-        return None
-    return round(cov / math.sqrt(var_l * var_r), 6)
-
-
-def _spearman(left: Sequence[float], right: Sequence[float]) -> float | None:
-    if len(left) != len(right) or len(left) < 2:
-        return None
-    return _pearson(_ranks(left), _ranks(right))
-
-
-def _ranks(values: Sequence[float]) -> list[float]:
-    indexed = sorted(enumerate(float(value) for value in values), key=lambda item: item[1])
-    ranks = [0.0] * len(indexed)
-    idx = 0
-    while idx < len(indexed):
-        end = idx
-        while end + 1 < len(indexed) and indexed[end + 1][1] == indexed[idx][1]:
-            end += 1
-        rank = (idx + end + 2) / 2.0
-        for pos in range(idx, end + 1):
-            ranks[indexed[pos][0]] = rank
-        idx = end + 1
-    return ranks
+def _forward_fields(replay: JsonDict) -> JsonDict:
+    if replay.get("available") is not True:
+        return replay
+    return {key: replay[key] for key in ("available", "entry_trade_date", "exit_trade_date", "return_pct")}
 
 
 def _decay_profile(ic_path: Sequence[float]) -> str:
@@ -532,23 +442,6 @@ def _safe_json_loads(value: Any, fallback: Any) -> Any:
     return parsed
 
 
-def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
-    try:
-        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    except sqlite3.Error:
-        return set()
-    return {str(row[1] or "") for row in rows}
-
-
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    try:
-        row = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (str(table),),
-        ).fetchone()
-    except sqlite3.Error:
-        return False
-    return bool(row)
 
 
 def _unique(values: Iterable[Any]) -> list[str]:
@@ -562,22 +455,3 @@ def _unique(values: Iterable[Any]) -> list[str]:
 
 def _compact_date(value: Any) -> str:
     return str(value or "").strip().replace("-", "")
-
-
-def _run_visible_as_of(*, trade_date: Any, data_version: Any, as_of_date: str) -> bool:
-    visible = _run_visible_date(trade_date=trade_date, data_version=data_version)
-    return bool(visible and visible <= str(as_of_date or ""))
-
-
-def _run_visible_date(*, trade_date: Any, data_version: Any) -> str:
-    return _data_version_trade_date(data_version) or _compact_date(trade_date)
-
-
-def _data_version_trade_date(value: Any) -> str:
-    text = str(value or "")
-    marker = "trade_date:"
-    if marker not in text:
-        return ""
-    tail = text.split(marker, 1)[1]
-    raw = tail.split("|", 1)[0].strip()
-    return _compact_date(raw)
@@ -3,6 +3,9 @@ from __future__ import annotations
 import sqlite3
 from typing import Any, Dict, Sequence
 
+from openclaw.services.forward_return_replay_service import replay_forward_returns
+from openclaw.services.schema_catalog_service import table_exists
+
 
 JsonDict = Dict[str, Any]
 
@@ -41,12 +44,20 @@ def build_ensemble_execution_cost_replay(
     cost_bps_weighted = 0.0
     slippage_bps_weighted = 0.0
 
-    for item in weights:
+    traded_items = [
+        item
+        for item in weights
+        if str(item.get("ts_code") or "") and max(0.0, float(item.get("weight", 0.0) or 0.0)) > 0.0
+    ]
+    replays = _price_replays(
+        conn,
+        ts_codes=[str(item.get("ts_code") or "") for item in traded_items],
+        as_of_date=normalized_date,
+        holding_days=int(holding_days or 0),
+    )
+    for item, replay in zip(traded_items, replays):
         code = str(item.get("ts_code") or "")
         weight = max(0.0, float(item.get("weight", 0.0) or 0.0))
-        if not code or weight <= 0.0:
-            continue
-        replay = _price_replay(conn, ts_code=code, as_of_date=normalized_date, holding_days=int(holding_days or 0))
         capacity_usage = _capacity_usage(portfolio, item)
         blocked_reason = ""
         if replay.get("available") is not True:
@@ -119,42 +130,42 @@ def build_ensemble_execution_cost_replay(
     }
 
 
-def _price_replay(conn: sqlite3.Connection, *, ts_code: str, as_of_date: str, holding_days: int) -> JsonDict:
-    if not _table_exists(conn, "daily_trading_data"):
-        return {"available": False, "blocking_reason": "missing_daily_trading_data"}
+def _price_replays(
+    conn: sqlite3.Connection,
+    *,
+    ts_codes: Sequence[str],
+    as_of_date: str,
+    holding_days: int,
+) -> list[JsonDict]:
+    if not table_exists(conn, "daily_trading_data"):
+        return [{"available": False, "blocking_reason": "missing_daily_trading_data"} for _ in ts_codes]
+    h = max(0, int(holding_days))
     try:
-        rows = conn.execute(
-            """
-            SELECT trade_date, close_price, pct_chg, amount
-            FROM daily_trading_data
-            WHERE ts_code = ?
-              AND REPLACE(trade_date, '-', '') >= ?
-              AND close_price IS NOT NULL
-            ORDER BY REPLACE(trade_date, '-', '') ASC
-            LIMIT ?
-            """,
-            (str(ts_code), str(as_of_date), int(holding_days) + 1),
-        ).fetchall()
+        replays = replay_forward_returns(
+            conn,
+            [(code, as_of_date, (h,)) for code in ts_codes],
+            date_key="dashless",
+            extra_columns=("pct_chg", "amount"),
+            invalid_price_reason="invalid_close_price",
+        )
     except sqlite3.Error:
-        return {"available": False, "blocking_reason": "price_replay_query_failed"}
-    if len(rows) < int(holding_days) + 1:
-        return {"available": False, "blocking_reason": "insufficient_forward_price_window", "price_count": len(rows)}
-    entry_close = float(rows[0][1] or 0.0)
-    exit_close = float(rows[int(holding_days)][1] or 0.0)
-    if entry_close <= 0.0 or exit_close <= 0.0:
-        return {"available": False, "blocking_reason": "invalid_close_price"}
-    entry_pct = float(rows[0][2] or 0.0)
-    exit_pct = float(rows[int(holding_days)][2] or 0.0)
-    return {
-        "available": True,
-        "entry_trade_date": str(rows[0][0] or ""),
-        "exit_trade_date": str(rows[int(holding_days)][0] or ""),
-        "entry_limit_up": entry_pct >= 9.5,
-        "exit_limit_down": exit_pct <= -9.5,
-        "entry_amount": float(rows[0][3] or 0.0),
-        "exit_amount": float(rows[int(holding_days)][3] or 0.0),
-        "return_pct": (exit_close / entry_close - 1.0) * 100.0,
-    }
+        return [{"available": False, "blocking_reason": "price_replay_query_failed"} for _ in ts_codes]
+    out: list[JsonDict] = []
+    for replay in replays:
+        result = replay[h]
+        if result.get("available") is True:
+            result = {
+                "available": True,
+                "entry_trade_date": result["entry_trade_date"],
+                "exit_trade_date": result["exit_trade_date"],
+                "entry_limit_up": result["entry_pct_chg"] >= 9.5,
+                "exit_limit_down": result["exit_pct_chg"] <= -9.5,
+                "entry_amount": result["entry_amount"],
+                "exit_amount": result["exit_amount"],
+                "return_pct": result["return_pct"],
+            }
+        out.append(result)
+    return out
 
 
 def _capacity_usage(portfolio: JsonDict, item: JsonDict) -> float:
@@ -169,11 +180,3 @@ def _capacity_usage(portfolio: JsonDict, item: JsonDict) -> float:
 
 def _compact_date(value: Any) -> str:
     return str(value or "").strip().replace("-", "")
-
-
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    try:
-        row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (str(table),)).fetchone()
-    except sqlite3.Error:
-        return False
-    return bool(row)
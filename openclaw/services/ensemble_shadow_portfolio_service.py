@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Sequence
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
 
 from openclaw.services.ensemble_alpha_rebuild_lab_service import _candidate_score
 from openclaw.services.ensemble_alpha_rebuild_lab_service import hard_event_neutral_noise_turnover_veto
@@ -34,6 +38,58 @@ def build_ensemble_shadow_portfolio(
     never contribute positive alpha weight.
     """
 
+    return _ensemble_window_portfolios(
+        fact_chain,
+        alpha_risk_budgets=[alpha_risk_budget],
+        max_positions=max_positions,
+        portfolio_value=portfolio_value,
+        single_name_cap=single_name_cap,
+        industry_cap=industry_cap,
+        capacity_participation=capacity_participation,
+    )[0]
+
+
+def sweep_ensemble_shadow_portfolios(
+    fact_chains: Sequence[JsonDict | None],
+    *,
+    alpha_risk_budgets: Sequence[JsonDict | None],
+    max_positions: int = 10,
+    portfolio_value: float = DEFAULT_PORTFOLIO_VALUE,
+    single_name_cap: float = DEFAULT_SINGLE_NAME_CAP,
+    industry_cap: float = DEFAULT_INDUSTRY_CAP,
+    capacity_participation: float = DEFAULT_CAPACITY_PARTICIPATION,
+) -> List[List[JsonDict]]:
+    """Shadow portfolios for every (window fact chain, alpha risk budget) pair.
+
+    ``out[w][b]`` equals ``build_ensemble_shadow_portfolio(fact_chains[w],
+    alpha_risk_budget=alpha_risk_budgets[b], ...)``.  Each window is parsed into
+    a candidate frame once and all budgets are scored and allocated together.
+    """
+
+    return [
+        _ensemble_window_portfolios(
+            fact_chain,
+            alpha_risk_budgets=alpha_risk_budgets,
+            max_positions=max_positions,
+            portfolio_value=portfolio_value,
+            single_name_cap=single_name_cap,
+            industry_cap=industry_cap,
+            capacity_participation=capacity_participation,
+        )
+        for fact_chain in fact_chains
+    ]
+
+
+def _ensemble_window_portfolios(
+    fact_chain: JsonDict | None,
+    *,
+    alpha_risk_budgets: Sequence[JsonDict | None],
+    max_positions: int,
+    portfolio_value: float,
+    single_name_cap: float,
+    industry_cap: float,
+    capacity_participation: float,
+) -> List[JsonDict]:
     payload = fact_chain if isinstance(fact_chain, dict) else {}
     policy_audit = payload.get("sleeve_policy_audit")
     if not isinstance(policy_audit, dict):
@@ -46,64 +102,63 @@ def build_ensemble_shadow_portfolio(
     if not alpha_sleeves:
         blockers.append("missing_positive_alpha_candidate_sleeves")
     if blockers:
-        return _blocked(policy_audit=policy_audit, risk_filters=risk_filters, blocking=blockers)
-
-    budget = _normalized_budget(alpha_sleeves, alpha_risk_budget)
-    rows = _candidate_rows(
-        payload.get("sample_facts") or [],
-        alpha_sleeves=alpha_sleeves,
-        risk_filters=risk_filters,
-        risk_budget=budget,
+        return [_blocked(policy_audit=policy_audit, risk_filters=risk_filters, blocking=blockers) for _ in alpha_risk_budgets]
+
+    frame = candidate_frame(payload.get("sample_facts") or [], alpha_sleeves=alpha_sleeves, risk_filters=risk_filters)
+    budgets = [_normalized_budget(alpha_sleeves, budget) for budget in alpha_risk_budgets]
+    budget_matrix = np.array(
+        [[float(budget.get(sleeve, 0.0) or 0.0) for sleeve in alpha_sleeves] for budget in budgets],
+        dtype=float,
+    ).reshape(len(budgets), len(alpha_sleeves))
+    # Sequential sums/rounding reproduce the per-row builder bit for bit, so
+    # rankings and ties do not depend on the batch shape.
+    alpha_scores = np.cumsum(frame.alpha_sleeve_scores[None, :, :] * budget_matrix[:, None, :], axis=2)[:, :, -1]
+    alpha_rounded = _round6(alpha_scores)
+    filter_rounded = _round6(frame.filter_multiplier)
+    construction = _round6(alpha_scores * frame.filter_multiplier[None, :])
+    allocation = _allocate(
+        construction,
+        industries=frame.industries,
+        latest_amount=frame.latest_amount,
+        max_positions=max_positions,
+        portfolio_value=portfolio_value,
+        single_name_cap=single_name_cap,
+        industry_cap=industry_cap,
+        capacity_participation=capacity_participation,
     )
-    rows = [row for row in rows if float(row.get("construction_score", 0.0) or 0.0) > 0.0]
-    if not rows:
-        return _blocked(policy_audit=policy_audit, risk_filters=risk_filters, blocking=["missing_positive_construction_scores"])
-
-    rows = sorted(rows, key=lambda row: float(row.get("construction_score", 0.0) or 0.0), reverse=True)[: int(max_positions or 0)]
-    total_score = sum(float(row.get("construction_score", 0.0) or 0.0) for row in rows)
-    industry_weights: dict[str, float] = {}
-    weights: list[JsonDict] = []
-    constraint_hits: list[JsonDict] = []
-    for row in rows:
-        raw_weight = float(row.get("construction_score", 0.0) or 0.0) / total_score if total_score > 0.0 else 0.0
-        capped = min(raw_weight, float(single_name_cap))
-        if capped < raw_weight:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "single_name_cap", "raw_weight": raw_weight, "capped_weight": capped})
-        industry = str(row.get("industry") or "unknown")
-        remaining_industry = max(0.0, float(industry_cap) - industry_weights.get(industry, 0.0))
-        if capped > remaining_industry:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "industry_cap", "raw_weight": capped, "capped_weight": remaining_industry})
-            capped = remaining_industry
-        amount = float(row.get("latest_amount", 0.0) or 0.0)
-        capacity_cap = (amount * float(capacity_participation)) / float(portfolio_value or DEFAULT_PORTFOLIO_VALUE) if amount > 0.0 else 0.0
-        if capacity_cap > 0.0 and capped > capacity_cap:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "capacity_constraint", "raw_weight": capped, "capped_weight": capacity_cap})
-            capped = capacity_cap
-        if capped <= 0.0:
-            continue
-        industry_weights[industry] = industry_weights.get(industry, 0.0) + capped
-        weights.append({**row, "raw_weight": round(raw_weight, 6), "weight": round(capped, 6)})
 
-    invested = sum(float(row.get("weight", 0.0) or 0.0) for row in weights)
-    return {
-        "portfolio_version": "ensemble_shadow_portfolio.v1",
-        "research_only": True,
-        "not_for_production": True,
-        "shadow_weights": weights,
-        "excluded_sleeves": policy_audit.get("excluded_sleeves") or [],
-        "constraint_hits": constraint_hits,
-        "risk_budget": budget,
-        "industry_exposure": {key: round(value, 6) for key, value in sorted(industry_weights.items())},
-        "capacity_usage": _capacity_usage(weights, portfolio_value=portfolio_value),
-        "turnover_estimate": round(invested, 6),
-        "cash_weight": round(max(0.0, 1.0 - invested), 6),
-        "blocking_reasons": [],
-        "hard_boundaries": [
-            "do_not_write_shadow_weights_to_formal_top_stocks",
-            "do_not_use_risk_filters_as_positive_alpha",
-            "do_not_bypass_after_cost_benchmark_before_observation",
-        ],
-    }
+    out: List[JsonDict] = []
+    for idx, budget in enumerate(budgets):
+        if not bool((construction[idx] > 0.0).any()):
+            out.append(_blocked(policy_audit=policy_audit, risk_filters=risk_filters, blocking=["missing_positive_construction_scores"]))
+            continue
+        weights, constraint_hits = allocation.emit(
+            idx,
+            partial(_frame_row, frame, alpha_rounded[idx], filter_rounded, construction[idx]),
+        )
+        invested = _sequential_total(np.array([row["weight"] for row in weights], dtype=float))
+        out.append(
+            {
+                "portfolio_version": "ensemble_shadow_portfolio.v1",
+                "research_only": True,
+                "not_for_production": True,
+                "shadow_weights": weights,
+                "excluded_sleeves": policy_audit.get("excluded_sleeves") or [],
+                "constraint_hits": constraint_hits,
+                "risk_budget": budget,
+                "industry_exposure": allocation.industry_exposure(idx),
+                "capacity_usage": _capacity_usage(weights, portfolio_value=portfolio_value),
+                "turnover_estimate": round(invested, 6),
+                "cash_weight": round(max(0.0, 1.0 - invested), 6),
+                "blocking_reasons": [],
+                "hard_boundaries": [
+                    "do_not_write_shadow_weights_to_formal_top_stocks",
+                    "do_not_use_risk_filters_as_positive_alpha",
+                    "do_not_bypass_after_cost_benchmark_before_observation",
+                ],
+            }
+        )
+    return out
 
 
 def build_rebuilt_candidate_shadow_portfolio(
@@ -257,30 +312,19 @@ def _construct_weight_payload(
     risk_off_vetoed_signals: Sequence[JsonDict] | None = None,
     neutral_vetoed_signals: Sequence[JsonDict] | None = None,
 ) -> JsonDict:
-    selected = sorted(rows, key=lambda row: float(row.get("construction_score", 0.0) or 0.0), reverse=True)[: int(max_positions or 0)]
-    total_score = sum(float(row.get("construction_score", 0.0) or 0.0) for row in selected)
-    industry_weights: dict[str, float] = {}
-    weights: list[JsonDict] = []
-    constraint_hits: list[JsonDict] = []
-    for row in selected:
-        raw_weight = float(row.get("construction_score", 0.0) or 0.0) / total_score if total_score > 0.0 else 0.0
-        capped = min(raw_weight, float(single_name_cap))
-        if capped < raw_weight:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "single_name_cap", "raw_weight": raw_weight, "capped_weight": capped})
-        industry = str(row.get("industry") or "unknown")
-        remaining_industry = max(0.0, float(industry_cap) - industry_weights.get(industry, 0.0))
-        if capped > remaining_industry:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "industry_cap", "raw_weight": capped, "capped_weight": remaining_industry})
-            capped = remaining_industry
-        amount = float(row.get("latest_amount", 0.0) or 0.0)
-        capacity_cap = (amount * float(capacity_participation)) / float(portfolio_value or DEFAULT_PORTFOLIO_VALUE) if amount > 0.0 else 0.0
-        if capacity_cap > 0.0 and capped > capacity_cap:
-            constraint_hits.append({"ts_code": row["ts_code"], "constraint": "capacity_constraint", "raw_weight": capped, "capped_weight": capacity_cap})
-            capped = capacity_cap
-        if capped <= 0.0:
-            continue
-        industry_weights[industry] = industry_weights.get(industry, 0.0) + capped
-        weights.append({**row, "raw_weight": round(raw_weight, 6), "weight": round(capped, 6)})
+    allocation = _allocate(
+        np.array([[float(row.get("construction_score", 0.0) or 0.0) for row in rows]], dtype=float).reshape(1, len(rows)),
+        industries=[str(row.get("industry") or "unknown") for row in rows],
+        latest_amount=np.array([float(row.get("latest_amount", 0.0) or 0.0) for row in rows], dtype=float),
+        max_positions=max_positions,
+        portfolio_value=portfolio_value,
+        single_name_cap=single_name_cap,
+        industry_cap=industry_cap,
+        capacity_participation=capacity_participation,
+        positive_only=False,
+    )
+    weights, constraint_hits = allocation.emit(0, lambda pos: dict(rows[pos]))
+    industry_exposure = allocation.industry_exposure(0)
 
     regime = str(market_regime_label or "").strip() or "unknown"
     gross_target = _effective_gross_exposure(
@@ -288,7 +332,7 @@ def _construct_weight_payload(
         target_gross_exposure=target_gross_exposure,
         neutral_gross_exposure=neutral_gross_exposure,
     )
-    pre_throttle_invested = sum(float(row.get("weight", 0.0) or 0.0) for row in weights)
+    pre_throttle_invested = _sequential_total(np.array([row["weight"] for row in weights], dtype=float))
     allocator_controls = {
         "market_regime_label": regime,
         "target_gross_exposure": round(gross_target, 6),
@@ -306,10 +350,11 @@ def _construct_weight_payload(
                 "capped_weight": gross_target,
             }
         )
-        weights = [{**row, "weight": round(float(row.get("weight", 0.0) or 0.0) * scale, 6)} for row in weights]
-        industry_weights = _industry_weights(weights)
+        scaled = _round6(np.array([row["weight"] for row in weights], dtype=float) * scale)
+        weights = [{**row, "weight": float(weight)} for row, weight in zip(weights, scaled)]
+        industry_exposure = _industry_exposure([str(row["industry"]) for row in weights], scaled)
 
-    invested = sum(float(row.get("weight", 0.0) or 0.0) for row in weights)
+    invested = _sequential_total(np.array([row["weight"] for row in weights], dtype=float))
     return {
         "portfolio_version": "rebuilt_candidate_shadow_portfolio.v1",
         "research_only": True,
@@ -324,7 +369,7 @@ def _construct_weight_payload(
         "neutral_vetoed_signals": list(neutral_vetoed_signals or []),
         "shadow_weights": weights,
         "constraint_hits": constraint_hits,
-        "industry_exposure": {key: round(value, 6) for key, value in sorted(industry_weights.items())},
+        "industry_exposure": industry_exposure,
         "capacity_usage": _capacity_usage(weights, portfolio_value=portfolio_value),
         "turnover_estimate": round(invested, 6),
         "cash_weight": round(max(0.0, 1.0 - invested), 6),
@@ -417,14 +462,32 @@ def _normalized_budget(alpha_sleeves: Sequence[str], value: JsonDict | None) ->
     return {sleeve: round(weight / total, 6) for sleeve, weight in out.items()}
 
 
-def _candidate_rows(
+@dataclass(frozen=True)
+class CandidateFrame:
+    """Deduplicated sample facts as typed columns, in first-appearance order."""
+
+    ts_codes: Tuple[str, ...]
+    industries: Tuple[str, ...]
+    source_strategies: Tuple[str, ...]
+    latest_amount: np.ndarray
+    alpha_sleeve_scores: np.ndarray
+    filter_multiplier: np.ndarray
+
+
+def candidate_frame(
     items: Sequence[JsonDict],
     *,
     alpha_sleeves: Sequence[str],
     risk_filters: Sequence[str],
-    risk_budget: JsonDict,
-) -> list[JsonDict]:
-    out: list[JsonDict] = []
+) -> CandidateFrame:
+    """Parse sample facts once: clipped alpha sleeve scores (rows x sleeves) and risk-filter multipliers."""
+
+    codes: list[str] = []
+    industries: list[str] = []
+    sources: list[str] = []
+    amounts: list[float] = []
+    alpha_rows: list[list[float]] = []
+    filter_rows: list[list[float]] = []
     seen: set[str] = set()
     for item in items:
         code = str(item.get("ts_code") or "")
@@ -432,25 +495,189 @@ def _candidate_rows(
             continue
         seen.add(code)
         sleeve_scores = item.get("sleeve_scores") if isinstance(item.get("sleeve_scores"), dict) else {}
-        alpha_score = sum(
-            _score(sleeve_scores, sleeve) * float(risk_budget.get(sleeve, 0.0) or 0.0)
-            for sleeve in alpha_sleeves
-        )
-        filter_multiplier = _filter_multiplier(sleeve_scores, risk_filters)
         features = item.get("tushare_pro_alpha_features") if isinstance(item.get("tushare_pro_alpha_features"), dict) else {}
         evidence = features.get("evidence") if isinstance(features.get("evidence"), dict) else {}
-        out.append(
-            {
-                "ts_code": code,
-                "industry": str(evidence.get("industry") or "unknown"),
-                "alpha_score": round(alpha_score, 6),
-                "risk_filter_multiplier": round(filter_multiplier, 6),
-                "construction_score": round(alpha_score * filter_multiplier, 6),
-                "latest_amount": float(evidence.get("latest_amount", 0.0) or 0.0),
-                "source_strategy": str(item.get("strategy") or ""),
-            }
+        codes.append(code)
+        industries.append(str(evidence.get("industry") or "unknown"))
+        sources.append(str(item.get("strategy") or ""))
+        amounts.append(float(evidence.get("latest_amount", 0.0) or 0.0))
+        alpha_rows.append([_score(sleeve_scores, sleeve) for sleeve in alpha_sleeves])
+        filter_rows.append([_score(sleeve_scores, sleeve) for sleeve in risk_filters])
+
+    filter_scores = np.array(filter_rows, dtype=float).reshape(len(codes), len(risk_filters))
+    if risk_filters:
+        multiplier = np.clip(np.cumprod(0.7 + 0.3 * (filter_scores / 100.0), axis=1)[:, -1], 0.0, 1.0)
+    else:
+        multiplier = np.ones(len(codes), dtype=float)
+    return CandidateFrame(
+        ts_codes=tuple(codes),
+        industries=tuple(industries),
+        source_strategies=tuple(sources),
+        latest_amount=np.array(amounts, dtype=float),
+        alpha_sleeve_scores=np.array(alpha_rows, dtype=float).reshape(len(codes), len(alpha_sleeves)),
+        filter_multiplier=multiplier,
+    )
+
+
+def _frame_row(
+    frame: CandidateFrame,
+    alpha_scores: np.ndarray,
+    filter_multiplier: np.ndarray,
+    construction_scores: np.ndarray,
+    pos: int,
+) -> JsonDict:
+    return {
+        "ts_code": frame.ts_codes[pos],
+        "industry": frame.industries[pos],
+        "alpha_score": float(alpha_scores[pos]),
+        "risk_filter_multiplier": float(filter_multiplier[pos]),
+        "construction_score": float(construction_scores[pos]),
+        "latest_amount": float(frame.latest_amount[pos]),
+        "source_strategy": frame.source_strategies[pos],
+    }
+
+
+@dataclass(frozen=True)
+class _Allocation:
+    """Capped weights of S scenarios; rank-indexed arrays are (S, M), ``order`` is -1 past each selection."""
+
+    order: np.ndarray
+    raw_weight: np.ndarray
+    single_capped: np.ndarray
+    single_hit: np.ndarray
+    industry_remaining: np.ndarray
+    industry_hit: np.ndarray
+    post_industry: np.ndarray
+    capacity_cap: np.ndarray
+    capacity_hit: np.ndarray
+    weight: np.ndarray
+    industry_names: Tuple[str, ...]
+    industry_totals: np.ndarray
+    industry_used: np.ndarray
+
+    def emit(self, scenario: int, row_for: Callable[[int], JsonDict]) -> tuple[list[JsonDict], list[JsonDict]]:
+        weights: list[JsonDict] = []
+        constraint_hits: list[JsonDict] = []
+        columns = zip(
+            self.order[scenario].tolist(),
+            self.raw_weight[scenario].tolist(),
+            self.single_capped[scenario].tolist(),
+            self.single_hit[scenario].tolist(),
+            self.industry_remaining[scenario].tolist(),
+            self.industry_hit[scenario].tolist(),
+            self.post_industry[scenario].tolist(),
+            self.capacity_cap[scenario].tolist(),
+            self.capacity_hit[scenario].tolist(),
+            self.weight[scenario].tolist(),
         )
-    return out
+        for pos, raw, single, single_hit, remaining, industry_hit, post_industry, capacity, capacity_hit, weight in columns:
+            if pos < 0:
+                break
+            row = row_for(pos)
+            if single_hit:
+                constraint_hits.append({"ts_code": row["ts_code"], "constraint": "single_name_cap", "raw_weight": raw, "capped_weight": single})
+            if industry_hit:
+                constraint_hits.append({"ts_code": row["ts_code"], "constraint": "industry_cap", "raw_weight": single, "capped_weight": remaining})
+            if capacity_hit:
+                constraint_hits.append({"ts_code": row["ts_code"], "constraint": "capacity_constraint", "raw_weight": post_industry, "capped_weight": capacity})
+            if weight <= 0.0:
+                continue
+            weights.append({**row, "raw_weight": round(raw, 6), "weight": round(weight, 6)})
+        return weights, constraint_hits
+
+    def industry_exposure(self, scenario: int) -> dict[str, float]:
+        return {
+            name: round(float(total), 6)
+            for name, total, used in zip(self.industry_names, self.industry_totals[scenario], self.industry_used[scenario])
+            if used
+        }
+
+
+def _allocate(
+    scores: np.ndarray,
+    *,
+    industries: Sequence[str],
+    latest_amount: np.ndarray,
+    max_positions: int,
+    portfolio_value: float,
+    single_name_cap: float,
+    industry_cap: float,
+    capacity_participation: float,
+    positive_only: bool = True,
+) -> _Allocation:
+    """Rank construction scores per scenario, normalize, then apply single-name, industry and capacity caps.
+
+    ``scores`` is (scenarios x candidates); ``positive_only`` drops non-positive
+    scores before ``max_positions`` is applied.  Industry caps depend on the weights
+    already granted to higher-ranked names, so ranks are walked in order while
+    every scenario advances together.
+    """
+
+    scenarios, count = scores.shape
+    names = tuple(sorted(set(industries)))
+    lookup = {name: idx for idx, name in enumerate(names)}
+    codes = np.array([lookup[name] for name in industries], dtype=np.int64)
+
+    eligible = scores > 0.0 if positive_only else np.ones(scores.shape, dtype=bool)
+    keep = np.array([len(range(int(n))[: int(max_positions or 0)]) for n in eligible.sum(axis=1)], dtype=np.int64)
+    width = int(keep.max()) if scenarios else 0
+    ranked = np.argsort(np.where(eligible, -scores, np.inf), axis=1, kind="stable")[:, :width]
+    valid = np.arange(width)[None, :] < keep[:, None]
+    order = np.where(valid, ranked, -1)
+    safe = np.where(valid, ranked, 0)
+
+    selected = np.where(valid, np.take_along_axis(scores, safe, axis=1), 0.0)
+    total = np.cumsum(selected, axis=1)[:, -1:] if width else np.zeros((scenarios, 1))
+    raw = np.where(total > 0.0, selected / np.where(total > 0.0, total, 1.0), 0.0)
+    single = np.minimum(raw, float(single_name_cap))
+    single_hit = valid & (single < raw)
+
+    value = float(portfolio_value or DEFAULT_PORTFOLIO_VALUE)
+    amounts = np.asarray(latest_amount, dtype=float)
+    candidate_capacity = np.where(amounts > 0.0, (amounts * float(capacity_participation)) / value, 0.0)
+
+    remaining = np.zeros((scenarios, width))
+    industry_hit = np.zeros((scenarios, width), dtype=bool)
+    post_industry = np.zeros((scenarios, width))
+    capacity = np.zeros((scenarios, width))
+    capacity_hit = np.zeros((scenarios, width), dtype=bool)
+    weight = np.zeros((scenarios, width))
+    totals = np.zeros((scenarios, len(names)))
+    used = np.zeros((scenarios, len(names)), dtype=bool)
+    rows = np.arange(scenarios)
+    for rank in range(width):
+        industry = codes[safe[:, rank]] if count else np.zeros(scenarios, dtype=np.int64)
+        capped = single[:, rank]
+        left = np.maximum(0.0, float(industry_cap) - totals[rows, industry])
+        hit = valid[:, rank] & (capped > left)
+        capped = np.where(hit, left, capped)
+        cap = candidate_capacity[safe[:, rank]]
+        cap_hit = valid[:, rank] & (cap > 0.0) & (capped > cap)
+        final = np.where(valid[:, rank], np.where(cap_hit, cap, capped), 0.0)
+        granted = final > 0.0
+        totals[rows, industry] += np.where(granted, final, 0.0)
+        used[rows, industry] |= granted
+        remaining[:, rank] = left
+        industry_hit[:, rank] = hit
+        post_industry[:, rank] = capped
+        capacity[:, rank] = cap
+        capacity_hit[:, rank] = cap_hit
+        weight[:, rank] = final
+    return _Allocation(
+        order=order,
+        raw_weight=raw,
+        single_capped=single,
+        single_hit=single_hit,
+        industry_remaining=remaining,
+        industry_hit=industry_hit,
+        post_industry=post_industry,
+        capacity_cap=capacity,
+        capacity_hit=capacity_hit,
+        weight=weight,
+        industry_names=names,
+        industry_totals=totals,
+        industry_used=used,
+    )
 
 
 def _score(sleeve_scores: JsonDict, sleeve: str) -> float:
@@ -458,23 +685,12 @@ def _score(sleeve_scores: JsonDict, sleeve: str) -> float:
     return max(0.0, min(100.0, float(score or 0.0)))
 
 
-def _filter_multiplier(sleeve_scores: JsonDict, risk_filters: Sequence[str]) -> float:
-    if not risk_filters:
-        return 1.0
-    multiplier = 1.0
-    for sleeve in risk_filters:
-        score = _score(sleeve_scores, sleeve)
-        multiplier *= 0.7 + 0.3 * (score / 100.0)
-    return max(0.0, min(1.0, multiplier))
-
-
 def _capacity_usage(weights: Sequence[JsonDict], *, portfolio_value: float) -> JsonDict:
-    out: JsonDict = {}
-    for row in weights:
-        amount = float(row.get("latest_amount", 0.0) or 0.0)
-        usage = (float(row.get("weight", 0.0) or 0.0) * float(portfolio_value or DEFAULT_PORTFOLIO_VALUE)) / amount if amount > 0.0 else 0.0
-        out[str(row.get("ts_code") or "")] = round(usage, 6)
-    return out
+    amounts = np.array([float(row.get("latest_amount", 0.0) or 0.0) for row in weights], dtype=float)
+    weight = np.array([float(row.get("weight", 0.0) or 0.0) for row in weights], dtype=float)
+    value = float(portfolio_value or DEFAULT_PORTFOLIO_VALUE)
+    usage = np.where(amounts > 0.0, (weight * value) / np.where(amounts > 0.0, amounts, 1.0), 0.0)
+    return {str(row.get("ts_code") or ""): float(item) for row, item in zip(weights, _round6(usage))}
 
 
 def _effective_gross_exposure(
@@ -490,9 +706,20 @@ def _effective_gross_exposure(
     return base
 
 
-def _industry_weights(weights: Sequence[JsonDict]) -> dict[str, float]:
-    out: dict[str, float] = {}
-    for row in weights:
-        industry = str(row.get("industry") or "unknown")
-        out[industry] = out.get(industry, 0.0) + float(row.get("weight", 0.0) or 0.0)
-    return out
+def _industry_exposure(industries: Sequence[str], weights: np.ndarray) -> dict[str, float]:
+    names = sorted(set(industries))
+    lookup = {name: idx for idx, name in enumerate(names)}
+    totals = np.zeros(len(names))
+    np.add.at(totals, np.array([lookup[name] for name in industries], dtype=np.int64), weights)
+    return {name: round(float(total), 6) for name, total in zip(names, totals)}
+
+
+def _round6(values: np.ndarray) -> np.ndarray:
+    # Python's correctly rounded ``round`` (np.round can differ in the last digit).
+    array = np.asarray(values, dtype=float)
+    return np.array([round(value, 6) for value in array.ravel().tolist()], dtype=float).reshape(array.shape)
+
+
+def _sequential_total(values: np.ndarray) -> float:
+    # Left-to-right like ``sum``; numpy's pairwise sum may differ in the last bit.
+    return float(np.cumsum(values)[-1]) if values.size else 0.0
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
 from typing import Any, Dict, Sequence
 
 
@@ -8,6 +13,8 @@ JsonDict = Dict[str, Any]
 
 FORMAL_POOL_BENCHMARK_STRATEGIES = ("v4", "v5", "v8", "v9", "combo")
 MIN_WALK_FORWARD_WINDOWS = 5
+WALK_FORWARD_ACCUMULATOR_TABLE = "ensemble_walk_forward_benchmark_accumulators"
+ACCUMULATOR_STATE_VERSION = "ensemble_walk_forward_benchmark_accumulator.v3"
 
 
 def build_ensemble_walk_forward_shadow_benchmark(
@@ -40,7 +47,7 @@ def build_ensemble_walk_forward_shadow_benchmark(
         blocking.append(f"insufficient_valid_after_cost_windows:{len(valid)}/{int(min_windows)}")
 
     if blocking:
-        return _blocked(rows=rows, formal_pool_strategies=formal_pool_strategies, blocking=blocking)
+        return _blocked(window_count=len(rows), formal_pool_strategies=formal_pool_strategies, blocking=blocking)
 
     ensemble_returns = [float((row.get("execution_cost_replay") or {}).get("net_return", 0.0) or 0.0) for row in valid]
     benchmark_returns = [float((row.get("formal_pool_benchmark") or {}).get("avg_return_pct", 0.0) or 0.0) for row in valid]
@@ -71,14 +78,291 @@ def build_ensemble_walk_forward_shadow_benchmark(
     }
 
 
-def _blocked(*, rows: Sequence[JsonDict], formal_pool_strategies: Sequence[str], blocking: Sequence[str]) -> JsonDict:
+@dataclass
+class WalkForwardBenchmarkAccumulator:
+    """Running walk-forward benchmark state for one ensemble.
+
+    ``add`` folds a single window in O(window) time, so a daily job appends the
+    new window instead of rescanning history.  Sums are accumulated in window
+    order, which keeps ``payload`` identical to
+    ``build_ensemble_walk_forward_shadow_benchmark`` over the same windows; the
+    full builder stays the verification path.  ``last_window_id`` and
+    ``last_window_digest`` identify the last folded window so a refresh can
+    tell an appended history from a rolled one without rehashing history.
+    """
+
+    window_count: int = 0
+    last_window_id: str = ""
+    last_window_digest: str = ""
+    valid_window_count: int = 0
+    window_blocking: list[str] = field(default_factory=list)
+    excess_sum: float = 0.0
+    hit_count: int = 0
+    turnover_sum: float = 0.0
+    equity: float = 1.0
+    equity_peak: float = 1.0
+    max_drawdown: float = 0.0
+    capacity_sum: float = 0.0
+    capacity_count: int = 0
+    industry_concentration: float | None = None
+    regimes: Dict[str, JsonDict] = field(default_factory=dict)
+    source_weights: Dict[str, float] = field(default_factory=dict)
+    industry_weights: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, window: JsonDict) -> None:
+        if not isinstance(window, dict):
+            return
+        idx = self.window_count
+        self.window_count += 1
+        self.last_window_id = _window_id(window)
+        self.last_window_digest = _window_digest(window)
+        window_blocking = _window_blocking(window)
+        if window_blocking:
+            self.window_blocking.extend([f"window_{idx}:{reason}" for reason in window_blocking])
+            return
+        self.valid_window_count += 1
+        execution = window.get("execution_cost_replay") or {}
+        ensemble_return = float(execution.get("net_return", 0.0) or 0.0)
+        excess = ensemble_return - float((window.get("formal_pool_benchmark") or {}).get("avg_return_pct", 0.0) or 0.0)
+        self.excess_sum += excess
+        self.hit_count += 1 if excess > 0.0 else 0
+        self.turnover_sum += float(execution.get("turnover", 0.0) or 0.0)
+
+        self.equity *= 1.0 + ensemble_return / 100.0
+        self.equity_peak = max(self.equity_peak, self.equity)
+        if self.equity_peak > 0.0:
+            self.max_drawdown = min(self.max_drawdown, self.equity / self.equity_peak - 1.0)
+
+        for replay in execution.get("trade_replay") or []:
+            if isinstance(replay, dict) and replay.get("traded") is True:
+                self.capacity_sum += float(replay.get("capacity_usage", 0.0) or 0.0)
+                self.capacity_count += 1
+
+        portfolio = window.get("shadow_portfolio") if isinstance(window.get("shadow_portfolio"), dict) else {}
+        exposure = portfolio.get("industry_exposure") if isinstance(portfolio.get("industry_exposure"), dict) else {}
+        if exposure:
+            concentration = max(float(value or 0.0) for value in exposure.values())
+            if self.industry_concentration is None or concentration > self.industry_concentration:
+                self.industry_concentration = concentration
+
+        regime = window.get("market_regime") if isinstance(window.get("market_regime"), dict) else {}
+        label = str(window.get("market_regime_label") or regime.get("label") or "unknown")
+        bucket = self.regimes.setdefault(label, {"window_count": 0, "excess_sum": 0.0, "hit_count": 0})
+        bucket["window_count"] += 1
+        bucket["excess_sum"] += excess
+        bucket["hit_count"] += 1 if excess > 0.0 else 0
+
+        for weight in portfolio.get("shadow_weights") or []:
+            if not isinstance(weight, dict):
+                continue
+            value = float(weight.get("weight", 0.0) or 0.0)
+            source = str(weight.get("source_strategy") or "unknown")
+            industry = str(weight.get("industry") or "unknown")
+            self.source_weights[source] = self.source_weights.get(source, 0.0) + value
+            self.industry_weights[industry] = self.industry_weights.get(industry, 0.0) + value
+
+    def extend(self, windows: Sequence[JsonDict] | None) -> "WalkForwardBenchmarkAccumulator":
+        for window in windows or []:
+            self.add(window)
+        return self
+
+    def folded_prefix_of(self, windows: Sequence[JsonDict]) -> bool:
+        """Whether ``windows[:window_count]`` ends with the last folded window, unchanged.
+
+        Only ``windows[window_count - 1]`` is compared, so a rolled or
+        truncated history is detected in O(1) windows; rewrites of earlier
+        windows need an explicit rebuild.
+        """
+        count = self.window_count
+        if count > len(windows):
+            return False
+        if count == 0:
+            return True
+        last = windows[count - 1]
+        return _window_id(last) == self.last_window_id and _window_digest(last) == self.last_window_digest
+
+    def payload(
+        self,
+        *,
+        formal_pool_strategies: Sequence[str] = FORMAL_POOL_BENCHMARK_STRATEGIES,
+        min_windows: int = MIN_WALK_FORWARD_WINDOWS,
+    ) -> JsonDict:
+        """The ``build_ensemble_walk_forward_shadow_benchmark`` payload for the folded windows."""
+        blocking = list(self.window_blocking)
+        if self.window_count < int(min_windows):
+            blocking.append(f"insufficient_walk_forward_windows:{self.window_count}/{int(min_windows)}")
+        if self.valid_window_count < int(min_windows):
+            blocking.append(f"insufficient_valid_after_cost_windows:{self.valid_window_count}/{int(min_windows)}")
+        if blocking:
+            return _blocked(window_count=self.window_count, formal_pool_strategies=formal_pool_strategies, blocking=blocking)
+
+        valid = float(self.valid_window_count)
+        source_total = sum(self.source_weights.values())
+        industry_total = sum(self.industry_weights.values())
+        return {
+            "benchmark_version": "ensemble_walk_forward_shadow_benchmark.v1",
+            "research_only": True,
+            "not_for_production": True,
+            "passed": True,
+            "formal_pool_strategies": list(formal_pool_strategies),
+            "window_count": self.window_count,
+            "valid_window_count": self.valid_window_count,
+            "after_cost_excess_return": round(self.excess_sum / valid, 6),
+            "max_drawdown": round(self.max_drawdown * 100.0, 6),
+            "hit_rate": round(self.hit_count / valid, 6),
+            "turnover": round(self.turnover_sum / valid, 6),
+            "capacity_utilization": (
+                round(self.capacity_sum / float(self.capacity_count), 6) if self.capacity_count else 0.0
+            ),
+            "industry_concentration": (
+                round(self.industry_concentration, 6) if self.industry_concentration is not None else 0.0
+            ),
+            "regime_split": {
+                label: {
+                    "window_count": int(bucket["window_count"]),
+                    "avg_after_cost_excess_return": round(bucket["excess_sum"] / float(bucket["window_count"]), 6),
+                    "hit_rate": round(bucket["hit_count"] / float(bucket["window_count"]), 6),
+                }
+                for label, bucket in sorted(self.regimes.items())
+            },
+            "risk_contribution": {
+                "source_strategy_weight_share": {
+                    key: round(value / source_total, 6)
+                    for key, value in sorted(self.source_weights.items())
+                    if source_total > 0.0
+                },
+                "industry_weight_share": {
+                    key: round(value / industry_total, 6)
+                    for key, value in sorted(self.industry_weights.items())
+                    if industry_total > 0.0
+                },
+            },
+            "blocking_reasons": [],
+            "hard_boundaries": [
+                "do_not_promote_to_observation_without_passing_walk_forward_shadow_benchmark",
+                "do_not_compare_pre_cost_ensemble_against_after_cost_formal_pool",
+            ],
+        }
+
+    def to_state(self) -> JsonDict:
+        return {"state_version": ACCUMULATOR_STATE_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_state(cls, state: JsonDict | None) -> "WalkForwardBenchmarkAccumulator":
+        payload = state if isinstance(state, dict) else {}
+        if payload.get("state_version") != ACCUMULATOR_STATE_VERSION:
+            return cls()
+        return cls(**{key: value for key, value in payload.items() if key in cls.__dataclass_fields__})
+
+
+def ensure_walk_forward_accumulator_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {WALK_FORWARD_ACCUMULATOR_TABLE} (
+            ensemble_id TEXT PRIMARY KEY,
+            window_count INTEGER NOT NULL,
+            state_json TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def load_walk_forward_accumulator(conn: sqlite3.Connection, ensemble_id: str) -> WalkForwardBenchmarkAccumulator:
+    ensure_walk_forward_accumulator_table(conn)
+    row = conn.execute(
+        f"SELECT state_json FROM {WALK_FORWARD_ACCUMULATOR_TABLE} WHERE ensemble_id = ?",
+        (str(ensemble_id),),
+    ).fetchone()
+    return WalkForwardBenchmarkAccumulator.from_state(json.loads(row[0]) if row else None)
+
+
+def save_walk_forward_accumulator(
+    conn: sqlite3.Connection,
+    ensemble_id: str,
+    accumulator: WalkForwardBenchmarkAccumulator,
+) -> None:
+    ensure_walk_forward_accumulator_table(conn)
+    conn.execute(
+        f"""
+        INSERT OR REPLACE INTO {WALK_FORWARD_ACCUMULATOR_TABLE} (ensemble_id, window_count, state_json, updated_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        (
+            str(ensemble_id),
+            int(accumulator.window_count),
+            json.dumps(accumulator.to_state(), ensure_ascii=False, sort_keys=True),
+            datetime.now().isoformat(timespec="seconds"),
+        ),
+    )
+    conn.commit()
+
+
+def refresh_walk_forward_shadow_benchmark(
+    conn: sqlite3.Connection,
+    ensemble_id: str,
+    windows: Sequence[JsonDict] | None,
+    *,
+    formal_pool_strategies: Sequence[str] = FORMAL_POOL_BENCHMARK_STRATEGIES,
+    min_windows: int = MIN_WALK_FORWARD_WINDOWS,
+    rebuild: bool = False,
+) -> JsonDict:
+    """Fold only the windows appended since the stored state, persist it and return the benchmark.
+
+    ``windows`` is the ensemble's full window history.  When its window at the
+    stored count is still the last folded window, only the new suffix is
+    folded; when the history rolled forward, shrank or that window changed,
+    the whole history is refolded.  Rewritten earlier windows need
+    ``rebuild=True``.
+    """
+    rows = [item for item in (windows or []) if isinstance(item, dict)]
+    accumulator = WalkForwardBenchmarkAccumulator() if rebuild else load_walk_forward_accumulator(conn, ensemble_id)
+    if not accumulator.folded_prefix_of(rows):
+        accumulator = WalkForwardBenchmarkAccumulator()
+    accumulator.extend(rows[accumulator.window_count :])
+    save_walk_forward_accumulator(conn, ensemble_id, accumulator)
+    return accumulator.payload(formal_pool_strategies=formal_pool_strategies, min_windows=min_windows)
+
+
+def append_walk_forward_window(
+    conn: sqlite3.Connection,
+    ensemble_id: str,
+    window: JsonDict,
+    *,
+    formal_pool_strategies: Sequence[str] = FORMAL_POOL_BENCHMARK_STRATEGIES,
+    min_windows: int = MIN_WALK_FORWARD_WINDOWS,
+) -> JsonDict:
+    """Fold one new window into the stored state, persist it and return the benchmark.
+
+    The daily job's entry point: only ``window`` is read.  A window whose id
+    is already the last folded one (a rerun of the same day) is not folded
+    again; replace rewritten history with
+    ``refresh_walk_forward_shadow_benchmark(..., rebuild=True)``.
+    """
+    accumulator = load_walk_forward_accumulator(conn, ensemble_id)
+    if isinstance(window, dict) and not (accumulator.window_count and _window_id(window) == accumulator.last_window_id):
+        accumulator.add(window)
+        save_walk_forward_accumulator(conn, ensemble_id, accumulator)
+    return accumulator.payload(formal_pool_strategies=formal_pool_strategies, min_windows=min_windows)
+
+
+def _window_id(window: JsonDict) -> str:
+    return str(window.get("window_id") or window.get("as_of_date") or window.get("trade_date") or "")
+
+
+def _window_digest(window: JsonDict) -> str:
+    body = json.dumps(window, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _blocked(*, window_count: int, formal_pool_strategies: Sequence[str], blocking: Sequence[str]) -> JsonDict:
     return {
         "benchmark_version": "ensemble_walk_forward_shadow_benchmark.v1",
         "research_only": True,
         "not_for_production": True,
         "passed": False,
         "formal_pool_strategies": list(formal_pool_strategies),
-        "window_count": len(rows),
+        "window_count": int(window_count),
         "valid_window_count": 0,
         "after_cost_excess_return": None,
         "max_drawdown": None,
@@ -3,6 +3,10 @@ from __future__ import annotations
 import sqlite3
 from typing import Any, Dict, Sequence
 
+from openclaw.services.scan_run_index_service import ScanRunIndex, scan_run_index
+from openclaw.services.schema_catalog_service import table_exists
+from openclaw.services.signal_item_forward_return_service import materialized_forward_returns
+
 
 JsonDict = Dict[str, Any]
 
@@ -14,8 +18,13 @@ def build_formal_pool_benchmark_return_series(
     as_of_date: str,
     holding_days: int,
     top_n_per_strategy: int = 5,
+    scan_index: ScanRunIndex | None = None,
 ) -> JsonDict:
-    """Build a replayable benchmark return series from formal strategy signals."""
+    """Build a replayable benchmark return series from formal strategy signals.
+
+    Scan runs and items come from ``scan_index`` (default: the shared index
+    of ``conn``'s database).
+    """
 
     strategy_list = _unique_strategies(strategies)
     normalized_as_of_date = _compact_date(as_of_date)
@@ -35,19 +44,20 @@ def build_formal_pool_benchmark_return_series(
         blocking.append("missing_as_of_date")
     if int(holding_days or 0) <= 0:
         blocking.append("invalid_holding_days")
-    if not _table_exists(conn, "signal_runs"):
+    if not table_exists(conn, "signal_runs"):
         blocking.append("missing_signal_runs_table")
-    if not _table_exists(conn, "signal_items"):
+    if not table_exists(conn, "signal_items"):
         blocking.append("missing_signal_items_table")
-    if not _table_exists(conn, "daily_trading_data"):
+    if not table_exists(conn, "daily_trading_data"):
         blocking.append("missing_daily_trading_data_table")
     if blocking:
         return _blocked(contract=contract, blocking=blocking)
 
+    index = scan_index if scan_index is not None else scan_run_index(conn)
     runs = []
     missing_runs = []
     for strategy in strategy_list:
-        run = _latest_scan_run(conn, strategy=strategy, as_of_date=normalized_as_of_date)
+        run = _latest_scan_run(index, strategy=strategy, as_of_date=normalized_as_of_date)
         if not run:
             missing_runs.append(strategy)
             continue
@@ -56,8 +66,10 @@ def build_formal_pool_benchmark_return_series(
         blocking.append("missing_formal_pool_scan_runs:" + ",".join(missing_runs))
 
     signal_rows = []
+    if int(top_n_per_strategy or 0) > 0:
+        index.preload_items(conn, [str(run["run_id"]) for run in runs])
     for run in runs:
-        items = _top_signal_items(conn, run_id=str(run["run_id"]), limit=int(top_n_per_strategy or 0))
+        items = _top_signal_items(conn, index, run_id=str(run["run_id"]), limit=int(top_n_per_strategy or 0))
         if not items:
             blocking.append(f"missing_signal_items:{run['strategy']}")
             continue
@@ -70,13 +82,13 @@ def build_formal_pool_benchmark_return_series(
     returns = []
     replay_rows = []
     return_blocking_counts: Dict[str, int] = {}
-    for item in signal_rows:
-        replay = _forward_return_pct(
-            conn,
-            ts_code=str(item.get("ts_code") or ""),
-            as_of_date=normalized_as_of_date,
-            holding_days=int(holding_days),
-        )
+    replays = _forward_returns_pct(
+        conn,
+        ts_codes=[str(item.get("ts_code") or "") for item in signal_rows],
+        as_of_date=normalized_as_of_date,
+        holding_days=int(holding_days),
+    )
+    for item, replay in zip(signal_rows, replays):
         replay_row = {**item, **replay}
         replay_rows.append(replay_row)
         if replay.get("available") is True:
@@ -129,105 +141,47 @@ def _unique_strategies(strategies: Sequence[str]) -> list[str]:
     return out
 
 
-def _latest_scan_run(conn: sqlite3.Connection, *, strategy: str, as_of_date: str) -> JsonDict:
-    rows = conn.execute(
-        """
-        SELECT run_id, strategy, trade_date, created_at
-        FROM signal_runs
-        WHERE run_type = 'scan'
-          AND strategy = ?
-          AND status = 'success'
-          AND trade_date != ''
-          AND REPLACE(trade_date, '-', '') <= ?
-        ORDER BY REPLACE(trade_date, '-', '') DESC, created_at DESC
-        LIMIT 1
-        """,
-        (str(strategy), str(as_of_date)),
-    ).fetchall()
-    if not rows:
+def _latest_scan_run(index: ScanRunIndex, *, strategy: str, as_of_date: str) -> JsonDict:
+    run = index.latest_run(str(strategy), str(as_of_date))
+    if run is None:
         return {}
-    row = rows[0]
     return {
-        "run_id": str(row[0] or ""),
-        "strategy": str(row[1] or ""),
-        "trade_date": str(row[2] or ""),
-        "created_at": str(row[3] or ""),
+        "run_id": run.run_id,
+        "strategy": run.strategy,
+        "trade_date": run.trade_date,
+        "created_at": str(run.created_at or ""),
     }
 
 
-def _top_signal_items(conn: sqlite3.Connection, *, run_id: str, limit: int) -> list[JsonDict]:
-    if limit <= 0:
-        return []
-    rows = conn.execute(
-        """
-        SELECT ts_code, score, rank_idx
-        FROM signal_items
-        WHERE run_id = ?
-        ORDER BY rank_idx ASC, score DESC
-        LIMIT ?
-        """,
-        (str(run_id), int(limit)),
-    ).fetchall()
+def _top_signal_items(conn: sqlite3.Connection, index: ScanRunIndex, *, run_id: str, limit: int) -> list[JsonDict]:
     return [
         {
-            "ts_code": str(row[0] or ""),
-            "score": float(row[1] or 0.0),
-            "rank_idx": int(row[2] or 0),
+            "ts_code": str(item.ts_code or ""),
+            "score": float(item.score or 0.0),
+            "rank_idx": int(item.rank_idx or 0),
         }
-        for row in rows
+        for item in index.top_items(conn, str(run_id), int(limit))
     ]
 
 
-def _forward_return_pct(
+def _forward_returns_pct(
     conn: sqlite3.Connection,
     *,
-    ts_code: str,
+    ts_codes: Sequence[str],
     as_of_date: str,
     holding_days: int,
-) -> JsonDict:
-    if not ts_code:
-        return {"available": False, "blocking_reason": "missing_ts_code"}
-    rows = conn.execute(
-        """
-        SELECT trade_date, close_price
-        FROM daily_trading_data
-        WHERE ts_code = ?
-          AND trade_date >= ?
-          AND close_price IS NOT NULL
-        ORDER BY trade_date ASC
-        LIMIT ?
-        """,
-        (str(ts_code), _compact_date(as_of_date), int(holding_days) + 1),
-    ).fetchall()
-    if len(rows) < int(holding_days) + 1:
-        return {
-            "available": False,
-            "blocking_reason": "insufficient_forward_price_window",
-            "price_count": len(rows),
-        }
-    entry = rows[0]
-    exit_row = rows[int(holding_days)]
-    entry_price = float(entry[1] or 0.0)
-    exit_price = float(exit_row[1] or 0.0)
-    if entry_price <= 0.0 or exit_price <= 0.0:
-        return {"available": False, "blocking_reason": "invalid_forward_price"}
-    return {
-        "available": True,
-        "entry_trade_date": str(entry[0] or ""),
-        "exit_trade_date": str(exit_row[0] or ""),
-        "entry_close": entry_price,
-        "exit_close": exit_price,
-        "return_pct": (exit_price / entry_price - 1.0) * 100.0,
-    }
+) -> list[JsonDict]:
+    h = int(holding_days)
+    as_of = _compact_date(as_of_date)
+    replays = iter(materialized_forward_returns(conn, [(code, as_of, (h,)) for code in ts_codes if code]))
+    out: list[JsonDict] = []
+    for code in ts_codes:
+        if not code:
+            out.append({"available": False, "blocking_reason": "missing_ts_code"})
+            continue
+        out.append(next(replays)[h])
+    return out
 
 
 def _compact_date(value: Any) -> str:
     return str(value or "").strip().replace("-", "")
-
-
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    try:
-        row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (str(table),)).fetchone()
-    except sqlite3.Error:
-        return False
-    return bool(row)
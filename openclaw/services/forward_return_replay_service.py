@@ -0,0 +1,168 @@
+"""Batched forward-return replay over ``daily_trading_data``.
+
+Every request is ``(ts_code, as_of_date, horizons)``: entry is the first
+priced row whose date key is on/after ``as_of_date`` and the exit for horizon
+``h`` is ``h`` rows later, exactly like the per-symbol ``ORDER BY trade_date
+LIMIT max(h) + 1`` readers.  Each symbol's rows are loaded once per chunk of
+symbols (bounded to the window the latest request needs) and the entry/exit
+positions of all requests are resolved with array lookups.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+JsonDict = Dict[str, Any]
+ForwardReturnRequest = Tuple[str, str, Sequence[int]]
+
+# Four placeholders per symbol; 200 symbols stay under SQLite's historical 999-variable cap.
+FORWARD_REPLAY_CHUNK = 200
+# How callers compared ``trade_date`` with ``as_of_date``; both sides use the same key.
+DATE_KEY_EXPRESSIONS = {
+    "raw": "trade_date",
+    "dashless": "REPLACE(trade_date, '-', '')",
+    "compact": "REPLACE(REPLACE(trade_date, '-', ''), '/', '')",
+}
+
+
+def replay_forward_returns(
+    conn: sqlite3.Connection,
+    requests: Sequence[ForwardReturnRequest],
+    *,
+    date_key: str = "raw",
+    extra_columns: Sequence[str] = (),
+    invalid_price_reason: str = "invalid_forward_price",
+) -> List[Dict[int, JsonDict]]:
+    """Forward returns per request and non-negative horizon, aligned with ``requests``.
+
+    Results carry ``entry_trade_date`` / ``exit_trade_date`` / ``entry_close`` /
+    ``exit_close`` / ``return_pct`` plus ``entry_<col>`` / ``exit_<col>`` for
+    ``extra_columns`` (``None`` read as ``0.0``).  A short window blocks with
+    ``insufficient_forward_price_window`` and the ``price_count`` the
+    ``LIMIT max(h) + 1`` query would have returned; a non-positive close blocks
+    with ``invalid_price_reason``.  SQL errors propagate so callers keep their
+    own failure reasons.
+    """
+    expr = DATE_KEY_EXPRESSIONS[date_key]
+    extras = [str(col) for col in extra_columns]
+    normalized = [
+        (str(code or ""), str(as_of or ""), sorted({int(h) for h in horizons if int(h) >= 0}))
+        for code, as_of, horizons in requests
+    ]
+    out: List[Dict[int, JsonDict]] = [{} for _ in normalized]
+    spans: Dict[str, JsonDict] = {}
+    for code, as_of, horizons in normalized:
+        if not horizons:
+            continue
+        span = spans.setdefault(code, {"first": as_of, "last": as_of, "limit": 0})
+        span["first"] = min(span["first"], as_of)
+        span["last"] = max(span["last"], as_of)
+        span["limit"] = max(span["limit"], horizons[-1] + 1)
+    if not spans:
+        return out
+
+    codes = list(spans)
+    keys: list[str] = []
+    trade_dates: list[str] = []
+    closes: list[float] = []
+    extra_values: Dict[str, list[float]] = {col: [] for col in extras}
+    bounds: Dict[str, Tuple[int, int]] = {}
+    for start in range(0, len(codes), FORWARD_REPLAY_CHUNK):
+        chunk = codes[start : start + FORWARD_REPLAY_CHUNK]
+        for row in _window_rows(conn, spans, chunk, expr=expr, extras=extras):
+            code = str(row[0] or "")
+            first, _ = bounds.get(code, (len(keys), 0))
+            keys.append(str(row[1]))
+            trade_dates.append(str(row[2] or ""))
+            closes.append(float(row[3] or 0.0))
+            for idx, col in enumerate(extras):
+                extra_values[col].append(float(row[4 + idx] or 0.0))
+            bounds[code] = (first, len(keys))
+
+    live = [idx for idx, (_, _, horizons) in enumerate(normalized) if horizons]
+    entry = np.zeros(len(live), dtype=np.int64)
+    remaining = np.zeros(len(live), dtype=np.int64)
+    key_array = np.asarray(keys, dtype=object)
+    for pos, idx in enumerate(live):
+        code, as_of, _ = normalized[idx]
+        first, end = bounds.get(code, (0, 0))
+        entry[pos] = first + int(np.searchsorted(key_array[first:end], as_of, side="left"))
+        remaining[pos] = end - entry[pos]
+    close_array = np.asarray(closes, dtype=float)
+    extra_arrays = {col: np.asarray(values, dtype=float) for col, values in extra_values.items()}
+
+    for h in sorted({h for _, _, horizons in normalized for h in horizons}):
+        enough = remaining >= h + 1
+        exit_pos = np.where(enough, entry + h, 0)
+        entry_pos = np.where(enough, entry, 0)
+        entry_close = close_array[entry_pos] if len(close_array) else np.zeros(len(live))
+        exit_close = close_array[exit_pos] if len(close_array) else np.zeros(len(live))
+        priced = enough & (entry_close > 0.0) & (exit_close > 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return_pct = (exit_close / np.where(priced, entry_close, 1.0) - 1.0) * 100.0
+        for pos, idx in enumerate(live):
+            _, _, horizons = normalized[idx]
+            if h not in horizons:
+                continue
+            if not enough[pos]:
+                out[idx][h] = {
+                    "available": False,
+                    "blocking_reason": "insufficient_forward_price_window",
+                    "price_count": int(min(remaining[pos], horizons[-1] + 1)),
+                }
+                continue
+            if not priced[pos]:
+                out[idx][h] = {"available": False, "blocking_reason": invalid_price_reason}
+                continue
+            result: JsonDict = {
+                "available": True,
+                "entry_trade_date": trade_dates[entry_pos[pos]],
+                "exit_trade_date": trade_dates[exit_pos[pos]],
+                "entry_close": float(entry_close[pos]),
+                "exit_close": float(exit_close[pos]),
+                "return_pct": float(return_pct[pos]),
+            }
+            for col, values in extra_arrays.items():
+                result[f"entry_{col}"] = float(values[entry_pos[pos]])
+                result[f"exit_{col}"] = float(values[exit_pos[pos]])
+            out[idx][h] = result
+    return out
+
+
+def _window_rows(
+    conn: sqlite3.Connection,
+    spans: Dict[str, JsonDict],
+    codes: Sequence[str],
+    *,
+    expr: str,
+    extras: Sequence[str],
+) -> list[tuple]:
+    """Priced rows from each code's earliest ``as_of`` through ``limit`` rows past its latest one."""
+    values = ", ".join("(?, ?, ?, ?)" for _ in codes)
+    params: list[Any] = []
+    for code in codes:
+        span = spans[code]
+        params.extend((code, span["first"], span["last"], int(span["limit"])))
+    extra_select = "".join(f", d.{col}" for col in extras)
+    extra_outer = "".join(f", {col}" for col in extras)
+    sql = f"""
+        WITH req(ts_code, first_key, last_key, tail_limit) AS (VALUES {values})
+        SELECT ts_code, date_key, trade_date, close_price{extra_outer}
+        FROM (
+            SELECT d.ts_code AS ts_code, {expr} AS date_key, d.trade_date AS trade_date,
+                   d.close_price AS close_price{extra_select}, req.tail_limit AS tail_limit,
+                   SUM(CASE WHEN {expr} >= req.last_key THEN 1 ELSE 0 END)
+                       OVER (PARTITION BY d.ts_code ORDER BY {expr} ROWS UNBOUNDED PRECEDING) AS tail_rn
+            FROM daily_trading_data d
+            JOIN req ON d.ts_code = req.ts_code
+            WHERE {expr} >= req.first_key
+              AND d.close_price IS NOT NULL
+        )
+        WHERE tail_rn <= tail_limit
+        ORDER BY ts_code, date_key
+        """
+    return conn.execute(sql, params).fetchall()
@@ -0,0 +1,341 @@
+"""Process-wide in-memory index of successful scan runs and their signal items.
+
+Ensemble and benchmark builders resolve "latest scan run of strategy X as of
+date D" and "top N items of run R" for every strategy of every window.  The
+index loads every successful scan/experiment run with one query, answers
+latest-run lookups by bisection and serves items from per-run lists that are
+bulk-loaded (one query per chunk of runs) the first time they are needed or
+when a date range is preloaded.
+
+Indexes are shared per database file and reused while a cheap fingerprint of
+``signal_runs``/``signal_items`` (row counts, max rowid, success count, schema
+version) is unchanged; unnamed (in-memory) databases get a fresh index per
+call unless the caller passes one explicitly.  In-place edits the fingerprint
+cannot see (rewriting a run's trade date or an item's score) require
+``invalidate_scan_run_index``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from openclaw.services.schema_catalog_service import table_columns, table_exists
+
+
+INDEXED_RUN_TYPES = ("scan", "experiment")
+# Placeholders per bulk item query; stays below SQLite's default variable limit.
+ITEM_RUN_CHUNK = 500
+NULL_RANK = 999999
+
+
+@dataclass(frozen=True)
+class ScanRun:
+    run_id: str
+    strategy: str
+    run_type: str
+    trade_date: str
+    created_at: str | None
+    data_version: str
+
+    @property
+    def compact_trade_date(self) -> str:
+        return self.trade_date.replace("-", "")
+
+    @property
+    def visible_date(self) -> str:
+        """First date the run's data is visible: the ``data_version`` trade date, else its trade date."""
+        return data_version_trade_date(self.data_version) or _compact_date(self.trade_date)
+
+
+@dataclass(frozen=True)
+class ScanItem:
+    ts_code: Any
+    score: Any
+    rank_idx: Any
+    reason_codes: Any
+    raw_payload_json: Any
+
+
+class _RunLookup:
+    """Runs of one strategy in query order with the running minimum of their visibility dates.
+
+    The latest visible run is the first run whose visibility date is on or
+    before the as-of date, i.e. the first position where the (non-increasing)
+    running minimum drops to it, which bisection finds.
+    """
+
+    def __init__(self, runs: Sequence[ScanRun], *, data_version_visibility: bool) -> None:
+        self.runs = list(runs)
+        visible = [run.visible_date if data_version_visibility else run.compact_trade_date for run in self.runs]
+        self.start = next((idx for idx, value in enumerate(visible) if value), len(visible))
+        self.minima: list[str] = []
+        for value in visible[self.start :]:
+            self.minima.append(min(value, self.minima[-1]) if value and self.minima else (value or self.minima[-1]))
+
+    def latest(self, as_of_date: str) -> ScanRun | None:
+        lo, hi = 0, len(self.minima)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.minima[mid] <= as_of_date:
+                hi = mid
+            else:
+                lo = mid + 1
+        return self.runs[self.start + lo] if lo < len(self.minima) else None
+
+
+class ScanRunIndex:
+    """Latest-run and top-item lookups over one snapshot of ``signal_runs``/``signal_items``."""
+
+    def __init__(self, runs: Sequence[ScanRun], *, item_columns: Sequence[str] = ()) -> None:
+        self._by_strategy: Dict[str, List[ScanRun]] = {}
+        for run in _query_order(runs):
+            self._by_strategy.setdefault(run.strategy, []).append(run)
+        self._item_columns = tuple(item_columns)
+        self._lookups: Dict[Tuple[str, Tuple[str, ...], bool], _RunLookup] = {}
+        self._items: Dict[str, Tuple[ScanItem, ...]] = {}
+        self._sorted_items: Dict[Tuple[str, bool], Tuple[ScanItem, ...]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> "ScanRunIndex":
+        if not table_exists(conn, "signal_runs"):
+            return cls(())
+        data_version_expr = "data_version" if "data_version" in table_columns(conn, "signal_runs") else "''"
+        marks = ", ".join("?" for _ in INDEXED_RUN_TYPES)
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT run_id, strategy, run_type, trade_date, created_at, {data_version_expr}
+                FROM signal_runs
+                WHERE run_type IN ({marks})
+                  AND status = 'success'
+                  AND trade_date != ''
+                ORDER BY rowid
+                """,
+                INDEXED_RUN_TYPES,
+            ).fetchall()
+        except sqlite3.Error:
+            return cls(())
+        runs = [
+            ScanRun(
+                run_id=str(row[0] or ""),
+                strategy=str(row[1] or ""),
+                run_type=str(row[2] or ""),
+                trade_date=str(row[3] or ""),
+                created_at=row[4],
+                data_version=str(row[5] or ""),
+            )
+            for row in rows
+        ]
+        return cls(runs, item_columns=table_columns(conn, "signal_items"))
+
+    def latest_run(
+        self,
+        strategy: str,
+        as_of_date: str,
+        *,
+        run_types: Sequence[str] = ("scan",),
+        data_version_visibility: bool = False,
+    ) -> ScanRun | None:
+        """Latest run by trade date (then ``created_at``) that is visible on ``as_of_date``.
+
+        Visibility is the compact trade date, or the ``data_version`` trade date
+        when ``data_version_visibility`` is set.
+        """
+        key = (str(strategy), tuple(sorted(str(item) for item in run_types)), bool(data_version_visibility))
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            runs = [run for run in self._by_strategy.get(key[0], []) if run.run_type in key[1]]
+            lookup = _RunLookup(runs, data_version_visibility=key[2])
+            with self._lock:
+                self._lookups[key] = lookup
+        return lookup.latest(as_of_date)
+
+    def runs_between(self, start_date: str, end_date: str) -> list[ScanRun]:
+        """Runs that any ``latest_run`` lookup in ``[start_date, end_date]`` can return."""
+        out: Dict[str, ScanRun] = {}
+        for strategy in self._by_strategy:
+            for run_types, data_version_visibility in ((("scan",), False), (INDEXED_RUN_TYPES, True)):
+                start_run = self.latest_run(
+                    strategy, start_date, run_types=run_types, data_version_visibility=data_version_visibility
+                )
+                if start_run is not None:
+                    out[start_run.run_id] = start_run
+                for run in self._by_strategy[strategy]:
+                    if run.run_type not in run_types:
+                        continue
+                    visible = run.visible_date if data_version_visibility else run.compact_trade_date
+                    if visible and str(start_date) <= visible <= str(end_date):
+                        out[run.run_id] = run
+        return list(out.values())
+
+    def preload_items(self, conn: sqlite3.Connection, run_ids: Iterable[str]) -> None:
+        missing = sorted({str(run_id) for run_id in run_ids} - set(self._items))
+        if not missing or not table_exists(conn, "signal_items"):
+            return
+        reason_expr = "reason_codes" if "reason_codes" in self._item_columns else "''"
+        raw_expr = "raw_payload_json" if "raw_payload_json" in self._item_columns else "'{}'"
+        loaded: Dict[str, List[ScanItem]] = {run_id: [] for run_id in missing}
+        for start in range(0, len(missing), ITEM_RUN_CHUNK):
+            chunk = missing[start : start + ITEM_RUN_CHUNK]
+            rows = conn.execute(
+                f"""
+                SELECT run_id, ts_code, score, rank_idx, {reason_expr}, {raw_expr}
+                FROM signal_items
+                WHERE run_id IN ({", ".join("?" for _ in chunk)})
+                ORDER BY rowid
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                loaded[str(row[0])].append(ScanItem(*row[1:]))
+        ordered = {
+            (run_id, null_rank_last): tuple(sorted(items, key=_coalesced_item_key if null_rank_last else _item_key))
+            for run_id, items in loaded.items()
+            for null_rank_last in (False, True)
+        }
+        with self._lock:
+            for run_id, items in loaded.items():
+                if run_id not in self._items:
+                    self._items[run_id] = tuple(items)
+                    self._sorted_items[(run_id, False)] = ordered[(run_id, False)]
+                    self._sorted_items[(run_id, True)] = ordered[(run_id, True)]
+
+    def top_items(
+        self,
+        conn: sqlite3.Connection,
+        run_id: str,
+        limit: int,
+        *,
+        null_rank_last: bool = False,
+    ) -> list[ScanItem]:
+        """Top ``limit`` items by ``rank_idx`` ascending, then ``score`` descending.
+
+        ``null_rank_last`` ranks missing ``rank_idx`` as 999999 and breaks ties
+        by ``ts_code``; otherwise missing ranks sort first, as SQLite does.
+        Both orders are sorted once, when the run's items are loaded.
+        """
+        if int(limit) <= 0:
+            return []
+        run_id = str(run_id)
+        if run_id not in self._items:
+            self.preload_items(conn, [run_id])
+        return list(self._sorted_items.get((run_id, bool(null_rank_last)), ())[: int(limit)])
+
+
+_INDEXES: Dict[str, Tuple[tuple, ScanRunIndex]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def scan_run_index(conn: sqlite3.Connection) -> ScanRunIndex:
+    """The shared index of ``conn``'s database, reloaded when its fingerprint changes."""
+    path = _database_path(conn)
+    fingerprint = _fingerprint(conn) if path else None
+    if path and fingerprint is not None:
+        with _INDEX_LOCK:
+            cached = _INDEXES.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+    index = ScanRunIndex.load(conn)
+    if path and fingerprint is not None:
+        with _INDEX_LOCK:
+            _INDEXES[path] = (fingerprint, index)
+    return index
+
+
+def preload_scan_run_index(conn: sqlite3.Connection, *, start_date: str, end_date: str) -> ScanRunIndex:
+    """Shared index with the items of every run resolvable in ``[start_date, end_date]`` loaded."""
+    index = scan_run_index(conn)
+    runs = index.runs_between(_compact_date(start_date), _compact_date(end_date))
+    index.preload_items(conn, [run.run_id for run in runs])
+    return index
+
+
+def invalidate_scan_run_index(conn: sqlite3.Connection | None = None) -> None:
+    with _INDEX_LOCK:
+        if conn is None:
+            _INDEXES.clear()
+        else:
+            _INDEXES.pop(_database_path(conn), None)
+
+
+def data_version_trade_date(value: Any) -> str:
+    text = str(value or "")
+    marker = "trade_date:"
+    if marker not in text:
+        return ""
+    tail = text.split(marker, 1)[1]
+    raw = tail.split("|", 1)[0].strip()
+    return _compact_date(raw)
+
+
+def _query_order(runs: Sequence[ScanRun]) -> list[ScanRun]:
+    # ORDER BY REPLACE(trade_date, '-', '') DESC, created_at DESC (NULL created_at last); stable on rowid.
+    ordered = sorted(runs, key=lambda run: (run.created_at is not None, run.created_at or ""), reverse=True)
+    ordered.sort(key=lambda run: run.compact_trade_date, reverse=True)
+    return ordered
+
+
+def _item_key(item: ScanItem) -> tuple:
+    # ORDER BY rank_idx ASC, score DESC: SQLite sorts NULL first ascending, last descending.
+    return (item.rank_idx is not None, *_numeric_key(item.rank_idx), *_score_desc_key(item.score))
+
+
+def _coalesced_item_key(item: ScanItem) -> tuple:
+    # ORDER BY COALESCE(rank_idx, 999999), score DESC, ts_code.
+    return (
+        *_numeric_key(item.rank_idx if item.rank_idx is not None else NULL_RANK),
+        *_score_desc_key(item.score),
+        item.ts_code is not None,
+        str(item.ts_code) if item.ts_code is not None else "",
+    )
+
+
+def _numeric_key(value: Any) -> tuple:
+    # Numeric values (and numeric TEXT) ascending; values float() rejects sort after them by text.
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+    return (0, number, "") if number == number else (1, 0.0, str(value))
+
+
+def _score_desc_key(score: Any) -> tuple:
+    # Scores descending with NULL last; a TEXT score column must not make the sort raise.
+    if score is None:
+        return (2, 0.0, "")
+    kind, number, text = _numeric_key(score)
+    return (kind, -number, text)
+
+
+def _fingerprint(conn: sqlite3.Connection) -> tuple | None:
+    try:
+        schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        if not table_exists(conn, "signal_runs"):
+            return (schema_version,)
+        runs = conn.execute(
+            "SELECT COUNT(*), MAX(rowid), SUM(status = 'success'), MAX(created_at) FROM signal_runs"
+        ).fetchone()
+        items = (
+            conn.execute("SELECT MAX(rowid) FROM signal_items").fetchone()
+            if table_exists(conn, "signal_items")
+            else (None,)
+        )
+    except sqlite3.Error:
+        return None
+    return (schema_version, *runs, *items)
+
+
+def _database_path(conn: sqlite3.Connection) -> str:
+    try:
+        databases = conn.execute("PRAGMA database_list").fetchall()
+    except sqlite3.Error:
+        return ""
+    return str(next((row[2] for row in databases if row[1] == "main"), "") or "")
+
+
+def _compact_date(value: Any) -> str:
+    return str(value or "").strip().replace("-", "")
@@ -0,0 +1,97 @@
+"""Process-wide cache of SQLite table and column names.
+
+Snapshots are keyed by database file and ``PRAGMA schema_version``: a lookup
+costs two pragma reads instead of a ``sqlite_master`` scan plus ``table_info``,
+and any DDL (from any connection) bumps the version so the next lookup reloads
+the schema.  Unnamed (in-memory / temporary) databases
+cannot be told apart across connections, so they are introspected on every
+call.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Dict, Sequence, Tuple
+
+
+class _SchemaEntry:
+    """Table names of one database at one schema version; columns are filled on demand."""
+
+    def __init__(self, tables: Sequence[str]) -> None:
+        self.tables = frozenset(tables)
+        self.columns: Dict[str, Tuple[str, ...]] = {}
+
+
+class SchemaSnapshot:
+    """Table and column lookups against a cached schema, reading columns through ``conn``."""
+
+    def __init__(self, conn: sqlite3.Connection | None = None, entry: _SchemaEntry | None = None) -> None:
+        self._conn = conn
+        self._entry = entry or _SchemaEntry(())
+
+    def exists(self, table: str) -> bool:
+        return str(table) in self._entry.tables
+
+    def columns(self, table: str) -> list[str]:
+        table = str(table)
+        if table not in self._entry.tables:
+            return []
+        cached = self._entry.columns.get(table)
+        if cached is None:
+            if self._conn is None:
+                return []
+            try:
+                rows = self._conn.execute(f"PRAGMA table_info({table})").fetchall()
+            except sqlite3.Error:
+                return []
+            cached = tuple(str(row[1] or "") for row in rows)
+            with _CATALOG_LOCK:
+                self._entry.columns[table] = cached
+        return list(cached)
+
+
+_CATALOG: Dict[str, Tuple[int, _SchemaEntry]] = {}
+_CATALOG_LOCK = threading.Lock()
+
+
+def schema_snapshot(conn: sqlite3.Connection) -> SchemaSnapshot:
+    """Current schema of ``conn``'s main database, from the catalog when unchanged."""
+    try:
+        databases = conn.execute("PRAGMA database_list").fetchall()
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    except sqlite3.Error:
+        return SchemaSnapshot()
+    path = str(next((row[2] for row in databases if row[1] == "main"), "") or "")
+    if path:
+        with _CATALOG_LOCK:
+            cached = _CATALOG.get(path)
+        if cached is not None and cached[0] == version:
+            return SchemaSnapshot(conn, cached[1])
+    try:
+        entry = _load_entry(conn)
+    except sqlite3.Error:
+        return SchemaSnapshot()
+    if path:
+        with _CATALOG_LOCK:
+            _CATALOG[path] = (version, entry)
+    return SchemaSnapshot(conn, entry)
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return schema_snapshot(conn).exists(table)
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Column names in declaration order (``PRAGMA table_info``); empty for unknown tables."""
+    return schema_snapshot(conn).columns(table)
+
+
+def clear_schema_catalog() -> None:
+    with _CATALOG_LOCK:
+        _CATALOG.clear()
+
+
+def _load_entry(conn: sqlite3.Connection) -> _SchemaEntry:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+    return _SchemaEntry([str(row[0]) for row in rows])
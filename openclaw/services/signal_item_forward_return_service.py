@@ -0,0 +1,308 @@
+"""Materialized forward returns for historical ``signal_items``.
+
+Forward returns of a signal are immutable once the horizon has elapsed, so an
+incremental job (run after the daily DB update) stores every matured
+``(run_id, ts_code, horizon)`` return, anchored on the run's trade date, in
+``signal_item_forward_returns``.  Replay services read stored returns with one
+indexed join per chunk of symbols and only replay what is not stored yet
+(unmatured horizons, unpriced symbols, anchors without a scan run).
+
+Horizons that can never mature -- a non-positive close in the fixed history, or
+a symbol whose prices stopped ``STALE_PRICE_SESSIONS`` market sessions ago
+(delisted / long suspended) -- get a terminal ``blocked_reason`` row in
+``signal_item_forward_return_blocks`` so later refreshes stop replaying them;
+``rebuild`` clears those rows together with the stored returns.
+
+Stored rows are computed on compacted trade dates, i.e. they match live
+replays on databases that keep ``trade_date`` as ``YYYYMMDD``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+from openclaw.services.forward_return_replay_service import (
+    DATE_KEY_EXPRESSIONS,
+    ForwardReturnRequest,
+    replay_forward_returns,
+)
+from openclaw.services.schema_catalog_service import table_exists
+
+
+JsonDict = Dict[str, Any]
+
+SIGNAL_ITEM_FORWARD_RETURN_TABLE = "signal_item_forward_returns"
+SIGNAL_ITEM_FORWARD_RETURN_BLOCK_TABLE = "signal_item_forward_return_blocks"
+MATERIALIZED_HORIZONS = (1, 3, 5, 10, 20, 60)
+MATERIALIZED_RUN_TYPES = ("scan", "experiment")
+# Symbols replayed per refresh batch; keeps the loaded price windows bounded.
+REFRESH_CODE_BATCH = 1000
+# Two placeholders per (ts_code, anchor) pair in the read join.
+READ_KEY_CHUNK = 400
+STORED_FIELDS = ("entry_trade_date", "exit_trade_date", "entry_close", "exit_close", "return_pct")
+# Market sessions without a price after which a short forward window is treated as final.
+STALE_PRICE_SESSIONS = 60
+INVALID_PRICE_REASON = "invalid_forward_price"
+
+
+def ensure_signal_item_forward_return_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SIGNAL_ITEM_FORWARD_RETURN_TABLE} (
+            run_id TEXT NOT NULL,
+            ts_code TEXT NOT NULL,
+            horizon INTEGER NOT NULL,
+            anchor_date TEXT NOT NULL,
+            entry_trade_date TEXT NOT NULL,
+            exit_trade_date TEXT NOT NULL,
+            entry_close REAL NOT NULL,
+            exit_close REAL NOT NULL,
+            return_pct REAL NOT NULL,
+            computed_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, ts_code, horizon)
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_signal_item_forward_returns_anchor
+        ON {SIGNAL_ITEM_FORWARD_RETURN_TABLE}(ts_code, anchor_date, horizon)
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SIGNAL_ITEM_FORWARD_RETURN_BLOCK_TABLE} (
+            run_id TEXT NOT NULL,
+            ts_code TEXT NOT NULL,
+            horizon INTEGER NOT NULL,
+            anchor_date TEXT NOT NULL,
+            blocked_reason TEXT NOT NULL,
+            computed_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, ts_code, horizon)
+        )
+        """
+    )
+
+
+def refresh_signal_item_forward_returns(
+    conn: sqlite3.Connection,
+    *,
+    horizons: Sequence[int] = MATERIALIZED_HORIZONS,
+    rebuild: bool = False,
+) -> JsonDict:
+    """Store newly matured forward returns of successful scan/experiment signal items.
+
+    Only items missing at least one horizon are replayed and only available
+    returns are written, so a daily run touches the recent runs whose horizons
+    just elapsed.  Horizons that can never mature are recorded as blocked
+    instead and are not replayed again.  ``rebuild`` drops stored and blocked
+    rows first (e.g. after a price backfill rewrote history).
+    """
+    horizon_list = sorted({int(h) for h in horizons if int(h) > 0})
+    blocking = [
+        f"missing_{table}_table"
+        for table in ("signal_runs", "signal_items", "daily_trading_data")
+        if not table_exists(conn, table)
+    ]
+    if not horizon_list:
+        blocking.append("missing_positive_horizons")
+    if blocking:
+        return {"available": False, "blocking_reasons": blocking, "pending_items": 0, "inserted_rows": 0}
+
+    ensure_signal_item_forward_return_table(conn)
+    if rebuild:
+        conn.execute(f"DELETE FROM {SIGNAL_ITEM_FORWARD_RETURN_TABLE}")
+        conn.execute(f"DELETE FROM {SIGNAL_ITEM_FORWARD_RETURN_BLOCK_TABLE}")
+    pending = _pending_items(conn, horizon_list)
+    computed_at = datetime.now().isoformat(timespec="seconds")
+    stale_before = _stale_price_cutoff(conn) if pending else ""
+    inserted = 0
+    matured: Dict[str, int] = {str(h): 0 for h in horizon_list}
+    blocked: Dict[str, int] = {}
+    codes = sorted({code for _, code, _ in pending})
+    for start in range(0, len(codes), REFRESH_CODE_BATCH):
+        batch_codes = set(codes[start : start + REFRESH_CODE_BATCH])
+        batch = [item for item in pending if item[1] in batch_codes]
+        replays = replay_forward_returns(
+            conn,
+            [(code, anchor, horizon_list) for _, code, anchor in batch],
+            date_key="compact",
+            invalid_price_reason=INVALID_PRICE_REASON,
+        )
+        last_priced = _last_priced_dates(conn, sorted(batch_codes)) if stale_before else {}
+        rows = []
+        block_rows = []
+        for (run_id, code, anchor), replay in zip(batch, replays):
+            for h, result in replay.items():
+                if result.get("available") is not True:
+                    reason = _terminal_reason(result, last_priced.get(code, ""), stale_before)
+                    if reason:
+                        block_rows.append((run_id, code, h, anchor, reason, computed_at))
+                        blocked[reason] = blocked.get(reason, 0) + 1
+                    continue
+                rows.append((run_id, code, h, anchor, *(result[field] for field in STORED_FIELDS), computed_at))
+                matured[str(h)] += 1
+        conn.executemany(
+            f"""
+            INSERT OR IGNORE INTO {SIGNAL_ITEM_FORWARD_RETURN_BLOCK_TABLE} (
+                run_id, ts_code, horizon, anchor_date, blocked_reason, computed_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            block_rows,
+        )
+        before = conn.total_changes
+        conn.executemany(
+            f"""
+            INSERT OR IGNORE INTO {SIGNAL_ITEM_FORWARD_RETURN_TABLE} (
+                run_id, ts_code, horizon, anchor_date, entry_trade_date, exit_trade_date,
+                entry_close, exit_close, return_pct, computed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        inserted += conn.total_changes - before
+    conn.commit()
+    return {
+        "available": True,
+        "blocking_reasons": [],
+        "table": SIGNAL_ITEM_FORWARD_RETURN_TABLE,
+        "horizons": horizon_list,
+        "rebuild": bool(rebuild),
+        "pending_items": len(pending),
+        "inserted_rows": inserted,
+        "matured_rows_by_horizon": matured,
+        "blocked_rows_by_reason": blocked,
+    }
+
+
+def materialized_forward_returns(
+    conn: sqlite3.Connection,
+    requests: Sequence[ForwardReturnRequest],
+    *,
+    date_key: str = "raw",
+    invalid_price_reason: str = "invalid_forward_price",
+) -> List[Dict[int, JsonDict]]:
+    """``replay_forward_returns`` that serves matured horizons from the materialized table."""
+    normalized = [
+        (str(code or ""), str(as_of or ""), sorted({int(h) for h in horizons if int(h) >= 0}))
+        for code, as_of, horizons in requests
+    ]
+    stored = _stored_returns(conn, {(code, as_of) for code, as_of, horizons in normalized if horizons})
+    out: List[Dict[int, JsonDict]] = []
+    misses: List[Tuple[int, ForwardReturnRequest]] = []
+    for idx, (code, as_of, horizons) in enumerate(normalized):
+        hits = stored.get((code, as_of), {})
+        out.append({h: dict(hits[h]) for h in horizons if h in hits})
+        missing = [h for h in horizons if h not in hits]
+        if missing:
+            misses.append((idx, (code, as_of, missing)))
+    if misses:
+        replays = replay_forward_returns(
+            conn,
+            [request for _, request in misses],
+            date_key=date_key,
+            invalid_price_reason=invalid_price_reason,
+        )
+        for (idx, _), replay in zip(misses, replays):
+            out[idx].update(replay)
+    return [{h: result[h] for h in sorted(result)} for result in out]
+
+
+def _pending_items(conn: sqlite3.Connection, horizons: Sequence[int]) -> list[Tuple[str, str, str]]:
+    run_types = ", ".join("?" for _ in MATERIALIZED_RUN_TYPES)
+    horizon_marks = ", ".join("?" for _ in horizons)
+    rows = conn.execute(
+        f"""
+        SELECT DISTINCT i.run_id, i.ts_code, REPLACE(REPLACE(r.trade_date, '-', ''), '/', '')
+        FROM signal_items i
+        JOIN signal_runs r ON r.run_id = i.run_id
+        WHERE r.status = 'success'
+          AND r.run_type IN ({run_types})
+          AND COALESCE(r.trade_date, '') != ''
+          AND COALESCE(i.ts_code, '') != ''
+          AND (
+              SELECT COUNT(*)
+              FROM {SIGNAL_ITEM_FORWARD_RETURN_TABLE} f
+              WHERE f.run_id = i.run_id AND f.ts_code = i.ts_code AND f.horizon IN ({horizon_marks})
+          ) + (
+              SELECT COUNT(*)
+              FROM {SIGNAL_ITEM_FORWARD_RETURN_BLOCK_TABLE} b
+              WHERE b.run_id = i.run_id AND b.ts_code = i.ts_code AND b.horizon IN ({horizon_marks})
+          ) < ?
+        ORDER BY i.ts_code, i.run_id
+        """,
+        (*MATERIALIZED_RUN_TYPES, *horizons, *horizons, len(horizons)),
+    ).fetchall()
+    return [(str(row[0]), str(row[1]), str(row[2])) for row in rows]
+
+
+def _stale_price_cutoff(conn: sqlite3.Connection) -> str:
+    """Compact date of the market session ``STALE_PRICE_SESSIONS`` back ('' if history is shorter)."""
+    expr = DATE_KEY_EXPRESSIONS["compact"]
+    row = conn.execute(
+        f"""
+        SELECT date_key FROM (
+            SELECT DISTINCT {expr} AS date_key FROM daily_trading_data WHERE close_price IS NOT NULL
+        )
+        ORDER BY date_key DESC
+        LIMIT 1 OFFSET ?
+        """,
+        (STALE_PRICE_SESSIONS,),
+    ).fetchone()
+    return str(row[0] or "") if row else ""
+
+
+def _last_priced_dates(conn: sqlite3.Connection, codes: Sequence[str]) -> Dict[str, str]:
+    expr = DATE_KEY_EXPRESSIONS["compact"]
+    out: Dict[str, str] = {}
+    for start in range(0, len(codes), READ_KEY_CHUNK):
+        chunk = list(codes[start : start + READ_KEY_CHUNK])
+        marks = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"""
+            SELECT ts_code, MAX({expr})
+            FROM daily_trading_data
+            WHERE ts_code IN ({marks}) AND close_price IS NOT NULL
+            GROUP BY ts_code
+            """,
+            chunk,
+        ).fetchall()
+        out.update({str(row[0]): str(row[1] or "") for row in rows})
+    return out
+
+
+def _terminal_reason(result: JsonDict, last_priced: str, stale_before: str) -> str:
+    """Why an unavailable horizon can never mature, or '' while it still can."""
+    reason = str(result.get("blocking_reason") or "")
+    if reason == INVALID_PRICE_REASON:
+        return reason
+    if reason != "insufficient_forward_price_window" or not stale_before or last_priced >= stale_before:
+        return ""
+    return "stale_symbol_prices" if int(result.get("price_count") or 0) else "missing_entry_price"
+
+
+def _stored_returns(conn: sqlite3.Connection, keys: set[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[int, JsonDict]]:
+    if not keys or not table_exists(conn, SIGNAL_ITEM_FORWARD_RETURN_TABLE):
+        return {}
+    ordered = sorted(keys)
+    out: Dict[Tuple[str, str], Dict[int, JsonDict]] = {}
+    for start in range(0, len(ordered), READ_KEY_CHUNK):
+        chunk = ordered[start : start + READ_KEY_CHUNK]
+        values = ", ".join("(?, ?)" for _ in chunk)
+        rows = conn.execute(
+            f"""
+            WITH req(ts_code, anchor_date) AS (VALUES {values})
+            SELECT f.ts_code, f.anchor_date, f.horizon, {", ".join(f"f.{field}" for field in STORED_FIELDS)}
+            FROM req
+            JOIN {SIGNAL_ITEM_FORWARD_RETURN_TABLE} f
+              ON f.ts_code = req.ts_code AND f.anchor_date = req.anchor_date
+            """,
+            [value for key in chunk for value in key],
+        ).fetchall()
+        for row in rows:
+            result: JsonDict = {"available": True}
+            result.update({field: row[3 + idx] for idx, field in enumerate(STORED_FIELDS)})
+            out.setdefault((str(row[0]), str(row[1])), {})[int(row[2])] = result
+    return out
@@ -0,0 +1,169 @@
+"""Vectorized rank / correlation statistics shared by the ensemble alpha services.
+
+Row-wise kernels take 2-D arrays (series x observations) so multi-horizon and
+multi-window evaluations score every series in one pass.  Correlations are
+rounded to six decimals and are ``None`` for mismatched lengths, fewer than
+two points or a constant side; ties share their average 1-based rank.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+CORRELATION_DIGITS = 6
+
+
+def rank_rows(values: np.ndarray) -> np.ndarray:
+    """Average 1-based ranks along the last axis (ties share the mean of their positions)."""
+    matrix = np.asarray(values, dtype=float)
+    if matrix.size == 0:
+        return np.empty(matrix.shape, dtype=float)
+    flat = matrix.reshape(-1, matrix.shape[-1]) if matrix.ndim else matrix.reshape(1, 1)
+    rows, width = flat.shape
+    out = np.empty(flat.shape, dtype=float)
+    order = np.argsort(flat, axis=1, kind="stable")
+    ordered = np.take_along_axis(flat, order, axis=1)
+    positions = np.broadcast_to(np.arange(width), (rows, width))
+    starts = np.ones((rows, width), dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones((rows, width), dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, positions, width - 1)[:, ::-1], axis=1)[:, ::-1]
+    np.put_along_axis(out, order, (first + last + 2) / 2.0, axis=1)
+    return out.reshape(matrix.shape)
+
+
+def ranks(values: Sequence[float]) -> list[float]:
+    return rank_rows(_vector(values)).tolist()
+
+
+def percentiles(values: Sequence[float]) -> list[float]:
+    """Rank percentiles in [0, 100]; a single value sits at 50."""
+    vector = _vector(values)
+    if vector.size == 0:
+        return []
+    if vector.size == 1:
+        return [50.0]
+    return (100.0 * (rank_rows(vector) - 1.0) / float(vector.size - 1)).tolist()
+
+
+def group_percentiles(values: Sequence[float], groups: Sequence[str]) -> list[float]:
+    """``percentiles`` computed inside each group in one sort over (group, value)."""
+    vector = _vector(values)
+    if vector.size == 0:
+        return []
+    _, codes = np.unique(np.asarray([str(group) for group in groups], dtype=object), return_inverse=True)
+    order = np.lexsort((vector, codes))
+    ordered_codes = codes[order]
+    ordered_values = vector[order]
+    width = vector.size
+    positions = np.arange(width)
+    group_start = np.ones(width, dtype=bool)
+    group_start[1:] = ordered_codes[1:] != ordered_codes[:-1]
+    tie_start = group_start.copy()
+    tie_start[1:] |= ordered_values[1:] != ordered_values[:-1]
+    tie_end = np.ones(width, dtype=bool)
+    tie_end[:-1] = tie_start[1:]
+    group_first = np.maximum.accumulate(np.where(group_start, positions, 0))
+    first = np.maximum.accumulate(np.where(tie_start, positions, 0))
+    last = np.minimum.accumulate(np.where(tie_end, positions, width - 1)[::-1])[::-1]
+    sizes = np.bincount(codes)[ordered_codes]
+    rank = (first + last + 2) / 2.0 - group_first
+    pct = np.where(sizes > 1, 100.0 * (rank - 1.0) / np.maximum(sizes - 1, 1), 50.0)
+    out = np.empty(width, dtype=float)
+    out[order] = pct
+    return out.tolist()
+
+
+def pearson_rows(left: np.ndarray, right: np.ndarray) -> List[float | None]:
+    """Row-wise Pearson correlation of two aligned (series x observations) matrices.
+
+    Rows must be complete; each value is rounded to ``CORRELATION_DIGITS`` and
+    ``None`` marks a constant row.  For NaN-masked rows with overlap counts see
+    ``stock_ultimate_system/src/utils/correlation.masked_pearson_rows``.
+    """
+    x = np.atleast_2d(np.asarray(left, dtype=float))
+    y = np.atleast_2d(np.asarray(right, dtype=float))
+    if x.shape != y.shape:
+        raise ValueError(f"misaligned series matrices: {x.shape} vs {y.shape}")
+    if x.shape[1] < 2:
+        return [None] * x.shape[0]
+    dx = x - x.mean(axis=1, keepdims=True)
+    dy = y - y.mean(axis=1, keepdims=True)
+    cov = (dx * dy).sum(axis=1)
+    var_x = _variance_sums(x, dx)
+    var_y = _variance_sums(y, dy)
+    valid = (var_x > 0.0) & (var_y > 0.0)
+    corr = cov / np.sqrt(np.where(valid, var_x * var_y, 1.0))
+    return [round(float(value), CORRELATION_DIGITS) if ok else None for value, ok in zip(corr, valid)]
+
+
+def spearman_rows(left: np.ndarray, right: np.ndarray) -> List[float | None]:
+    return pearson_rows(rank_rows(np.atleast_2d(left)), rank_rows(np.atleast_2d(right)))
+
+
+def pearson(left: Sequence[float], right: Sequence[float]) -> float | None:
+    if len(left) != len(right) or len(left) < 2:
+        return None
+    return pearson_rows(_vector(left), _vector(right))[0]
+
+
+def spearman(left: Sequence[float], right: Sequence[float]) -> float | None:
+    if len(left) != len(right) or len(left) < 2:
+        return None
+    return spearman_rows(_vector(left), _vector(right))[0]
+
+
+def pearson_many(pairs: Sequence[Tuple[Sequence[float], Sequence[float]]]) -> List[float | None]:
+    """``pearson`` for many (left, right) pairs; pairs of equal length share one matrix pass."""
+    return _many(pairs, pearson_rows)
+
+
+def spearman_many(pairs: Sequence[Tuple[Sequence[float], Sequence[float]]]) -> List[float | None]:
+    return _many(pairs, spearman_rows)
+
+
+def correlation_matrix(series: np.ndarray) -> List[List[float | None]]:
+    """Pearson correlation between every pair of rows of a (series x observations) matrix."""
+    matrix = np.atleast_2d(np.asarray(series, dtype=float))
+    count, width = matrix.shape
+    if width < 2:
+        return [[None] * count for _ in range(count)]
+    deviations = matrix - matrix.mean(axis=1, keepdims=True)
+    cov = deviations @ deviations.T
+    variances = _variance_sums(matrix, deviations)
+    valid = (variances > 0.0)[:, None] & (variances > 0.0)[None, :]
+    corr = cov / np.sqrt(np.where(valid, np.outer(variances, variances), 1.0))
+    return [
+        [round(float(corr[i, j]), CORRELATION_DIGITS) if valid[i, j] else None for j in range(count)]
+        for i in range(count)
+    ]
+
+
+def _variance_sums(values: np.ndarray, deviations: np.ndarray) -> np.ndarray:
+    # Constant rows are exactly zero even when the mean is not representable.
+    sums = (deviations * deviations).sum(axis=1)
+    return np.where(values.max(axis=1) > values.min(axis=1), sums, 0.0)
+
+
+def _many(pairs: Sequence[Tuple[Sequence[float], Sequence[float]]], kernel) -> List[float | None]:
+    out: List[float | None] = [None] * len(pairs)
+    by_length: Dict[int, List[int]] = {}
+    for idx, (left, right) in enumerate(pairs):
+        if len(left) == len(right) and len(left) >= 2:
+            by_length.setdefault(len(left), []).append(idx)
+    for indices in by_length.values():
+        left = np.array([_vector(pairs[idx][0]) for idx in indices])
+        right = np.array([_vector(pairs[idx][1]) for idx in indices])
+        for idx, value in zip(indices, kernel(left, right)):
+            out[idx] = value
+    return out
+
+
+def _vector(values: Sequence[float]) -> np.ndarray:
+    # ``float()`` per item keeps the helpers' TypeError on None instead of a silent NaN.
+    return np.fromiter((float(value) for value in values), dtype=float)
@@ -8,6 +8,7 @@ second truth source.
 
 from __future__ import annotations
 
+import hashlib
 from typing import Any, Dict, Sequence
 
 from openclaw.services.backtest_credibility_service import evaluate_backtest_credibility
@@ -31,7 +32,15 @@ def build_strategy_backtest_diagnostics(
     rows: Sequence[JsonDict],
     errors: Sequence[JsonDict],
     backtest_credibility: JsonDict | None = None,
+    diagnostic_aggregator: WindowDiagnosticsAggregator | None = None,
 ) -> JsonDict:
+    """Explain a strategy's sweep evidence.
+
+    Long sweeps should stream window diagnostics into a
+    ``WindowDiagnosticsAggregator`` as windows finish and pass it as
+    ``diagnostic_aggregator`` instead of keeping them on ``rows``; diagnostics
+    still attached to rows/errors are folded in as well (duplicates dropped).
+    """
     strategy_key = str(strategy or "").lower()
     rows = list(rows or [])
     errors = list(errors or [])
@@ -40,7 +49,7 @@ def build_strategy_backtest_diagnostics(
     successful_rows = [r for r in rows if str(r.get("status")) == "success"]
     best = _best_successful_row(rows)
 
-    window_diagnostics = _collect_window_diagnostics(rows=rows, errors=errors)
+    window_diagnostics = _collect_window_diagnostics(rows=rows, errors=errors, aggregator=diagnostic_aggregator)
     failure_classes = _classify_failures(
         strategy=strategy_key,
         rows=rows,
@@ -346,175 +355,254 @@ def _has_runtime_execution_constraints(rows: Sequence[JsonDict]) -> bool:
     return False
 
 
-def _collect_window_diagnostics(*, rows: Sequence[JsonDict], errors: Sequence[JsonDict]) -> JsonDict:
-    diagnostics: list[JsonDict] = []
-    for source in list(rows or []) + list(errors or []):
+TOP_SAMPLE_LIMIT = 10
+
+
+class WindowDiagnosticsAggregator:
+    """Single-pass aggregation of rolling-window diagnostics.
+
+    Diagnostics are folded as they are produced: counters and weighted metrics
+    are merged in place and sample lists keep only the current top
+    ``TOP_SAMPLE_LIMIT`` by ``final_score``.  Duplicates are dropped by a
+    fixed-size digest of the dedupe key, so a window costs 16 bytes however
+    large its reason counts are.  ``payload()`` matches the former
+    materialize-then-aggregate output.
+    """
+
+    def __init__(self) -> None:
+        self._seen: set[bytes] = set()
+        self.diagnostic_count = 0
+        self._score = _new_score_state()
+        self._combo = _new_combo_state()
+
+    def add(self, diag: Any) -> None:
+        if not isinstance(diag, dict):
+            return
+        key = hashlib.blake2b(repr(_window_diagnostic_key(diag)).encode("utf-8"), digest_size=16).digest()
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.diagnostic_count += 1
+        kind = str(diag.get("type"))
+        if kind == "score_distribution":
+            _fold_score_diagnostic(self._score, diag)
+        elif kind == "combo_consensus":
+            _fold_combo_diagnostic(self._combo, diag)
+
+    def add_source(self, source: JsonDict) -> None:
+        """Fold the ``run_diagnostics`` and ``failure_diagnostics`` of one sweep row or error."""
         for item in source.get("run_diagnostics", []) or []:
-            if isinstance(item, dict):
-                diagnostics.append(item)
+            self.add(item)
         for item in source.get("failure_diagnostics", []) or []:
-            if isinstance(item, dict):
-                diagnostics.append(item)
-    diagnostics = _dedupe_window_diagnostics(diagnostics)
-    if not diagnostics:
-        return {"available": False, "diagnostic_count": 0}
-
-    score_diags = [x for x in diagnostics if str(x.get("type")) == "score_distribution"]
-    combo_diags = [x for x in diagnostics if str(x.get("type")) == "combo_consensus"]
-    if combo_diags:
-        return _aggregate_combo_diagnostics(combo_diags, total_count=len(diagnostics))
-    if not score_diags:
-        return {"available": True, "diagnostic_count": len(diagnostics)}
-
-    evaluated = sum(int(x.get("evaluated", 0) or 0) for x in score_diags)
-    passed = sum(int(x.get("passed_threshold", 0) or 0) for x in score_diags)
-    missing = sum(int(x.get("missing_score", 0) or 0) for x in score_diags)
-    max_score = max((float(x.get("max_score", 0.0) or 0.0) for x in score_diags), default=0.0)
-    avg_scores = [float(x.get("avg_score", 0.0) or 0.0) for x in score_diags if int(x.get("score_count", 0) or 0) > 0]
-    thresholds = [float(x.get("threshold", 0.0) or 0.0) for x in score_diags if x.get("threshold") is not None]
-    near_threshold = {"within_2": 0, "within_5": 0, "within_10": 0}
-    reason_counts: Dict[str, int] = {}
-    score_breakdown = _aggregate_score_breakdown(score_diags)
-    stage_timing_ms = _aggregate_stage_timing(score_diags)
-    v6_runtime_review = _aggregate_v6_runtime_review(score_diags)
-    top_near_threshold_samples = _aggregate_top_near_threshold_samples(score_diags)
-    entry_gate_review = _aggregate_entry_gate_review(score_diags)
-    entry_gate_passed_samples = _aggregate_entry_gate_passed_samples(score_diags)
-    entry_gate_quality_by_mode = _aggregate_entry_gate_quality_by_mode(score_diags)
-    for diag in score_diags:
-        for key, value in (diag.get("reason_counts") or {}).items():
-            reason_counts[str(key)] = int(reason_counts.get(str(key), 0) or 0) + int(value or 0)
-        near = diag.get("near_threshold") if isinstance(diag.get("near_threshold"), dict) else {}
-        runtime = diag.get("v6_runtime_diagnostics") if isinstance(diag.get("v6_runtime_diagnostics"), dict) else {}
-        runtime_near = runtime.get("threshold_near_samples") if isinstance(runtime.get("threshold_near_samples"), dict) else {}
-        for key in near_threshold:
-            near_threshold[key] += int(near.get(key, runtime_near.get(key, 0)) or 0)
+            self.add(item)
+
+    def payload(self) -> JsonDict:
+        if not self.diagnostic_count:
+            return {"available": False, "diagnostic_count": 0}
+        if self._combo["count"]:
+            return _freeze_combo_state(self._combo, total_count=self.diagnostic_count)
+        if not self._score["count"]:
+            return {"available": True, "diagnostic_count": self.diagnostic_count}
+        return _freeze_score_state(self._score, total_count=self.diagnostic_count)
+
+
+def _collect_window_diagnostics(
+    *,
+    rows: Sequence[JsonDict],
+    errors: Sequence[JsonDict],
+    aggregator: WindowDiagnosticsAggregator | None = None,
+) -> JsonDict:
+    aggregator = aggregator if aggregator is not None else WindowDiagnosticsAggregator()
+    for source in list(rows or []) + list(errors or []):
+        aggregator.add_source(source)
+    return aggregator.payload()
+
+
+def _window_diagnostic_key(diag: JsonDict) -> tuple:
+    return (
+        str(diag.get("type")),
+        str(diag.get("strategy")),
+        float(diag.get("threshold", diag.get("combo_threshold", 0.0)) or 0.0),
+        int(diag.get("evaluated", 0) or 0),
+        int(diag.get("passed_threshold", 0) or 0),
+        float(diag.get("max_score", 0.0) or 0.0),
+        str(sorted((diag.get("reason_counts") or diag.get("drop_reasons") or {}).items())),
+    )
+
+
+def _new_score_state() -> JsonDict:
+    return {
+        "count": 0,
+        "evaluated": 0,
+        "passed": 0,
+        "missing": 0,
+        "max_score": None,
+        "avg_score_sum": 0.0,
+        "avg_score_count": 0,
+        "min_threshold": None,
+        "max_threshold": None,
+        "near_threshold": {"within_2": 0, "within_5": 0, "within_10": 0},
+        "reason_counts": {},
+        "score_breakdown": {},
+        "stage_timing_ms": {},
+        "v6_runtime": None,
+        "top_near_threshold_samples": [],
+        "entry_gate_review": None,
+        "entry_gate_passed_samples": [],
+        "entry_gate_quality_by_mode": {},
+    }
+
+
+def _fold_score_diagnostic(state: JsonDict, diag: JsonDict) -> None:
+    state["count"] += 1
+    state["evaluated"] += int(diag.get("evaluated", 0) or 0)
+    state["passed"] += int(diag.get("passed_threshold", 0) or 0)
+    state["missing"] += int(diag.get("missing_score", 0) or 0)
+    max_score = float(diag.get("max_score", 0.0) or 0.0)
+    if state["max_score"] is None or max_score > state["max_score"]:
+        state["max_score"] = max_score
+    if int(diag.get("score_count", 0) or 0) > 0:
+        state["avg_score_sum"] += float(diag.get("avg_score", 0.0) or 0.0)
+        state["avg_score_count"] += 1
+    if diag.get("threshold") is not None:
+        threshold = float(diag.get("threshold", 0.0) or 0.0)
+        if state["min_threshold"] is None or threshold < state["min_threshold"]:
+            state["min_threshold"] = threshold
+        if state["max_threshold"] is None or threshold > state["max_threshold"]:
+            state["max_threshold"] = threshold
+
+    reason_counts = state["reason_counts"]
+    for key, value in (diag.get("reason_counts") or {}).items():
+        reason_counts[str(key)] = int(reason_counts.get(str(key), 0) or 0) + int(value or 0)
+    near = diag.get("near_threshold") if isinstance(diag.get("near_threshold"), dict) else {}
+    runtime = diag.get("v6_runtime_diagnostics") if isinstance(diag.get("v6_runtime_diagnostics"), dict) else {}
+    runtime_near = runtime.get("threshold_near_samples") if isinstance(runtime.get("threshold_near_samples"), dict) else {}
+    near_threshold = state["near_threshold"]
+    for key in near_threshold:
+        near_threshold[key] += int(near.get(key, runtime_near.get(key, 0)) or 0)
+
+    _fold_min_max_metrics(state["score_breakdown"], diag.get("score_breakdown"))
+    _fold_max_metrics(state["stage_timing_ms"], diag.get("stage_timing_ms"))
+    if isinstance(diag.get("v6_runtime_diagnostics"), dict):
+        state["v6_runtime"] = _fold_v6_runtime(state["v6_runtime"], diag["v6_runtime_diagnostics"])
+    _keep_top_samples(state["top_near_threshold_samples"], diag.get("top_near_threshold_samples"))
+    if isinstance(diag.get("entry_gate_review"), dict):
+        state["entry_gate_review"] = _fold_entry_gate_review(state["entry_gate_review"], diag["entry_gate_review"])
+    _keep_top_samples(state["entry_gate_passed_samples"], diag.get("entry_gate_passed_samples"))
+    _fold_entry_gate_quality_by_mode(state["entry_gate_quality_by_mode"], diag.get("entry_gate_quality_by_mode"))
+
+
+def _freeze_score_state(state: JsonDict, *, total_count: int) -> JsonDict:
+    evaluated = int(state["evaluated"])
+    passed = int(state["passed"])
+    avg_score_count = int(state["avg_score_count"])
     return {
         "available": True,
-        "diagnostic_count": len(diagnostics),
-        "score_distribution_count": len(score_diags),
+        "diagnostic_count": int(total_count),
+        "score_distribution_count": int(state["count"]),
         "evaluated": evaluated,
         "passed_threshold": passed,
         "pass_rate": (float(passed) / float(evaluated)) if evaluated > 0 else 0.0,
-        "missing_score": missing,
-        "min_threshold": min(thresholds) if thresholds else 0.0,
-        "max_threshold": max(thresholds) if thresholds else 0.0,
-        "near_threshold": near_threshold,
-        "max_score": max_score,
-        "avg_score_mean": (sum(avg_scores) / len(avg_scores)) if avg_scores else 0.0,
-        "reason_counts": reason_counts,
-        "score_breakdown": score_breakdown,
-        "stage_timing_ms": stage_timing_ms,
-        "v6_runtime_review": v6_runtime_review,
-        "top_near_threshold_samples": top_near_threshold_samples,
-        "entry_gate_review": entry_gate_review,
-        "entry_gate_passed_samples": entry_gate_passed_samples,
-        "entry_gate_quality_by_mode": entry_gate_quality_by_mode,
+        "missing_score": int(state["missing"]),
+        "min_threshold": state["min_threshold"] if state["min_threshold"] is not None else 0.0,
+        "max_threshold": state["max_threshold"] if state["max_threshold"] is not None else 0.0,
+        "near_threshold": dict(state["near_threshold"]),
+        "max_score": state["max_score"] if state["max_score"] is not None else 0.0,
+        "avg_score_mean": (state["avg_score_sum"] / avg_score_count) if avg_score_count else 0.0,
+        "reason_counts": dict(state["reason_counts"]),
+        "score_breakdown": _freeze_min_max_metrics(state["score_breakdown"]),
+        "stage_timing_ms": _freeze_max_metrics(state["stage_timing_ms"]),
+        "v6_runtime_review": _freeze_v6_runtime(state["v6_runtime"]),
+        "top_near_threshold_samples": list(state["top_near_threshold_samples"]),
+        "entry_gate_review": {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in (state["entry_gate_review"] or {}).items()
+        },
+        "entry_gate_passed_samples": list(state["entry_gate_passed_samples"]),
+        "entry_gate_quality_by_mode": _freeze_entry_gate_quality_by_mode(state["entry_gate_quality_by_mode"]),
     }
 
 
-def _aggregate_top_near_threshold_samples(score_diags: Sequence[JsonDict], limit: int = 10) -> list[JsonDict]:
-    samples: list[JsonDict] = []
-    for diag in score_diags:
-        raw_samples = diag.get("top_near_threshold_samples")
-        if not isinstance(raw_samples, list):
-            continue
-        for item in raw_samples:
-            if isinstance(item, dict):
-                samples.append(dict(item))
-    samples.sort(key=lambda row: _float_or_default(row.get("final_score"), 0.0), reverse=True)
-    return samples[: int(limit)]
-
-
-def _aggregate_entry_gate_passed_samples(score_diags: Sequence[JsonDict], limit: int = 10) -> list[JsonDict]:
-    samples: list[JsonDict] = []
-    for diag in score_diags:
-        raw_samples = diag.get("entry_gate_passed_samples")
-        if not isinstance(raw_samples, list):
-            continue
-        for item in raw_samples:
-            if isinstance(item, dict):
-                samples.append(dict(item))
-    samples.sort(key=lambda row: _float_or_default(row.get("final_score"), 0.0), reverse=True)
-    return samples[: int(limit)]
+def _keep_top_samples(kept: list[JsonDict], raw_samples: Any, limit: int = TOP_SAMPLE_LIMIT) -> None:
+    # Stable sort of (kept, new) keeps the global top-k in first-seen order among ties.
+    if not isinstance(raw_samples, list):
+        return
+    kept.extend(dict(item) for item in raw_samples if isinstance(item, dict))
+    kept.sort(key=lambda row: _float_or_default(row.get("final_score"), 0.0), reverse=True)
+    del kept[int(limit) :]
+
+
+def _fold_entry_gate_review(out: JsonDict | None, review: JsonDict) -> JsonDict:
+    if out is None:
+        out = {
+            "observed": 0,
+            "passed": 0,
+            "blocked": 0,
+            "mode_counts": {},
+            "reason_counts": {},
+            "overheat_flag_counts": {},
+            "passed_score_max": 0.0,
+            "blocked_score_max": 0.0,
+        }
+    out["observed"] = int(out.get("observed", 0) or 0) + int(review.get("observed", 0) or 0)
+    out["passed"] = int(out.get("passed", 0) or 0) + int(review.get("passed", 0) or 0)
+    out["blocked"] = int(out.get("blocked", 0) or 0) + int(review.get("blocked", 0) or 0)
+    out["passed_score_max"] = max(
+        _float_or_default(out.get("passed_score_max"), 0.0),
+        _float_or_default(review.get("passed_score_max"), 0.0),
+    )
+    out["blocked_score_max"] = max(
+        _float_or_default(out.get("blocked_score_max"), 0.0),
+        _float_or_default(review.get("blocked_score_max"), 0.0),
+    )
+    for key in ("mode_counts", "reason_counts", "overheat_flag_counts"):
+        _merge_count_map(out.setdefault(key, {}), review.get(key))
+    return out
 
 
-def _aggregate_entry_gate_review(score_diags: Sequence[JsonDict]) -> JsonDict:
-    out: JsonDict = {
-        "observed": 0,
-        "passed": 0,
-        "blocked": 0,
-        "mode_counts": {},
-        "reason_counts": {},
-        "overheat_flag_counts": {},
-        "passed_score_max": 0.0,
-        "blocked_score_max": 0.0,
-    }
-    found = False
-    for diag in score_diags:
-        review = diag.get("entry_gate_review")
-        if not isinstance(review, dict):
+def _fold_entry_gate_quality_by_mode(accum: Dict[str, JsonDict], quality: Any) -> None:
+    if not isinstance(quality, dict):
+        return
+    for mode, payload in quality.items():
+        if not isinstance(payload, dict):
+            continue
+        count = int(payload.get("count", 0) or 0)
+        if count <= 0:
             continue
-        found = True
-        out["observed"] = int(out.get("observed", 0) or 0) + int(review.get("observed", 0) or 0)
-        out["passed"] = int(out.get("passed", 0) or 0) + int(review.get("passed", 0) or 0)
-        out["blocked"] = int(out.get("blocked", 0) or 0) + int(review.get("blocked", 0) or 0)
-        out["passed_score_max"] = max(
-            _float_or_default(out.get("passed_score_max"), 0.0),
-            _float_or_default(review.get("passed_score_max"), 0.0),
+        item = accum.setdefault(
+            str(mode),
+            {
+                "count": 0,
+                "score_sum": 0.0,
+                "score_max": _float_or_default(payload.get("max_score"), 0.0),
+                "gap_sum": 0.0,
+                "gap_min": _float_or_default(payload.get("min_gap_to_threshold"), 0.0),
+                "base_score": {},
+                "synergy_bonus": {},
+                "risk_penalty": {},
+                "dimension_scores": {},
+                "dimension_shortfall_to_reference": {},
+                "secondary_confirmation_counts": {},
+                "secondary_confirmation_metrics": {},
+            },
         )
-        out["blocked_score_max"] = max(
-            _float_or_default(out.get("blocked_score_max"), 0.0),
-            _float_or_default(review.get("blocked_score_max"), 0.0),
+        item["count"] = int(item.get("count", 0) or 0) + count
+        item["score_sum"] = float(item.get("score_sum", 0.0) or 0.0) + _float_or_default(payload.get("avg_score"), 0.0) * count
+        item["score_max"] = max(_float_or_default(item.get("score_max"), 0.0), _float_or_default(payload.get("max_score"), 0.0))
+        item["gap_sum"] = float(item.get("gap_sum", 0.0) or 0.0) + _float_or_default(payload.get("avg_gap_to_threshold"), 0.0) * count
+        item["gap_min"] = min(
+            _float_or_default(item.get("gap_min"), _float_or_default(payload.get("min_gap_to_threshold"), 0.0)),
+            _float_or_default(payload.get("min_gap_to_threshold"), 0.0),
         )
-        for key in ("mode_counts", "reason_counts", "overheat_flag_counts"):
-            _merge_count_map(out.setdefault(key, {}), review.get(key))
-    return out if found else {}
+        for key in ("base_score", "synergy_bonus", "risk_penalty"):
+            _merge_weighted_metric(item.setdefault(key, {}), payload.get(key))
+        for key in ("dimension_scores", "dimension_shortfall_to_reference"):
+            _merge_weighted_metric_map(item.setdefault(key, {}), payload.get(key))
+        _merge_count_map(item.setdefault("secondary_confirmation_counts", {}), payload.get("secondary_confirmation_counts"))
+        _merge_weighted_metric_map(item.setdefault("secondary_confirmation_metrics", {}), payload.get("secondary_confirmation_metrics"))
 
 
-def _aggregate_entry_gate_quality_by_mode(score_diags: Sequence[JsonDict]) -> JsonDict:
-    accum: Dict[str, JsonDict] = {}
-    for diag in score_diags:
-        quality = diag.get("entry_gate_quality_by_mode")
-        if not isinstance(quality, dict):
-            continue
-        for mode, payload in quality.items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            item = accum.setdefault(
-                str(mode),
-                {
-                    "count": 0,
-                    "score_sum": 0.0,
-                    "score_max": _float_or_default(payload.get("max_score"), 0.0),
-                    "gap_sum": 0.0,
-                    "gap_min": _float_or_default(payload.get("min_gap_to_threshold"), 0.0),
-                    "base_score": {},
-                    "synergy_bonus": {},
-                    "risk_penalty": {},
-                    "dimension_scores": {},
-                    "dimension_shortfall_to_reference": {},
-                    "secondary_confirmation_counts": {},
-                    "secondary_confirmation_metrics": {},
-                },
-            )
-            item["count"] = int(item.get("count", 0) or 0) + count
-            item["score_sum"] = float(item.get("score_sum", 0.0) or 0.0) + _float_or_default(payload.get("avg_score"), 0.0) * count
-            item["score_max"] = max(_float_or_default(item.get("score_max"), 0.0), _float_or_default(payload.get("max_score"), 0.0))
-            item["gap_sum"] = float(item.get("gap_sum", 0.0) or 0.0) + _float_or_default(payload.get("avg_gap_to_threshold"), 0.0) * count
-            item["gap_min"] = min(
-                _float_or_default(item.get("gap_min"), _float_or_default(payload.get("min_gap_to_threshold"), 0.0)),
-                _float_or_default(payload.get("min_gap_to_threshold"), 0.0),
-            )
-            for key in ("base_score", "synergy_bonus", "risk_penalty"):
-                _merge_weighted_metric(item.setdefault(key, {}), payload.get(key))
-            for key in ("dimension_scores", "dimension_shortfall_to_reference"):
-                _merge_weighted_metric_map(item.setdefault(key, {}), payload.get(key))
-            _merge_count_map(item.setdefault("secondary_confirmation_counts", {}), payload.get("secondary_confirmation_counts"))
-            _merge_weighted_metric_map(item.setdefault("secondary_confirmation_metrics", {}), payload.get("secondary_confirmation_metrics"))
+def _freeze_entry_gate_quality_by_mode(accum: Dict[str, JsonDict]) -> JsonDict:
     out: JsonDict = {}
     for mode, payload in accum.items():
         count = int(payload.get("count", 0) or 0)
@@ -594,24 +682,25 @@ def _merge_count_map(target: Any, source: Any) -> None:
         target[str(key)] = int(target.get(str(key), 0) or 0) + int(value or 0)
 
 
-def _aggregate_stage_timing(score_diags: Sequence[JsonDict]) -> JsonDict:
-    accum: Dict[str, Dict[str, float]] = {}
-    for diag in score_diags:
-        timing = diag.get("stage_timing_ms")
-        if not isinstance(timing, dict):
+def _fold_max_metrics(accum: Dict[str, Dict[str, float]], metrics: Any) -> None:
+    """Merge ``{key: {count, avg, max}}`` timing-style metrics, weighting averages by count."""
+    if not isinstance(metrics, dict):
+        return
+    for key, payload in metrics.items():
+        if not isinstance(payload, dict):
+            continue
+        count = int(payload.get("count", 0) or 0)
+        if count <= 0:
             continue
-        for key, payload in timing.items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg = _float_or_default(payload.get("avg"), 0.0)
-            max_value = _float_or_default(payload.get("max"), avg)
-            item = accum.setdefault(str(key), {"count": 0.0, "weighted_sum": 0.0, "max": max_value})
-            item["count"] += float(count)
-            item["weighted_sum"] += avg * float(count)
-            item["max"] = max(float(item.get("max", max_value)), max_value)
+        avg = _float_or_default(payload.get("avg"), 0.0)
+        max_value = _float_or_default(payload.get("max"), avg)
+        item = accum.setdefault(str(key), {"count": 0.0, "weighted_sum": 0.0, "max": max_value})
+        item["count"] += float(count)
+        item["weighted_sum"] += avg * float(count)
+        item["max"] = max(float(item.get("max", max_value)), max_value)
+
+
+def _freeze_max_metrics(accum: Dict[str, Dict[str, float]]) -> JsonDict:
     out: JsonDict = {}
     for key, payload in accum.items():
         count = int(payload.get("count", 0.0) or 0.0)
@@ -625,89 +714,32 @@ def _aggregate_stage_timing(score_diags: Sequence[JsonDict]) -> JsonDict:
     return out
 
 
-def _aggregate_v6_runtime_review(score_diags: Sequence[JsonDict]) -> JsonDict:
-    runtime_items = [
-        diag.get("v6_runtime_diagnostics")
-        for diag in score_diags
-        if isinstance(diag.get("v6_runtime_diagnostics"), dict)
-    ]
-    if not runtime_items:
-        return {}
-    relaxed = 0
-    replay_steps: list[int] = []
-    coarse = False
-    candidate_modes: Dict[str, int] = {}
-    point_in_time = True
-    production_candidate_allowed = False
-    for item in runtime_items:
-        relaxed += int(item.get("candidate_filter_relaxed_count", 0) or 0)
-        step = int(item.get("replay_step", 0) or 0)
-        if step > 0:
-            replay_steps.append(step)
-        mode = str(item.get("candidate_filter_mode", "") or "")
-        if mode:
-            candidate_modes[mode] = int(candidate_modes.get(mode, 0) or 0) + 1
-        point_in_time = bool(point_in_time and item.get("point_in_time_context") is True)
-        production_candidate_allowed = bool(production_candidate_allowed or item.get("production_candidate_allowed") is True)
-        noise = item.get("short_cycle_noise_review") if isinstance(item.get("short_cycle_noise_review"), dict) else {}
-        coarse = bool(coarse or noise.get("coarse_step") is True)
-    return {
-        "point_in_time_context": point_in_time,
-        "production_candidate_allowed": production_candidate_allowed,
-        "candidate_filter_relaxed_count": relaxed,
-        "candidate_filter_modes": candidate_modes,
-        "replay_step_min": min(replay_steps) if replay_steps else 0,
-        "replay_step_max": max(replay_steps) if replay_steps else 0,
-        "short_cycle_noise_review": {
-            "coarse_step": coarse,
-            "reason": "short_cycle_strategy_requires_dense_replay_review" if coarse else "",
-        },
-    }
-
-
-def _dedupe_window_diagnostics(diagnostics: Sequence[JsonDict]) -> list[JsonDict]:
-    seen = set()
-    out: list[JsonDict] = []
-    for diag in diagnostics:
-        key = (
-            str(diag.get("type")),
-            str(diag.get("strategy")),
-            float(diag.get("threshold", diag.get("combo_threshold", 0.0)) or 0.0),
-            int(diag.get("evaluated", 0) or 0),
-            int(diag.get("passed_threshold", 0) or 0),
-            float(diag.get("max_score", 0.0) or 0.0),
-            str(sorted((diag.get("reason_counts") or diag.get("drop_reasons") or {}).items())),
-        )
-        if key in seen:
+def _fold_min_max_metrics(accum: Dict[str, Dict[str, float]], metrics: Any, *, with_p50: bool = False) -> None:
+    """Merge ``{key: {count, avg, min, max[, p50]}}`` score-style metrics, weighting averages by count."""
+    if not isinstance(metrics, dict):
+        return
+    for key, payload in metrics.items():
+        if not isinstance(payload, dict):
             continue
-        seen.add(key)
-        out.append(diag)
-    return out
-
-
-def _aggregate_score_breakdown(score_diags: Sequence[JsonDict]) -> JsonDict:
-    accum: Dict[str, Dict[str, float]] = {}
-    for diag in score_diags:
-        breakdown = diag.get("score_breakdown")
-        if not isinstance(breakdown, dict):
+        count = int(payload.get("count", 0) or 0)
+        if count <= 0:
             continue
-        for key, payload in breakdown.items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg = _float_or_default(payload.get("avg"), 0.0)
-            min_value = _float_or_default(payload.get("min"), avg)
-            max_value = _float_or_default(payload.get("max"), avg)
-            item = accum.setdefault(
-                str(key),
-                {"count": 0.0, "weighted_sum": 0.0, "min": min_value, "max": max_value},
-            )
-            item["count"] += float(count)
-            item["weighted_sum"] += avg * float(count)
-            item["min"] = min(float(item.get("min", min_value)), min_value)
-            item["max"] = max(float(item.get("max", max_value)), max_value)
+        avg = _float_or_default(payload.get("avg"), 0.0)
+        min_value = _float_or_default(payload.get("min"), avg)
+        max_value = _float_or_default(payload.get("max"), avg)
+        seed = {"count": 0.0, "weighted_sum": 0.0, "min": min_value, "max": max_value}
+        if with_p50:
+            seed["p50_weighted_sum"] = 0.0
+        item = accum.setdefault(str(key), seed)
+        item["count"] += float(count)
+        item["weighted_sum"] += avg * float(count)
+        if with_p50:
+            item["p50_weighted_sum"] += _float_or_default(payload.get("p50"), avg) * float(count)
+        item["min"] = min(float(item.get("min", min_value)), min_value)
+        item["max"] = max(float(item.get("max", max_value)), max_value)
+
+
+def _freeze_min_max_metrics(accum: Dict[str, Dict[str, float]], *, with_p50: bool = False) -> JsonDict:
     out: JsonDict = {}
     for key, payload in accum.items():
         count = int(payload.get("count", 0.0) or 0.0)
@@ -719,9 +751,58 @@ def _aggregate_score_breakdown(score_diags: Sequence[JsonDict]) -> JsonDict:
             "min": float(payload.get("min", 0.0) or 0.0),
             "max": float(payload.get("max", 0.0) or 0.0),
         }
+        if with_p50:
+            out[key]["p50"] = float(payload.get("p50_weighted_sum", 0.0) or 0.0) / float(count)
     return out
 
 
+def _fold_v6_runtime(state: JsonDict | None, item: JsonDict) -> JsonDict:
+    if state is None:
+        state = {
+            "relaxed": 0,
+            "replay_step_min": 0,
+            "replay_step_max": 0,
+            "coarse": False,
+            "candidate_modes": {},
+            "point_in_time": True,
+            "production_candidate_allowed": False,
+        }
+    state["relaxed"] += int(item.get("candidate_filter_relaxed_count", 0) or 0)
+    step = int(item.get("replay_step", 0) or 0)
+    if step > 0:
+        state["replay_step_min"] = min(state["replay_step_min"], step) if state["replay_step_min"] else step
+        state["replay_step_max"] = max(state["replay_step_max"], step)
+    mode = str(item.get("candidate_filter_mode", "") or "")
+    if mode:
+        modes = state["candidate_modes"]
+        modes[mode] = int(modes.get(mode, 0) or 0) + 1
+    state["point_in_time"] = bool(state["point_in_time"] and item.get("point_in_time_context") is True)
+    state["production_candidate_allowed"] = bool(
+        state["production_candidate_allowed"] or item.get("production_candidate_allowed") is True
+    )
+    noise = item.get("short_cycle_noise_review") if isinstance(item.get("short_cycle_noise_review"), dict) else {}
+    state["coarse"] = bool(state["coarse"] or noise.get("coarse_step") is True)
+    return state
+
+
+def _freeze_v6_runtime(state: JsonDict | None) -> JsonDict:
+    if state is None:
+        return {}
+    coarse = bool(state["coarse"])
+    return {
+        "point_in_time_context": bool(state["point_in_time"]),
+        "production_candidate_allowed": bool(state["production_candidate_allowed"]),
+        "candidate_filter_relaxed_count": int(state["relaxed"]),
+        "candidate_filter_modes": dict(state["candidate_modes"]),
+        "replay_step_min": int(state["replay_step_min"]),
+        "replay_step_max": int(state["replay_step_max"]),
+        "short_cycle_noise_review": {
+            "coarse_step": coarse,
+            "reason": "short_cycle_strategy_requires_dense_replay_review" if coarse else "",
+        },
+    }
+
+
 def _float_or_default(value: Any, default: float) -> float:
     try:
         return float(value)
@@ -729,195 +810,108 @@ def _float_or_default(value: Any, default: float) -> float:
         return float(default)
 
 
-def _aggregate_combo_diagnostics(combo_diags: Sequence[JsonDict], *, total_count: int) -> JsonDict:
-    evaluated = sum(int(x.get("evaluated", 0) or 0) for x in combo_diags)
-    component_available: Dict[str, int] = {}
-    component_pass: Dict[str, int] = {}
-    component_score_stats: Dict[str, Dict[str, float]] = {}
-    component_timing_stats: Dict[str, Dict[str, float]] = {}
-    component_cache_stats: Dict[str, Dict[str, int]] = {}
-    v8_stage_timing_stats: Dict[str, Dict[str, float]] = {}
-    v7_stage_timing_stats: Dict[str, Dict[str, float]] = {}
-    v5_score_breakdown_stats: Dict[str, Dict[str, float]] = {}
-    v5_synergy_combo_counts: Dict[str, int] = {}
-    v5_risk_reason_counts: Dict[str, int] = {}
-    v5_candidate_filter = {"total": 0, "applicable": 0, "filtered_out": 0, "reason_counts": {}}
-    component_near_threshold: Dict[str, Dict[str, int]] = {}
-    pair_agreement: Dict[str, int] = {}
-    weight_context: Dict[str, Any] = {}
-    weighted_candidates = {
-        "count": 0.0,
-        "weighted_sum": 0.0,
-        "min": 0.0,
-        "max": 0.0,
-        "below_combo_threshold": 0.0,
-        "gap_sum": 0.0,
-        "max_gap": 0.0,
+def _new_combo_state() -> JsonDict:
+    return {
+        "count": 0,
+        "evaluated": 0,
+        "component_available": {},
+        "component_pass": {},
+        "component_score_stats": {},
+        "component_timing_stats": {},
+        "component_cache_stats": {},
+        "v8_stage_timing_stats": {},
+        "v7_stage_timing_stats": {},
+        "v5_score_breakdown_stats": {},
+        "v5_synergy_combo_counts": {},
+        "v5_risk_reason_counts": {},
+        "v5_candidate_filter": {"total": 0, "applicable": 0, "filtered_out": 0, "reason_counts": {}},
+        "component_near_threshold": {},
+        "pair_agreement": {},
+        "weight_context": {},
+        "weighted_candidates": {
+            "count": 0.0,
+            "weighted_sum": 0.0,
+            "min": 0.0,
+            "max": 0.0,
+            "below_combo_threshold": 0.0,
+            "gap_sum": 0.0,
+            "max_gap": 0.0,
+        },
+        "agree_hist": {},
+        "drop_reasons": {},
     }
-    agree_hist: Dict[str, int] = {}
-    drop_reasons: Dict[str, int] = {}
-    for diag in combo_diags:
-        if not weight_context:
-            weight_context = {
-                "base_weights": dict(diag.get("base_weights") or {}),
-                "health_multipliers": dict(diag.get("health_multipliers") or {}),
-                "health_evidence": dict(diag.get("health_evidence") or {}),
-                "pre_normalized_weights": dict(diag.get("pre_normalized_weights") or {}),
-                "weights": dict(diag.get("weights") or {}),
-            }
-        for key, value in (diag.get("component_available") or {}).items():
-            component_available[str(key)] = int(component_available.get(str(key), 0) or 0) + int(value or 0)
-        for key, value in (diag.get("component_pass") or {}).items():
-            component_pass[str(key)] = int(component_pass.get(str(key), 0) or 0) + int(value or 0)
-        for key, payload in (diag.get("component_score_stats") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg = _float_or_default(payload.get("avg"), 0.0)
-            min_score = _float_or_default(payload.get("min"), avg)
-            max_score = _float_or_default(payload.get("max"), avg)
-            p50 = _float_or_default(payload.get("p50"), avg)
-            item = component_score_stats.setdefault(
-                str(key),
-                {"count": 0.0, "weighted_sum": 0.0, "min": min_score, "max": max_score, "p50_weighted_sum": 0.0},
-            )
-            item["count"] += float(count)
-            item["weighted_sum"] += avg * float(count)
-            item["p50_weighted_sum"] += p50 * float(count)
-            item["min"] = min(float(item.get("min", min_score)), min_score)
-            item["max"] = max(float(item.get("max", max_score)), max_score)
-        for key, payload in (diag.get("component_timing_ms") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg_ms = _float_or_default(payload.get("avg"), 0.0)
-            max_ms = _float_or_default(payload.get("max"), avg_ms)
-            item = component_timing_stats.setdefault(str(key), {"count": 0.0, "weighted_sum": 0.0, "max": max_ms})
-            item["count"] += float(count)
-            item["weighted_sum"] += avg_ms * float(count)
-            item["max"] = max(float(item.get("max", max_ms)), max_ms)
-        for key, payload in (diag.get("component_score_cache") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            item = component_cache_stats.setdefault(str(key), {"hit": 0, "miss": 0})
-            item["hit"] = int(item.get("hit", 0) or 0) + int(payload.get("hit", 0) or 0)
-            item["miss"] = int(item.get("miss", 0) or 0) + int(payload.get("miss", 0) or 0)
-        for key, payload in (diag.get("v8_stage_timing_ms") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg_ms = _float_or_default(payload.get("avg"), 0.0)
-            max_ms = _float_or_default(payload.get("max"), avg_ms)
-            item = v8_stage_timing_stats.setdefault(str(key), {"count": 0.0, "weighted_sum": 0.0, "max": max_ms})
-            item["count"] += float(count)
-            item["weighted_sum"] += avg_ms * float(count)
-            item["max"] = max(float(item.get("max", max_ms)), max_ms)
-        for key, payload in (diag.get("v7_stage_timing_ms") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg_ms = _float_or_default(payload.get("avg"), 0.0)
-            max_ms = _float_or_default(payload.get("max"), avg_ms)
-            item = v7_stage_timing_stats.setdefault(str(key), {"count": 0.0, "weighted_sum": 0.0, "max": max_ms})
-            item["count"] += float(count)
-            item["weighted_sum"] += avg_ms * float(count)
-            item["max"] = max(float(item.get("max", max_ms)), max_ms)
-        for key, payload in (diag.get("v5_score_breakdown") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            count = int(payload.get("count", 0) or 0)
-            if count <= 0:
-                continue
-            avg = _float_or_default(payload.get("avg"), 0.0)
-            min_value = _float_or_default(payload.get("min"), avg)
-            max_value = _float_or_default(payload.get("max"), avg)
-            item = v5_score_breakdown_stats.setdefault(
-                str(key),
-                {"count": 0.0, "weighted_sum": 0.0, "min": min_value, "max": max_value},
-            )
-            item["count"] += float(count)
-            item["weighted_sum"] += avg * float(count)
-            item["min"] = min(float(item.get("min", min_value)), min_value)
-            item["max"] = max(float(item.get("max", max_value)), max_value)
-        for key, value in (diag.get("v5_synergy_combo_counts") or {}).items():
-            v5_synergy_combo_counts[str(key)] = int(v5_synergy_combo_counts.get(str(key), 0) or 0) + int(value or 0)
-        for key, value in (diag.get("v5_risk_reason_counts") or {}).items():
-            v5_risk_reason_counts[str(key)] = int(v5_risk_reason_counts.get(str(key), 0) or 0) + int(value or 0)
-        candidate_filter = diag.get("v5_candidate_filter")
-        if isinstance(candidate_filter, dict):
-            v5_candidate_filter["total"] = int(v5_candidate_filter["total"]) + int(candidate_filter.get("total", 0) or 0)
-            v5_candidate_filter["applicable"] = int(v5_candidate_filter["applicable"]) + int(candidate_filter.get("applicable", 0) or 0)
-            v5_candidate_filter["filtered_out"] = int(v5_candidate_filter["filtered_out"]) + int(candidate_filter.get("filtered_out", 0) or 0)
-            reason_counts = v5_candidate_filter["reason_counts"]
-            if isinstance(reason_counts, dict):
-                for key, value in (candidate_filter.get("reason_counts") or {}).items():
-                    reason_counts[str(key)] = int(reason_counts.get(str(key), 0) or 0) + int(value or 0)
-        for key, payload in (diag.get("component_near_threshold") or {}).items():
-            if not isinstance(payload, dict):
-                continue
-            item = component_near_threshold.setdefault(str(key), {})
-            for bucket, value in payload.items():
-                item[str(bucket)] = int(item.get(str(bucket), 0) or 0) + int(value or 0)
-        for key, value in (diag.get("pair_agreement") or {}).items():
-            pair_agreement[str(key)] = int(pair_agreement.get(str(key), 0) or 0) + int(value or 0)
-        candidates = diag.get("weighted_consensus_candidates")
-        if isinstance(candidates, dict):
-            count = int(candidates.get("count", 0) or 0)
-            if count > 0:
-                avg = _float_or_default(candidates.get("avg"), 0.0)
-                min_value = _float_or_default(candidates.get("min"), avg)
-                max_value = _float_or_default(candidates.get("max"), avg)
-                if int(weighted_candidates["count"]) <= 0:
-                    weighted_candidates["min"] = min_value
-                    weighted_candidates["max"] = max_value
-                weighted_candidates["count"] += float(count)
-                weighted_candidates["weighted_sum"] += avg * float(count)
-                weighted_candidates["min"] = min(float(weighted_candidates["min"]), min_value)
-                weighted_candidates["max"] = max(float(weighted_candidates["max"]), max_value)
-                below = int(candidates.get("below_combo_threshold", 0) or 0)
-                weighted_candidates["below_combo_threshold"] += float(below)
-                weighted_candidates["gap_sum"] += _float_or_default(candidates.get("avg_gap"), 0.0) * float(below)
-                weighted_candidates["max_gap"] = max(float(weighted_candidates["max_gap"]), _float_or_default(candidates.get("max_gap"), 0.0))
-        for key, value in (diag.get("agree_count_histogram") or {}).items():
-            agree_hist[str(key)] = int(agree_hist.get(str(key), 0) or 0) + int(value or 0)
-        for key, value in (diag.get("drop_reasons") or {}).items():
-            drop_reasons[str(key)] = int(drop_reasons.get(str(key), 0) or 0) + int(value or 0)
+
+
+def _fold_combo_diagnostic(state: JsonDict, diag: JsonDict) -> None:
+    state["count"] += 1
+    state["evaluated"] += int(diag.get("evaluated", 0) or 0)
+    if not state["weight_context"]:
+        state["weight_context"] = {
+            "base_weights": dict(diag.get("base_weights") or {}),
+            "health_multipliers": dict(diag.get("health_multipliers") or {}),
+            "health_evidence": dict(diag.get("health_evidence") or {}),
+            "pre_normalized_weights": dict(diag.get("pre_normalized_weights") or {}),
+            "weights": dict(diag.get("weights") or {}),
+        }
+    _merge_count_map(state["component_available"], diag.get("component_available") or {})
+    _merge_count_map(state["component_pass"], diag.get("component_pass") or {})
+    _fold_min_max_metrics(state["component_score_stats"], diag.get("component_score_stats") or {}, with_p50=True)
+    _fold_max_metrics(state["component_timing_stats"], diag.get("component_timing_ms") or {})
+    for key, payload in (diag.get("component_score_cache") or {}).items():
+        if not isinstance(payload, dict):
+            continue
+        item = state["component_cache_stats"].setdefault(str(key), {"hit": 0, "miss": 0})
+        item["hit"] = int(item.get("hit", 0) or 0) + int(payload.get("hit", 0) or 0)
+        item["miss"] = int(item.get("miss", 0) or 0) + int(payload.get("miss", 0) or 0)
+    _fold_max_metrics(state["v8_stage_timing_stats"], diag.get("v8_stage_timing_ms") or {})
+    _fold_max_metrics(state["v7_stage_timing_stats"], diag.get("v7_stage_timing_ms") or {})
+    _fold_min_max_metrics(state["v5_score_breakdown_stats"], diag.get("v5_score_breakdown") or {})
+    _merge_count_map(state["v5_synergy_combo_counts"], diag.get("v5_synergy_combo_counts") or {})
+    _merge_count_map(state["v5_risk_reason_counts"], diag.get("v5_risk_reason_counts") or {})
+    candidate_filter = diag.get("v5_candidate_filter")
+    if isinstance(candidate_filter, dict):
+        v5_candidate_filter = state["v5_candidate_filter"]
+        v5_candidate_filter["total"] = int(v5_candidate_filter["total"]) + int(candidate_filter.get("total", 0) or 0)
+        v5_candidate_filter["applicable"] = int(v5_candidate_filter["applicable"]) + int(candidate_filter.get("applicable", 0) or 0)
+        v5_candidate_filter["filtered_out"] = int(v5_candidate_filter["filtered_out"]) + int(candidate_filter.get("filtered_out", 0) or 0)
+        _merge_count_map(v5_candidate_filter["reason_counts"], candidate_filter.get("reason_counts") or {})
+    for key, payload in (diag.get("component_near_threshold") or {}).items():
+        if not isinstance(payload, dict):
+            continue
+        _merge_count_map(state["component_near_threshold"].setdefault(str(key), {}), payload)
+    _merge_count_map(state["pair_agreement"], diag.get("pair_agreement") or {})
+    candidates = diag.get("weighted_consensus_candidates")
+    if isinstance(candidates, dict):
+        count = int(candidates.get("count", 0) or 0)
+        if count > 0:
+            weighted_candidates = state["weighted_candidates"]
+            avg = _float_or_default(candidates.get("avg"), 0.0)
+            min_value = _float_or_default(candidates.get("min"), avg)
+            max_value = _float_or_default(candidates.get("max"), avg)
+            if int(weighted_candidates["count"]) <= 0:
+                weighted_candidates["min"] = min_value
+                weighted_candidates["max"] = max_value
+            weighted_candidates["count"] += float(count)
+            weighted_candidates["weighted_sum"] += avg * float(count)
+            weighted_candidates["min"] = min(float(weighted_candidates["min"]), min_value)
+            weighted_candidates["max"] = max(float(weighted_candidates["max"]), max_value)
+            below = int(candidates.get("below_combo_threshold", 0) or 0)
+            weighted_candidates["below_combo_threshold"] += float(below)
+            weighted_candidates["gap_sum"] += _float_or_default(candidates.get("avg_gap"), 0.0) * float(below)
+            weighted_candidates["max_gap"] = max(float(weighted_candidates["max_gap"]), _float_or_default(candidates.get("max_gap"), 0.0))
+    _merge_count_map(state["agree_hist"], diag.get("agree_count_histogram") or {})
+    _merge_count_map(state["drop_reasons"], diag.get("drop_reasons") or {})
+
+
+def _freeze_combo_state(state: JsonDict, *, total_count: int) -> JsonDict:
+    component_available = state["component_available"]
+    component_pass = state["component_pass"]
     component_pass_rate = {
         key: (float(component_pass.get(key, 0)) / float(value)) if int(value or 0) > 0 else 0.0
         for key, value in component_available.items()
     }
-    frozen_score_stats: Dict[str, JsonDict] = {}
-    for key, payload in component_score_stats.items():
-        count = int(payload.get("count", 0.0) or 0.0)
-        if count <= 0:
-            continue
-        frozen_score_stats[key] = {
-            "count": count,
-            "avg": float(payload.get("weighted_sum", 0.0) or 0.0) / float(count),
-            "min": float(payload.get("min", 0.0) or 0.0),
-            "max": float(payload.get("max", 0.0) or 0.0),
-            "p50": float(payload.get("p50_weighted_sum", 0.0) or 0.0) / float(count),
-        }
-    frozen_timing_stats: Dict[str, JsonDict] = {}
-    for key, payload in component_timing_stats.items():
-        count = int(payload.get("count", 0.0) or 0.0)
-        if count <= 0:
-            continue
-        frozen_timing_stats[key] = {
-            "count": count,
-            "avg": float(payload.get("weighted_sum", 0.0) or 0.0) / float(count),
-            "max": float(payload.get("max", 0.0) or 0.0),
-        }
     frozen_cache_stats: Dict[str, JsonDict] = {}
-    for key, payload in component_cache_stats.items():
+    for key, payload in state["component_cache_stats"].items():
         hit = int(payload.get("hit", 0) or 0)
         miss = int(payload.get("miss", 0) or 0)
         total = hit + miss
@@ -926,63 +920,34 @@ def _aggregate_combo_diagnostics(combo_diags: Sequence[JsonDict], *, total_count
             "miss": miss,
             "hit_rate": (float(hit) / float(total)) if total > 0 else 0.0,
         }
-    frozen_v8_stage_timing: Dict[str, JsonDict] = {}
-    for key, payload in v8_stage_timing_stats.items():
-        count = int(payload.get("count", 0.0) or 0.0)
-        if count <= 0:
-            continue
-        frozen_v8_stage_timing[key] = {
-            "count": count,
-            "avg": float(payload.get("weighted_sum", 0.0) or 0.0) / float(count),
-            "max": float(payload.get("max", 0.0) or 0.0),
-        }
-    frozen_v7_stage_timing: Dict[str, JsonDict] = {}
-    for key, payload in v7_stage_timing_stats.items():
-        count = int(payload.get("count", 0.0) or 0.0)
-        if count <= 0:
-            continue
-        frozen_v7_stage_timing[key] = {
-            "count": count,
-            "avg": float(payload.get("weighted_sum", 0.0) or 0.0) / float(count),
-            "max": float(payload.get("max", 0.0) or 0.0),
-        }
-    frozen_v5_score_breakdown: Dict[str, JsonDict] = {}
-    for key, payload in v5_score_breakdown_stats.items():
-        count = int(payload.get("count", 0.0) or 0.0)
-        if count <= 0:
-            continue
-        frozen_v5_score_breakdown[key] = {
-            "count": count,
-            "avg": float(payload.get("weighted_sum", 0.0) or 0.0) / float(count),
-            "min": float(payload.get("min", 0.0) or 0.0),
-            "max": float(payload.get("max", 0.0) or 0.0),
-        }
+    v5_candidate_filter = state["v5_candidate_filter"]
+    weighted_candidates = state["weighted_candidates"]
     return {
         "available": True,
         "diagnostic_count": int(total_count),
-        "combo_consensus_count": len(combo_diags),
-        "evaluated": evaluated,
-        "component_available": component_available,
-        "component_pass": component_pass,
+        "combo_consensus_count": int(state["count"]),
+        "evaluated": int(state["evaluated"]),
+        "component_available": dict(component_available),
+        "component_pass": dict(component_pass),
         "component_pass_rate": component_pass_rate,
-        "component_score_stats": frozen_score_stats,
-        "component_timing_ms": frozen_timing_stats,
+        "component_score_stats": _freeze_min_max_metrics(state["component_score_stats"], with_p50=True),
+        "component_timing_ms": _freeze_max_metrics(state["component_timing_stats"]),
         "component_score_cache": frozen_cache_stats,
-        "v8_stage_timing_ms": frozen_v8_stage_timing,
-        "v7_stage_timing_ms": frozen_v7_stage_timing,
-        "v5_score_breakdown": frozen_v5_score_breakdown,
-        "v5_synergy_combo_counts": v5_synergy_combo_counts,
-        "v5_risk_reason_counts": v5_risk_reason_counts,
+        "v8_stage_timing_ms": _freeze_max_metrics(state["v8_stage_timing_stats"]),
+        "v7_stage_timing_ms": _freeze_max_metrics(state["v7_stage_timing_stats"]),
+        "v5_score_breakdown": _freeze_min_max_metrics(state["v5_score_breakdown_stats"]),
+        "v5_synergy_combo_counts": dict(state["v5_synergy_combo_counts"]),
+        "v5_risk_reason_counts": dict(state["v5_risk_reason_counts"]),
         "v5_candidate_filter": {
             "total": int(v5_candidate_filter["total"]),
             "applicable": int(v5_candidate_filter["applicable"]),
             "filtered_out": int(v5_candidate_filter["filtered_out"]),
             "applicable_rate": (float(v5_candidate_filter["applicable"]) / float(v5_candidate_filter["total"])) if int(v5_candidate_filter["total"]) > 0 else 0.0,
-            "reason_counts": dict(v5_candidate_filter["reason_counts"]) if isinstance(v5_candidate_filter["reason_counts"], dict) else {},
+            "reason_counts": dict(v5_candidate_filter["reason_counts"]),
         },
-        "component_near_threshold": component_near_threshold,
-        "weight_context": weight_context,
-        "pair_agreement": pair_agreement,
+        "component_near_threshold": {key: dict(value) for key, value in state["component_near_threshold"].items()},
+        "weight_context": state["weight_context"],
+        "pair_agreement": dict(state["pair_agreement"]),
         "weighted_consensus_candidates": {
             "count": int(weighted_candidates["count"]),
             "avg": (float(weighted_candidates["weighted_sum"]) / float(weighted_candidates["count"])) if weighted_candidates["count"] > 0 else 0.0,
@@ -992,8 +957,8 @@ def _aggregate_combo_diagnostics(combo_diags: Sequence[JsonDict], *, total_count
             "avg_gap": (float(weighted_candidates["gap_sum"]) / float(weighted_candidates["below_combo_threshold"])) if weighted_candidates["below_combo_threshold"] > 0 else 0.0,
             "max_gap": float(weighted_candidates["max_gap"]),
         },
-        "agree_count_histogram": agree_hist,
-        "drop_reasons": drop_reasons,
+        "agree_count_histogram": dict(state["agree_hist"]),
+        "drop_reasons": dict(state["drop_reasons"]),
     }
 
 
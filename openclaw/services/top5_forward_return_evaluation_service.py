@@ -18,6 +18,9 @@ import sqlite3
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Sequence
 
+from openclaw.services.schema_catalog_service import table_exists
+from openclaw.services.signal_item_forward_return_service import materialized_forward_returns
+
 JsonDict = Dict[str, Any]
 
 
@@ -67,74 +70,48 @@ def resolve_as_of_trade_date_compact(
     return "", notes
 
 
-def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
-    row = conn.execute(
-        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1",
-        (str(name),),
-    ).fetchone()
-    return row is not None
-
 
-def _forward_window_rows(
+def forward_returns_for_symbol(
     conn: sqlite3.Connection,
     *,
     ts_code: str,
     as_of_compact: str,
-    max_holding_days: int,
-) -> List[tuple[str, float]]:
-    """Rows ordered ascending trade_date from first session on/after as_of."""
-    row = conn.execute(
-        """
-        SELECT trade_date, close_price
-        FROM daily_trading_data
-        WHERE ts_code = ?
-          AND REPLACE(REPLACE(trade_date, '-', ''), '/', '') >= ?
-          AND close_price IS NOT NULL
-        ORDER BY REPLACE(REPLACE(trade_date, '-', ''), '/', '') ASC
-        LIMIT ?
-        """,
-        (str(ts_code or "").strip(), str(as_of_compact), int(max_holding_days) + 1),
-    ).fetchall()
-    return [(str(r[0] or ""), float(r[1] or 0.0)) for r in row]
+    horizons: Sequence[int],
+) -> JsonDict:
+    return forward_returns_for_symbols(conn, ts_codes=[ts_code], as_of_compact=as_of_compact, horizons=horizons)[0]
 
 
-def forward_returns_for_symbol(
+def forward_returns_for_symbols(
     conn: sqlite3.Connection,
     *,
-    ts_code: str,
+    ts_codes: Sequence[str],
     as_of_compact: str,
     horizons: Sequence[int],
-) -> JsonDict:
-    if not _table_exists(conn, "daily_trading_data"):
-        return {
-            str(h): {"available": False, "blocking_reason": "missing_daily_trading_data_table"}
-            for h in horizons
-        }
+) -> List[JsonDict]:
+    """``forward_returns_for_symbol`` for many symbols from one batched price read."""
+    if not table_exists(conn, "daily_trading_data"):
+        return [
+            {str(h): {"available": False, "blocking_reason": "missing_daily_trading_data_table"} for h in horizons}
+            for _ in ts_codes
+        ]
     pos = [int(h) for h in horizons if int(h) > 0]
     if not pos:
-        return {}
-    max_h = max(pos)
-    rows = _forward_window_rows(conn, ts_code=ts_code, as_of_compact=as_of_compact, max_holding_days=max_h)
-    out: JsonDict = {}
-    for h in pos:
-        if len(rows) < h + 1:
-            out[str(h)] = {
-                "available": False,
-                "blocking_reason": "insufficient_forward_price_window",
-                "price_count": len(rows),
-            }
-            continue
-        entry_px = float(rows[0][1] or 0.0)
-        exit_px = float(rows[h][1] or 0.0)
-        if entry_px <= 0.0 or exit_px <= 0.0:
-            out[str(h)] = {"available": False, "blocking_reason": "invalid_close_price"}
-            continue
-        out[str(h)] = {
-            "available": True,
-            "entry_trade_date": rows[0][0],
-            "exit_trade_date": rows[h][0],
-            "return_pct": (exit_px / entry_px - 1.0) * 100.0,
-        }
+        return [{} for _ in ts_codes]
+    replays = materialized_forward_returns(
+        conn,
+        [(str(ts_code or "").strip(), str(as_of_compact), pos) for ts_code in ts_codes],
+        date_key="compact",
+        invalid_price_reason="invalid_close_price",
+    )
+    out: List[JsonDict] = []
+    for replay in replays:
+        cells: JsonDict = {}
+        for h in pos:
+            cell = replay[h]
+            if cell.get("available") is True:
+                cell = {key: cell[key] for key in ("available", "entry_trade_date", "exit_trade_date", "return_pct")}
+            cells[str(h)] = cell
+        out.append(cells)
     return out
 
 
@@ -167,16 +144,16 @@ def evaluate_top5_forward_returns(
     pos_horizons = sorted({int(h) for h in horizons if int(h) > 0})
     per_symbol: List[JsonDict] = []
     weight_sum = 0.0
-    for row in top5_rows:
-        ts_code = str(row.get("ts_code") or "").strip()
+    ts_codes = [str(row.get("ts_code") or "").strip() for row in top5_rows]
+    forwards = (
+        forward_returns_for_symbols(conn, ts_codes=ts_codes, as_of_compact=as_of, horizons=pos_horizons)
+        if as_of
+        else [{str(h): {"available": False, "blocking_reason": "missing_as_of_trade_date"} for h in pos_horizons} for _ in ts_codes]
+    )
+    for row, ts_code, fwd in zip(top5_rows, ts_codes, forwards):
         weight = float(row.get("weight") or 0.0)
         if ts_code:
             weight_sum += weight
-        fwd = (
-            forward_returns_for_symbol(conn, ts_code=ts_code, as_of_compact=as_of, horizons=pos_horizons)
-            if as_of
-            else {str(h): {"available": False, "blocking_reason": "missing_as_of_trade_date"} for h in pos_horizons}
-        )
         per_symbol.append({"ts_code": ts_code, "weight": weight, "forward": fwd})
 
     portfolio_by_h: Dict[str, JsonDict] = {}
@@ -2,11 +2,64 @@ from __future__ import annotations
 
 import math
 import sqlite3
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, Iterable, Sequence
+
+from openclaw.services.schema_catalog_service import SchemaSnapshot, schema_snapshot, table_columns, table_exists
 
 
 JsonDict = Dict[str, Any]
 
+PRICE_WINDOW_DAYS = 60
+# Placeholders per batch query; stays under SQLite's historical 999-variable cap.
+BATCH_KEY_CHUNK = 500
+EVENT_SOURCES: tuple[JsonDict, ...] = (
+    {
+        "table": "top_inst",
+        "date_col": "trade_date",
+        "event_type": "top_inst",
+        "directional_prior": "institution_flow_sensitive",
+        "magnitude_col": "net_buy",
+        "reason_col": "reason",
+        "limit": 3,
+    },
+    {
+        "table": "hm_detail_daily",
+        "date_col": "trade_date",
+        "event_type": "hot_money",
+        "directional_prior": "high_turnover_event_risk",
+        "magnitude_col": "net_amount",
+        "reason_col": "hm_name",
+        "limit": 3,
+    },
+    {
+        "table": "repurchase_events",
+        "date_col": "ann_date",
+        "event_type": "repurchase",
+        "directional_prior": "capital_return_positive_but_event_driven",
+        "magnitude_col": "amount",
+        "reason_col": "proc",
+        "limit": 2,
+    },
+    {
+        "table": "share_float_events",
+        "date_col": "ann_date",
+        "event_type": "share_float_unlock",
+        "directional_prior": "supply_overhang_risk",
+        "magnitude_col": "float_ratio",
+        "reason_col": "share_type",
+        "limit": 2,
+    },
+    {
+        "table": "stk_surv_events",
+        "date_col": "surv_date",
+        "event_type": "institution_survey",
+        "directional_prior": "attention_event_not_alpha",
+        "magnitude_col": "fund_visitors",
+        "reason_col": "rece_mode",
+        "limit": 2,
+    },
+)
+
 
 def build_tushare_pro_alpha_features(
     conn: sqlite3.Connection,
@@ -31,60 +84,243 @@ def build_tushare_pro_alpha_features(
     if blocking:
         return _empty(blocking)
 
-    price_rows = _price_window(conn, ts_code=code, as_of_date=date, limit=60)
-    latest_price = price_rows[-1] if price_rows else {}
-    money_flow = _latest_row(
+    inputs = _symbol_inputs(conn, ts_code=code, as_of_date=date)
+    return _assemble_features(code, date, inputs, announcement=_announcement_availability(schema_snapshot(conn)))
+
+
+def build_tushare_pro_alpha_features_batch(
+    conn: sqlite3.Connection,
+    *,
+    ts_codes: Sequence[str],
+    as_of_date: str,
+) -> Dict[str, JsonDict]:
+    """Build ``build_tushare_pro_alpha_features`` payloads for many symbols at once.
+
+    Table schemas are resolved once and every source table is read with one
+    ``ROW_NUMBER() OVER (PARTITION BY ...)`` query for the whole symbol set,
+    so the query count no longer grows with the number of symbols.  Payloads
+    are identical to the per-symbol builder's.
+    """
+
+    date = _compact_date(as_of_date)
+    codes = _unique_codes(ts_codes)
+    if not date:
+        return {code: _empty(["missing_as_of_date"]) for code in codes}
+    schema = schema_snapshot(conn)
+    price = _windowed_rows(
         conn,
-        table="moneyflow_daily",
+        schema,
+        table="daily_trading_data",
+        key_col="ts_code",
+        keys=codes,
         date_col="trade_date",
         as_of_date=date,
-        where="ts_code = ?",
-        params=(code,),
+        limit=PRICE_WINDOW_DAYS,
+        extra_where="close_price IS NOT NULL",
+        strict=True,
     )
-    stock_basic = _latest_stock_basic(conn, code)
-    industry = str(stock_basic.get("industry") or "")
-    sector = _latest_row(
+    stock_basic = _stock_basic_rows(conn, schema, codes)
+    industries = _unique_codes(str((stock_basic.get(code) or {}).get("industry") or "") for code in codes)
+    by_code = {
+        table: _windowed_rows(conn, schema, table=table, key_col="ts_code", keys=codes, date_col=date_col, as_of_date=date, limit=limit)
+        for table, date_col, limit in (
+            ("moneyflow_daily", "trade_date", 5),
+            ("top_list", "trade_date", 1),
+            ("top_inst", "trade_date", 8),
+            ("hm_detail_daily", "trade_date", 5),
+            ("margin_detail", "trade_date", 5),
+            ("stk_auction_daily", "trade_date", 1),
+            ("stk_factor_pro_daily", "trade_date", 1),
+            ("cyq_perf_daily", "trade_date", 1),
+        )
+    }
+    events = {
+        spec["table"]: _windowed_rows(
+            conn,
+            schema,
+            table=spec["table"],
+            key_col="ts_code",
+            keys=codes,
+            date_col=spec["date_col"],
+            as_of_date=date,
+            limit=spec["limit"],
+        )
+        for spec in EVENT_SOURCES
+        if spec["table"] not in by_code
+    }
+    sector = _windowed_rows(
         conn,
+        schema,
         table="moneyflow_ind_ths",
+        key_col="industry",
+        keys=industries,
         date_col="trade_date",
         as_of_date=date,
-        where="industry = ?",
-        params=(industry,),
-    ) if industry else {}
-    top_list = _latest_row(
-        conn,
-        table="top_list",
-        date_col="trade_date",
-        as_of_date=date,
-        where="ts_code = ?",
-        params=(code,),
+        limit=5,
     )
-    event_facts = _event_facts(conn, ts_code=code, as_of_date=date, latest_price=latest_price, top_list=top_list)
-    hard_alpha = _hard_alpha_evidence(
-        conn,
+    announcement = _announcement_availability(schema)
+
+    out: Dict[str, JsonDict] = {}
+    for code in codes:
+        basic = stock_basic.get(code) or {}
+        industry = str(basic.get("industry") or "")
+        money_rows = by_code["moneyflow_daily"].get(code, [])
+        sector_rows = sector.get(industry, []) if industry else []
+        inputs = {
+            "price_rows": _price_rows(price.get(code, [])),
+            "stock_basic": basic,
+            "money_flow": _first(money_rows),
+            "sector": _first(sector_rows),
+            "top_list": _first(by_code["top_list"].get(code, [])),
+            "factor": _first(by_code["stk_factor_pro_daily"].get(code, [])),
+            "cyq": _first(by_code["cyq_perf_daily"].get(code, [])),
+            "auction": _first(by_code["stk_auction_daily"].get(code, [])),
+            "money_rows": money_rows,
+            "top_inst_rows": by_code["top_inst"].get(code, []),
+            "hot_money_rows": by_code["hm_detail_daily"].get(code, []),
+            "sector_rows": sector_rows,
+            "margin_rows": by_code["margin_detail"].get(code, []),
+            "event_rows": [
+                _facts_from_rows(
+                    spec,
+                    code,
+                    (by_code.get(spec["table"]) or events.get(spec["table"]) or {}).get(code, [])[: spec["limit"]],
+                    schema.columns(spec["table"]),
+                )
+                for spec in EVENT_SOURCES
+            ],
+        }
+        out[code] = _assemble_features(code, date, inputs, announcement=announcement)
+    return out
+
+
+def _symbol_inputs(conn: sqlite3.Connection, *, ts_code: str, as_of_date: str) -> JsonDict:
+    code, date = ts_code, as_of_date
+    stock_basic = _latest_stock_basic(conn, code)
+    industry = str(stock_basic.get("industry") or "")
+    return {
+        "price_rows": _price_window(conn, ts_code=code, as_of_date=date, limit=PRICE_WINDOW_DAYS),
+        "stock_basic": stock_basic,
+        "money_flow": _latest_row(
+            conn,
+            table="moneyflow_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+        ),
+        "sector": _latest_row(
+            conn,
+            table="moneyflow_ind_ths",
+            date_col="trade_date",
+            as_of_date=date,
+            where="industry = ?",
+            params=(industry,),
+        ) if industry else {},
+        "top_list": _latest_row(
+            conn,
+            table="top_list",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+        ),
+        "factor": _latest_row(
+            conn,
+            table="stk_factor_pro_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+        ),
+        "cyq": _latest_row(
+            conn,
+            table="cyq_perf_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+        ),
+        "auction": _latest_row(
+            conn,
+            table="stk_auction_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+        ),
+        "money_rows": _recent_rows(
+            conn,
+            table="moneyflow_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+            limit=5,
+        ),
+        "top_inst_rows": _recent_rows(
+            conn,
+            table="top_inst",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+            limit=8,
+        ),
+        "hot_money_rows": _recent_rows(
+            conn,
+            table="hm_detail_daily",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+            limit=5,
+        ),
+        "sector_rows": _recent_rows(
+            conn,
+            table="moneyflow_ind_ths",
+            date_col="trade_date",
+            as_of_date=date,
+            where="industry = ?",
+            params=(industry,),
+            limit=5,
+        ) if industry else [],
+        "margin_rows": _recent_rows(
+            conn,
+            table="margin_detail",
+            date_col="trade_date",
+            as_of_date=date,
+            where="ts_code = ?",
+            params=(code,),
+            limit=5,
+        ),
+        "event_rows": [_event_rows(conn, ts_code=code, as_of_date=date, **spec) for spec in EVENT_SOURCES],
+    }
+
+
+def _assemble_features(code: str, date: str, inputs: JsonDict, *, announcement: JsonDict) -> JsonDict:
+    price_rows = inputs["price_rows"]
+    latest_price = price_rows[-1] if price_rows else {}
+    money_flow = inputs["money_flow"]
+    stock_basic = inputs["stock_basic"]
+    industry = str(stock_basic.get("industry") or "")
+    sector = inputs["sector"]
+    top_list = inputs["top_list"]
+    event_facts = _event_facts(
         ts_code=code,
-        as_of_date=date,
-        industry=industry,
+        latest_price=latest_price,
+        top_list=top_list,
+        event_rows=inputs["event_rows"],
+    )
+    hard_alpha = _hard_alpha_evidence(
+        inputs,
         price_rows=price_rows,
         latest_price=latest_price,
         event_facts=event_facts,
+        announcement=announcement,
     )
-    factor = _latest_row(
-        conn,
-        table="stk_factor_pro_daily",
-        date_col="trade_date",
-        as_of_date=date,
-        where="ts_code = ?",
-        params=(code,),
-    )
-    cyq = _latest_row(
-        conn,
-        table="cyq_perf_daily",
-        date_col="trade_date",
-        as_of_date=date,
-        where="ts_code = ?",
-        params=(code,),
-    )
+    factor = inputs["factor"]
+    cyq = inputs["cyq"]
 
     scores = {
         "momentum": _momentum_score(price_rows, factor),
@@ -146,7 +382,7 @@ def _empty(blocking: Sequence[str]) -> JsonDict:
 
 
 def _price_window(conn: sqlite3.Connection, *, ts_code: str, as_of_date: str, limit: int) -> list[JsonDict]:
-    if not _table_exists(conn, "daily_trading_data"):
+    if not table_exists(conn, "daily_trading_data"):
         return []
     rows = conn.execute(
         """
@@ -160,13 +396,19 @@ def _price_window(conn: sqlite3.Connection, *, ts_code: str, as_of_date: str, li
         """,
         (ts_code, as_of_date, int(limit)),
     ).fetchall()
+    columns = ("trade_date", "close_price", "pct_chg", "amount", "turnover_rate")
+    return _price_rows([dict(zip(columns, row)) for row in rows])
+
+
+def _price_rows(rows: Sequence[JsonDict]) -> list[JsonDict]:
+    """Newest-first ``daily_trading_data`` rows as the oldest-first price window."""
     out = [
         {
-            "trade_date": str(row[0] or ""),
-            "close": _num(row[1]),
-            "pct_chg": _num(row[2]),
-            "amount": _num(row[3]),
-            "turnover_rate": _num(row[4]),
+            "trade_date": str(row.get("trade_date") or ""),
+            "close": _num(row.get("close_price")),
+            "pct_chg": _num(row.get("pct_chg")),
+            "amount": _num(row.get("amount")),
+            "turnover_rate": _num(row.get("turnover_rate")),
         }
         for row in rows
     ]
@@ -182,7 +424,7 @@ def _latest_row(
     where: str,
     params: Sequence[Any],
 ) -> JsonDict:
-    if not _table_exists(conn, table):
+    if not table_exists(conn, table):
         return {}
     try:
         row = conn.execute(
@@ -200,17 +442,17 @@ def _latest_row(
         return {}
     if not row:
         return {}
-    columns = [str(item[1] or "") for item in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+    columns = table_columns(conn, table)
     return {column: row[idx] for idx, column in enumerate(columns)}
 
 
 def _latest_stock_basic(conn: sqlite3.Connection, ts_code: str) -> JsonDict:
-    if not _table_exists(conn, "stock_basic"):
+    if not table_exists(conn, "stock_basic"):
         return {}
     row = conn.execute("SELECT * FROM stock_basic WHERE ts_code = ? LIMIT 1", (ts_code,)).fetchone()
     if not row:
         return {}
-    columns = [str(item[1] or "") for item in conn.execute("PRAGMA table_info(stock_basic)").fetchall()]
+    columns = table_columns(conn, "stock_basic")
     return {column: row[idx] for idx, column in enumerate(columns)}
 
 
@@ -283,12 +525,11 @@ def _quality_low_vol_score(
 
 
 def _event_facts(
-    conn: sqlite3.Connection,
     *,
     ts_code: str,
-    as_of_date: str,
     latest_price: JsonDict,
     top_list: JsonDict,
+    event_rows: Sequence[Sequence[JsonDict]],
 ) -> list[JsonDict]:
     facts: list[JsonDict] = []
     if top_list:
@@ -303,76 +544,8 @@ def _event_facts(
                 reason=top_list.get("reason"),
             )
         )
-    facts.extend(
-        _event_rows(
-            conn,
-            table="top_inst",
-            date_col="trade_date",
-            ts_code=ts_code,
-            as_of_date=as_of_date,
-            event_type="top_inst",
-            directional_prior="institution_flow_sensitive",
-            magnitude_col="net_buy",
-            reason_col="reason",
-            limit=3,
-        )
-    )
-    facts.extend(
-        _event_rows(
-            conn,
-            table="hm_detail_daily",
-            date_col="trade_date",
-            ts_code=ts_code,
-            as_of_date=as_of_date,
-            event_type="hot_money",
-            directional_prior="high_turnover_event_risk",
-            magnitude_col="net_amount",
-            reason_col="hm_name",
-            limit=3,
-        )
-    )
-    facts.extend(
-        _event_rows(
-            conn,
-            table="repurchase_events",
-            date_col="ann_date",
-            ts_code=ts_code,
-            as_of_date=as_of_date,
-            event_type="repurchase",
-            directional_prior="capital_return_positive_but_event_driven",
-            magnitude_col="amount",
-            reason_col="proc",
-            limit=2,
-        )
-    )
-    facts.extend(
-        _event_rows(
-            conn,
-            table="share_float_events",
-            date_col="ann_date",
-            ts_code=ts_code,
-            as_of_date=as_of_date,
-            event_type="share_float_unlock",
-            directional_prior="supply_overhang_risk",
-            magnitude_col="float_ratio",
-            reason_col="share_type",
-            limit=2,
-        )
-    )
-    facts.extend(
-        _event_rows(
-            conn,
-            table="stk_surv_events",
-            date_col="surv_date",
-            ts_code=ts_code,
-            as_of_date=as_of_date,
-            event_type="institution_survey",
-            directional_prior="attention_event_not_alpha",
-            magnitude_col="fund_visitors",
-            reason_col="rece_mode",
-            limit=2,
-        )
-    )
+    for rows in event_rows:
+        facts.extend(rows)
     pct = _num(latest_price.get("pct_chg"))
     if abs(pct) >= 9.5:
         facts.append(
@@ -402,9 +575,9 @@ def _event_rows(
     reason_col: str,
     limit: int,
 ) -> list[JsonDict]:
-    if not _table_exists(conn, table):
+    if not table_exists(conn, table):
         return []
-    columns = _columns(conn, table)
+    columns = set(table_columns(conn, table))
     if "ts_code" not in columns or date_col not in columns:
         return []
     magnitude_expr = magnitude_col if magnitude_col in columns else "NULL"
@@ -437,6 +610,24 @@ def _event_rows(
     ]
 
 
+def _facts_from_rows(spec: JsonDict, ts_code: str, rows: Sequence[JsonDict], columns: Sequence[str]) -> list[JsonDict]:
+    """``_event_rows`` output rebuilt from full rows fetched by the batch builder."""
+    if "ts_code" not in columns or spec["date_col"] not in columns:
+        return []
+    return [
+        _event_fact(
+            event_type=spec["event_type"],
+            event_date=row.get(spec["date_col"]),
+            source_table=spec["table"],
+            ts_code=ts_code,
+            directional_prior=spec["directional_prior"],
+            magnitude=_num(row.get(spec["magnitude_col"])),
+            reason=row.get(spec["reason_col"]),
+        )
+        for row in rows
+    ]
+
+
 def _event_fact(
     *,
     event_type: str,
@@ -490,68 +681,19 @@ def _event_score(event_facts: Sequence[JsonDict], latest_price: JsonDict) -> flo
 
 
 def _hard_alpha_evidence(
-    conn: sqlite3.Connection,
+    inputs: JsonDict,
     *,
-    ts_code: str,
-    as_of_date: str,
-    industry: str,
     price_rows: Sequence[JsonDict],
     latest_price: JsonDict,
     event_facts: Sequence[JsonDict],
+    announcement: JsonDict,
 ) -> JsonDict:
-    money_rows = _recent_rows(
-        conn,
-        table="moneyflow_daily",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="ts_code = ?",
-        params=(ts_code,),
-        limit=5,
-    )
-    top_inst_rows = _recent_rows(
-        conn,
-        table="top_inst",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="ts_code = ?",
-        params=(ts_code,),
-        limit=8,
-    )
-    hot_money_rows = _recent_rows(
-        conn,
-        table="hm_detail_daily",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="ts_code = ?",
-        params=(ts_code,),
-        limit=5,
-    )
-    sector_rows = _recent_rows(
-        conn,
-        table="moneyflow_ind_ths",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="industry = ?",
-        params=(industry,),
-        limit=5,
-    ) if industry else []
-    margin_rows = _recent_rows(
-        conn,
-        table="margin_detail",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="ts_code = ?",
-        params=(ts_code,),
-        limit=5,
-    )
-    auction = _latest_row(
-        conn,
-        table="stk_auction_daily",
-        date_col="trade_date",
-        as_of_date=as_of_date,
-        where="ts_code = ?",
-        params=(ts_code,),
-    )
+    money_rows = inputs["money_rows"]
+    top_inst_rows = inputs["top_inst_rows"]
+    hot_money_rows = inputs["hot_money_rows"]
+    sector_rows = inputs["sector_rows"]
+    margin_rows = inputs["margin_rows"]
+    auction = inputs["auction"]
     return {
         "evidence_version": "hard_alpha_event_sources.v1",
         "research_only": True,
@@ -561,7 +703,7 @@ def _hard_alpha_evidence(
         "industry_crowding": _industry_crowding(sector_rows),
         "capacity_liquidity": _capacity_liquidity(latest_price, auction),
         "margin_pressure": _margin_pressure(margin_rows),
-        "announcement_availability": _announcement_availability(conn),
+        "announcement_availability": {key: list(value) for key, value in announcement.items()},
         "source_tables": sorted(
             table
             for table, rows in {
@@ -588,9 +730,9 @@ def _recent_rows(
     params: Sequence[Any],
     limit: int,
 ) -> list[JsonDict]:
-    if not _table_exists(conn, table):
+    if not table_exists(conn, table):
         return []
-    columns = list(_columns_ordered(conn, table))
+    columns = table_columns(conn, table)
     if date_col not in columns:
         return []
     try:
@@ -717,9 +859,9 @@ def _margin_pressure(rows: Sequence[JsonDict]) -> JsonDict:
     }
 
 
-def _announcement_availability(conn: sqlite3.Connection) -> JsonDict:
+def _announcement_availability(schema: SchemaSnapshot) -> JsonDict:
     candidates = ("forecast", "express", "fina_indicator", "anns", "stock_notice")
-    available = [table for table in candidates if _table_exists(conn, table)]
+    available = [table for table in candidates if schema.exists(table)]
     return {
         "available_tables": available,
         "blocking_reasons": [] if available else ["missing_announcement_or_earnings_forecast_tables"],
@@ -803,28 +945,81 @@ def _compact_date(value: Any) -> str:
     return str(value or "").strip().replace("-", "")
 
 
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    try:
-        row = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (str(table),),
-        ).fetchone()
-    except sqlite3.Error:
-        return False
-    return bool(row)
+def _unique_codes(values: Iterable[Any]) -> list[str]:
+    out: list[str] = []
+    seen: set[str] = set()
+    for value in values:
+        text = str(value or "").strip()
+        if text and text not in seen:
+            seen.add(text)
+            out.append(text)
+    return out
 
 
-def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
-    try:
-        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    except sqlite3.Error:
-        return set()
-    return {str(row[1] or "") for row in rows}
+def _first(rows: Sequence[JsonDict]) -> JsonDict:
+    return dict(rows[0]) if rows else {}
 
 
-def _columns_ordered(conn: sqlite3.Connection, table: str) -> list[str]:
-    try:
-        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    except sqlite3.Error:
-        return []
-    return [str(row[1] or "") for row in rows]
+def _windowed_rows(
+    conn: sqlite3.Connection,
+    schema: SchemaSnapshot,
+    *,
+    table: str,
+    key_col: str,
+    keys: Sequence[str],
+    date_col: str,
+    as_of_date: str,
+    limit: int,
+    extra_where: str = "",
+    strict: bool = False,
+) -> Dict[str, list[JsonDict]]:
+    """Newest ``limit`` rows per key at or before ``as_of_date``, newest first.
+
+    One ``ROW_NUMBER()`` query per chunk of keys.  SQL errors yield no rows
+    (as the per-symbol readers did) unless ``strict``.
+    """
+    if not keys or not schema.exists(table):
+        return {}
+    columns = schema.columns(table)
+    date_expr = f"REPLACE({date_col}, '-', '')"
+    extra = f"AND {extra_where}" if extra_where else ""
+    out: Dict[str, list[JsonDict]] = {}
+    for start in range(0, len(keys), BATCH_KEY_CHUNK):
+        chunk = list(keys[start : start + BATCH_KEY_CHUNK])
+        placeholders = ", ".join("?" for _ in chunk)
+        sql = f"""
+            SELECT *
+            FROM (
+                SELECT t.*, ROW_NUMBER() OVER (PARTITION BY {key_col} ORDER BY {date_expr} DESC) AS _batch_rn
+                FROM {table} t
+                WHERE {key_col} IN ({placeholders})
+                  AND {date_expr} <= ?
+                  {extra}
+            )
+            WHERE _batch_rn <= ?
+            ORDER BY {key_col}, _batch_rn
+            """
+        try:
+            rows = conn.execute(sql, tuple(chunk) + (as_of_date, int(limit))).fetchall()
+        except sqlite3.Error:
+            if strict:
+                raise
+            return {}
+        for row in rows:
+            record = {column: row[idx] for idx, column in enumerate(columns)}
+            out.setdefault(str(record.get(key_col) or ""), []).append(record)
+    return out
+
+
+def _stock_basic_rows(conn: sqlite3.Connection, schema: SchemaSnapshot, codes: Sequence[str]) -> Dict[str, JsonDict]:
+    if not codes or not schema.exists("stock_basic"):
+        return {}
+    columns = schema.columns("stock_basic")
+    out: Dict[str, JsonDict] = {}
+    for start in range(0, len(codes), BATCH_KEY_CHUNK):
+        chunk = list(codes[start : start + BATCH_KEY_CHUNK])
+        placeholders = ", ".join("?" for _ in chunk)
+        for row in conn.execute(f"SELECT * FROM stock_basic WHERE ts_code IN ({placeholders})", tuple(chunk)).fetchall():
+            record = {column: row[idx] for idx, column in enumerate(columns)}
+            out.setdefault(str(record.get("ts_code") or ""), record)
+    return out
@@ -41,6 +41,7 @@ from src.primary_result_candidate_basket import (
     DEFAULT_MAX_SINGLE_WEIGHT,
     TARGET_MAX_INDUSTRY_WEIGHT,
 )
+from src.utils.correlation import average_abs_correlation as _average_abs_correlation
 from src.utils.project_paths import resolve_project_path
 from src.utils.serialization import save_json
 from src.utils.update_status import record_manual_run
@@ -818,22 +819,6 @@ def load_stock_basic_map(settings: dict[str, Any], ts_codes: list[str], return_l
     return out
 
 
-def _average_abs_correlation(return_series: list[float], selected_series: list[list[float]]) -> float:
-    if not return_series or not selected_series:
-        return 0.0
-    current = pd.Series(return_series, dtype=float)
-    correlations: list[float] = []
-    for series in selected_series:
-        other = pd.Series(series, dtype=float)
-        pair = pd.concat([current, other], axis=1).dropna()
-        if len(pair) < 5:
-            continue
-        corr = pair.iloc[:, 0].corr(pair.iloc[:, 1])
-        if pd.notna(corr):
-            correlations.append(abs(float(corr)))
-    return float(sum(correlations) / len(correlations)) if correlations else 0.0
-
-
 def _risk_penalty(risk_level: str) -> float:
     if risk_level == "high":
         return 15.0
@@ -837,6 +837,42 @@ def run_post_daily_research(
         return False, str(e)
 
 
+def run_post_signal_forward_returns(project_root: Path, config_dir: str) -> tuple[bool, str]:
+    settings = _load_settings(project_root / config_dir)
+    db_path = _resolve_path(project_root, str(settings.get("data", {}).get("sqlite_db_path", "")).strip())
+    script = project_root.parent / "tools" / "refresh_signal_item_forward_returns.py"
+    if not script.exists():
+        return False, f"signal forward return refresher not found: {script}"
+    cmd = [
+        sys.executable,
+        str(script),
+        "--db-path",
+        str(db_path),
+    ]
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(project_root.parent),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if proc.returncode != 0:
+            detail = (proc.stdout or proc.stderr or "").strip()
+            return False, detail[:500] or "signal forward return refresh failed"
+        try:
+            summary = json.loads(proc.stdout or "{}")
+            inserted = int(summary.get("inserted_rows", 0) or 0)
+            skipped = list(summary.get("blocking_reasons") or []) if summary.get("available") is False else []
+        except (ValueError, AttributeError):
+            inserted, skipped = 0, []
+        if skipped:
+            return True, f"signal forward returns skipped ({', '.join(str(r) for r in skipped)})"
+        return True, f"signal forward returns refreshed (inserted_rows={inserted})"
+    except Exception as e:
+        return False, str(e)
+
+
 def run_post_buylist_snapshot(project_root: Path, target_count: int) -> tuple[bool, str]:
     cmd = [
         sys.executable,
@@ -990,6 +1026,19 @@ def main() -> None:
         action="store_false",
         help="更新后不运行每日研究",
     )
+    parser.add_argument(
+        "--post-signal-forward-returns",
+        dest="post_signal_forward_returns",
+        action="store_true",
+        default=True,
+        help="更新后增量物化已到期的信号远期收益",
+    )
+    parser.add_argument(
+        "--no-post-signal-forward-returns",
+        dest="post_signal_forward_returns",
+        action="store_false",
+        help="更新后不物化信号远期收益",
+    )
     parser.add_argument(
         "--post-research-profiles",
         nargs="*",
@@ -1022,12 +1071,23 @@ def main() -> None:
         "post_top_n": int(args.post_top_n),
         "post_daily_research": bool(args.post_daily_research),
         "post_research_profiles": list(args.post_research_profiles),
+        "post_signal_forward_returns": bool(args.post_signal_forward_returns),
     }
     _write_status(root, status_payload)
     try:
         update_summary = run_update(args.config_dir)
         status_payload["update_summary"] = update_summary
         post_failures = 0
+        if args.post_signal_forward_returns:
+            status_payload["stage"] = "refreshing_signal_forward_returns"
+            _write_status(root, status_payload)
+            ok, detail = run_post_signal_forward_returns(root, args.config_dir)
+            status_payload["post_signal_forward_returns"] = {"ok": ok, "detail": detail}
+            if ok:
+                logger.info("更新后信号远期收益物化完成：%s", detail)
+            else:
+                post_failures += 1
+                logger.warning("更新后信号远期收益物化失败：%s", detail)
         if args.post_top_candidates:
             dq_ok, dq_detail = run_post_candidate_data_quality_report(root, args.config_dir)
             status_payload["post_candidate_data_quality_report"] = {"ok": dq_ok, "detail": dq_detail}
@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from src.utils.correlation import pairwise_pearson
+
 
 CANDIDATE_PORTFOLIO_VERSION = "candidate_portfolio.v1"
 PORTFOLIO_EXPOSURE_REPORT_VERSION = "portfolio_exposure_report.v1"
@@ -230,20 +232,6 @@ def _returns_from_closes(closes: list[float | None]) -> list[float | None]:
     return returns
 
 
-def _pearson(xs: list[float], ys: list[float]) -> float | None:
-    if len(xs) != len(ys) or len(xs) < 2:
-        return None
-    mean_x = sum(xs) / len(xs)
-    mean_y = sum(ys) / len(ys)
-    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
-    var_x = sum((x - mean_x) ** 2 for x in xs)
-    var_y = sum((y - mean_y) ** 2 for y in ys)
-    denom = math.sqrt(var_x * var_y)
-    if denom <= 0:
-        return None
-    return cov / denom
-
-
 def _build_correlation_report(
     *,
     sqlite_db_path: str | Path,
@@ -268,27 +256,24 @@ def _build_correlation_report(
     finally:
         conn.close()
     return_series = {code: _returns_from_closes(values) for code, values in close_series.items()}
+    correlations, overlaps = pairwise_pearson(
+        [return_series.get(code, []) for code in codes],
+        min_points=config.min_correlation_points,
+    )
     pairs: list[dict[str, Any]] = []
     high_pairs: list[dict[str, Any]] = []
     data_gap = False
     for left_idx, left_code in enumerate(codes):
-        for right_code in codes[left_idx + 1 :]:
-            xs_raw = return_series.get(left_code, [])
-            ys_raw = return_series.get(right_code, [])
-            xs: list[float] = []
-            ys: list[float] = []
-            for x, y in zip(xs_raw, ys_raw):
-                if x is None or y is None:
-                    continue
-                xs.append(float(x))
-                ys.append(float(y))
-            corr = _pearson(xs, ys) if len(xs) >= config.min_correlation_points else None
+        for right_idx in range(left_idx + 1, len(codes)):
+            right_code = codes[right_idx]
+            value = float(correlations[left_idx, right_idx])
+            corr = None if math.isnan(value) else value
             if corr is None:
                 data_gap = True
             pair = {
                 "left_ts_code": left_code,
                 "right_ts_code": right_code,
-                "sample_points": len(xs),
+                "sample_points": int(overlaps[left_idx, right_idx]),
                 "correlation": round(float(corr), 6) if corr is not None else None,
                 "status": "data_gap" if corr is None else ("high" if abs(corr) >= config.high_correlation_threshold else "passed"),
             }
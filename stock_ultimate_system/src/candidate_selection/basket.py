@@ -11,6 +11,7 @@ from src.primary_result_candidate_basket import (
     DEFAULT_MAX_SINGLE_WEIGHT,
     TARGET_MAX_INDUSTRY_WEIGHT,
 )
+from src.utils.correlation import average_abs_correlation as _average_abs_correlation
 
 
 def _append_flag(current_flag: object, new_flag: str) -> str:
@@ -36,22 +37,6 @@ def _text_series(df: pd.DataFrame, column: str, default: str = "") -> pd.Series:
     return df[column].astype(str).fillna(default)
 
 
-def _average_abs_correlation(return_series: list[float], selected_series: list[list[float]]) -> float:
-    if not return_series or not selected_series:
-        return 0.0
-    current = pd.Series(return_series, dtype=float)
-    correlations: list[float] = []
-    for series in selected_series:
-        other = pd.Series(series, dtype=float)
-        pair = pd.concat([current, other], axis=1).dropna()
-        if len(pair) < 5:
-            continue
-        corr = pair.iloc[:, 0].corr(pair.iloc[:, 1])
-        if pd.notna(corr):
-            correlations.append(abs(float(corr)))
-    return float(sum(correlations) / len(correlations)) if correlations else 0.0
-
-
 def diversify_top_candidates(df: pd.DataFrame, top_n: int) -> pd.DataFrame:
     candidate_pool = df.sort_values("final_score", ascending=False).reset_index(drop=True).copy()
     if candidate_pool.empty:
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-from src.stock_ai_runner_storage import StockAIRunnerStorage
+from src.stock_ai_runner_storage import STOCK_AI_RUNNER_HISTORY_LIMIT, StockAIRunnerStorage
 
 
 def _load_json_object(path: Path) -> dict[str, Any] | None:
@@ -33,6 +33,21 @@ def _parse_recorded_at(value: Any) -> datetime | None:
     return datetime.fromisoformat(normalized).astimezone(timezone.utc)
 
 
+def _index_since_date(recorded_at_from: str) -> str:
+    # Index spans carry raw recorded_at date prefixes; back off one day so
+    # offsets such as +08:00 never skip rows that fall inside the range.
+    floor = _parse_recorded_at(recorded_at_from)
+    if floor is None:
+        return ""
+    return (floor - timedelta(days=1)).date().isoformat()
+
+
+def _telemetry_tail_limit(*windows: int) -> int | None:
+    if any(int(window or 0) <= 0 for window in windows):
+        return None
+    return max(STOCK_AI_RUNNER_HISTORY_LIMIT, *(int(window) for window in windows))
+
+
 def _is_within_range(*, recorded_at: str, recorded_at_from: str = "", recorded_at_to: str = "") -> bool:
     current = _parse_recorded_at(recorded_at)
     if current is None:
@@ -69,7 +84,7 @@ def read_stock_ai_provider_health_rollups(
     window: int = 8,
 ) -> list[dict[str, Any]]:
     storage = StockAIRunnerStorage.from_path(storage_dir)
-    telemetry_rows = storage.load_telemetry_rows()
+    telemetry_rows = storage.load_telemetry_rows(limit=_telemetry_tail_limit(window))
     provider_groups: dict[str, list[dict[str, Any]]] = {}
     for row in telemetry_rows:
         provider_name = str(row.get("provider_name", "") or "unknown")
@@ -116,7 +131,7 @@ def read_stock_ai_provider_trend_summaries(
     long_window: int = 16,
 ) -> list[dict[str, Any]]:
     storage = StockAIRunnerStorage.from_path(storage_dir)
-    telemetry_rows = storage.load_telemetry_rows()
+    telemetry_rows = storage.load_telemetry_rows(limit=_telemetry_tail_limit(short_window, long_window))
     provider_groups: dict[str, list[dict[str, Any]]] = {}
     for row in telemetry_rows:
         provider_name = str(row.get("provider_name", "") or "unknown")
@@ -206,7 +221,10 @@ def read_stock_ai_result_replay(
 ) -> dict[str, Any]:
     normalized_result_id = str(result_id or "").strip()
     storage = StockAIRunnerStorage.from_path(storage_dir)
-    ledger_rows = storage.load_attempt_ledger_rows()
+    ledger_rows = storage.load_attempt_ledger_rows(
+        result_id=normalized_result_id,
+        since_date=_index_since_date(recorded_at_from),
+    )
     normalized_attempts = []
     for row in ledger_rows:
         if str(row.get("result_id", "") or "") != normalized_result_id:
@@ -261,7 +279,7 @@ def read_stock_ai_provider_attempt_replay(
 ) -> dict[str, Any]:
     normalized_provider_name = str(provider_name or "").strip()
     storage = StockAIRunnerStorage.from_path(storage_dir)
-    ledger_rows = storage.load_attempt_ledger_rows()
+    ledger_rows = storage.load_attempt_ledger_rows(since_date=_index_since_date(recorded_at_from))
     normalized_attempts = []
     for row in ledger_rows:
         if str(row.get("provider_name", "") or "") != normalized_provider_name:
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from src.stock_ai_provider_adapter import build_stock_ai_provider_telemetry_summary
 from src.utils.project_paths import resolve_project_path
 
 
 STOCK_AI_RUNNER_STORAGE_SCHEMA_VERSION = "stock_ai_runner_storage.v1"
+STOCK_AI_RUNNER_LOG_MANIFEST_SCHEMA_VERSION = "stock_ai_runner_log_manifest.v1"
 STOCK_AI_RUNNER_HISTORY_LIMIT = 32
 STOCK_AI_RUNNER_RECENT_ATTEMPT_LIMIT = 8
+STOCK_AI_RUNNER_SEGMENT_MAX_ROWS = 4096
+STOCK_AI_RUNNER_FSYNC_BATCH = 8
+STOCK_AI_RUNNER_COMPACT_SEGMENT_LIMIT = 8
 _FAILURE_STATES = {"timeout", "blocked", "error"}
+_PENDING_FSYNC: dict[str, int] = {}
 
 
 def _read_jsonl(path: Path) -> list[dict[str, Any]]:
@@ -33,13 +39,307 @@ def _read_jsonl(path: Path) -> list[dict[str, Any]]:
 def _write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     rendered = "\n".join(json.dumps(row, ensure_ascii=False, sort_keys=True) for row in rows)
-    path.write_text(rendered + ("\n" if rendered else ""), encoding="utf-8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write(rendered + ("\n" if rendered else ""))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
 
 
-def _truncate_rows(rows: list[dict[str, Any]], *, limit: int = STOCK_AI_RUNNER_HISTORY_LIMIT) -> list[dict[str, Any]]:
-    if len(rows) <= limit:
+def _iter_lines_reversed(path: Path, *, block_size: int = 8192) -> Iterator[bytes]:
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            lines = (handle.read(step) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def _row_date(row: dict[str, Any]) -> str:
+    return str(row.get("recorded_at", "") or "")[:10]
+
+
+def _scan_spans(segment: str, payload: bytes, *, base_offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+    # Consecutive rows of one result id collapse into a single index span; a
+    # trailing line without a newline is a torn write and is left unindexed.
+    spans: list[dict[str, Any]] = []
+    consumed = 0
+    for raw in payload.splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            break
+        offset = base_offset + consumed
+        consumed += len(raw)
+        if not raw.strip():
+            continue
+        row = json.loads(raw)
+        if not isinstance(row, dict):
+            raise ValueError(f"expected object jsonl entry: {segment}")
+        result_id = str(row.get("result_id", "") or "")
+        date = _row_date(row)
+        current = spans[-1] if spans else None
+        if current is not None and current["result_id"] == result_id and current["offset"] + current["length"] == offset:
+            current["length"] += len(raw)
+            current["rows"] += 1
+            current["date_from"] = min(current["date_from"], date)
+            current["date_to"] = max(current["date_to"], date)
+            continue
+        spans.append(
+            {
+                "segment": segment,
+                "offset": offset,
+                "length": len(raw),
+                "rows": 1,
+                "result_id": result_id,
+                "date_from": date,
+                "date_to": date,
+            }
+        )
+    return spans, consumed
+
+
+class _SegmentedJsonlLog:
+    """Append-only jsonl log: ``<name>.jsonl`` is the active segment, sealed
+    segments live under ``segments/``, ``<name>.index.jsonl`` holds one span
+    (segment, byte offset, length, rows, result id, dates) per appended batch
+    and ``<name>.manifest.json`` tracks the active segment size."""
+
+    def __init__(self, storage_dir: Path, name: str) -> None:
+        self.storage_dir = storage_dir
+        self.name = name
+
+    @property
+    def active_path(self) -> Path:
+        return self.storage_dir / f"{self.name}.jsonl"
+
+    @property
+    def index_path(self) -> Path:
+        return self.storage_dir / f"{self.name}.index.jsonl"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.storage_dir / f"{self.name}.manifest.json"
+
+    @property
+    def segments_dir(self) -> Path:
+        return self.storage_dir / "segments"
+
+    def _segment_path(self, segment: str) -> Path:
+        return self.storage_dir / segment
+
+    def _sealed_segment_names(self) -> list[str]:
+        if not self.segments_dir.exists():
+            return []
+        return sorted(f"segments/{path.name}" for path in self.segments_dir.glob(f"{self.name}.*.jsonl"))
+
+    def _load_manifest(self) -> dict[str, Any] | None:
+        if not self.manifest_path.exists():
+            return None
+        try:
+            payload = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _write_manifest(self, manifest: dict[str, Any]) -> None:
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def _reindex(self, *, write: bool) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        spans: list[dict[str, Any]] = []
+        sealed_segments: list[dict[str, Any]] = []
+        for segment in self._sealed_segment_names():
+            segment_spans, _ = _scan_spans(segment, self._segment_path(segment).read_bytes())
+            spans.extend(segment_spans)
+            sealed_segments.append({"segment": segment, "rows": sum(span["rows"] for span in segment_spans)})
+        active_payload = self.active_path.read_bytes() if self.active_path.exists() else b""
+        active_spans, active_bytes = _scan_spans(self.active_path.name, active_payload)
+        spans.extend(active_spans)
+        manifest = {
+            "schema_version": STOCK_AI_RUNNER_LOG_MANIFEST_SCHEMA_VERSION,
+            "sealed_segments": sealed_segments,
+            "active_rows": sum(span["rows"] for span in active_spans),
+            "active_bytes": active_bytes,
+        }
+        if write:
+            if active_bytes < len(active_payload):
+                with self.active_path.open("r+b") as handle:
+                    handle.truncate(active_bytes)
+            _write_jsonl(self.index_path, spans)
+            self._write_manifest(manifest)
+        return manifest, spans
+
+    def _state(self, *, write: bool) -> tuple[dict[str, Any], list[dict[str, Any]] | None]:
+        manifest = self._load_manifest()
+        active_bytes = self.active_path.stat().st_size if self.active_path.exists() else 0
+        if (
+            manifest is not None
+            and int(manifest.get("active_bytes", -1)) == active_bytes
+            and (self.index_path.exists() or not active_bytes)
+        ):
+            return manifest, None
+        if manifest is None and not active_bytes and not self._sealed_segment_names():
+            return {"sealed_segments": [], "active_rows": 0, "active_bytes": 0}, []
+        return self._reindex(write=write)
+
+    @staticmethod
+    def _total_rows(manifest: dict[str, Any]) -> int:
+        sealed_rows = sum(int(item.get("rows", 0) or 0) for item in manifest.get("sealed_segments", []) or [])
+        return sealed_rows + int(manifest.get("active_rows", 0) or 0)
+
+    def _load_spans(self, spans: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+        if spans is not None:
+            return spans
+        return _read_jsonl(self.index_path)
+
+    def _read_spans(self, spans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        handles: dict[str, Any] = {}
+        try:
+            for span in spans:
+                segment = str(span["segment"])
+                handle = handles.get(segment)
+                if handle is None:
+                    handle = handles[segment] = self._segment_path(segment).open("rb")
+                handle.seek(int(span["offset"]))
+                for raw in handle.read(int(span["length"])).splitlines():
+                    if raw.strip():
+                        rows.append(json.loads(raw))
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return rows
+
+    def _roll(self, manifest: dict[str, Any]) -> dict[str, Any]:
+        sealed_segments = list(manifest.get("sealed_segments", []) or [])
+        existing = self._sealed_segment_names()
+        next_seq = int(existing[-1].rsplit(".", 2)[-2]) + 1 if existing else 1
+        segment = f"segments/{self.name}.{next_seq:06d}.jsonl"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        os.replace(self.active_path, self._segment_path(segment))
+        spans = _read_jsonl(self.index_path)
+        for span in spans:
+            if span.get("segment") == self.active_path.name:
+                span["segment"] = segment
+        _write_jsonl(self.index_path, spans)
+        sealed_segments.append({"segment": segment, "rows": int(manifest.get("active_rows", 0) or 0)})
+        manifest = {
+            **manifest,
+            "sealed_segments": sealed_segments,
+            "active_rows": 0,
+            "active_bytes": 0,
+        }
+        self._write_manifest(manifest)
+        return manifest
+
+    def append(self, rows: list[dict[str, Any]]) -> int:
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        manifest, _ = self._state(write=True)
+        if not rows:
+            return self._total_rows(manifest)
+        if int(manifest.get("active_rows", 0) or 0) >= STOCK_AI_RUNNER_SEGMENT_MAX_ROWS:
+            manifest = self._roll(manifest)
+        payload = "".join(json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n" for row in rows).encode("utf-8")
+        offset = int(manifest.get("active_bytes", 0) or 0)
+        spans, _ = _scan_spans(self.active_path.name, payload, base_offset=offset)
+        sync_key = str(self.active_path)
+        pending = _PENDING_FSYNC.get(sync_key, 0) + 1
+        sync = pending >= STOCK_AI_RUNNER_FSYNC_BATCH
+        _PENDING_FSYNC[sync_key] = 0 if sync else pending
+        with self.active_path.open("ab") as handle:
+            handle.write(payload)
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+        with self.index_path.open("a", encoding="utf-8") as handle:
+            handle.write("".join(json.dumps(span, ensure_ascii=False, sort_keys=True) + "\n" for span in spans))
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+        manifest = {
+            **manifest,
+            "schema_version": STOCK_AI_RUNNER_LOG_MANIFEST_SCHEMA_VERSION,
+            "active_rows": int(manifest.get("active_rows", 0) or 0) + len(rows),
+            "active_bytes": offset + len(payload),
+        }
+        self._write_manifest(manifest)
+        if len(manifest.get("sealed_segments", []) or []) > STOCK_AI_RUNNER_COMPACT_SEGMENT_LIMIT:
+            self.compact()
+            manifest, _ = self._state(write=False)
+        return self._total_rows(manifest)
+
+    def sync(self) -> None:
+        for path in (self.active_path, self.index_path):
+            if path.exists():
+                with path.open("rb") as handle:
+                    os.fsync(handle.fileno())
+        _PENDING_FSYNC[str(self.active_path)] = 0
+
+    def compact(self, *, retain_rows: int | None = None) -> dict[str, Any]:
+        manifest, _ = self._state(write=True)
+        sealed = [str(item["segment"]) for item in manifest.get("sealed_segments", []) or []]
+        sealed_rows: list[dict[str, Any]] = []
+        for segment in sealed:
+            sealed_rows.extend(_read_jsonl(self._segment_path(segment)))
+        if retain_rows is not None:
+            sealed_limit = max(int(retain_rows) - int(manifest.get("active_rows", 0) or 0), 0)
+            sealed_rows = sealed_rows[len(sealed_rows) - sealed_limit :] if sealed_limit else []
+        if sealed:
+            merged = sealed[-1]
+            _write_jsonl(self._segment_path(merged), sealed_rows)
+            for segment in sealed[:-1]:
+                self._segment_path(segment).unlink()
+        self.sync()
+        compacted, _ = self._reindex(write=True)
+        return {
+            "merged_segments": len(sealed),
+            "sealed_segments": len(compacted.get("sealed_segments", []) or []),
+            "total_rows": self._total_rows(compacted),
+        }
+
+    def total_rows(self) -> int:
+        manifest, _ = self._state(write=False)
+        return self._total_rows(manifest)
+
+    def tail(self, limit: int) -> list[dict[str, Any]]:
+        if limit <= 0:
+            return []
+        _, spans = self._state(write=False)
+        selected: list[dict[str, Any]] = []
+        covered = 0
+        reversed_spans = reversed(spans) if spans is not None else (json.loads(line) for line in _iter_lines_reversed(self.index_path))
+        for span in reversed_spans:
+            selected.append(span)
+            covered += int(span.get("rows", 0) or 0)
+            if covered >= limit:
+                break
+        rows = self._read_spans(list(reversed(selected)))
+        return rows[-limit:]
+
+    def rows(self, *, result_id: str | None = None, since_date: str = "") -> list[dict[str, Any]]:
+        _, spans = self._state(write=False)
+        selected = [
+            span
+            for span in self._load_spans(spans)
+            if (result_id is None or span.get("result_id") == result_id)
+            and (not since_date or str(span.get("date_to", "") or "") >= since_date)
+        ]
+        rows = self._read_spans(selected)
+        if result_id is not None:
+            rows = [row for row in rows if str(row.get("result_id", "") or "") == result_id]
         return rows
-    return rows[-limit:]
 
 
 def _utc_now_iso() -> str:
@@ -103,15 +403,58 @@ class StockAIRunnerStorage:
     def read_model_path(self) -> Path:
         return self.storage_dir / "read_model.json"
 
-    def load_attempt_ledger_rows(self) -> list[dict[str, Any]]:
-        return _read_jsonl(self.ledger_path)
+    @property
+    def _ledger_log(self) -> _SegmentedJsonlLog:
+        return _SegmentedJsonlLog(self.storage_dir, "attempt_ledger")
+
+    @property
+    def _telemetry_log(self) -> _SegmentedJsonlLog:
+        return _SegmentedJsonlLog(self.storage_dir, "telemetry")
+
+    @staticmethod
+    def _load_log_rows(
+        log: _SegmentedJsonlLog,
+        *,
+        limit: int | None,
+        result_id: str | None,
+        since_date: str,
+    ) -> list[dict[str, Any]]:
+        if limit is not None and result_id is None and not since_date:
+            return log.tail(limit)
+        rows = log.rows(result_id=result_id, since_date=since_date)
+        return rows if limit is None else rows[-limit:] if limit > 0 else []
+
+    def load_attempt_ledger_rows(
+        self,
+        *,
+        limit: int | None = None,
+        result_id: str | None = None,
+        since_date: str = "",
+    ) -> list[dict[str, Any]]:
+        return self._load_log_rows(self._ledger_log, limit=limit, result_id=result_id, since_date=since_date)
+
+    def load_telemetry_rows(
+        self,
+        *,
+        limit: int | None = None,
+        result_id: str | None = None,
+        since_date: str = "",
+    ) -> list[dict[str, Any]]:
+        return self._load_log_rows(self._telemetry_log, limit=limit, result_id=result_id, since_date=since_date)
 
-    def load_telemetry_rows(self) -> list[dict[str, Any]]:
-        return _read_jsonl(self.telemetry_path)
+    def compact(self, *, retain_rows: int | None = None) -> dict[str, Any]:
+        return {
+            "ledger": self._ledger_log.compact(retain_rows=retain_rows),
+            "telemetry": self._telemetry_log.compact(retain_rows=retain_rows),
+        }
+
+    def sync(self) -> None:
+        self._ledger_log.sync()
+        self._telemetry_log.sync()
 
     def build_read_model(self) -> dict[str, Any]:
-        ledger_rows = self.load_attempt_ledger_rows()
-        telemetry_rows = self.load_telemetry_rows()
+        ledger_rows = self.load_attempt_ledger_rows(limit=STOCK_AI_RUNNER_HISTORY_LIMIT)
+        telemetry_rows = self.load_telemetry_rows(limit=STOCK_AI_RUNNER_HISTORY_LIMIT)
 
         provider_groups: dict[str, list[dict[str, Any]]] = {}
         for row in telemetry_rows:
@@ -214,36 +557,18 @@ class StockAIRunnerStorage:
         attempt_ledger: list[dict[str, Any]],
         telemetry_buffer: list[dict[str, Any]],
     ) -> dict[str, Any]:
-        ledger_rows = self.load_attempt_ledger_rows()
-        telemetry_rows = self.load_telemetry_rows()
-
-        for row in attempt_ledger:
-            ledger_rows.append(
-                {
-                    "schema_version": STOCK_AI_RUNNER_STORAGE_SCHEMA_VERSION,
-                    "result_id": str(result_id or "").strip(),
-                    "provider_name": str(provider_name or "").strip(),
-                    "final_status": str(final_status or "").strip(),
-                    "recorded_at": _normalize_recorded_at(row.get("recorded_at")),
-                    **dict(row),
-                }
-            )
-        for row in telemetry_buffer:
-            telemetry_rows.append(
-                {
-                    "schema_version": STOCK_AI_RUNNER_STORAGE_SCHEMA_VERSION,
-                    "result_id": str(result_id or "").strip(),
-                    "provider_name": str(provider_name or "").strip(),
-                    "final_status": str(final_status or "").strip(),
-                    "recorded_at": _normalize_recorded_at(row.get("recorded_at")),
-                    **dict(row),
-                }
-            )
-
-        ledger_rows = _truncate_rows(ledger_rows)
-        telemetry_rows = _truncate_rows(telemetry_rows)
-        _write_jsonl(self.ledger_path, ledger_rows)
-        _write_jsonl(self.telemetry_path, telemetry_rows)
+        stamp = {
+            "schema_version": STOCK_AI_RUNNER_STORAGE_SCHEMA_VERSION,
+            "result_id": str(result_id or "").strip(),
+            "provider_name": str(provider_name or "").strip(),
+            "final_status": str(final_status or "").strip(),
+        }
+        ledger_entries = self._ledger_log.append(
+            [{**stamp, "recorded_at": _normalize_recorded_at(row.get("recorded_at")), **dict(row)} for row in attempt_ledger]
+        )
+        telemetry_entries = self._telemetry_log.append(
+            [{**stamp, "recorded_at": _normalize_recorded_at(row.get("recorded_at")), **dict(row)} for row in telemetry_buffer]
+        )
 
         read_model = self.build_read_model()
         provider_summary = {
@@ -259,6 +584,6 @@ class StockAIRunnerStorage:
             "telemetry_path": str(self.telemetry_path),
             "provider_summary_path": str(self.provider_summary_path),
             "read_model_path": str(self.read_model_path),
-            "ledger_entries": len(ledger_rows),
-            "telemetry_entries": len(telemetry_rows),
+            "ledger_entries": ledger_entries,
+            "telemetry_entries": telemetry_entries,
         }
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+def return_matrix(series: Sequence[Sequence[float | None]], width: int | None = None) -> np.ndarray:
+    """Stack ragged return series into a (series x points) float matrix; gaps and missing values are NaN."""
+    length = max([len(values) for values in series] + [0]) if width is None else int(width)
+    out = np.full((len(series), length), np.nan, dtype=float)
+    for row, values in enumerate(series):
+        clipped = list(values)[:length]
+        out[row, : len(clipped)] = np.array([np.nan if value is None else float(value) for value in clipped], dtype=float)
+    return out
+
+
+def masked_pearson_rows(
+    left: np.ndarray, right: np.ndarray, *, min_points: int = 2
+) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise Pearson correlation over the points where both sides are present.
+
+    Returns ``(correlation, points)`` as arrays.  Correlation is NaN when fewer
+    than ``min_points`` points overlap or either side is constant on the
+    overlap, and is clipped to [-1, 1] like ``numpy.corrcoef``.  Unlike
+    ``openclaw.services.statistics_kernel_service.pearson_rows`` (complete
+    rows only, rounded floats with ``None``), NaN points are masked per row.
+    """
+    x = np.atleast_2d(np.asarray(left, dtype=float))
+    y = np.atleast_2d(np.asarray(right, dtype=float))
+    mask = ~(np.isnan(x) | np.isnan(y))
+    points = mask.sum(axis=1)
+    safe_points = np.maximum(points, 1)
+    xs = np.where(mask, x, 0.0)
+    ys = np.where(mask, y, 0.0)
+    dx = np.where(mask, xs - (xs.sum(axis=1) / safe_points)[:, None], 0.0)
+    dy = np.where(mask, ys - (ys.sum(axis=1) / safe_points)[:, None], 0.0)
+    var_x = (dx * dx).sum(axis=1)
+    var_y = (dy * dy).sum(axis=1)
+    varying = _varies(x, mask) & _varies(y, mask)
+    valid = (points >= max(int(min_points), 2)) & varying & (var_x > 0.0) & (var_y > 0.0)
+    denom = np.sqrt(np.where(valid, var_x * var_y, 1.0))
+    corr = np.where(valid, np.clip((dx * dy).sum(axis=1) / denom, -1.0, 1.0), np.nan)
+    return corr, points
+
+
+def pairwise_pearson(series: Sequence[Sequence[float | None]], *, min_points: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete correlation matrix and overlap counts for every pair of series."""
+    matrix = return_matrix(series)
+    count, width = matrix.shape
+    left = np.broadcast_to(matrix[:, None, :], (count, count, width)).reshape(count * count, width)
+    right = np.broadcast_to(matrix[None, :, :], (count, count, width)).reshape(count * count, width)
+    corr, points = masked_pearson_rows(left, right, min_points=min_points)
+    return corr.reshape(count, count), points.reshape(count, count)
+
+
+def average_abs_correlation(
+    return_series: Sequence[float | None],
+    selected_series: Sequence[Sequence[float | None]],
+    *,
+    min_points: int = 5,
+) -> float:
+    """Mean absolute correlation of one return series against already selected ones (position-aligned)."""
+    if not return_series or not selected_series:
+        return 0.0
+    width = max([len(return_series)] + [len(series) for series in selected_series])
+    current = return_matrix([return_series], width)
+    others = return_matrix(selected_series, width)
+    corr, _ = masked_pearson_rows(np.broadcast_to(current, others.shape), others, min_points=min_points)
+    available = corr[~np.isnan(corr)]
+    return float(np.abs(available).mean()) if available.size else 0.0
+
+
+def _varies(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # Exact constancy check: a non-representable mean leaves tiny non-zero deviations.
+    high = np.where(mask, values, -np.inf).max(axis=1, initial=-np.inf)
+    low = np.where(mask, values, np.inf).min(axis=1, initial=np.inf)
+    return high > low
@@ -0,0 +1,30 @@
+import math
+
+from src.utils.correlation import average_abs_correlation, pairwise_pearson
+
+
+def test_pairwise_pearson_uses_pairwise_complete_points():
+    corr, points = pairwise_pearson(
+        [
+            [0.01, 0.02, None, 0.04, 0.05],
+            [0.02, 0.04, 0.06, 0.08],
+            [0.01, 0.01, 0.01, 0.01, 0.01],
+        ],
+        min_points=3,
+    )
+
+    assert points[0, 1] == 3
+    assert round(float(corr[0, 1]), 6) == 1.0
+    assert corr[0, 1] == corr[1, 0]
+    assert math.isnan(corr[0, 2])
+    assert points[0, 2] == 4
+
+
+def test_average_abs_correlation_skips_short_and_constant_series():
+    current = [0.01, -0.02, 0.03, 0.01, -0.01, 0.02]
+    mirrored = [-value for value in current]
+
+    assert average_abs_correlation(current, [mirrored]) == 1.0
+    assert average_abs_correlation(current, [mirrored, [0.01, 0.02, 0.03], [0.005] * 6]) == 1.0
+    assert average_abs_correlation(current, [[0.01, 0.02, 0.03]]) == 0.0
+    assert average_abs_correlation([], [mirrored]) == 0.0
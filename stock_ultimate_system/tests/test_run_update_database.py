@@ -26,6 +26,7 @@ from run_update_database import (
     run_post_candidate_data_quality_report,
     run_post_candidate_basket_snapshot,
     run_post_buylist_snapshot,
+    run_post_signal_forward_returns,
 )
 
 
@@ -423,6 +424,43 @@ def test_run_post_buylist_snapshot_invokes_snapshot_builder(tmp_path, monkeypatc
     assert cmd[cmd.index("--target-count") + 1] == "7"
 
 
+def test_run_post_signal_forward_returns_invokes_repo_refresher(tmp_path, monkeypatch):
+    project_root = tmp_path / "stock_ultimate_system"
+    config_dir = project_root / "config"
+    config_dir.mkdir(parents=True)
+    db_path = tmp_path / "stock.db"
+    (config_dir / "settings.yaml").write_text(f"data:\n  sqlite_db_path: {db_path}\n", encoding="utf-8")
+    script = tmp_path / "tools" / "refresh_signal_item_forward_returns.py"
+    calls = []
+
+    class Result:
+        returncode = 0
+        stdout = '{"available": true, "inserted_rows": 12}'
+        stderr = ""
+
+    def fake_run(cmd, cwd=None, capture_output=None, text=None, check=None):
+        calls.append((cmd, cwd))
+        return Result()
+
+    monkeypatch.setattr(run_update_database.subprocess, "run", fake_run)
+
+    ok, detail = run_post_signal_forward_returns(project_root, "config")
+    assert ok is False
+    assert "not found" in detail
+    assert calls == []
+
+    script.parent.mkdir()
+    script.write_text("", encoding="utf-8")
+    ok, detail = run_post_signal_forward_returns(project_root, "config")
+
+    assert ok is True
+    assert detail == "signal forward returns refreshed (inserted_rows=12)"
+    cmd, cwd = calls[0]
+    assert cwd == str(tmp_path)
+    assert str(script) in cmd
+    assert cmd[cmd.index("--db-path") + 1] == str(db_path)
+
+
 def test_run_post_candidate_basket_snapshot_invokes_registry_cli(tmp_path, monkeypatch):
     project_root = tmp_path
     calls = []
@@ -1,5 +1,6 @@
 import json
 
+import src.stock_ai_runner_storage as storage_module
 from src.stock_ai_runner_storage import (
     STOCK_AI_RUNNER_HISTORY_LIMIT,
     STOCK_AI_RUNNER_RECENT_ATTEMPT_LIMIT,
@@ -7,6 +8,32 @@ from src.stock_ai_runner_storage import (
 )
 
 
+def _persist_run(storage: StockAIRunnerStorage, idx: int, *, recorded_at: str = "") -> dict:
+    return storage.persist(
+        result_id=f"primary:{idx}",
+        provider_name="echo_summary",
+        final_status="ready",
+        attempt_ledger=[
+            {"state": "ok", "request_id": f"req-{idx}", "provider_name": "echo_summary", "reason": "", "recorded_at": recorded_at}
+        ],
+        telemetry_buffer=[
+            {
+                "provider_name": "echo_summary",
+                "request_id": f"req-{idx}",
+                "timeout_ms": 1200,
+                "retry_count": 0,
+                "status": "ok",
+                "status_code": 200,
+                "response_bytes": 32,
+                "elapsed_ms": idx,
+                "network_mode": "offline_only",
+                "response_schema_version": "stock_ai_provider_adapter.v1",
+                "recorded_at": recorded_at,
+            }
+        ],
+    )
+
+
 def test_stock_ai_runner_storage_persists_ledger_and_provider_summary(tmp_path):
     storage = StockAIRunnerStorage.from_path(tmp_path / "artifacts" / "stock_ai_runner")
 
@@ -49,37 +76,67 @@ def test_stock_ai_runner_storage_persists_ledger_and_provider_summary(tmp_path):
     assert read_model["failure_top_causes"] == []
 
 
-def test_stock_ai_runner_storage_truncates_history_window(tmp_path):
+def test_stock_ai_runner_storage_retains_full_history_and_windows_read_model(tmp_path):
     storage = StockAIRunnerStorage.from_path(tmp_path / "artifacts" / "stock_ai_runner")
 
     for idx in range(STOCK_AI_RUNNER_HISTORY_LIMIT + 5):
-        storage.persist(
-            result_id=f"primary:{idx}",
-            provider_name="echo_summary",
-            final_status="ready",
-            attempt_ledger=[
-                {"state": "ok", "request_id": f"req-{idx}", "provider_name": "echo_summary", "reason": ""}
-            ],
-            telemetry_buffer=[
-                {
-                    "provider_name": "echo_summary",
-                    "request_id": f"req-{idx}",
-                    "timeout_ms": 1200,
-                    "retry_count": 0,
-                    "status": "ok",
-                    "status_code": 200,
-                    "response_bytes": 32,
-                    "elapsed_ms": idx,
-                    "network_mode": "offline_only",
-                    "response_schema_version": "stock_ai_provider_adapter.v1",
-                }
-            ],
-        )
+        persisted = _persist_run(storage, idx)
 
     ledger_lines = storage.ledger_path.read_text(encoding="utf-8").splitlines()
     telemetry_lines = storage.telemetry_path.read_text(encoding="utf-8").splitlines()
-    assert len(ledger_lines) == STOCK_AI_RUNNER_HISTORY_LIMIT
-    assert len(telemetry_lines) == STOCK_AI_RUNNER_HISTORY_LIMIT
+    assert len(ledger_lines) == STOCK_AI_RUNNER_HISTORY_LIMIT + 5
+    assert len(telemetry_lines) == STOCK_AI_RUNNER_HISTORY_LIMIT + 5
+    assert persisted["ledger_entries"] == STOCK_AI_RUNNER_HISTORY_LIMIT + 5
+    read_model = json.loads(storage.read_model_path.read_text(encoding="utf-8"))
+    assert read_model["provider_rollups"]["echo_summary"]["total_calls"] == STOCK_AI_RUNNER_HISTORY_LIMIT
+    assert "primary:0" not in read_model["result_recent_attempts"]
+
+
+def test_stock_ai_runner_storage_reads_tail_and_single_run_from_index(tmp_path):
+    storage = StockAIRunnerStorage.from_path(tmp_path / "artifacts" / "stock_ai_runner")
+    for idx in range(12):
+        _persist_run(storage, idx, recorded_at=f"2026-05-{idx + 1:02d}T01:00:00Z")
+
+    tail = storage.load_attempt_ledger_rows(limit=3)
+    assert [row["request_id"] for row in tail] == ["req-9", "req-10", "req-11"]
+    run_rows = storage.load_attempt_ledger_rows(result_id="primary:4")
+    assert [row["request_id"] for row in run_rows] == ["req-4"]
+    since_rows = storage.load_telemetry_rows(since_date="2026-05-11")
+    assert [row["request_id"] for row in since_rows] == ["req-10", "req-11"]
+    index_rows = storage.ledger_path.with_name("attempt_ledger.index.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(index_rows) == 12
+
+
+def test_stock_ai_runner_storage_rolls_segments_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_module, "STOCK_AI_RUNNER_SEGMENT_MAX_ROWS", 2)
+    monkeypatch.setattr(storage_module, "STOCK_AI_RUNNER_COMPACT_SEGMENT_LIMIT", 3)
+    storage = StockAIRunnerStorage.from_path(tmp_path / "artifacts" / "stock_ai_runner")
+
+    for idx in range(9):
+        persisted = _persist_run(storage, idx)
+
+    assert persisted["ledger_entries"] == 9
+    assert [row["request_id"] for row in storage.load_attempt_ledger_rows()] == [f"req-{idx}" for idx in range(9)]
+    assert len(list((storage.storage_dir / "segments").glob("attempt_ledger.*.jsonl"))) <= 3
+
+    summary = storage.compact(retain_rows=4)
+    assert summary["ledger"]["total_rows"] == 4
+    assert [row["request_id"] for row in storage.load_attempt_ledger_rows()] == ["req-5", "req-6", "req-7", "req-8"]
+    assert storage.load_attempt_ledger_rows(result_id="primary:6")[0]["request_id"] == "req-6"
+
+
+def test_stock_ai_runner_storage_reindexes_legacy_and_torn_jsonl(tmp_path):
+    storage_dir = tmp_path / "artifacts" / "stock_ai_runner"
+    storage_dir.mkdir(parents=True)
+    legacy = {"result_id": "primary:legacy", "provider_name": "echo_summary", "state": "ok", "request_id": "req-legacy"}
+    (storage_dir / "attempt_ledger.jsonl").write_text(json.dumps(legacy) + "\n" + '{"result_id": "primary:torn"', encoding="utf-8")
+    storage = StockAIRunnerStorage.from_path(storage_dir)
+
+    assert [row["request_id"] for row in storage.load_attempt_ledger_rows(limit=5)] == ["req-legacy"]
+    persisted = _persist_run(storage, 1)
+
+    assert persisted["ledger_entries"] == 2
+    assert [row["request_id"] for row in storage.load_attempt_ledger_rows()] == ["req-legacy", "req-1"]
 
 
 def test_stock_ai_runner_storage_builds_recent_attempts_and_failure_buckets(tmp_path):
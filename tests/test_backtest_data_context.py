@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from openclaw.runtime import backtest_data_context as ctx
+from openclaw.runtime.dataframe_utils import ensure_price_aliases
+
+
+@pytest.fixture()
+def history_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENCLAW_BACKTEST_HISTORY_SHARED", "1")
+    monkeypatch.setenv("OPENCLAW_BACKTEST_HISTORY_SHARED_DIR", str(tmp_path / "shared"))
+    ctx.clear_backtest_history_cache()
+    db_path = tmp_path / "history.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT PRIMARY KEY, name TEXT, industry TEXT)")
+    conn.execute(
+        """
+        CREATE TABLE daily_trading_data (
+            ts_code TEXT, trade_date TEXT, open_price REAL, high_price REAL, low_price REAL,
+            close_price REAL, vol REAL, pct_chg REAL, amount REAL
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO stock_basic VALUES (?, ?, ?)",
+        [("000001.SZ", "平安银行", "银行"), ("600000.SH", "浦发银行", None)],
+    )
+    today = datetime.now()
+    rows = []
+    for offset in range(200):
+        trade_date = (today - timedelta(days=offset)).strftime("%Y%m%d")
+        for code in ("000001.SZ", "600000.SH"):
+            rows.append((code, trade_date, 10.0, 10.5, 9.5, 10.0 + offset * 0.01, 1000.0, 0.5, 1e6))
+    conn.executemany("INSERT INTO daily_trading_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    yield db_path
+    ctx.clear_backtest_history_cache()
+
+
+def _loader(db_path, calls):
+    def _connect():
+        calls.append("connect")
+        return sqlite3.connect(str(db_path))
+
+    def _load(days, use_cache=True):
+        return ctx.load_backtest_history_df(
+            app_root=str(db_path.parent),
+            permanent_db_path=str(db_path),
+            connect_permanent_db=_connect,
+            ensure_price_aliases=ensure_price_aliases,
+            now_ts=lambda: 1_000.0,
+            days=days,
+            use_cache=use_cache,
+        )
+
+    return _load
+
+
+def test_history_cache_serves_sub_range_from_covering_superset(history_db):
+    calls = []
+    load = _loader(history_db, calls)
+
+    full = load(180)
+    short = load(60)
+
+    assert calls == ["connect"]
+    cutoff = (datetime.now() - timedelta(days=60)).strftime("%Y%m%d")
+    assert short["trade_date"].min() >= cutoff
+    assert len(short) == len(full[full["trade_date"] >= cutoff])
+    assert list(short.columns) == list(full.columns)
+
+
+def test_history_cache_hits_do_not_leak_writes_into_cache(history_db):
+    calls = []
+    load = _loader(history_db, calls)
+
+    first = load(120)
+    first.loc[0, "close_price"] = -1.0
+    first["extra"] = 1
+    second = load(120)
+
+    assert calls == ["connect"]
+    assert second.loc[0, "close_price"] != -1.0
+    assert "extra" not in second.columns
+
+
+def test_history_panel_is_attached_from_shared_memory_map(history_db):
+    calls = []
+    load = _loader(history_db, calls)
+    loaded = load(120)
+
+    ctx.clear_backtest_history_cache()
+    attached = load(90)
+
+    assert calls == ["connect"]
+    cutoff = (datetime.now() - timedelta(days=90)).strftime("%Y%m%d")
+    expected = loaded[loaded["trade_date"] >= cutoff].reset_index(drop=True)
+    pd.testing.assert_frame_equal(attached, expected, check_dtype=False)
+    assert attached["industry"].isna().sum() == expected["industry"].isna().sum()
+
+
+def test_shared_panel_keeps_datetime_dtypes_and_cleans_failed_publishes(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENCLAW_BACKTEST_HISTORY_SHARED_DIR", str(tmp_path / "shared"))
+    df = pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ", None, "600000.SH"],
+            "day": pd.to_datetime(["2026-01-02", None, "2026-01-06"]),
+            "stamp": pd.to_datetime(["2026-01-02 09:30", "2026-01-05 09:30", None]).tz_localize("Asia/Shanghai"),
+            "close_price": [10.0, 11.0, 12.0],
+        }
+    )
+    publish = dict(permanent_db_path=str(tmp_path / "a.db"), db_mtime=1.0, start_date="20260101", created_at=1_000.0)
+    root = ctx._shared_panel_root(str(tmp_path / "a.db"))
+
+    def _fail_replace(src, dst):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(ctx.os, "replace", _fail_replace)
+    assert ctx.publish_backtest_history_panel(df, **publish) is None
+    assert os.listdir(root) == []
+    monkeypatch.undo()
+    monkeypatch.setenv("OPENCLAW_BACKTEST_HISTORY_SHARED_DIR", str(tmp_path / "shared"))
+
+    assert ctx.publish_backtest_history_panel(df, **publish) is not None
+    attached, _ = ctx.attach_backtest_history_panel(
+        permanent_db_path=str(tmp_path / "a.db"), db_mtime=1.0, start_date="20260101", current_ts=1_000.0, ttl_sec=300
+    )
+    pd.testing.assert_frame_equal(attached, df)
+
+
+def test_history_cache_reloads_when_database_changes(history_db):
+    calls = []
+    load = _loader(history_db, calls)
+    load(120)
+
+    conn = sqlite3.connect(str(history_db))
+    conn.execute("UPDATE daily_trading_data SET vol = 2000.0")
+    conn.commit()
+    conn.close()
+    stat = os.stat(history_db)
+    os.utime(history_db, (stat.st_atime, stat.st_mtime + 10))
+    reloaded = load(120)
+
+    assert calls == ["connect", "connect"]
+    assert float(reloaded["vol"].iloc[0]) == 2000.0
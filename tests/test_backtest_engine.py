@@ -249,6 +249,7 @@ class TestBacktestEngine:
                 "train_window_days": 180,
                 "test_window_days": 60,
                 "step_days": 60,
+                "keep_window_diagnostics": True,
             },
         )
 
@@ -256,6 +257,47 @@ class TestBacktestEngine:
         assert failed
         assert failed[0]["backtest_diagnostics"]["type"] == "score_distribution"
         assert failed[0]["backtest_diagnostics"]["max_score"] == 39.5
+        window_diagnostics = result["strategy_backtest_diagnostics"]["window_diagnostics"]
+        assert window_diagnostics["diagnostic_count"] == 1
+        assert window_diagnostics["max_score"] == 39.5
+
+    def test_rolling_folds_only_test_window_diagnostics_and_keeps_rows_lean(self):
+        adapter = V49Adapter(module_path=Path("/tmp/fake.py"))
+
+        def _window_backtest(params: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "summary": {"win_rate": 0.50, "max_drawdown": 0.10, "signal_density": 0.01},
+                "raw": {
+                    "success": True,
+                    "backtest_diagnostics": {
+                        "type": "score_distribution",
+                        "evaluated": 10,
+                        "passed_threshold": 1,
+                        "max_score": float(params["window_index"]),
+                    },
+                },
+            }
+
+        adapter.register_backtest_handler("v6", _window_backtest)
+        engine = BacktestEngine(adapter)
+        result = engine.run(
+            "v6",
+            "2025-01-01",
+            "2025-12-31",
+            {
+                "mode": "rolling",
+                "train_window_days": 180,
+                "test_window_days": 60,
+                "step_days": 60,
+            },
+        )
+
+        window_results = result["result"]["window_results"]
+        rows = window_results["train"] + window_results["test"]
+        assert rows
+        assert all("backtest_diagnostics" not in row for row in rows)
+        window_diagnostics = result["strategy_backtest_diagnostics"]["window_diagnostics"]
+        assert window_diagnostics["diagnostic_count"] == len(window_results["test"])
 
     def test_rolling_applies_global_evaluation_budget_across_windows(self):
         adapter = V49Adapter(module_path=Path("/tmp/fake.py"))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import itertools
+import sqlite3
+
+from openclaw.runtime.db_maintenance import run_online_maintenance
+
+
+def _db(path, *, incremental: bool) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    if incremental:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, note TEXT)")
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT, name TEXT)")
+    conn.executemany(
+        "INSERT INTO daily_trading_data VALUES (?, ?, ?)",
+        [(f"{i % 300:06d}.SZ", f"2026{i % 12 + 1:02d}01", "x" * 200) for i in range(6000)],
+    )
+    conn.commit()
+    conn.execute("DELETE FROM daily_trading_data WHERE rowid <= 4000")
+    conn.commit()
+    return conn
+
+
+def test_online_maintenance_reclaims_pages_while_readers_continue(tmp_path):
+    path = tmp_path / "stock.db"
+    conn = _db(path, incremental=True)
+    reader = sqlite3.connect(str(path))
+    reader.execute("BEGIN")
+    before = reader.execute("SELECT COUNT(*) FROM daily_trading_data").fetchone()[0]
+
+    report = run_online_maintenance(
+        conn, hot_tables=["daily_trading_data", "stock_basic", "missing_table"], db_path=str(path), pages_per_step=10
+    )
+
+    assert reader.execute("SELECT COUNT(*) FROM daily_trading_data").fetchone()[0] == before
+    reader.rollback()
+    assert report["incremental_auto_vacuum"] is True
+    assert report["freelist_before"] > 0 and report["freelist_after"] == 0
+    assert report["vacuum_steps"] > 1
+    assert report["reclaimed_bytes"] == report["reclaimed_pages"] * conn.execute("PRAGMA page_size").fetchone()[0]
+    assert report["analyzed_tables"] == ["daily_trading_data", "stock_basic"]
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'daily_trading_data'").fetchone()[0] == 1
+
+
+def test_budget_bounds_the_vacuum_slices(tmp_path):
+    conn = _db(tmp_path / "stock.db", incremental=True)
+    ticks = itertools.count()
+
+    report = run_online_maintenance(
+        conn, hot_tables=["daily_trading_data"], budget_seconds=2, pages_per_step=1, clock=lambda: float(next(ticks))
+    )
+
+    assert report["vacuum_steps"] <= 2
+    assert report["timed_out"] is True
+    assert report["freelist_after"] > 0
+
+
+def test_non_incremental_db_is_flagged_instead_of_vacuumed(tmp_path):
+    conn = _db(tmp_path / "stock.db", incremental=False)
+
+    report = run_online_maintenance(conn, hot_tables=["stock_basic"])
+
+    assert report["incremental_auto_vacuum"] is False
+    assert report["needs_full_vacuum"] is True
+    assert report["vacuum_steps"] == 0
+    assert report["freelist_after"] > 0
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sqlite3
+
+from openclaw.runtime import db_metadata as meta
+
+
+def _conn(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, close_price REAL)")
+    conn.execute("CREATE INDEX idx_trade_date ON daily_trading_data(trade_date)")
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT, industry TEXT)")
+    conn.executemany("INSERT INTO stock_basic VALUES (?, ?)", [(f"{code:06d}.SZ", "银行") for code in range(40)])
+    rows = [(f"{code:06d}.SZ", date, 10.0) for date in ("20260508", "20260511", "20260512") for code in range(40)]
+    conn.executemany("INSERT INTO daily_trading_data VALUES (?, ?, ?)", rows[:-5])
+    conn.commit()
+    return conn
+
+
+def test_rebuild_matches_full_table_aggregates(tmp_path):
+    conn = _conn(tmp_path / "stock.db")
+    assert meta.read_db_summary(conn, daily_table="daily_trading_data") is None
+
+    assert meta.rebuild_db_metadata(conn) == ["daily_trading_data", "stock_basic"]
+    summary = meta.read_db_summary(conn, daily_table="daily_trading_data")
+
+    total, min_date, max_date = conn.execute(
+        "SELECT COUNT(*), MIN(trade_date), MAX(trade_date) FROM daily_trading_data"
+    ).fetchone()
+    assert (summary["total_records"], summary["min_date"], summary["max_date"]) == (total, min_date, max_date)
+    assert summary["records_last_trade_date"] == 35
+    assert summary["recent_counts"] == {"20260512": 35, "20260511": 40, "20260508": 40}
+    assert summary["table_counts"] == {"daily_trading_data": 115, "stock_basic": 40}
+    assert summary["metadata_verified_at"]
+    assert not summary["stale"]
+
+
+def test_reads_flag_backfills_from_other_writers_and_sync_recounts_only_appended_dates(tmp_path):
+    conn = _conn(tmp_path / "stock.db")
+    meta.rebuild_db_metadata(conn)
+
+    before = conn.total_changes
+    assert meta.sync_db_metadata(conn) == {}
+    assert conn.total_changes == before
+
+    writer = sqlite3.connect(str(tmp_path / "stock.db"))
+    writer.executemany(
+        "INSERT INTO daily_trading_data VALUES (?, ?, ?)",
+        [("000039.SZ", "20260512", 10.0)] + [(f"{code:06d}.SZ", "20260430", 10.0) for code in range(40)],
+    )
+    writer.commit()
+    before = conn.total_changes
+    stale = meta.read_db_summary(conn, daily_table="daily_trading_data")
+    assert conn.total_changes == before
+    assert (stale["stale"], stale["stale_tables"], stale["total_records"]) == (True, ["daily_trading_data"], 115)
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    assert meta.sync_db_metadata(conn) == {"daily_trading_data": "synced"}
+    conn.set_trace_callback(None)
+    recounted = [sql for sql in statements if "COUNT(*) FROM \"daily_trading_data\" WHERE trade_date" in sql]
+    assert sorted(sql.rsplit("=", 1)[1].strip(" ')") for sql in recounted) == ["20260430", "20260512"]
+
+    summary = meta.read_db_summary(conn, daily_table="daily_trading_data")
+    assert summary["total_records"] == conn.execute("SELECT COUNT(*) FROM daily_trading_data").fetchone()[0]
+    assert (summary["min_date"], summary["records_last_trade_date"], summary["stale"]) == ("20260430", 36, False)
+
+
+def test_background_sync_builds_summary_for_every_table(tmp_path):
+    path = tmp_path / "stock.db"
+    _conn(path).close()
+
+    assert meta.start_background_sync(str(path), lambda: sqlite3.connect(str(path)))
+    meta._SYNC_THREADS[str(path)].join(timeout=10)
+
+    conn = sqlite3.connect(str(path))
+    summary = meta.read_db_summary(conn, daily_table="daily_trading_data")
+    assert summary["total_records"] == 115
+    assert summary["table_counts"]["stock_basic"] == 40
+    assert not summary["stale"]
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
+from openclaw.services import ensemble_alpha_rebuild_lab_service as rebuild_lab
 from openclaw.services.ensemble_alpha_rebuild_lab_service import (
+    RebuildScoreCache,
     _candidate_score,
     build_ensemble_alpha_rebuild_lab,
     build_ensemble_alpha_rebuild_multi_window_lab,
@@ -135,6 +139,63 @@ def test_hard_event_alpha_candidate_penalizes_crowded_exhaustion_structure():
     assert _candidate_score("hard_event_alpha_candidate", low_capacity) == 0.0
 
 
+def test_ensemble_alpha_rebuild_multi_window_lab_parallel_matches_sequential():
+    chains = [_window(f"2026010{day}", shift=day) for day in range(1, 6)]
+    chains.append(_window("20260103", shift=9))
+
+    sequential = build_ensemble_alpha_rebuild_multi_window_lab(chains, min_samples=3, min_research_windows=3)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = build_ensemble_alpha_rebuild_multi_window_lab(
+            chains, min_samples=3, min_research_windows=3, executor=executor
+        )
+
+    assert parallel == sequential
+    assert list(parallel["window_reviews"]) == ["20260101", "20260102", "20260103", "20260104", "20260105"]
+    assert parallel["window_reviews"]["20260103"] == build_ensemble_alpha_rebuild_lab(
+        chains[-1], min_samples=3, min_research_windows=1
+    )
+
+
+def test_ensemble_alpha_rebuild_multi_window_lab_reuses_cached_window_scores(monkeypatch):
+    chains = [_window(f"2026010{day}", shift=day) for day in range(1, 4)]
+    cache = RebuildScoreCache()
+    first = build_ensemble_alpha_rebuild_multi_window_lab(chains, min_samples=3, score_cache=cache)
+    scored: list[str] = []
+    original = rebuild_lab._candidate_scores
+
+    def counting_scores(candidate, items):
+        scored.append(candidate)
+        return original(candidate, items)
+
+    monkeypatch.setattr(rebuild_lab, "_candidate_scores", counting_scores)
+    second = build_ensemble_alpha_rebuild_multi_window_lab(chains, min_samples=3, score_cache=cache)
+
+    assert second == first
+    assert len(cache) == 3
+    assert scored == ["industry_neutral_quality_momentum"]
+    build_ensemble_alpha_rebuild_multi_window_lab(chains, min_samples=3, score_cache=cache, rule_version="next")
+    assert len(cache) == 6
+
+    trimmed = [dict(chain, sample_facts=chain["sample_facts"][:-1]) for chain in chains]
+    scored.clear()
+    assert build_ensemble_alpha_rebuild_multi_window_lab(
+        trimmed, min_samples=3, score_cache=cache
+    ) == build_ensemble_alpha_rebuild_multi_window_lab(trimmed, min_samples=3)
+    assert len(cache) == 9
+    assert scored.count("quality_adjusted_momentum") == 6
+
+
+def _window(as_of: str, *, shift: int) -> dict:
+    return {
+        "as_of_date": as_of,
+        "sample_facts": [
+            _item("000001.SZ", 90.0 - shift, 80.0, 10.0, 1.0, 2.0, 3.0, 4.0, 5.0 - shift),
+            _item("000002.SZ", 70.0, 75.0 - shift, 10.0, 0.5, 1.0, 1.5, 2.0, 3.0),
+            _item("000003.SZ", 50.0 + shift, 70.0, 10.0, -0.5, -1.0, -1.5 + shift, -2.0, -3.0),
+        ],
+    }
+
+
 def _item(
     ts_code: str,
     momentum: float,
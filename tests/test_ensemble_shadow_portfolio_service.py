@@ -3,6 +3,7 @@ from __future__ import annotations
 from openclaw.services.ensemble_shadow_portfolio_service import (
     build_ensemble_shadow_portfolio,
     build_rebuilt_candidate_shadow_portfolio,
+    sweep_ensemble_shadow_portfolios,
 )
 
 
@@ -394,6 +395,68 @@ def test_rebuilt_candidate_shadow_portfolio_v6_reduces_neutral_over_veto_without
     assert "neutral_v6_hard_event_below_conviction_floor" in review["neutral_vetoed_signals"][0]["reason"]
 
 
+def test_sweep_matches_single_builds_for_every_window_and_budget():
+    audit = {
+        "passed": True,
+        "alpha_candidate_sleeves": ["momentum", "reversal"],
+        "risk_filter_sleeves": ["quality_low_vol"],
+        "excluded_sleeves": ["money_flow", "quality_low_vol"],
+    }
+    windows = [
+        {
+            "sleeve_policy_audit": audit,
+            "sample_facts": [
+                _fact("000001.SZ", "电子", 90.0, 40.0, 80.0, 1_000_000.0),
+                _fact("000002.SZ", "电子", 75.0, 55.0, 70.0, 300_000.0),
+                _fact("000002.SZ", "电子", 10.0, 10.0, 10.0, 1.0),
+                _fact("000003.SZ", "医药", 60.0, 70.0, 50.0, 0.0),
+                _fact("000004.SZ", "银行", 0.0, 0.0, 90.0, 1_000_000.0),
+            ],
+        },
+        {"sleeve_policy_audit": audit, "sample_facts": [_fact("000005.SZ", "银行", 0.0, 0.0, 90.0, 1_000_000.0)]},
+        {"sleeve_policy_audit": {**audit, "alpha_candidate_sleeves": []}, "sample_facts": []},
+    ]
+    budgets = [None, {"momentum": 0.7, "reversal": 0.3}, {"momentum": 0.0, "reversal": 1.0}, {"momentum": 0.0, "reversal": 0.0}]
+    kwargs = {"max_positions": 3, "single_name_cap": 0.25, "industry_cap": 0.3, "capacity_participation": 0.1}
+
+    swept = sweep_ensemble_shadow_portfolios(windows, alpha_risk_budgets=budgets, **kwargs)
+
+    assert swept == [
+        [build_ensemble_shadow_portfolio(window, alpha_risk_budget=budget, **kwargs) for budget in budgets]
+        for window in windows
+    ]
+    assert swept[1][0]["blocking_reasons"] == ["missing_positive_construction_scores"]
+    assert swept[2][0]["blocking_reasons"] == ["missing_positive_alpha_candidate_sleeves"]
+
+
+def test_industry_and_capacity_caps_follow_score_rank():
+    review = build_ensemble_shadow_portfolio(
+        {
+            "sleeve_policy_audit": {"passed": True, "alpha_candidate_sleeves": ["momentum"], "risk_filter_sleeves": []},
+            "sample_facts": [
+                _fact("000003.SZ", "医药", 40.0, 0.0, 0.0, 100_000.0),
+                _fact("000001.SZ", "电子", 80.0, 0.0, 0.0, 10_000_000.0),
+                _fact("000002.SZ", "电子", 80.0, 0.0, 0.0, 10_000_000.0),
+            ],
+        },
+        single_name_cap=0.5,
+        industry_cap=0.6,
+    )
+
+    assert [(row["ts_code"], row["weight"]) for row in review["shadow_weights"]] == [
+        ("000001.SZ", 0.4),
+        ("000002.SZ", 0.2),
+        ("000003.SZ", 0.01),
+    ]
+    assert [(hit["ts_code"], hit["constraint"]) for hit in review["constraint_hits"]] == [
+        ("000002.SZ", "industry_cap"),
+        ("000003.SZ", "capacity_constraint"),
+    ]
+    assert review["industry_exposure"] == {"医药": 0.01, "电子": 0.6}
+    assert review["capacity_usage"] == {"000001.SZ": 0.04, "000002.SZ": 0.02, "000003.SZ": 0.1}
+    assert review["cash_weight"] == 0.39
+
+
 def _fact(
     ts_code: str,
     industry: str,
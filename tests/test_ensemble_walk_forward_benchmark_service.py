@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from openclaw.services.ensemble_walk_forward_benchmark_service import build_ensemble_walk_forward_shadow_benchmark
+import sqlite3
+
+from openclaw.services.ensemble_walk_forward_benchmark_service import (
+    WalkForwardBenchmarkAccumulator,
+    append_walk_forward_window,
+    build_ensemble_walk_forward_shadow_benchmark,
+    load_walk_forward_accumulator,
+    refresh_walk_forward_shadow_benchmark,
+)
 
 
 def test_ensemble_walk_forward_benchmark_blocks_without_valid_windows():
@@ -72,3 +80,79 @@ def test_ensemble_walk_forward_benchmark_computes_metrics_only_after_minimum_val
     assert review["regime_split"]["risk_on"]["window_count"] == 3
     assert review["risk_contribution"]["source_strategy_weight_share"] == {"v4": 0.5, "v8": 0.5}
     assert review["blocking_reasons"] == []
+
+
+def test_walk_forward_accumulator_matches_full_recompute_for_every_prefix():
+    rows = _valid_rows(7)
+    rows[2]["execution_cost_replay"]["net_return"] = -12.0
+    rows[4]["formal_pool_benchmark"] = {"available": False}
+    accumulator = WalkForwardBenchmarkAccumulator()
+
+    for count, row in enumerate(rows, start=1):
+        accumulator.add(row)
+        assert accumulator.payload(min_windows=3) == build_ensemble_walk_forward_shadow_benchmark(
+            rows[:count], min_windows=3
+        )
+    restored = WalkForwardBenchmarkAccumulator.from_state(accumulator.to_state())
+    assert restored == accumulator
+    assert "window_4:missing_formal_pool_benchmark" in accumulator.payload()["blocking_reasons"]
+
+
+def test_refresh_walk_forward_benchmark_folds_appended_windows_and_refolds_changed_history():
+    conn = sqlite3.connect(":memory:")
+    rows = _valid_rows(8)
+    refresh_walk_forward_shadow_benchmark(conn, "ensemble_core", rows[:5])
+
+    appended = refresh_walk_forward_shadow_benchmark(conn, "ensemble_core", rows[:6])
+    assert appended == build_ensemble_walk_forward_shadow_benchmark(rows[:6])
+    assert load_walk_forward_accumulator(conn, "ensemble_core").last_window_id == "2026-01-06"
+
+    rolled = refresh_walk_forward_shadow_benchmark(conn, "ensemble_core", rows[2:8])
+    assert rolled == build_ensemble_walk_forward_shadow_benchmark(rows[2:8])
+
+    rows[7]["execution_cost_replay"]["net_return"] = 40.0
+    last_rewritten = refresh_walk_forward_shadow_benchmark(conn, "ensemble_core", rows[2:8])
+    assert last_rewritten == build_ensemble_walk_forward_shadow_benchmark(rows[2:8])
+
+    rows[3]["execution_cost_replay"]["net_return"] = 50.0
+    rewritten = refresh_walk_forward_shadow_benchmark(conn, "ensemble_core", rows[2:8], rebuild=True)
+    assert rewritten == build_ensemble_walk_forward_shadow_benchmark(rows[2:8])
+    assert rewritten != last_rewritten
+    assert load_walk_forward_accumulator(conn, "ensemble_core").window_count == 6
+    assert load_walk_forward_accumulator(conn, "other").window_count == 0
+
+
+def test_append_walk_forward_window_folds_only_the_new_window():
+    conn = sqlite3.connect(":memory:")
+    rows = _valid_rows(6)
+    for row in rows:
+        appended = append_walk_forward_window(conn, "ensemble_core", row)
+    assert append_walk_forward_window(conn, "ensemble_core", rows[-1]) == appended
+    assert appended == build_ensemble_walk_forward_shadow_benchmark(rows)
+    assert load_walk_forward_accumulator(conn, "ensemble_core").window_count == 6
+
+
+def _valid_rows(count: int) -> list[dict]:
+    return [
+        {
+            "as_of_date": f"2026-01-{idx + 1:02d}",
+            "market_regime_label": "risk_on" if idx % 2 == 0 else "neutral",
+            "shadow_portfolio": {
+                "industry_exposure": {"电子": 0.2 + idx * 0.01},
+                "shadow_weights": [
+                    {"weight": 0.1, "source_strategy": "v4", "industry": "电子"},
+                    {"weight": 0.1, "source_strategy": "v8", "industry": "医药"},
+                ],
+            },
+            "execution_cost_replay": {
+                "research_only": True,
+                "not_for_production": True,
+                "blocking_reasons": [],
+                "net_return": 2.0 + idx,
+                "turnover": 0.2,
+                "trade_replay": [{"traded": True, "capacity_usage": 0.04}],
+            },
+            "formal_pool_benchmark": {"available": True, "avg_return_pct": 1.0},
+        }
+        for idx in range(count)
+    ]
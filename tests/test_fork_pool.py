@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openclaw.runtime import fork_pool
+from openclaw.runtime.fork_pool import default_workers, fork_map, fork_supported
+
+
+@pytest.mark.skipif(not fork_supported(), reason="fork start method unavailable")
+def test_concurrent_fork_maps_keep_their_own_tasks():
+    def run(offset: int) -> list:
+        seen = []
+        results = fork_map(lambda item: item + offset, range(6), workers=2, on_result=lambda item, _: seen.append(item))
+        return [results, seen]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(run, (100, 200))
+
+    assert first == [[100, 101, 102, 103, 104, 105], [0, 1, 2, 3, 4, 5]]
+    assert second[0] == [200, 201, 202, 203, 204, 205]
+    assert fork_pool._WORKER_TASK is None
+
+
+def test_default_workers_is_serial_inside_streamlit(monkeypatch):
+    monkeypatch.delenv("TEST_FORK_WORKERS", raising=False)
+    monkeypatch.setitem(sys.modules, "streamlit.runtime", types.SimpleNamespace(exists=lambda: True))
+    assert default_workers("TEST_FORK_WORKERS", 4) == 1
+
+    monkeypatch.setenv("TEST_FORK_WORKERS", "3")
+    assert default_workers("TEST_FORK_WORKERS", 4) == 3
+
+    monkeypatch.delenv("TEST_FORK_WORKERS")
+    monkeypatch.setitem(sys.modules, "streamlit.runtime", types.SimpleNamespace(exists=lambda: False))
+    assert default_workers("TEST_FORK_WORKERS", 1) == 1
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+
+from openclaw.services.forward_return_replay_service import replay_forward_returns
+
+
+def _conn() -> sqlite3.Connection:
+    rng = random.Random(11)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, close_price REAL, pct_chg REAL, amount REAL)"
+    )
+    rows = []
+    for k in range(12):
+        code = f"{600000 + k}.SH"
+        for day in range(1, 29):
+            if rng.random() < 0.15:
+                continue
+            trade_date = f"202603{day:02d}" if k % 2 else f"2026-03-{day:02d}"
+            close = None if rng.random() < 0.05 else (0.0 if day == 11 else round(rng.uniform(5, 20), 2))
+            rows.append((code, trade_date, close, round(rng.uniform(-11, 11), 2), None if day % 7 == 0 else 1e6 * day))
+    conn.executemany("INSERT INTO daily_trading_data VALUES (?, ?, ?, ?, ?)", rows)
+    return conn
+
+
+def _per_symbol(conn, code: str, as_of: str, horizons, expr: str) -> dict:
+    rows = conn.execute(
+        f"""
+        SELECT trade_date, close_price, pct_chg, amount FROM daily_trading_data
+        WHERE ts_code = ? AND {expr} >= ? AND close_price IS NOT NULL
+        ORDER BY {expr} ASC LIMIT ?
+        """,
+        (code, as_of, max(horizons) + 1),
+    ).fetchall()
+    out = {}
+    for h in horizons:
+        if len(rows) < h + 1:
+            out[h] = {"available": False, "blocking_reason": "insufficient_forward_price_window", "price_count": len(rows)}
+            continue
+        entry, exit_ = float(rows[0][1] or 0.0), float(rows[h][1] or 0.0)
+        if entry <= 0.0 or exit_ <= 0.0:
+            out[h] = {"available": False, "blocking_reason": "invalid_forward_price"}
+            continue
+        out[h] = {
+            "available": True,
+            "entry_trade_date": rows[0][0],
+            "exit_trade_date": rows[h][0],
+            "entry_close": entry,
+            "exit_close": exit_,
+            "return_pct": (exit_ / entry - 1.0) * 100.0,
+            "entry_pct_chg": float(rows[0][2] or 0.0),
+            "exit_pct_chg": float(rows[h][2] or 0.0),
+            "entry_amount": float(rows[0][3] or 0.0),
+            "exit_amount": float(rows[h][3] or 0.0),
+        }
+    return out
+
+
+def test_batched_replay_matches_per_symbol_limit_queries():
+    conn = _conn()
+    codes = [f"{600000 + k}.SH" for k in range(12)] + ["missing.SZ"]
+    requests = [
+        (code, as_of, horizons)
+        for code in codes
+        for as_of, horizons in (("20260301", (1, 5, 20)), ("20260311", (3,)), ("20260325", (1, 5)), ("20260310", (10,)))
+    ]
+    for date_key, expr in (("raw", "trade_date"), ("dashless", "REPLACE(trade_date, '-', '')")):
+        actual = replay_forward_returns(conn, requests, date_key=date_key, extra_columns=("pct_chg", "amount"))
+        expected = [_per_symbol(conn, code, as_of, horizons, expr) for code, as_of, horizons in requests]
+        assert actual == expected
+        assert any(cell["available"] for result in actual for cell in result.values())
+        assert any(cell.get("blocking_reason") == "invalid_forward_price" for result in actual for cell in result.values())
+
+
+def test_replay_reads_each_chunk_of_symbols_once(monkeypatch):
+    import openclaw.services.forward_return_replay_service as replay_service
+
+    conn = _conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    monkeypatch.setattr(replay_service, "FORWARD_REPLAY_CHUNK", 5)
+    requests = [(f"{600000 + k}.SH", f"202603{day:02d}", (1, 5)) for k in range(12) for day in range(1, 20)]
+
+    results = replay_forward_returns(conn, requests, date_key="compact", invalid_price_reason="invalid_close_price")
+
+    assert len(results) == len(requests)
+    assert len(statements) == 3
+    assert {cell.get("blocking_reason") for result in results for cell in result.values()} <= {
+        None,
+        "insufficient_forward_price_window",
+        "invalid_close_price",
+    }
+
+
+def test_non_positive_horizons_are_dropped_and_empty_requests_skip_sql():
+    conn = _conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    assert replay_forward_returns(conn, [("600000.SH", "20260301", (-1,))]) == [{}]
+    assert replay_forward_returns(conn, []) == []
+    assert statements == []
+    zero = replay_forward_returns(conn, [("600001.SH", "20260301", (0,))])[0][0]
+    assert zero["available"] is True and zero["return_pct"] == 0.0
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.indicator_cache import IndicatorCache, build_indicator_series
+
+
+def _history(rows: int = 260, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.cumprod(1 + rng.normal(0, 0.02, rows))
+    volume = rng.uniform(1e4, 5e4, rows)
+    dates = pd.date_range("2025-01-01", periods=rows, freq="B").strftime("%Y%m%d").to_numpy()
+    return dates, close, volume
+
+
+def _window_indicators(close: np.ndarray, volume: np.ndarray) -> dict:
+    """The per-window computation identify_signals_optimized used to hash tuples for."""
+    mean_close = np.mean(close[-10:])
+    return {
+        "ma5": np.mean(close[-5:]),
+        "ma10": np.mean(close[-10:]),
+        "ma20": np.mean(close[-20:]),
+        "ma60": np.mean(close[-60:]) if len(close) >= 60 else 0,
+        "vol_ma5": np.mean(volume[-5:]),
+        "vol_ma10": np.mean(volume[-10:]),
+        "vol_ma20": np.mean(volume[-20:]),
+        "momentum_5": (close[-1] - close[-5]) / (close[-5] + 0.0001) * 100,
+        "momentum_10": (close[-1] - close[-10]) / (close[-10] + 0.0001) * 100,
+        "volatility": np.std(close[-10:]) / mean_close * 100 if mean_close > 0 else 0,
+    }
+
+
+def test_series_rows_match_per_window_indicators():
+    dates, close, volume = _history()
+    series = build_indicator_series("000001.SZ", dates, close, volume)
+
+    for i in range(20, len(close)):
+        window = slice(max(0, i - 60), i + 1)
+        assert series.row(i) == _window_indicators(close[window], volume[window])
+    ema12 = pd.Series(close).ewm(span=12, adjust=False).mean().to_numpy()
+    ema26 = pd.Series(close).ewm(span=26, adjust=False).mean().to_numpy()
+    np.testing.assert_array_equal(series.dif, ema12 - ema26)
+    np.testing.assert_array_equal(series.dea, pd.Series(ema12 - ema26).ewm(span=9, adjust=False).mean().to_numpy())
+
+
+def test_new_trade_dates_extend_the_persisted_series(tmp_path):
+    dates, close, volume = _history()
+    full = build_indicator_series("000001.SZ", dates, close, volume)
+
+    IndicatorCache(str(tmp_path)).get("000001.SZ", dates[:200], close[:200], volume[:200])
+    restarted = IndicatorCache(str(tmp_path))
+    extended = restarted.get("000001.SZ", dates, close, volume)
+    prefix = restarted.get("000001.SZ", dates[:120], close[:120], volume[:120])
+
+    for name, values in full.arrays.items():
+        np.testing.assert_array_equal(extended.arrays[name], values)
+        np.testing.assert_array_equal(prefix.arrays[name], values[:120])
+    assert extended.last_trade_date == dates[-1]
+    assert len(list(tmp_path.rglob("*.npz"))) == 1
+
+
+def test_rewritten_history_is_recomputed(tmp_path):
+    dates, close, volume = _history()
+    cache = IndicatorCache(str(tmp_path))
+    cache.get("000001.SZ", dates, close, volume)
+
+    adjusted = close * 0.9
+    series = cache.get("000001.SZ", dates, adjusted, volume)
+
+    np.testing.assert_array_equal(series.arrays["ma20"], build_indicator_series("x", dates, adjusted, volume).arrays["ma20"])
+
+
+def test_rolling_window_requests_are_aligned_on_their_first_trade_date(tmp_path, monkeypatch):
+    dates, close, volume = _history()
+    cache = IndicatorCache(str(tmp_path))
+    cache.get("000001.SZ", dates[:200], close[:200], volume[:200])
+    saves = []
+    monkeypatch.setattr(cache, "_save", saves.append)
+
+    shifted = cache.get("000001.SZ", dates[30:200], close[30:200], volume[30:200])
+    assert saves == []
+    rolled = cache.get("000001.SZ", dates[60:], close[60:], volume[60:])
+    assert len(saves) == 1
+
+    for request, (start, end) in ((shifted, (30, 200)), (rolled, (60, len(dates)))):
+        fresh = build_indicator_series("000001.SZ", dates[start:end], close[start:end], volume[start:end])
+        for name, values in fresh.arrays.items():
+            np.testing.assert_array_equal(request.arrays[name], values)
+        assert list(request.trade_dates) == list(dates[start:end])
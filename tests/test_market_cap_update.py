@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pandas as pd
+
+from openclaw.runtime.market_cap_update import (
+    StaticMarketCapProvider,
+    market_cap_distribution,
+    update_market_cap_incremental,
+)
+
+
+def _conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO stock_basic VALUES (?, ?)", [(f"{i:06d}.SZ", f"股票{i}") for i in range(4)])
+    return conn
+
+
+def _frame(trade_date: str, codes, scale: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ts_code": codes,
+            "trade_date": trade_date,
+            "circ_mv": [scale * (i + 1) * 100000 for i in range(len(codes))],
+            "total_mv": [scale * (i + 1) * 200000 for i in range(len(codes))],
+        }
+    )
+
+
+def test_first_run_keeps_only_newest_published_date():
+    conn = _conn()
+    codes = [f"{i:06d}.SZ" for i in range(4)] + ["999999.SH"]
+    provider = StaticMarketCapProvider({"20260511": _frame("20260511", codes, 1.0), "20260508": _frame("20260508", codes, 0.5)})
+
+    result = update_market_cap_incremental(conn, provider, candidate_dates=["20260508", "20260512", "20260511"])
+
+    assert provider.requested == ["20260512", "20260511"]
+    assert result["fetched_dates"] == ["20260511"]
+    assert result["updated_count"] == 4
+    assert conn.execute("SELECT COUNT(*) FROM stock_market_cap_daily").fetchone()[0] == 4
+    assert conn.execute("SELECT circ_mv, mv_date FROM stock_basic WHERE ts_code = '000001.SZ'").fetchone() == (200000.0, "20260511")
+    assert market_cap_distribution(conn)["total"] == 4
+
+
+def test_daily_run_fetches_only_new_dates_and_touches_stale_codes():
+    conn = _conn()
+    codes = [f"{i:06d}.SZ" for i in range(4)]
+    provider = StaticMarketCapProvider(
+        {
+            "20260511": _frame("20260511", codes, 1.0),
+            "20260512": _frame("20260512", codes[:2], 2.0),
+        }
+    )
+    update_market_cap_incremental(conn, provider, candidate_dates=["20260511"])
+
+    provider.requested.clear()
+    result = update_market_cap_incremental(conn, provider, candidate_dates=["20260512", "20260511", "20260508"])
+
+    assert provider.requested == ["20260512"]
+    assert result["stored_rows"] == 2
+    assert result["updated_count"] == 2
+    rows = dict(conn.execute("SELECT ts_code, mv_date FROM stock_basic").fetchall())
+    assert rows == {"000000.SZ": "20260512", "000001.SZ": "20260512", "000002.SZ": "20260511", "000003.SZ": "20260511"}
+
+    provider.requested.clear()
+    again = update_market_cap_incremental(conn, provider, candidate_dates=["20260512", "20260511"])
+    assert provider.requested == []
+    assert again["updated_count"] == 0
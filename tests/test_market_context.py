@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pandas as pd
+
+from openclaw.runtime.market_context import (
+    MarketContextCache,
+    build_market_context_snapshot,
+    classify_market_environment,
+    score_industry_heat,
+)
+
+
+def _conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT, industry TEXT)")
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, pct_chg REAL, vol REAL)")
+    basics, rows = [], []
+    for idx in range(30):
+        code = f"{idx:06d}.SZ"
+        industry = ("银行", "电子", "医药", None)[idx % 4] if idx < 28 else "煤炭"
+        basics.append((code, industry))
+        rows.append((code, "20260512", (idx % 7) * 1.8 - 2.0, 40000.0 + idx * 3000))
+        rows.append((code, "20260511", 1.0, 1.0))
+    rows.append(("000001.SZ", "20260512", None, None))
+    conn.executemany("INSERT INTO stock_basic VALUES (?, ?)", basics)
+    conn.executemany("INSERT INTO daily_trading_data VALUES (?, ?, ?, ?)", rows)
+    return conn
+
+
+def _per_industry_heat(conn: sqlite3.Connection, industry: str) -> dict:
+    df = pd.read_sql_query(
+        """
+        SELECT dtd.ts_code, dtd.pct_chg, dtd.vol
+        FROM daily_trading_data dtd
+        INNER JOIN stock_basic sb ON dtd.ts_code = sb.ts_code
+        WHERE sb.industry = ? AND dtd.trade_date = ?
+        """,
+        conn,
+        params=(industry, "20260512"),
+    )
+    return score_industry_heat(
+        rows=len(df),
+        avg_return=df["pct_chg"].mean(),
+        limit_up_count=int((df["pct_chg"] > 9.5).sum()),
+        avg_volume=df["vol"].mean(),
+    )
+
+
+def test_snapshot_industry_heat_matches_per_industry_queries():
+    conn = _conn()
+    snapshot = build_market_context_snapshot(
+        conn=conn,
+        trade_date="20260512",
+        daily_table="daily_trading_data",
+        index_data=None,
+        dynamic_weights=lambda env: {"env": env},
+    )
+
+    assert snapshot.market_env == "oscillation"
+    assert snapshot.weights == {"env": "oscillation"}
+    for industry in ("银行", "电子", "医药", "煤炭"):
+        assert snapshot.heat_for(industry) == _per_industry_heat(conn, industry)
+    assert snapshot.heat_for("煤炭")["heat_level"] == "未知"
+    assert snapshot.heat_for(None) == snapshot.heat_for("不存在")
+
+
+def test_classify_market_environment_uses_newest_first_index_rows():
+    rising = pd.DataFrame({"close_price": [12.0 - i * 0.1 for i in range(20)], "pct_chg": [0.5] * 20})
+    falling = pd.DataFrame({"close_price": [9.0 + i * 0.1 for i in range(20)], "pct_chg": [-0.5] * 20})
+
+    assert classify_market_environment(rising) == "bull"
+    assert classify_market_environment(falling) == "bear"
+    assert classify_market_environment(rising.head(10)) == "oscillation"
+
+
+def test_market_context_cache_rebuilds_on_new_trade_date():
+    cache = MarketContextCache()
+    builds = []
+    index_data = pd.DataFrame({"close_price": [10.0] * 20, "pct_chg": [0.0] * 20})
+
+    def _build(trade_date: str, *, complete: bool = True):
+        def _inner():
+            builds.append(trade_date)
+            conn = _conn()
+            conn.execute("UPDATE daily_trading_data SET trade_date = ? WHERE trade_date = '20260512'", (trade_date,))
+            return build_market_context_snapshot(
+                conn=conn,
+                trade_date=trade_date,
+                daily_table="daily_trading_data",
+                index_data=index_data if complete else None,
+                dynamic_weights=lambda env: {},
+            )
+
+        return _inner
+
+    first = cache.get("20260512", _build("20260512"))
+    assert cache.get("20260512", _build("20260512")) is first
+    second = cache.get("20260513", _build("20260513"))
+    assert second.trade_date == "20260513"
+    assert second.industry_heat == first.industry_heat
+    assert cache.get("20260513", _build("20260513")) is second
+    assert builds == ["20260512", "20260513"]
+
+    failed = cache.get("20260514", _build("20260514", complete=False))
+    assert not failed.complete
+    assert cache.get("20260514", _build("20260514", complete=False)) is not failed
+    assert builds[-2:] == ["20260514", "20260514"]
+
+
+def test_market_context_cache_skips_trade_date_checks_within_recheck_window():
+    now = [100.0]
+    cache = MarketContextCache(recheck_seconds=30, clock=lambda: now[0])
+    assert cache.recent() is None
+
+    snapshot = cache.get(
+        "20260512",
+        lambda: build_market_context_snapshot(
+            conn=_conn(),
+            trade_date="20260512",
+            daily_table="daily_trading_data",
+            index_data=pd.DataFrame({"close_price": [10.0] * 20, "pct_chg": [0.0] * 20}),
+            dynamic_weights=lambda env: {},
+        ),
+    )
+    now[0] += 10
+    assert cache.recent() is snapshot
+    now[0] += 25
+    assert cache.recent() is None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.monthly_selection import build_monthly_features, limit_up_thresholds, run_monthly_stages
+
+STAGE_KWARGS = dict(
+    target_return=0.05,
+    min_amount=0.5,
+    max_volatility=0.20,
+    min_market_cap=0.0,
+    max_market_cap=5000.0,
+    market_status="正常",
+    market_multiplier=1.0,
+)
+
+
+def _stage(name: str, **overrides) -> dict:
+    params = {
+        "stage_name": name,
+        "min_history_days": 60,
+        "min_amount_factor": 1.0,
+        "turnover_min": 0.0,
+        "turnover_max": 1.0,
+        "limit_up_days_limit": 2,
+        "ret20_factor": 0.6,
+        "ret20_floor": 0.03,
+        "max_drawdown": 0.18,
+        "drawdown_good": 0.12,
+        "volatility_factor": 1.0,
+        "vol_percentile_max": 1.01,
+        "score_threshold": 35,
+        "sector_weight": 4,
+        "sector_cap": 18,
+        "sector_strong": 10,
+        "bias_min": -0.05,
+        "bias_max": 0.12,
+        "bias_soft_max": 0.18,
+        "require_pullback": False,
+        "mid_cap_min": 100,
+        "mid_cap_max": 800,
+        "large_cap_min": 800,
+        "large_cap_max": 5000,
+    }
+    params.update(overrides)
+    return params
+
+
+def _universe() -> pd.DataFrame:
+    frames = []
+    for k, (code, days, circ_mv) in enumerate(
+        [("600001.SH", 90, 2_000_000.0), ("300002.SZ", 90, np.nan), ("600003.SH", 50, 3_000_000.0), ("688004.SH", 90, 1_500_000.0)]
+    ):
+        pct = np.full(days, 0.3 + 0.05 * k)
+        pct[-1] = 1.0
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ts_code": code,
+                    "trade_date": pd.bdate_range("2025-01-01", periods=days).strftime("%Y%m%d"),
+                    "close_price": 10 * np.cumprod(1 + pct / 100),
+                    "pct_chg": pct,
+                    "vol": 1000.0 + k,
+                    "amount": 80000.0,
+                    "name": f"股票{k}",
+                    "industry": "电子",
+                    "circ_mv": circ_mv,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_limit_up_thresholds_map_boards_in_one_pass():
+    thresholds = limit_up_thresholds(["300750.SZ", "301001.SZ", "688981.SH", "600519.SH", "000001.SZ"])
+    assert thresholds.tolist() == [0.195, 0.195, 0.195, 0.095, 0.095]
+
+
+def test_features_are_shared_and_missing_cap_gets_no_tier():
+    features = build_monthly_features(_universe())
+
+    assert features["history_days"].tolist() == [90, 90, 50, 90]
+    run = run_monthly_stages(features, [_stage("strict")], **STAGE_KWARGS)
+
+    by_code = {row["股票代码"]: row for row in run["results"]}
+    assert set(by_code) == {"600001.SH", "300002.SZ", "688004.SH"}
+    assert by_code["600001.SH"]["市值层级"] == "中盘"
+    assert by_code["300002.SZ"]["市值层级"] == "-"
+    assert by_code["300002.SZ"]["换手率%"] == "-"
+    assert "行业龙头" in by_code["688004.SH"]["筛选理由"]
+    assert run["debug_runs"][0]["skip_history"] == 1
+
+
+def test_parallel_stages_fall_back_in_order_like_sequential_runs():
+    features = build_monthly_features(_universe())
+    stages = [_stage("strict", score_threshold=1000), _stage("relaxed", min_history_days=40), _stage("rescue")]
+
+    serial = run_monthly_stages(features, stages, workers=1, **STAGE_KWARGS)
+    parallel = run_monthly_stages(features, stages, workers=3, **STAGE_KWARGS)
+
+    assert serial == parallel
+    assert [stats["stage"] for stats in serial["debug_runs"]] == ["strict", "relaxed"]
+    assert serial["debug_runs"][0]["skip_score"] == 3
+    assert len(serial["results"]) == 4
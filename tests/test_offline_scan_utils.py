@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.offline_scan_utils import (
+    industry_return_strength,
+    resolve_history_table,
+    run_stock_scan_pipeline_parallel,
+    stack_history_panel,
+)
+from strategies.scan_pipeline import run_stock_scan_pipeline
+
+
+def _history(length: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 10.0 + np.cumsum(rng.normal(0, 0.2, length))
+    return pd.DataFrame({"trade_date": [f"2026{idx:04d}" for idx in range(length)], "close_price": close})
+
+
+def _loop_industry_strength(histories, industry_by_code):
+    ind_vals = {}
+    for code, industry in industry_by_code.items():
+        hist = histories.get(code)
+        if hist is None or len(hist) < 21:
+            continue
+        close = pd.to_numeric(hist["close_price"], errors="coerce").ffill()
+        if len(close) > 21:
+            r20 = (close.iloc[-1] / close.iloc[-21] - 1.0) * 100
+            ind_vals.setdefault(str(industry), []).append(float(r20))
+    return {ind: float(np.mean(vals)) for ind, vals in ind_vals.items() if vals}
+
+
+def test_industry_return_strength_matches_per_stock_loop():
+    histories = {f"{idx:06d}.SZ": _history(15 + idx * 3, idx) for idx in range(12)}
+    histories["000003.SZ"].loc[5, "close_price"] = np.nan
+    histories["000011.SZ"].loc[histories["000011.SZ"].index[-21], "close_price"] = np.nan
+    industry_by_code = {code: ("银行" if idx % 3 == 0 else "电子" if idx % 3 == 1 else "医药") for idx, code in enumerate(histories)}
+
+    expected = _loop_industry_strength(histories, industry_by_code)
+    actual = industry_return_strength(histories, industry_by_code)
+
+    assert set(actual) == set(expected)
+    for industry, value in expected.items():
+        assert math.isclose(actual[industry], value, rel_tol=1e-12)
+
+
+def test_industry_return_strength_handles_empty_panel():
+    assert industry_return_strength({}, {}) == {}
+    assert industry_return_strength({"000001.SZ": _history(10, 1)}, {"000001.SZ": "银行"}) == {}
+
+
+def test_parallel_scan_pipeline_matches_serial_order():
+    stocks_df = pd.DataFrame({"ts_code": [f"{idx:06d}.SZ" for idx in range(57)], "name": ["x"] * 57})
+    histories = {code: _history(30, idx) for idx, code in enumerate(stocks_df["ts_code"])}
+    progress = []
+    kwargs = dict(
+        conn=None,
+        min_history=20,
+        load_history=lambda _conn, code: histories.get(code),
+        evaluate=lambda row, data: {"score": float(data["close_price"].iloc[-1])},
+        build_result=lambda scan_row: {"ts_code": scan_row.row["ts_code"], "score": scan_row.score_result["score"]},
+    )
+
+    serial = run_stock_scan_pipeline(stocks_df=stocks_df, tag="t", **kwargs)
+    parallel = run_stock_scan_pipeline_parallel(
+        run_pipeline=run_stock_scan_pipeline,
+        stocks_df=stocks_df,
+        tag="t",
+        workers=3,
+        chunk_size=10,
+        on_progress=lambda tag, idx, total: progress.append((idx, total)),
+        **kwargs,
+    )
+
+    assert parallel == serial
+    assert progress[-1] == (56, 57)
+
+
+def test_parallel_scan_pipeline_runs_serially_for_single_worker():
+    stocks_df = pd.DataFrame({"ts_code": ["000001.SZ", "000002.SZ"], "name": ["a", "b"]})
+    calls = []
+
+    def _pipeline(**kwargs):
+        calls.append(len(kwargs["stocks_df"]))
+        return []
+
+    run_stock_scan_pipeline_parallel(run_pipeline=_pipeline, stocks_df=stocks_df, tag="t", workers=1)
+
+    assert calls == [2]
+
+
+def test_resolve_history_table_follows_per_stock_loader_order():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE daily_data (ts_code TEXT)")
+    assert resolve_history_table(conn) == "daily_data"
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT)")
+    assert resolve_history_table(conn) == "daily_trading_data"
+    conn.execute("CREATE TABLE daily_trading_history (ts_code TEXT)")
+    assert resolve_history_table(conn) == "daily_trading_history"
+    conn.close()
+
+
+def test_stack_history_panel_tags_rows_with_codes():
+    panel = stack_history_panel({"000001.SZ": _history(3, 1), "000002.SZ": None, "000003.SZ": _history(2, 2)})
+
+    assert panel["ts_code"].tolist() == ["000001.SZ"] * 3 + ["000003.SZ"] * 2
+    assert stack_history_panel({}).empty
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.panel_backtest import evaluator_backtest_signals, volume_price_backtest_signals
+
+
+def _universe(n_stocks: int = 6, n_days: int = 160, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    dates = pd.bdate_range("2025-01-01", periods=n_days).strftime("%Y%m%d")
+    for k in range(n_stocks):
+        pct = rng.normal(0.2, 2.5, n_days)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ts_code": f"{k:06d}.SZ",
+                    "name": f"股票{k}",
+                    "trade_date": dates,
+                    "close": 10 * np.cumprod(1 + pct / 100),
+                    "vol": rng.lognormal(10, 0.6, n_days),
+                    "pct_chg": pct,
+                }
+            )
+        )
+    frames.append(frames[0].head(90).assign(ts_code="short.SZ"))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _legacy_signals(stock_data: pd.DataFrame, min_score: float) -> pd.DataFrame:
+    stock_data = stock_data.sort_values("trade_date").reset_index(drop=True)
+    signals = []
+    for i in range(20, len(stock_data) - 5):
+        current_close, current_vol, current_pct = (stock_data.iloc[i][c] for c in ("close", "vol", "pct_chg"))
+        hist = stock_data.iloc[i - 20 : i]
+        avg_vol_20 = hist["vol"].mean()
+        score, reasons = 0, []
+        if avg_vol_20 > 0:
+            ratio = current_vol / avg_vol_20
+            for floor, pts, label in ((2.0, 30, "放量"), (1.5, 20, "温和放量"), (1.2, 10, "微量放量")):
+                if ratio >= floor:
+                    score += pts
+                    reasons.append(f"{label}{ratio:.1f}倍")
+                    break
+        for floor, pts, label in ((5, 25, "大涨"), (3, 20, "中涨"), (1, 15, "小涨")):
+            if current_pct >= floor:
+                score += pts
+                reasons.append(f"{label}{current_pct:.1f}%")
+                break
+        else:
+            if current_pct > 0:
+                score += 10
+                reasons.append(f"微涨{current_pct:.1f}%")
+        hi, lo = hist["close"].max(), hist["close"].min()
+        if hi > lo:
+            position = (current_close - lo) / (hi - lo) * 100
+            for ceiling, pts, label in ((30, 20, "底部位置"), (50, 15, "低位"), (70, 10, "中位")):
+                if position < ceiling:
+                    score += pts
+                    reasons.append(f"{label}{position:.0f}%")
+                    break
+        up_days = (stock_data.iloc[i - 4 : i + 1]["pct_chg"] > 0).sum()
+        if up_days >= 4:
+            score += 15
+            reasons.append(f"{up_days}连阳")
+        elif up_days >= 3:
+            score += 10
+            reasons.append(f"{up_days}天上涨")
+        if current_close > hist["close"].tail(5).mean():
+            score += 10
+            reasons.append("站上MA5")
+        if score >= min_score:
+            signals.append(
+                {
+                    "trade_date": stock_data.iloc[i]["trade_date"],
+                    "close": current_close,
+                    "vol": current_vol,
+                    "pct_chg": current_pct,
+                    "signal_strength": score,
+                    "reasons": ", ".join(reasons),
+                    "vol_ratio": current_vol / avg_vol_20 if avg_vol_20 > 0 else 1.0,
+                }
+            )
+    return pd.DataFrame(signals)
+
+
+def _legacy_backtest(df: pd.DataFrame, sample, min_score: float, holding_days: int) -> pd.DataFrame:
+    out = []
+    for ts_code in sample:
+        stock_data = df[df["ts_code"] == ts_code].copy()
+        if len(stock_data) < 120 or len(stock_data) < 30 + holding_days:
+            continue
+        signals = _legacy_signals(stock_data, min_score)
+        rows = []
+        for _, signal in signals.iterrows():
+            loc = stock_data.index.get_loc(stock_data[stock_data["trade_date"] == signal["trade_date"]].index[0])
+            if loc + holding_days < len(stock_data):
+                row = signal.to_dict()
+                row["future_return"] = (stock_data.iloc[loc + holding_days]["close"] - signal["close"]) / signal["close"] * 100
+                rows.append(row)
+        if rows:
+            frame = pd.DataFrame(rows)
+            frame["ts_code"], frame["name"], frame["industry"] = ts_code, stock_data["name"].iloc[0], "未知"
+            out.append(frame)
+    return pd.concat(out, ignore_index=True)
+
+
+def test_volume_price_panel_matches_per_day_loop_on_fixed_seed():
+    df = _universe()
+    np.random.seed(3)
+    sample = np.random.choice(df["ts_code"].unique(), 5, replace=False)
+
+    for holding_days in (5, 10):
+        expected = _legacy_backtest(df, sample, 50.0, holding_days)
+        actual = volume_price_backtest_signals(df, sample_codes=sample, min_score=50.0, holding_days=holding_days)
+        pd.testing.assert_frame_equal(actual, expected[actual.columns.tolist()], check_dtype=False)
+        assert list(actual.columns) == list(expected.columns)
+
+
+def test_volume_price_panel_handles_unsorted_histories_and_empty_samples():
+    df = _universe(n_stocks=2)
+    shuffled = df.sample(frac=1.0, random_state=1)
+    sample = ["000000.SZ", "000001.SZ"]
+
+    expected = _legacy_backtest(shuffled, sample, 50.0, 5)
+    actual = volume_price_backtest_signals(shuffled, sample_codes=sample, min_score=50.0, holding_days=5)
+    pd.testing.assert_frame_equal(actual, expected[actual.columns.tolist()], check_dtype=False)
+    assert volume_price_backtest_signals(df, sample_codes=["short.SZ"], min_score=50.0, holding_days=5).empty
+
+
+def test_evaluator_panel_takes_first_in_range_day_with_shifted_return():
+    df = _universe(n_stocks=4, n_days=100)
+    calls = []
+
+    def evaluate(window, ts_code):
+        calls.append(len(window))
+        if ts_code == "000002.SZ":
+            raise ValueError("bad history")
+        return {"success": True, "final_score": 40 + len(window) % 50, "grade": "B", "dimension_scores": {"潜伏价值": 3}}
+
+    signals = evaluator_backtest_signals(
+        df,
+        sample_codes=["000001.SZ", "000002.SZ", "short.SZ", "000000.SZ"],
+        holding_days=5,
+        evaluate=evaluate,
+        min_score=75,
+        max_score=80,
+        extra_fields=lambda result: {"lurking_value": result["dimension_scores"]["潜伏价值"]},
+    )
+
+    assert [s["ts_code"] for s in signals] == ["000001.SZ", "short.SZ", "000000.SZ"]
+    stock = df[df["ts_code"] == "000001.SZ"].reset_index(drop=True)
+    first = signals[0]
+    assert first["trade_date"] == stock["trade_date"].iloc[34]
+    assert first["future_return"] == (stock["close"].iloc[39] - stock["close"].iloc[34]) / stock["close"].iloc[34] * 100
+    assert (first["signal_strength"], first["lurking_value"]) == (75, 3)
+    assert max(calls) == 35
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+
+import pandas as pd
+
+from openclaw.runtime import scan_cache
+
+
+def _frame(rows: int = 20) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ts_code": [f"{idx:06d}.SZ" for idx in range(rows)],
+            "综合评分": [float(idx) for idx in range(rows)],
+        }
+    )
+
+
+def test_scan_cache_round_trip_registers_index_entry(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    params = {"score_threshold": 60}
+
+    scan_cache.save_scan_cache("v9_scan", params, "20260512", _frame(), {"candidate_count": 20})
+    df, meta = scan_cache.load_scan_cache("v9_scan", params, "20260512")
+
+    assert df is not None and len(df) == 20
+    assert df["ts_code"].iloc[1] == "000001.SZ"
+    assert meta["candidate_count"] == 20
+    assert meta["storage_format"] == scan_cache.cache_format()
+    index = json.loads((tmp_path / scan_cache.SCAN_CACHE_INDEX_FILENAME).read_text(encoding="utf-8"))
+    (entry,) = index["entries"].values()
+    assert entry["strategy"] == "v9_scan"
+    assert entry["db_last"] == "20260512"
+    assert entry["bytes"] > 0
+
+
+def test_find_recent_scan_cache_uses_index_and_predicate(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    scan_cache.save_scan_cache("combo_scan", {"production_only": True}, "20260512", _frame(3), {})
+    scan_cache.save_scan_cache("combo_scan", {"production_only": False}, "20260512", _frame(5), {})
+    scan_cache.save_scan_cache("combo_scan", {"production_only": True}, "20260511", _frame(7), {})
+
+    df, meta = scan_cache.find_recent_scan_cache(
+        "combo_scan",
+        "20260512",
+        predicate=lambda item: bool((item.get("params") or {}).get("production_only")),
+    )
+
+    assert len(df) == 3
+    assert meta["params"] == {"production_only": True}
+
+
+def test_scan_cache_evicts_least_recently_used_entries_over_budget(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("AIRIVO_SCAN_CACHE_FORMAT", "csv")
+    scan_cache.save_scan_cache("v4_scan", {"run": 1}, "20260512", _frame(200), {})
+    entry_bytes = sum(os.path.getsize(path) for path in tmp_path.iterdir() if path.name.startswith("v4_scan_"))
+    monkeypatch.setenv("AIRIVO_SCAN_CACHE_MAX_BYTES", str(int(entry_bytes * 2.5)))
+    scan_cache.save_scan_cache("v4_scan", {"run": 2}, "20260512", _frame(200), {})
+    scan_cache.load_scan_cache("v4_scan", {"run": 1}, "20260512")
+
+    scan_cache.save_scan_cache("v4_scan", {"run": 3}, "20260512", _frame(200), {})
+
+    assert scan_cache.load_scan_cache("v4_scan", {"run": 1}, "20260512")[0] is not None
+    assert scan_cache.load_scan_cache("v4_scan", {"run": 2}, "20260512")[0] is None
+    assert scan_cache.load_scan_cache("v4_scan", {"run": 3}, "20260512")[0] is not None
+    summary = scan_cache.evict_scan_cache()
+    assert summary["entries"] == 2
+
+
+def test_scan_cache_adopts_legacy_csv_entries_without_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    params = {"score_threshold": 55}
+    csv_path, meta_path = scan_cache.scan_cache_paths("v8_scan", params, "20260512")
+    _frame(4).to_csv(csv_path, index=False)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"strategy": "v8_scan", "params": params, "db_last": "20260512"}, f)
+
+    df, meta = scan_cache.find_recent_scan_cache("v8_scan", "20260512")
+
+    assert len(df) == 4
+    assert meta["params"] == params
+    assert (tmp_path / scan_cache.SCAN_CACHE_INDEX_FILENAME).exists()
+
+
+def test_scan_cache_hit_leaves_index_untouched(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    params = {"score_threshold": 60}
+    scan_cache.save_scan_cache("v9_scan", params, "20260512", _frame(), {})
+    index_path = tmp_path / scan_cache.SCAN_CACHE_INDEX_FILENAME
+    before = (index_path.read_bytes(), index_path.stat().st_mtime_ns)
+
+    for _ in range(3):
+        assert scan_cache.load_scan_cache("v9_scan", params, "20260512")[0] is not None
+
+    assert (index_path.read_bytes(), index_path.stat().st_mtime_ns) == before
+
+
+def _save_batch(cache_root: str, worker: int) -> None:
+    os.environ["AIRIVO_CACHE_DIR"] = cache_root
+    os.environ["AIRIVO_SCAN_CACHE_FORMAT"] = "csv"
+    for run in range(5):
+        scan_cache.save_scan_cache("v4_scan", {"worker": worker, "run": run}, "20260512", _frame(3), {})
+
+
+def test_scan_cache_index_keeps_entries_from_concurrent_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRIVO_CACHE_DIR", str(tmp_path))
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_save_batch, args=(str(tmp_path), worker)) for worker in range(4)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(timeout=60)
+        assert proc.exitcode == 0
+
+    index = json.loads((tmp_path / scan_cache.SCAN_CACHE_INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert len(index["entries"]) == 20
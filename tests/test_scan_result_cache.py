@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime
+
+from openclaw.runtime import scan_result_cache as cache
+
+
+def _results(count: int, offset: float = 0.0):
+    return [
+        {
+            "股票代码": f"{idx:06d}.SZ",
+            "股票名称": f"股票{idx}",
+            "行业": "银行",
+            "最新价": 10.0 + idx,
+            "流通市值(亿)": 50.0,
+            "综合评分": float(idx % 100) + offset,
+            "dim_scores": {"trend": idx % 7},
+        }
+        for idx in range(count)
+    ]
+
+
+def test_scan_results_round_trip_by_hashed_params():
+    conn = sqlite3.connect(":memory:")
+    cache.ensure_scan_result_cache_tables(conn)
+    params = {"score_threshold": 60, "cap_min": 100}
+
+    assert cache.save_scan_results(conn, version="v5", results=_results(5000), scan_params=params, scan_date="20260512") == 5000
+    cache.save_scan_results(conn, version="v5", results=_results(10, offset=0.5), scan_params=params, scan_date="20260512")
+    df = cache.load_scan_results(conn, version="v5", scan_params={"cap_min": 100, "score_threshold": 60}, scan_date="20260512")
+
+    assert len(df) == 5000
+    assert df["final_score"].is_monotonic_decreasing
+    assert float(df.loc[df["ts_code"] == "000003.SZ", "final_score"].iloc[0]) == 3.5
+    assert cache.load_scan_results(conn, version="v5", scan_params={"score_threshold": 61}, scan_date="20260512").empty
+    stored = conn.execute("SELECT scan_params FROM scan_cache_params").fetchall()
+    assert stored == [(cache.scan_params_text(params),)]
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT final_score FROM scan_cache_v5 WHERE scan_date = ? AND params_hash = ? ORDER BY final_score DESC",
+            ("20260512", "x"),
+        )
+    )
+    assert "idx_scan_cache_v5_lookup" in plan
+
+
+def test_legacy_tables_are_upgraded_and_remain_readable():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE scan_cache_v6 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, scan_date TEXT NOT NULL, ts_code TEXT NOT NULL,
+            stock_name TEXT, industry TEXT, latest_price REAL, circ_mv REAL, final_score REAL,
+            dim_scores TEXT, scan_params TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(scan_date, ts_code, scan_params)
+        )
+        """
+    )
+    params = {"score_threshold": 85}
+    conn.execute(
+        "INSERT INTO scan_cache_v6 (scan_date, ts_code, final_score, dim_scores, scan_params) VALUES (?, ?, ?, ?, ?)",
+        ("20260512", "000001.SZ", 88.0, "{}", json.dumps(params, ensure_ascii=False, sort_keys=True)),
+    )
+    conn.commit()
+
+    cache.ensure_scan_result_cache_tables(conn)
+    legacy = cache.load_scan_results(conn, version="v6", scan_params=params, scan_date="20260512")
+    cache.save_scan_results(conn, version="v6", results=_results(1, offset=1.0), scan_params=params, scan_date="20260512")
+
+    assert legacy["ts_code"].tolist() == ["000001.SZ"]
+    reloaded = cache.load_scan_results(conn, version="v6", scan_params=params, scan_date="20260512")
+    assert sorted(reloaded["ts_code"]) == ["000000.SZ", "000001.SZ"]
+
+
+def test_prune_scan_results_drops_old_dates_and_orphan_params():
+    conn = sqlite3.connect(":memory:")
+    cache.ensure_scan_result_cache_tables(conn)
+    cache.save_scan_results(conn, version="v5", results=_results(3), scan_params={"run": "old"}, scan_date="20260401")
+    cache.save_scan_results(conn, version="v6", results=_results(3), scan_params={"run": "new"}, scan_date="20260510")
+
+    removed = cache.prune_scan_results(conn, keep_days=7, today=datetime(2026, 5, 12))
+
+    assert removed["scan_cache_v5"] == 3
+    assert removed["scan_cache_v6"] == 0
+    assert removed["scan_cache_params"] == 1
+    assert conn.execute("SELECT COUNT(*) FROM scan_cache_v6").fetchone()[0] == 3
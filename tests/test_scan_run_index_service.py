@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sqlite3
+
+from openclaw.services.formal_pool_benchmark_service import build_formal_pool_benchmark_return_series
+from openclaw.services.scan_run_index_service import (
+    INDEXED_RUN_TYPES,
+    ScanRunIndex,
+    invalidate_scan_run_index,
+    preload_scan_run_index,
+    scan_run_index,
+)
+
+
+def _seed(conn: sqlite3.Connection) -> sqlite3.Connection:
+    conn.execute(
+        "CREATE TABLE signal_runs (run_id TEXT, strategy TEXT, trade_date TEXT, created_at TEXT,"
+        " run_type TEXT, status TEXT, data_version TEXT)"
+    )
+    conn.execute("CREATE TABLE signal_items (run_id TEXT, ts_code TEXT, score REAL, rank_idx INTEGER)")
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, close_price REAL)")
+    conn.executemany(
+        "INSERT INTO signal_runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("run-a", "v5", "20260102", "2026-01-02T15:00:00", "scan", "success", ""),
+            ("run-a2", "v5", "2026-01-02", "2026-01-02T16:00:00", "scan", "success", ""),
+            ("run-b", "v5", "20260106", "2026-01-06T15:00:00", "scan", "success", ""),
+            ("run-x", "v5", "20260105", "2026-01-05T15:00:00", "scan", "failed", ""),
+            ("run-e", "v5", "20260107", "2026-01-07T15:00:00", "experiment", "success", "trade_date:20260103|v1"),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO signal_items VALUES (?, ?, ?, ?)",
+        [
+            ("run-a2", "000001.SZ", 70.0, 2),
+            ("run-a2", "000002.SZ", 90.0, None),
+            ("run-a2", "000003.SZ", 80.0, 1),
+            ("run-b", "000001.SZ", 60.0, 1),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO daily_trading_data VALUES (?, ?, ?)",
+        [(code, f"202601{day + 1:02d}", 10.0 + day) for code in ("000001.SZ", "000002.SZ", "000003.SZ") for day in range(10)],
+    )
+    conn.commit()
+    return conn
+
+
+def test_latest_run_visibility_and_item_order():
+    conn = _seed(sqlite3.connect(":memory:"))
+    index = ScanRunIndex.load(conn)
+
+    assert index.latest_run("v5", "20260101") is None
+    assert index.latest_run("v5", "20260105").run_id == "run-a2"
+    assert index.latest_run("v5", "20260106").run_id == "run-b"
+    visible = dict(run_types=INDEXED_RUN_TYPES, data_version_visibility=True)
+    assert index.latest_run("v5", "20260103", **visible).run_id == "run-e"
+    assert index.latest_run("v5", "20260102", **visible).run_id == "run-a2"
+
+    assert [item.ts_code for item in index.top_items(conn, "run-a2", 3)] == ["000002.SZ", "000003.SZ", "000001.SZ"]
+    assert [item.ts_code for item in index.top_items(conn, "run-a2", 2, null_rank_last=True)] == [
+        "000003.SZ",
+        "000001.SZ",
+    ]
+
+
+def test_shared_index_is_reused_until_runs_change(tmp_path):
+    conn = _seed(sqlite3.connect(str(tmp_path / "signals.db")))
+    invalidate_scan_run_index()
+
+    first = scan_run_index(conn)
+    assert scan_run_index(conn) is first
+    assert scan_run_index(sqlite3.connect(str(tmp_path / "signals.db"))) is first
+
+    conn.execute("INSERT INTO signal_runs VALUES ('run-c', 'v5', '20260108', '2026-01-08T15:00:00', 'scan', 'success', '')")
+    conn.commit()
+    reloaded = scan_run_index(conn)
+    assert reloaded is not first
+    assert reloaded.latest_run("v5", "20260108").run_id == "run-c"
+    assert scan_run_index(sqlite3.connect(":memory:")) is not scan_run_index(sqlite3.connect(":memory:"))
+
+
+def test_preloaded_index_serves_builders_without_item_queries(tmp_path):
+    conn = _seed(sqlite3.connect(str(tmp_path / "signals.db")))
+    invalidate_scan_run_index()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    index = preload_scan_run_index(conn, start_date="2026-01-02", end_date="20260106")
+    assert len([sql for sql in statements if "WHERE run_id IN" in sql]) == 1
+    statements.clear()
+    for as_of in ("20260102", "20260106"):
+        build_formal_pool_benchmark_return_series(
+            conn, strategies=["v5"], as_of_date=as_of, holding_days=2, scan_index=index
+        )
+    conn.set_trace_callback(None)
+
+    assert not [sql for sql in statements if "FROM signal_items" in sql or "FROM signal_runs" in sql]
+
+
+def test_top_items_are_sorted_once_and_tolerate_text_scores():
+    conn = _seed(sqlite3.connect(":memory:"))
+    conn.execute("INSERT INTO signal_items VALUES ('run-b', '000002.SZ', '75.5', 1)")
+    conn.execute("INSERT INTO signal_items VALUES ('run-b', '000003.SZ', 'n/a', 1)")
+    index = ScanRunIndex.load(conn)
+
+    assert [item.ts_code for item in index.top_items(conn, "run-b", 3)] == ["000002.SZ", "000001.SZ", "000003.SZ"]
+    first = index.top_items(conn, "run-a2", 3, null_rank_last=True)
+    first.clear()
+    assert [item.ts_code for item in index.top_items(conn, "run-a2", 3, null_rank_last=True)] == [
+        "000003.SZ",
+        "000001.SZ",
+        "000002.SZ",
+    ]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sqlite3
+
+from openclaw.services.schema_catalog_service import (
+    clear_schema_catalog,
+    schema_snapshot,
+    table_columns,
+    table_exists,
+)
+
+
+def test_file_schema_is_introspected_once_per_schema_version(tmp_path):
+    clear_schema_catalog()
+    conn = sqlite3.connect(str(tmp_path / "stock.db"))
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, close_price REAL)")
+    assert table_exists(conn, "daily_trading_data")
+    assert table_columns(conn, "daily_trading_data") == ["ts_code", "trade_date", "close_price"]
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    for _ in range(50):
+        assert table_exists(conn, "daily_trading_data")
+        assert not table_exists(conn, "stock_basic")
+        assert table_columns(conn, "daily_trading_data") == ["ts_code", "trade_date", "close_price"]
+    assert table_columns(conn, "stock_basic") == []
+
+    assert not [sql for sql in statements if "sqlite_master" in sql or "table_info" in sql]
+    assert set(statements) == {"PRAGMA database_list", "PRAGMA schema_version"}
+
+
+def test_ddl_from_another_connection_invalidates_the_catalog(tmp_path):
+    path = str(tmp_path / "stock.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE signal_items (run_id TEXT, ts_code TEXT)")
+    conn.commit()
+    assert table_columns(conn, "signal_items") == ["run_id", "ts_code"]
+    assert not table_exists(conn, "signal_runs")
+
+    other = sqlite3.connect(path)
+    other.execute("CREATE TABLE signal_runs (run_id TEXT)")
+    other.execute("ALTER TABLE signal_items ADD COLUMN reason_codes TEXT")
+    other.commit()
+
+    assert table_exists(conn, "signal_runs")
+    assert table_columns(conn, "signal_items") == ["run_id", "ts_code", "reason_codes"]
+    other.execute("DROP TABLE signal_runs")
+    other.commit()
+    assert not schema_snapshot(conn).exists("signal_runs")
+
+
+def test_unnamed_databases_are_never_shared():
+    left = sqlite3.connect(":memory:")
+    right = sqlite3.connect(":memory:")
+    left.execute("CREATE TABLE stock_basic (ts_code TEXT, name TEXT)")
+    right.execute("CREATE TABLE stock_basic (ts_code TEXT)")
+
+    assert table_columns(left, "stock_basic") == ["ts_code", "name"]
+    assert table_columns(right, "stock_basic") == ["ts_code"]
+    right.execute("DROP TABLE stock_basic")
+    assert not table_exists(right, "stock_basic")
+    assert table_exists(left, "stock_basic")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.sector_scan import (
+    SectorPanelCache,
+    classify_sector_lifecycle,
+    load_sector_panel,
+    sector_lifecycle_frame,
+)
+
+
+def _conn(days: int = 40) -> sqlite3.Connection:
+    rng = np.random.default_rng(11)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE stock_basic (ts_code TEXT, industry TEXT)")
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, pct_chg REAL, vol REAL)")
+    dates = pd.date_range("2026-03-02", periods=days, freq="B").strftime("%Y%m%d")
+    industries = {"银行": (1.0, 0.1), "电子": (3.0, 6.0), "医药": (0.6, 0.5), "煤炭": (0.9, -3.0), "军工": (1.6, 3.5)}
+    basics, rows = [], []
+    for ind_idx, (industry, (vol_boost, recent_pct)) in enumerate(industries.items()):
+        for stock in range(4):
+            code = f"{ind_idx}{stock:05d}.SZ"
+            basics.append((code, industry))
+            for day, trade_date in enumerate(dates):
+                recent = day >= days - 5
+                rows.append(
+                    (
+                        code,
+                        trade_date,
+                        recent_pct + rng.normal(0, 0.1) if recent else rng.normal(0, 1),
+                        1e4 * (vol_boost if recent else 1.0) * rng.uniform(0.95, 1.05),
+                    )
+                )
+    basics.append(("900000.SZ", "新股"))
+    rows.extend(("900000.SZ", trade_date, 1.0, 1.0) for trade_date in dates[-6:])
+    basics.append(("900001.SZ", None))
+    rows.append(("900001.SZ", dates[-1], 1.0, 1.0))
+    conn.executemany("INSERT INTO stock_basic VALUES (?, ?)", basics)
+    conn.executemany("INSERT INTO daily_trading_data VALUES (?, ?, ?, ?)", rows)
+    return conn
+
+
+def test_sector_panel_aggregates_industry_by_trade_date():
+    conn = _conn()
+    panel = load_sector_panel(conn, daily_table="daily_trading_data", start_date="20260301")
+    raw = pd.read_sql_query(
+        "SELECT sb.industry, dtd.* FROM daily_trading_data dtd JOIN stock_basic sb ON dtd.ts_code = sb.ts_code "
+        "WHERE sb.industry IS NOT NULL",
+        conn,
+    )
+    expected = raw.groupby(["industry", "trade_date"]).agg(rows=("vol", "size"), vol=("vol", "mean"), pct_chg=("pct_chg", "mean"))
+
+    assert len(panel) == len(expected)
+    merged = panel.set_index(["industry", "trade_date"]).loc[expected.index]
+    np.testing.assert_allclose(merged[["rows", "vol", "pct_chg"]].to_numpy(), expected.to_numpy())
+
+
+def test_lifecycle_stages_match_per_sector_loop():
+    conn = _conn()
+    panel = load_sector_panel(conn, daily_table="daily_trading_data", start_date="20260301")
+    frame = sector_lifecycle_frame(panel).set_index("industry")
+
+    for industry, sector in panel.groupby("industry"):
+        if sector["rows"].sum() < 30:
+            assert industry not in frame.index
+            continue
+        recent = sector.tail(5)
+        historical = sector.head(len(sector) - 10)
+        vol_ratio = recent["vol"].mean() / historical["vol"].mean()
+        assert np.isclose(frame.loc[industry, "vol_ratio"], vol_ratio)
+        assert np.isclose(frame.loc[industry, "price_change"], recent["pct_chg"].mean())
+
+    results = classify_sector_lifecycle(panel)
+    stages = {item["sector_name"]: category for category, items in results.items() for item in items}
+    assert stages == {
+        "银行": "transitioning",
+        "电子": "exploding",
+        "医药": "emerging",
+        "煤炭": "declining",
+        "军工": "launching",
+    }
+    assert results["emerging"][0]["score"] == 75
+
+
+def test_sector_panel_cache_reuses_panel_until_trade_date_moves():
+    cache = SectorPanelCache()
+    builds = []
+
+    def _build(tag: str):
+        def _inner():
+            builds.append(tag)
+            return pd.DataFrame({"tag": [tag]})
+
+        return _inner
+
+    first = cache.get(("db", "20260301"), "20260512", _build("a"))
+    assert cache.get(("db", "20260301"), "20260512", _build("b")) is first
+    cache.get(("db", "20260301"), "20260513", _build("c"))
+    cache.get(("db", "20260302"), "20260513", _build("d"))
+
+    assert builds == ["a", "c", "d"]
+    assert list(cache._panels) == [("db", "20260302")]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from openclaw.services import signal_item_forward_return_service
+from openclaw.services.forward_return_replay_service import replay_forward_returns
+from openclaw.services.formal_pool_benchmark_service import build_formal_pool_benchmark_return_series
+from openclaw.services.signal_item_forward_return_service import (
+    materialized_forward_returns,
+    refresh_signal_item_forward_returns,
+)
+
+_TOOL = Path(__file__).resolve().parents[1] / "tools" / "refresh_signal_item_forward_returns.py"
+_SPEC = importlib.util.spec_from_file_location("refresh_signal_item_forward_returns", _TOOL)
+refresh_tool = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(refresh_tool)
+
+
+def _conn(days: int = 12) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE signal_runs (run_id TEXT, strategy TEXT, trade_date TEXT, created_at TEXT, run_type TEXT, status TEXT)"
+    )
+    conn.execute("CREATE TABLE signal_items (run_id TEXT, ts_code TEXT, score REAL, rank_idx INTEGER)")
+    conn.execute("CREATE TABLE daily_trading_data (ts_code TEXT, trade_date TEXT, close_price REAL)")
+    conn.executemany(
+        "INSERT INTO signal_runs VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("run-a", "v5", "20260102", "2026-01-02T15:00:00", "scan", "success"),
+            ("run-b", "v5", "2026-01-06", "2026-01-06T15:00:00", "scan", "success"),
+            ("run-x", "v5", "20260102", "2026-01-02T15:00:00", "scan", "failed"),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO signal_items VALUES (?, ?, ?, ?)",
+        [
+            ("run-a", "000001.SZ", 90.0, 1),
+            ("run-a", "000002.SZ", 80.0, 2),
+            ("run-b", "000001.SZ", 70.0, 1),
+            ("run-x", "000003.SZ", 60.0, 1),
+        ],
+    )
+    for offset, code in enumerate(("000001.SZ", "000002.SZ", "000003.SZ")):
+        conn.executemany(
+            "INSERT INTO daily_trading_data VALUES (?, ?, ?)",
+            [(code, f"202601{day + 1:02d}", 10.0 + offset + day * 0.5) for day in range(days)],
+        )
+    return conn
+
+
+def test_refresh_stores_only_newly_matured_horizons():
+    conn = _conn(days=8)
+
+    first = refresh_signal_item_forward_returns(conn, horizons=(1, 5))
+    assert first["pending_items"] == 3
+    assert first["matured_rows_by_horizon"] == {"1": 3, "5": 2}
+    assert conn.execute("SELECT COUNT(*) FROM signal_item_forward_returns WHERE run_id = 'run-x'").fetchone()[0] == 0
+
+    conn.executemany(
+        "INSERT INTO daily_trading_data VALUES (?, ?, ?)",
+        [(code, f"202601{day + 1:02d}", 20.0) for code in ("000001.SZ", "000002.SZ") for day in range(8, 12)],
+    )
+    second = refresh_signal_item_forward_returns(conn, horizons=(1, 5))
+    assert second["pending_items"] == 1
+    assert second["inserted_rows"] == 1
+    assert refresh_signal_item_forward_returns(conn, horizons=(1, 5))["pending_items"] == 0
+
+    stored = conn.execute(
+        "SELECT anchor_date, entry_trade_date, exit_trade_date FROM signal_item_forward_returns"
+        " WHERE run_id = 'run-b' AND horizon = 5"
+    ).fetchone()
+    assert stored == ("20260106", "20260106", "20260111")
+
+
+def test_materialized_reads_match_live_replay_and_skip_stored_horizons():
+    conn = _conn()
+    refresh_signal_item_forward_returns(conn, horizons=(1, 3, 5))
+    requests = [
+        ("000001.SZ", "20260102", (1, 5, 20)),
+        ("000002.SZ", "20260102", (3,)),
+        ("000003.SZ", "20260102", (1,)),
+        ("000001.SZ", "20260110", (5,)),
+    ]
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    actual = materialized_forward_returns(conn, requests)
+    conn.set_trace_callback(None)
+
+    assert actual == replay_forward_returns(conn, requests)
+    assert actual[3][5]["blocking_reason"] == "insufficient_forward_price_window"
+    replay_sql = [sql for sql in statements if "WITH req(ts_code, first_key" in sql]
+    assert len(replay_sql) == 1
+    assert "'000002.SZ'" not in replay_sql[0]
+
+
+def test_formal_pool_benchmark_reads_the_materialized_table():
+    conn = _conn()
+    expected = build_formal_pool_benchmark_return_series(conn, strategies=["v5"], as_of_date="20260102", holding_days=5)
+    refresh_signal_item_forward_returns(conn, horizons=(5,))
+    conn.execute("UPDATE daily_trading_data SET close_price = 99.0")
+
+    payload = build_formal_pool_benchmark_return_series(conn, strategies=["v5"], as_of_date="20260102", holding_days=5)
+
+    assert payload == expected
+    assert payload["replayable_signal_count"] == 2
+
+
+def test_items_that_can_never_mature_are_blocked_once(monkeypatch):
+    monkeypatch.setattr(signal_item_forward_return_service, "STALE_PRICE_SESSIONS", 3)
+    conn = _conn(days=12)
+    conn.executemany(
+        "INSERT INTO signal_items VALUES (?, ?, ?, ?)",
+        [("run-a", "000009.SZ", 50.0, 3), ("run-a", "000010.SZ", 40.0, 4)],
+    )
+    conn.execute("INSERT INTO daily_trading_data VALUES ('000010.SZ', '20260102', 0.0)")
+    conn.executemany(
+        "INSERT INTO daily_trading_data VALUES ('000010.SZ', ?, 5.0)", [(f"202601{day:02d}",) for day in range(3, 6)]
+    )
+    conn.execute("DELETE FROM daily_trading_data WHERE ts_code = '000002.SZ' AND trade_date > '20260104'")
+
+    first = refresh_signal_item_forward_returns(conn, horizons=(1, 5))
+    assert first["blocked_rows_by_reason"] == {
+        "stale_symbol_prices": 2,
+        "missing_entry_price": 2,
+        "invalid_forward_price": 1,
+    }
+    second = refresh_signal_item_forward_returns(conn, horizons=(1, 5))
+    assert second["pending_items"] == 0
+    assert refresh_signal_item_forward_returns(conn, horizons=(1, 5), rebuild=True)["pending_items"] == 5
+
+
+def test_refresh_tool_treats_missing_signal_tables_as_a_no_op(tmp_path, monkeypatch, capsys):
+    sqlite3.connect(str(tmp_path / "empty.db")).close()
+    monkeypatch.setattr(sys, "argv", ["refresh", "--db-path", str(tmp_path / "empty.db")])
+    assert refresh_tool.main() == 0
+    assert "missing_signal_runs_table" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", ["refresh", "--db-path", str(tmp_path / "empty.db"), "--horizons", "0"])
+    assert refresh_tool.main() == 1
+
+
+def test_refresh_tool_rejects_bad_horizons_and_missing_db_without_creating_it(tmp_path, monkeypatch, capsys):
+    sqlite3.connect(str(tmp_path / "empty.db")).close()
+    monkeypatch.setattr(sys, "argv", ["refresh", "--db-path", str(tmp_path / "empty.db"), "--horizons", "1,x"])
+    assert refresh_tool.main() == 1
+    assert json.loads(capsys.readouterr().out)["error"] == "invalid_horizons"
+
+    missing = tmp_path / "typo.db"
+    monkeypatch.setattr(sys, "argv", ["refresh", "--db-path", str(missing)])
+    assert refresh_tool.main() == 1
+    assert json.loads(capsys.readouterr().out)["error"] == "db_not_found"
+    assert not missing.exists()
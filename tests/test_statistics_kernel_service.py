@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from openclaw.services.statistics_kernel_service import (
+    correlation_matrix,
+    group_percentiles,
+    pearson,
+    pearson_many,
+    percentiles,
+    ranks,
+    spearman,
+    spearman_many,
+)
+
+
+def test_ranks_and_percentiles_average_ties():
+    assert ranks([3.0, 1.0, 3.0, 2.0]) == [3.5, 1.0, 3.5, 2.0]
+    assert ranks([]) == []
+    assert percentiles([]) == []
+    assert percentiles([7.0]) == [50.0]
+    assert percentiles([5.0, 1.0, 5.0]) == [75.0, 0.0, 75.0]
+
+    values = [10.0, 1.0, 4.0, 4.0, 9.0, 2.0]
+    groups = ["bank", "tech", "bank", "tech", "bank", "solo"]
+    assert group_percentiles(values, groups) == [100.0, 0.0, 0.0, 100.0, 50.0, 50.0]
+
+
+def test_correlations_keep_none_edge_cases():
+    assert pearson([1.0, 2.0], [1.0]) is None
+    assert pearson([1.0], [2.0]) is None
+    assert pearson([0.1, 0.1, 0.1], [1.0, 2.0, 3.0]) is None
+    assert spearman([1.0, 1.0, 1.0], [1.0, 2.0, 3.0]) is None
+    assert pearson([1.0, 2.0, 3.0, 4.0], [2.0, 4.0, 6.0, 8.5]) == 0.998381
+    assert spearman([1.0, 2.0, 3.0, 4.0], [1.0, 8.0, 27.0, 64.0]) == 1.0
+
+    pairs = [([1.0, 2.0, 3.0], [3.0, 1.0, 2.0]), ([1.0, 2.0], [2.0, 1.0]), ([], []), ([4.0, 1.0, 2.0], [8.0, 2.0, 5.0]), ([1.0], [1.0, 2.0])]
+    assert pearson_many(pairs) == [pearson(left, right) for left, right in pairs]
+    assert spearman_many(pairs) == [spearman(left, right) for left, right in pairs]
+
+
+def test_correlation_matrix_matches_pairwise_pearson():
+    series = [[1.0, 2.0, 4.0, 3.0], [2.0, 1.0, 0.0, 5.0], [3.0, 3.0, 3.0, 3.0]]
+
+    matrix = correlation_matrix(series)
+
+    for i, left in enumerate(series):
+        for j, right in enumerate(series):
+            assert matrix[i][j] == pearson(left, right)
+    assert matrix[0][0] == 1.0
+    assert matrix[2] == [None, None, None]
+    assert correlation_matrix([[1.0], [2.0]]) == [[None, None], [None, None]]
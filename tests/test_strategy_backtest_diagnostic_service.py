@@ -1,4 +1,7 @@
-from openclaw.services.strategy_backtest_diagnostic_service import build_strategy_backtest_diagnostics
+from openclaw.services.strategy_backtest_diagnostic_service import (
+    WindowDiagnosticsAggregator,
+    build_strategy_backtest_diagnostics,
+)
 
 
 def test_combo_zero_density_requires_component_diagnostic():
@@ -835,3 +838,53 @@ def test_v5_runtime_constraints_remove_legacy_failure_class():
     assert "legacy_return_sample_not_credible_without_constraints" not in diagnostics["failure_classes"]
     assert "weak_out_of_sample_win_rate" in diagnostics["failure_classes"]
     assert "drawdown_above_quality_floor" in diagnostics["failure_classes"]
+
+
+def test_streamed_window_diagnostics_match_attached_diagnostics_with_bounded_samples():
+    windows = [
+        {
+            "type": "score_distribution",
+            "strategy": "v6",
+            "threshold": 50.0,
+            "evaluated": 10 + idx,
+            "passed_threshold": idx % 2,
+            "max_score": 40.0 + idx,
+            "avg_score": 30.0,
+            "score_count": 10,
+            "reason_counts": {"below_threshold": 9},
+            "stage_timing_ms": {"evaluate_stock_v6": {"count": 10, "avg": 100.0 + idx, "max": 200.0}},
+            "top_near_threshold_samples": [
+                {"ts_code": f"{idx:06d}.SZ", "final_score": float(idx % 7)},
+                {"ts_code": f"{idx:06d}.SH", "final_score": float(idx % 7)},
+            ],
+        }
+        for idx in range(40)
+    ]
+    rows = [{"status": "failed", "failure_diagnostics": windows + windows[:5]}]
+    expected = build_strategy_backtest_diagnostics(
+        strategy="v6",
+        rows=rows,
+        errors=[],
+        backtest_credibility={"passed": False, "blocking_reasons": []},
+    )
+
+    aggregator = WindowDiagnosticsAggregator()
+    for window in windows:
+        aggregator.add(window)
+        assert len(aggregator.payload()["top_near_threshold_samples"]) <= 10
+    streamed = build_strategy_backtest_diagnostics(
+        strategy="v6",
+        rows=[{"status": "failed", "failure_diagnostics": windows[:5]}],
+        errors=[],
+        backtest_credibility={"passed": False, "blocking_reasons": []},
+        diagnostic_aggregator=aggregator,
+    )
+
+    assert streamed == expected
+    window_diag = streamed["window_diagnostics"]
+    assert window_diag["diagnostic_count"] == 40
+    assert [row["ts_code"] for row in window_diag["top_near_threshold_samples"][:3]] == [
+        "000006.SZ",
+        "000006.SH",
+        "000013.SZ",
+    ]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from openclaw.runtime.strategy_sweep import (
+    build_volume_price_sweep,
+    run_sweeps_parallel,
+    sweep_return_stats,
+    volume_price_signal_scores,
+)
+
+
+def _reference_scores(stock: pd.DataFrame) -> dict:
+    """Row-by-row scoring as done by ``_identify_volume_price_signals``."""
+    scores = {}
+    for i in range(20, len(stock) - 5):
+        current_close = stock.iloc[i]["close"]
+        current_vol = stock.iloc[i]["vol"]
+        current_pct = stock.iloc[i]["pct_chg"]
+        hist = stock.iloc[i - 20 : i]
+        avg_vol_20 = hist["vol"].mean()
+        score = 0
+        if avg_vol_20 > 0:
+            vol_ratio = current_vol / avg_vol_20
+            score += 30 if vol_ratio >= 2.0 else 20 if vol_ratio >= 1.5 else 10 if vol_ratio >= 1.2 else 0
+        score += 25 if current_pct >= 5 else 20 if current_pct >= 3 else 15 if current_pct >= 1 else 10 if current_pct > 0 else 0
+        max_close, min_close = hist["close"].max(), hist["close"].min()
+        if max_close > min_close:
+            position = (current_close - min_close) / (max_close - min_close) * 100
+            score += 20 if position < 30 else 15 if position < 50 else 10 if position < 70 else 0
+        up_days = (stock.iloc[i - 4 : i + 1]["pct_chg"] > 0).sum()
+        score += 15 if up_days >= 4 else 10 if up_days >= 3 else 0
+        if current_close > hist["close"].tail(5).mean():
+            score += 10
+        scores[i] = score
+    return scores
+
+
+def _panel(stocks: int = 6, rows: int = 150, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    dates = pd.date_range("2025-01-01", periods=rows, freq="B").strftime("%Y%m%d")
+    for idx in range(stocks):
+        pct = rng.normal(0.2, 2.5, rows)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ts_code": f"{idx:06d}.SZ",
+                    "trade_date": dates,
+                    "close_price": 10 * np.cumprod(1 + pct / 100),
+                    "vol": rng.uniform(1e4, 5e4, rows) * np.where(rng.random(rows) < 0.15, 2.5, 1.0),
+                    "pct_chg": pct,
+                }
+            )
+        )
+    # One short history that the sweep must skip.
+    frames.append(frames[0].head(60).assign(ts_code="999999.SZ"))
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=3)
+
+
+def test_vectorized_scores_match_row_by_row_scoring():
+    df = _panel(stocks=3)
+    for code, stock in df.groupby("ts_code"):
+        stock = stock.sort_values("trade_date").reset_index(drop=True).rename(columns={"close_price": "close"})
+        stock.loc[17, "vol"] = np.nan
+        scores = volume_price_signal_scores(stock["close"], stock["vol"], stock["pct_chg"])
+        expected = _reference_scores(stock)
+        if len(stock) < 30:
+            assert np.isnan(scores).all()
+            continue
+        assert {i: scores[i] for i in expected} == expected, code
+        assert np.isnan(np.delete(scores, list(expected))).all()
+
+
+def test_sweep_thresholds_and_holding_days_from_one_panel():
+    df = _panel()
+    codes = sorted(df["ts_code"].unique())
+    panel = build_volume_price_sweep(df, sample_codes=codes, holding_days_grid=[3, 5])
+
+    for holding_days in (3, 5):
+        for min_score in (40.0, 60.0):
+            manual = []
+            for code in codes:
+                stock = df[df["ts_code"] == code].sort_values("trade_date").reset_index(drop=True)
+                if len(stock) < 120:
+                    continue
+                for i, score in _reference_scores(stock.rename(columns={"close_price": "close"})).items():
+                    if score >= min_score and i + holding_days < len(stock):
+                        buy, sell = stock["close_price"].iloc[i], stock["close_price"].iloc[i + holding_days]
+                        manual.append((sell - buy) / buy * 100)
+            returns = panel.returns_for(min_score, holding_days)
+            np.testing.assert_allclose(returns, manual)
+            stats = sweep_return_stats(returns, analyzed_stocks=panel.analyzed_stocks, holding_days=holding_days)
+            assert stats["total_signals"] == len(manual)
+            assert stats["win_rate"] == sum(r > 0 for r in manual) / len(manual) * 100
+    assert panel.analyzed_stocks == len(codes)
+    assert sweep_return_stats(np.empty(0), analyzed_stocks=4, holding_days=5)["total_signals"] == 0
+
+
+def test_run_sweeps_parallel_keeps_task_keys_and_serial_fallback():
+    parent = os.getpid()
+    tasks = {name: (lambda name=name: (name, os.getpid() != parent)) for name in ("a", "b", "c")}
+
+    parallel = run_sweeps_parallel(tasks, workers=2)
+    serial = run_sweeps_parallel(tasks, workers=1)
+
+    assert list(parallel) == ["a", "b", "c"]
+    assert [value[0] for value in parallel.values()] == ["a", "b", "c"]
+    assert all(value[1] for value in parallel.values())
+    assert not any(value[1] for value in serial.values())
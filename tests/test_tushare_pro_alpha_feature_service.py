@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import sqlite3
 
-from openclaw.services.tushare_pro_alpha_feature_service import build_tushare_pro_alpha_features
+from openclaw.services.tushare_pro_alpha_feature_service import (
+    build_tushare_pro_alpha_features,
+    build_tushare_pro_alpha_features_batch,
+)
 
 
-def test_tushare_pro_alpha_features_build_explicit_pit_sleeve_scores():
+def _seeded_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(":memory:")
     conn.executescript(
         """
@@ -143,6 +146,11 @@ def test_tushare_pro_alpha_features_build_explicit_pit_sleeve_scores():
         ("000001.SZ", "20260122", 11.5, 10.5, 18.0, 2.1, 2_000_000.0),
     )
     conn.execute("INSERT INTO cyq_perf_daily VALUES (?, ?, ?)", ("000001.SZ", "20260122", 20.0))
+    return conn
+
+
+def test_tushare_pro_alpha_features_build_explicit_pit_sleeve_scores():
+    conn = _seeded_conn()
 
     review = build_tushare_pro_alpha_features(conn, ts_code="000001.SZ", as_of_date="2026-01-22")
 
@@ -178,3 +186,27 @@ def test_tushare_pro_alpha_features_build_explicit_pit_sleeve_scores():
     assert "do_not_fetch_live_tushare_inside_backtest" in review["hard_boundaries"]
     assert "do_not_use_unscored_event_presence_as_trade_signal" in review["hard_boundaries"]
     assert "do_not_use_missing_announcement_tables_as_synthetic_event_alpha" in review["hard_boundaries"]
+
+
+def test_batch_builder_matches_per_symbol_payloads_with_constant_query_count():
+    conn = _seeded_conn()
+    for idx, code in enumerate(("000002.SZ", "600000.SH")):
+        conn.executemany(
+            "INSERT INTO daily_trading_data VALUES (?, ?, ?, ?, ?, ?)",
+            [(code, f"2026-01-{day + 1:02d}", 20.0 + idx + day * 0.1, 10.0 if day == 20 else 0.5, 90000.0, 2.0) for day in range(24)],
+        )
+        conn.execute("INSERT INTO stock_basic VALUES (?, ?, ?)", (code, "电子" if idx else "银行", 500_000.0))
+        conn.execute("INSERT INTO top_inst VALUES (?, ?, ?, ?)", ("20260120", code, -3000.0, "机构卖出"))
+    conn.execute("INSERT INTO moneyflow_ind_ths VALUES (?, ?, ?, ?)", ("20260123", "电子", 9.0, 1.0))
+    codes = ["000001.SZ", "000002.SZ", "600000.SH", "999999.SH"]
+
+    expected = {code: build_tushare_pro_alpha_features(conn, ts_code=code, as_of_date="20260122") for code in codes}
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    batch = build_tushare_pro_alpha_features_batch(conn, ts_codes=codes + ["000001.SZ", ""], as_of_date="2026-01-22")
+    conn.set_trace_callback(None)
+
+    assert list(batch) == codes
+    assert batch == expected
+    assert batch["999999.SH"]["blocking_reasons"]
+    assert len(statements) < 40
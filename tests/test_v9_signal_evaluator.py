@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from openclaw.runtime.v9_signal_evaluator import calculate_v9_score_from_history
+from openclaw.runtime.v9_signal_evaluator import calculate_v9_score_from_history, calculate_v9_scores_panel
 
 
 def _history(rows: int = 130) -> pd.DataFrame:
@@ -49,3 +50,33 @@ def test_v9_score_increases_with_stronger_industry_context():
 
     assert strong["score"] > weak["score"]
     assert strong["details"]["sector_score"] > weak["details"]["sector_score"]
+
+
+def test_v9_panel_scores_match_per_stock_scores():
+    rng = np.random.default_rng(7)
+    histories = {}
+    for idx in range(40):
+        rows = int(rng.integers(60, 150))
+        close = 10 * np.exp(np.cumsum(rng.normal(0.001, 0.03, rows)))
+        hist = pd.DataFrame(
+            {
+                "trade_date": [f"2025{i:04d}" for i in range(rows)],
+                "close_price": close,
+                "vol": rng.uniform(0, 1e5, rows),
+                "amount": rng.uniform(0, 1e7, rows),
+                "pct_chg": rng.normal(0, 3, rows),
+            }
+        )
+        if idx % 5 == 0:
+            hist = hist.drop(columns=["amount"])
+        if idx % 7 == 0:
+            hist["pct_chg"] = np.nan
+        histories[f"{idx:06d}.SZ"] = hist.sample(frac=1.0, random_state=idx)
+    strength = {code: float(rng.normal(0, 3)) for code in histories}
+    panel = pd.concat([hist.assign(ts_code=code) for code, hist in histories.items()], ignore_index=True)
+
+    scores = calculate_v9_scores_panel(panel, industry_strength=strength)
+
+    assert set(scores) == set(histories)
+    for code, hist in histories.items():
+        assert scores[code] == calculate_v9_score_from_history(hist, industry_strength=strength[code])
@@ -4,6 +4,7 @@ from __future__ import annotations
 import argparse
 import json
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -19,6 +20,7 @@ from openclaw.services.ensemble_alpha_rebuild_lab_service import (  # noqa: E402
 from openclaw.services.ensemble_alpha_sleeve_service import (  # noqa: E402
     build_ensemble_alpha_sleeve_fact_chain,
 )
+from openclaw.services.scan_run_index_service import preload_scan_run_index  # noqa: E402
 
 
 DEFAULT_STRATEGIES = ("v4", "v5", "v8", "v9", "combo", "v6", "v7")
@@ -35,6 +37,7 @@ def main() -> int:
     parser.add_argument("--top-n-per-strategy", type=int, default=20)
     parser.add_argument("--min-samples", type=int, default=30)
     parser.add_argument("--min-research-windows", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes used to score windows in parallel.")
     parser.add_argument("--operator-name", default="ensemble_alpha_rebuild_multi_window_lab")
     parser.add_argument("--output-dir", default="logs/openclaw/ensemble_alpha_rebuild_multi_window_lab")
     args = parser.parse_args()
@@ -44,8 +47,12 @@ def main() -> int:
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    compact_dates = sorted(as_of.replace("-", "") for as_of in as_of_dates)
     conn = sqlite3.connect(str(args.db_path), timeout=30)
     try:
+        scan_index = (
+            preload_scan_run_index(conn, start_date=compact_dates[0], end_date=compact_dates[-1]) if compact_dates else None
+        )
         fact_chains = [
             build_ensemble_alpha_sleeve_fact_chain(
                 conn,
@@ -53,17 +60,19 @@ def main() -> int:
                 strategies=strategies,
                 holding_days=int(args.holding_days),
                 top_n_per_strategy=int(args.top_n_per_strategy),
+                scan_index=scan_index,
             )
             for as_of in as_of_dates
         ]
     finally:
         conn.close()
 
-    lab = build_ensemble_alpha_rebuild_multi_window_lab(
-        fact_chains,
-        min_samples=int(args.min_samples),
-        min_research_windows=int(args.min_research_windows),
-    )
+    lab_kwargs = {"min_samples": int(args.min_samples), "min_research_windows": int(args.min_research_windows)}
+    if int(args.workers) > 1 and len(fact_chains) > 1:
+        with ProcessPoolExecutor(max_workers=min(int(args.workers), len(fact_chains))) as executor:
+            lab = build_ensemble_alpha_rebuild_multi_window_lab(fact_chains, executor=executor, **lab_kwargs)
+    else:
+        lab = build_ensemble_alpha_rebuild_multi_window_lab(fact_chains, **lab_kwargs)
     payload: dict[str, Any] = {
         "run_version": "ensemble_alpha_rebuild_multi_window_lab_tool.v1",
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -23,6 +23,7 @@ from openclaw.services.ensemble_walk_forward_benchmark_service import (  # noqa:
     build_ensemble_walk_forward_shadow_benchmark,
 )
 from openclaw.services.formal_pool_benchmark_service import build_formal_pool_benchmark_return_series  # noqa: E402
+from openclaw.services.scan_run_index_service import preload_scan_run_index  # noqa: E402
 
 
 DEFAULT_STRATEGIES = ("v4", "v5", "v8", "v9", "combo", "v6", "v7")
@@ -65,8 +66,12 @@ def main() -> int:
     as_of_dates = _csv(args.as_of_dates)
     strategies = _csv(args.strategies)
     base_windows = []
+    compact_dates = sorted(str(as_of).replace("-", "") for as_of in as_of_dates)
     conn = sqlite3.connect(str(args.db_path), timeout=30)
     try:
+        scan_index = (
+            preload_scan_run_index(conn, start_date=compact_dates[0], end_date=compact_dates[-1]) if compact_dates else None
+        )
         for as_of in as_of_dates:
             fact_chain = build_ensemble_alpha_sleeve_fact_chain(
                 conn,
@@ -74,6 +79,7 @@ def main() -> int:
                 strategies=strategies,
                 holding_days=int(args.holding_days),
                 top_n_per_strategy=int(args.top_n_per_strategy),
+                scan_index=scan_index,
             )
             regime = _market_regime(conn, str(as_of).replace("-", ""))
             formal = build_formal_pool_benchmark_return_series(
@@ -81,6 +87,7 @@ def main() -> int:
                 strategies=FORMAL_POOL_BENCHMARK_STRATEGIES,
                 as_of_date=as_of,
                 holding_days=int(args.holding_days),
+                scan_index=scan_index,
             )
             base_windows.append(
                 {
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Store newly matured signal-item forward returns in ``signal_item_forward_returns``.
+
+Run after the daily DB update; only items with unstored horizons are replayed.
+
+Exit codes:
+  0  Refresh finished (including nothing to do, e.g. no signal tables yet).
+  1  Missing DB file, DB / IO error or invalid horizons.
+
+Example:
+
+  python tools/refresh_signal_item_forward_returns.py --horizons 1,3,5,10,20,60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from openclaw.paths import db_path as default_db_path  # noqa: E402
+from openclaw.services.signal_item_forward_return_service import (  # noqa: E402
+    MATERIALIZED_HORIZONS,
+    refresh_signal_item_forward_returns,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Materialize matured forward returns of historical signal items.")
+    parser.add_argument("--db-path", default="", help="SQLite DB path (defaults via openclaw.paths.db_path).")
+    parser.add_argument(
+        "--horizons",
+        default=",".join(str(h) for h in MATERIALIZED_HORIZONS),
+        help="Comma-separated forward horizons in trading days (positive integers).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Drop stored returns and recompute all of them.")
+    args = parser.parse_args()
+
+    try:
+        horizons = [int(part.strip()) for part in str(args.horizons or "").split(",") if part.strip()]
+    except ValueError as exc:
+        print(json.dumps({"error": "invalid_horizons", "detail": str(exc)}, indent=2))
+        return 1
+    dbp = Path(str(args.db_path or "").strip() or default_db_path()).resolve()
+    if not dbp.is_file():
+        print(json.dumps({"error": "db_not_found", "db_path": str(dbp)}, indent=2))
+        return 1
+    try:
+        # mode=rw never creates a missing DB file, even if it vanishes after the check above.
+        conn = sqlite3.connect(f"{dbp.as_uri()}?mode=rw", uri=True, timeout=60)
+    except Exception as exc:
+        print(json.dumps({"error": "db_connect_failed", "detail": str(exc)}, indent=2))
+        return 1
+    try:
+        summary = refresh_signal_item_forward_returns(conn, horizons=horizons, rebuild=bool(args.rebuild))
+    except Exception as exc:
+        print(json.dumps({"error": "refresh_failed", "detail": str(exc)}, indent=2))
+        return 1
+    finally:
+        conn.close()
+    summary["db_path"] = str(dbp)
+    print(json.dumps(summary, ensure_ascii=False, indent=2, sort_keys=True))
+    return 0 if summary.get("available") is True or _missing_tables_only(summary) else 1
+
+
+def _missing_tables_only(summary: dict) -> bool:
+    reasons = list(summary.get("blocking_reasons") or [])
+    return bool(reasons) and all(str(r).startswith("missing_") and str(r).endswith("_table") for r in reasons)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
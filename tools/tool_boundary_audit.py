@@ -22,6 +22,7 @@ STABLE_ENTRYPOINTS = {
     "build_top5_execution_court_record.py",
     "rebuild_top5_trader_brief_exports.py",
     "evaluate_top5_forward_returns.py",
+    "refresh_signal_item_forward_returns.py",
     "top5_audit_evidence_gate.py",
     "run_top5_competition_audit_then_gate.sh",
     "tool_boundary_audit.py",
@@ -203,7 +203,10 @@ from openclaw.runtime.backtest_workers import (
     run_single_backtest_worker as runtime_run_single_backtest_worker,
 )
 from openclaw.runtime.backtest_stats import calculate_backtest_stats as runtime_calculate_backtest_stats
-from openclaw.runtime.v9_signal_evaluator import calculate_v9_score_from_history as runtime_calculate_v9_score_from_history
+from openclaw.runtime.v9_signal_evaluator import (
+    calculate_v9_score_from_history as runtime_calculate_v9_score_from_history,
+    calculate_v9_scores_panel as runtime_calculate_v9_scores_panel,
+)
 from openclaw.runtime.combo_signal_evaluator import (
     evaluate_combo_component_scores as runtime_evaluate_combo_component_scores,
     evaluate_combo_signal as runtime_evaluate_combo_signal,
@@ -220,6 +223,69 @@ from openclaw.runtime.dataframe_utils import (
     ensure_price_aliases as runtime_ensure_price_aliases,
     normalize_stock_df as runtime_normalize_stock_df,
 )
+from openclaw.runtime.market_context import (
+    MarketContextCache,
+    MarketContextSnapshot,
+    UNKNOWN_INDUSTRY_HEAT,
+    build_market_context_snapshot as runtime_build_market_context_snapshot,
+    classify_market_environment as runtime_classify_market_environment,
+    score_industry_heat as runtime_score_industry_heat,
+)
+from openclaw.runtime.db_maintenance import (
+    enable_incremental_auto_vacuum as runtime_enable_incremental_auto_vacuum,
+    run_online_maintenance as runtime_run_online_maintenance,
+)
+from openclaw.runtime.db_metadata import (
+    read_db_summary as runtime_read_db_summary,
+    rebuild_db_metadata as runtime_rebuild_db_metadata,
+    start_background_sync as runtime_start_db_metadata_sync,
+    sync_db_metadata as runtime_sync_db_metadata,
+)
+from openclaw.runtime.market_cap_update import (
+    MarketCapProvider,
+    TushareMarketCapProvider as runtime_TushareMarketCapProvider,
+    market_cap_distribution as runtime_market_cap_distribution,
+    update_market_cap_incremental as runtime_update_market_cap_incremental,
+)
+from openclaw.runtime.indicator_cache import (
+    IndicatorCache,
+    IndicatorSeries,
+    build_indicator_series as runtime_build_indicator_series,
+)
+from openclaw.runtime.fork_pool import default_workers as runtime_default_fork_workers
+from openclaw.runtime.monthly_selection import (
+    build_monthly_features as runtime_build_monthly_features,
+    run_monthly_stages as runtime_run_monthly_stages,
+)
+from openclaw.runtime.panel_backtest import (
+    evaluator_backtest_signals as runtime_evaluator_backtest_signals,
+    volume_price_backtest_signals as runtime_volume_price_backtest_signals,
+)
+from openclaw.runtime.sector_scan import (
+    SectorPanelCache,
+    classify_sector_lifecycle as runtime_classify_sector_lifecycle,
+    empty_sector_results as runtime_empty_sector_results,
+    load_sector_panel as runtime_load_sector_panel,
+)
+from openclaw.runtime.strategy_sweep import (
+    VolumePriceSweepPanel,
+    build_volume_price_sweep as runtime_build_volume_price_sweep,
+    optimizer_score as runtime_optimizer_score,
+    run_sweeps_parallel as runtime_run_sweeps_parallel,
+    sweep_return_stats as runtime_sweep_return_stats,
+)
+from openclaw.runtime.scan_result_cache import (
+    ensure_scan_result_cache_tables as runtime_ensure_scan_result_cache_tables,
+    load_scan_results as runtime_load_scan_results,
+    prune_scan_results as runtime_prune_scan_results,
+    save_scan_results as runtime_save_scan_results,
+)
+from openclaw.runtime.offline_scan_utils import (
+    industry_return_strength as runtime_industry_return_strength,
+    resolve_history_table as runtime_resolve_history_table,
+    run_stock_scan_pipeline_parallel as runtime_run_stock_scan_pipeline_parallel,
+    stack_history_panel as runtime_stack_history_panel,
+)
 from openclaw.runtime.history_context import (
     batch_load_stock_histories as runtime_batch_load_stock_histories,
     load_history_range_bulk as runtime_load_history_range_bulk,
@@ -382,6 +448,15 @@ OFFLINE_MODE = os.getenv("OFFLINE_MODE") == "1" or os.getenv("RUN_OFFLINE_ALL")
 TUSHARE_ENABLED = os.getenv("TUSHARE_ENABLED", "1") != "0" and not OFFLINE_MODE
 OFFLINE_STOCK_LIMIT = int(os.getenv("OFFLINE_STOCK_LIMIT", "0"))
 OFFLINE_LOG_EVERY = int(os.getenv("OFFLINE_LOG_EVERY", "200"))
+COMBO_SCAN_WORKERS = runtime_default_fork_workers("COMBO_SCAN_WORKERS", 4)
+COMBO_SCAN_CHUNK = int(os.getenv("COMBO_SCAN_CHUNK", "100"))
+OFFLINE_PANEL_SCORING = os.getenv("OFFLINE_PANEL_SCORING", "1") == "1"
+DB_MAINTENANCE_BUDGET_SECONDS = float(os.getenv("DB_MAINTENANCE_BUDGET_SECONDS", "20"))
+INDICATOR_CACHE_PERSIST = os.getenv("INDICATOR_CACHE_PERSIST", "0") == "1"
+INDICATOR_CACHE_DIR = os.getenv("INDICATOR_CACHE_DIR", "")
+STRATEGY_OPTIMIZER_WORKERS = runtime_default_fork_workers("STRATEGY_OPTIMIZER_WORKERS", 3)
+BACKTEST_WORKERS = runtime_default_fork_workers("BACKTEST_WORKERS", 4)
+MONTHLY_SELECTION_WORKERS = int(os.getenv("MONTHLY_SELECTION_WORKERS", "3"))
 BULK_HISTORY_LIMIT = int(os.getenv("BULK_HISTORY_LIMIT", "1200"))
 BULK_HISTORY_CHUNK = int(os.getenv("BULK_HISTORY_CHUNK", "200"))
 AUTO_EVOLVE_LOCK_PATH = os.getenv("AUTO_EVOLVE_LOCK_PATH", "/tmp/auto_evolve.lock")
@@ -2931,6 +3006,39 @@ def _offline_apply_limit(stocks_df: pd.DataFrame) -> pd.DataFrame:
     return stocks_df
 
 
+def _offline_preload_histories(
+    conn: sqlite3.Connection, stocks_df: pd.DataFrame, limit: int, columns: str, tag: str
+) -> Dict[str, pd.DataFrame]:
+    """Load the whole candidate universe in one chunked query for panel scoring."""
+    if not OFFLINE_PANEL_SCORING or stocks_df is None or stocks_df.empty:
+        return {}
+    try:
+        histories = _load_stock_history_bulk(
+            conn,
+            stocks_df["ts_code"].astype(str).tolist(),
+            limit,
+            f"ts_code, {columns}",
+            table=runtime_resolve_history_table(conn),
+        )
+    except Exception as exc:
+        logger.warning(f"[offline:{tag}] bulk history load failed: {exc}")
+        return {}
+    logger.info(f"[offline:{tag}] histories loaded {len(histories)}")
+    return {str(code): hist.drop(columns=["ts_code"], errors="ignore") for code, hist in histories.items()}
+
+
+def _offline_history_loader(
+    histories: Dict[str, pd.DataFrame], limit: int, columns: str
+) -> Callable[[sqlite3.Connection, str], pd.DataFrame]:
+    def _load(conn: sqlite3.Connection, ts_code: str) -> pd.DataFrame:
+        hist = histories.get(str(ts_code))
+        if hist is not None:
+            return hist
+        return _load_stock_history(conn, ts_code, limit, columns)
+
+    return _load
+
+
 def _load_candidate_stocks(
     conn: sqlite3.Connection,
     *,
@@ -3212,8 +3320,10 @@ def _offline_scan_v4(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
         conn=conn,
         tag="v4",
         min_history=60,
-        load_history=lambda c, ts: _load_stock_history(
-            c, ts, 120, "trade_date, close_price, vol, pct_chg"
+        load_history=_offline_history_loader(
+            _offline_preload_histories(conn, stocks_df, 120, "trade_date, close_price, vol, pct_chg", "v4"),
+            120,
+            "trade_date, close_price, vol, pct_chg",
         ),
         evaluate=lambda row, stock_data: analyzer.evaluator_v4.evaluate_stock_v4(stock_data),
         build_result=lambda payload: {
@@ -3297,8 +3407,10 @@ def _offline_scan_v5(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
         conn=conn,
         tag="v5",
         min_history=60,
-        load_history=lambda c, ts: _load_stock_history(
-            c, ts, 120, "trade_date, close_price, vol, pct_chg"
+        load_history=_offline_history_loader(
+            _offline_preload_histories(conn, stocks_df, 120, "trade_date, close_price, vol, pct_chg", "v5"),
+            120,
+            "trade_date, close_price, vol, pct_chg",
         ),
         evaluate=lambda row, stock_data: analyzer.evaluator_v5.evaluate_stock_v4(stock_data),
         build_result=lambda payload: {
@@ -3382,8 +3494,10 @@ def _offline_scan_v6(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
         conn=conn,
         tag="v6",
         min_history=60,
-        load_history=lambda c, ts: _load_stock_history(
-            c, ts, 120, "trade_date, close_price, vol, pct_chg"
+        load_history=_offline_history_loader(
+            _offline_preload_histories(conn, stocks_df, 120, "trade_date, close_price, vol, pct_chg", "v6"),
+            120,
+            "trade_date, close_price, vol, pct_chg",
         ),
         evaluate=lambda row, stock_data: analyzer.evaluator_v6.evaluate_stock_v6(
             stock_data, row["ts_code"]
@@ -3469,6 +3583,8 @@ def _offline_scan_v8(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
 
     stocks_df = _offline_apply_limit(stocks_df)
     logger.info(f"[offline:v8] candidates {len(stocks_df)}")
+    # v8 仍逐只评分：evaluate_v8_signal 以 v7 基础评分器（strategies.evaluators，不在本仓库）
+    # 打底，无法与 v9 一样做面板化；这里只共享一次性的历史批量加载。
     def _eval_v8_row(row: pd.Series, stock_data: pd.DataFrame) -> Optional[Dict[str, Any]]:
         try:
             res = analyzer.evaluator_v8.evaluate_stock_v8(
@@ -3485,8 +3601,10 @@ def _offline_scan_v8(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
         conn=conn,
         tag="v8",
         min_history=60,
-        load_history=lambda c, ts: _load_stock_history(
-            c, ts, 120, "trade_date, close_price, high_price, low_price, vol, pct_chg"
+        load_history=_offline_history_loader(
+            _offline_preload_histories(conn, stocks_df, 120, "trade_date, close_price, high_price, low_price, vol, pct_chg", "v8"),
+            120,
+            "trade_date, close_price, high_price, low_price, vol, pct_chg",
         ),
         evaluate=_eval_v8_row,
         build_result=lambda payload: {
@@ -3587,15 +3705,32 @@ def _offline_scan_v9(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
     logger.info(f"[offline:v9] candidates {len(stocks_df)}")
 
     bonus_global, bonus_stock_map, top_list_set, top_inst_set, bonus_industry_map = _load_external_bonus_maps(conn)
+    v9_limit = max(80, int(lookback_days))
+    v9_columns = "trade_date, close_price, high_price, low_price, vol, pct_chg"
+    v9_histories = _offline_preload_histories(conn, stocks_df, v9_limit, v9_columns, "v9")
+    # 面板评分与逐只评分结果一致；批量加载成功时，未进入面板的股票显式跳过（计入
+    # panel_misses），不再逐只回读重算。批量加载关闭或失败时走逐只评分。
+    v9_panel = bool(v9_histories)
+    v9_scores = runtime_calculate_v9_scores_panel(runtime_stack_history_panel(v9_histories), industry_strength=0.0)
+    v9_panel_misses: List[str] = []
+
+    def _load_v9_panel_row(_conn: sqlite3.Connection, ts_code: str) -> Optional[pd.DataFrame]:
+        hist = v9_histories.get(str(ts_code))
+        if hist is None:
+            v9_panel_misses.append(str(ts_code))
+        return hist
+
     results = run_stock_scan_pipeline(
         stocks_df=stocks_df,
         conn=conn,
         tag="v9",
         min_history=80,
-        load_history=lambda c, ts: _load_stock_history(
-            c, ts, max(80, int(lookback_days)), "trade_date, close_price, high_price, low_price, vol, pct_chg"
+        load_history=_load_v9_panel_row if v9_panel else _offline_history_loader(v9_histories, v9_limit, v9_columns),
+        evaluate=lambda row, stock_data: (
+            v9_scores.get(str(row["ts_code"]))
+            if v9_panel
+            else analyzer._calc_v9_score_from_hist(stock_data, industry_strength=0.0)
         ),
-        evaluate=lambda _row, stock_data: analyzer._calc_v9_score_from_hist(stock_data, industry_strength=0.0),
         build_result=lambda payload: {
             "股票代码": payload.row["ts_code"],
             "股票名称": payload.row["name"],
@@ -3617,6 +3752,8 @@ def _offline_scan_v9(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
     )
 
     conn.close()
+    if v9_panel_misses:
+        logger.warning(f"[offline:v9] skipped {len(v9_panel_misses)} stocks missing from the history panel")
     logger.info(f"[offline:v9] results {len(results)}")
     if not results:
         return None, {"candidate_count": len(stocks_df), "filter_failed": 0, "cache_hit": False, "cache_mode": "miss"}
@@ -3648,6 +3785,7 @@ def _offline_scan_v9(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
             "cache_mode": "miss",
             "elapsed_ms": int((time.time() - scan_started_at) * 1000),
             "lookback_days": int(lookback_days),
+            "panel_misses": len(v9_panel_misses),
         },
     )
     return results_df, {
@@ -3657,6 +3795,7 @@ def _offline_scan_v9(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Optional[
         "cache_mode": "miss",
         "elapsed_ms": int((time.time() - scan_started_at) * 1000),
         "lookback_days": int(lookback_days),
+        "panel_misses": len(v9_panel_misses),
     }
 
 
@@ -3802,7 +3941,6 @@ def _offline_scan_combo(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Option
     stocks_df = stocks_df.head(candidate_count)
     logger.info(f"[offline:combo] candidates {len(stocks_df)}")
     bonus_global, bonus_stock_map, top_list_set, top_inst_set, bonus_industry_map = _load_external_bonus_maps(conn)
-    conn.close()
 
     # Calendar days undercount trading rows around long holidays; keep the
     # fetch window wide enough for the 80-row combo history gate.
@@ -3810,16 +3948,34 @@ def _offline_scan_combo(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Option
     combo_start = (datetime.now() - timedelta(days=combo_history_days)).strftime("%Y%m%d")
     combo_end = datetime.now().strftime("%Y%m%d")
 
-    ind_vals: Dict[str, List[float]] = {}
-    for _, row in stocks_df.iterrows():
-        hist = _load_history_full(str(row["ts_code"]), combo_start, combo_end)
-        if hist is None or len(hist) < 21:
-            continue
-        close = pd.to_numeric(hist["close_price"], errors="coerce").ffill()
-        if len(close) > 21:
-            r20 = (close.iloc[-1] / close.iloc[-21] - 1.0) * 100
-            ind_vals.setdefault(str(row["industry"]), []).append(float(r20))
-    industry_scores = {ind: float(np.mean(vals)) for ind, vals in ind_vals.items() if vals}
+    # One chunked range query feeds both industry strength and evaluation.
+    try:
+        from data.dao import detect_daily_table  # type: ignore
+        combo_table = _safe_daily_table_name(detect_daily_table(conn))
+    except Exception:
+        combo_table = "daily_trading_data"
+    try:
+        combo_histories = {
+            code: hist.drop(columns=["ts_code"], errors="ignore")
+            for code, hist in _load_history_range_bulk(
+                conn,
+                stocks_df["ts_code"].astype(str).tolist(),
+                combo_start,
+                combo_end,
+                columns="ts_code, trade_date, close_price, high_price, low_price, vol, amount, pct_chg, turnover_rate",
+                table=combo_table,
+            ).items()
+        }
+    except Exception as exc:
+        logger.warning(f"[offline:combo] bulk history load failed: {exc}")
+        combo_histories = {}
+    conn.close()
+    logger.info(f"[offline:combo] histories loaded {len(combo_histories)}")
+
+    industry_scores = runtime_industry_return_strength(
+        combo_histories,
+        dict(zip(stocks_df["ts_code"].astype(str), stocks_df["industry"])),
+    )
 
     def _combo_eval(row: pd.Series, hist: pd.DataFrame) -> Optional[Dict[str, Any]]:
         avg_amount = pd.to_numeric(hist["amount"], errors="coerce").tail(20).mean()
@@ -3883,12 +4039,16 @@ def _offline_scan_combo(analyzer: "CompleteVolumePriceAnalyzer") -> Tuple[Option
             external_bonus=extra,
         )
 
-    results = run_stock_scan_pipeline(
+    results = runtime_run_stock_scan_pipeline_parallel(
+        run_pipeline=run_stock_scan_pipeline,
         stocks_df=stocks_df,
-        conn=None,
         tag="combo",
+        workers=COMBO_SCAN_WORKERS,
+        chunk_size=COMBO_SCAN_CHUNK,
+        logger=logger,
+        conn=None,
         min_history=80,
-        load_history=lambda _c, ts: _load_history_full(ts, combo_start, combo_end),
+        load_history=lambda _c, ts: combo_histories.get(str(ts)),
         evaluate=_combo_eval,
         build_result=lambda payload: {
             "股票代码": payload.row["ts_code"],
@@ -4470,6 +4630,14 @@ class UnifiedBacktestEngine:
 
 
 # ===================== 完整的量价分析器（集成v43+v44）=====================
+# 市场环境/行业热度按最新交易日缓存，所有分析器实例共享
+_MARKET_CONTEXT_CACHE = MarketContextCache()
+# 滚动指标序列按(股票, 窗口集合)缓存并落盘，新交易日只增量计算尾部
+_INDICATOR_CACHE = IndicatorCache(
+    (INDICATOR_CACHE_DIR or os.path.join(runtime_cache_dir(), "indicator_cache")) if INDICATOR_CACHE_PERSIST else None
+)
+
+
 class CompleteVolumePriceAnalyzer:
     """完整的量价分析器 - 集成所有功能"""
     
@@ -4535,94 +4703,30 @@ class CompleteVolumePriceAnalyzer:
         """初始化缓存数据库表"""
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 创建v5.0扫描结果缓存表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scan_cache_v5 (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    scan_date TEXT NOT NULL,
-                    ts_code TEXT NOT NULL,
-                    stock_name TEXT,
-                    industry TEXT,
-                    latest_price REAL,
-                    circ_mv REAL,
-                    final_score REAL,
-                    dim_scores TEXT,
-                    scan_params TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(scan_date, ts_code, scan_params)
-                )
-            """)
-            
-            # 创建v6.0扫描结果缓存表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scan_cache_v6 (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    scan_date TEXT NOT NULL,
-                    ts_code TEXT NOT NULL,
-                    stock_name TEXT,
-                    industry TEXT,
-                    latest_price REAL,
-                    circ_mv REAL,
-                    final_score REAL,
-                    dim_scores TEXT,
-                    scan_params TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(scan_date, ts_code, scan_params)
-                )
-            """)
-            
-            # 创建索引加速查询
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_scan_cache_v5_date 
-                ON scan_cache_v5(scan_date, scan_params)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_scan_cache_v6_date 
-                ON scan_cache_v6(scan_date, scan_params)
-            """)
-            
-            conn.commit()
-            conn.close()
+            try:
+                runtime_ensure_scan_result_cache_tables(conn)
+            finally:
+                conn.close()
             logger.info("扫描结果缓存表初始化成功")
         except Exception as e:
             logger.error(f"缓存表初始化失败: {e}")
     
     def save_scan_results_to_cache(self, results: list, version: str, scan_params: dict):
-        """保存扫描结果到缓存数据库"""
+        """保存扫描结果到缓存数据库（单事务批量写入，并清理过期扫描日）"""
         try:
-            import json
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            scan_date = datetime.now().strftime('%Y%m%d')
-            scan_params_str = json.dumps(scan_params, ensure_ascii=False, sort_keys=True)
-            table_name = f"scan_cache_{version}"
-            
-            for result in results:
-                dim_scores_str = json.dumps(result.get('dim_scores', {}), ensure_ascii=False) if 'dim_scores' in result else '{}'
-                
-                cursor.execute(f"""
-                    INSERT OR REPLACE INTO {table_name} 
-                    (scan_date, ts_code, stock_name, industry, latest_price, circ_mv, final_score, dim_scores, scan_params)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    scan_date,
-                    result.get('股票代码', ''),
-                    result.get('股票名称', ''),
-                    result.get('行业', ''),
-                    result.get('最新价', 0),
-                    result.get('流通市值(亿)', 0),
-                    result.get('综合评分', 0),
-                    dim_scores_str,
-                    scan_params_str
-                ))
-            
-            conn.commit()
-            conn.close()
-            logger.info(f"已保存 {len(results)} 条{version}扫描结果到缓存")
+            try:
+                saved = runtime_save_scan_results(
+                    conn,
+                    version=version,
+                    results=results,
+                    scan_params=scan_params,
+                    scan_date=datetime.now().strftime('%Y%m%d'),
+                )
+                runtime_prune_scan_results(conn)
+            finally:
+                conn.close()
+            logger.info(f"已保存 {saved} 条{version}扫描结果到缓存")
             return True
         except Exception as e:
             logger.error(f"保存扫描结果失败: {e}")
@@ -4631,23 +4735,16 @@ class CompleteVolumePriceAnalyzer:
     def load_scan_results_from_cache(self, version: str, scan_params: dict):
         """从缓存加载扫描结果"""
         try:
-            import json
             conn = sqlite3.connect(self.db_path)
-            
-            scan_date = datetime.now().strftime('%Y%m%d')
-            scan_params_str = json.dumps(scan_params, ensure_ascii=False, sort_keys=True)
-            table_name = f"scan_cache_{version}"
-            
-            query = f"""
-                SELECT ts_code, stock_name, industry, latest_price, circ_mv, 
-                       final_score, dim_scores
-                FROM {table_name}
-                WHERE scan_date = ? AND scan_params = ?
-                ORDER BY final_score DESC
-            """
-            
-            df = pd.read_sql_query(query, conn, params=(scan_date, scan_params_str))
-            conn.close()
+            try:
+                df = runtime_load_scan_results(
+                    conn,
+                    version=version,
+                    scan_params=scan_params,
+                    scan_date=datetime.now().strftime('%Y%m%d'),
+                )
+            finally:
+                conn.close()
             
             if len(df) > 0:
                 logger.info(f"从缓存加载了 {len(df)} 条{version}扫描结果")
@@ -4657,6 +4754,18 @@ class CompleteVolumePriceAnalyzer:
         except Exception as e:
             logger.error(f"加载缓存失败: {e}")
             return None
+
+    def prune_scan_results_cache(self, keep_days: Optional[int] = None) -> Dict[str, int]:
+        """清理超过保留天数的扫描结果缓存"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                return runtime_prune_scan_results(conn, keep_days=keep_days)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"清理扫描结果缓存失败: {e}")
+            return {}
         
     def get_market_trend(self, days: int = 5) -> Dict:
         """
@@ -4835,55 +4944,14 @@ class CompleteVolumePriceAnalyzer:
                 'error': str(e)
             }
         
-    @staticmethod
-    @lru_cache(maxsize=1000)
-    def _calculate_technical_indicators(close_tuple: tuple, volume_tuple: tuple) -> Dict:
-        """计算技术指标（向量化优化）"""
-        try:
-            close = np.array(close_tuple)
-            volume = np.array(volume_tuple)
-            
-            if len(close) == 0 or len(volume) == 0:
-                return {}
-            
-            indicators = {}
-            
-            # 均线系统
-            indicators['ma5'] = np.mean(close[-5:]) if len(close) >= 5 else 0
-            indicators['ma10'] = np.mean(close[-10:]) if len(close) >= 10 else 0
-            indicators['ma20'] = np.mean(close[-20:]) if len(close) >= 20 else 0
-            indicators['ma60'] = np.mean(close[-60:]) if len(close) >= 60 else 0
-            
-            # 成交量指标
-            indicators['vol_ma5'] = np.mean(volume[-5:]) if len(volume) >= 5 else 0
-            indicators['vol_ma10'] = np.mean(volume[-10:]) if len(volume) >= 10 else 0
-            indicators['vol_ma20'] = np.mean(volume[-20:]) if len(volume) >= 20 else 0
-            
-            # 价格动量
-            if len(close) >= 5:
-                indicators['momentum_5'] = (close[-1] - close[-5]) / (close[-5] + 0.0001) * 100
-            else:
-                indicators['momentum_5'] = 0
-                
-            if len(close) >= 10:
-                indicators['momentum_10'] = (close[-1] - close[-10]) / (close[-10] + 0.0001) * 100
-            else:
-                indicators['momentum_10'] = 0
-            
-            # 波动率
-            if len(close) >= 10:
-                mean_close = np.mean(close[-10:])
-                if mean_close > 0:
-                    indicators['volatility'] = np.std(close[-10:]) / mean_close * 100
-                else:
-                    indicators['volatility'] = 0
-            else:
-                indicators['volatility'] = 0
-            
-            return indicators
-            
-        except Exception as e:
-            return {}
+    def _get_indicator_series(self, stock_data: pd.DataFrame, data: pd.DataFrame) -> IndicatorSeries:
+        """清洗后历史的滚动指标序列；有股票代码和交易日时走持久化缓存"""
+        close = data['close_price'].values
+        volume = data['vol'].values
+        if 'trade_date' not in data.columns or 'ts_code' not in stock_data.columns:
+            return runtime_build_indicator_series('', np.arange(len(data)), close, volume)
+        ts_code = str(stock_data['ts_code'].iloc[0])
+        return _INDICATOR_CACHE.get(ts_code, data['trade_date'].values, close, volume)
     
     def identify_signals_optimized(self, stock_data: pd.DataFrame, 
                                    signal_strength_threshold: float = 0.55,
@@ -4957,6 +5025,7 @@ class CompleteVolumePriceAnalyzer:
             
             signals = []
             signals_found = 0  # 调试计数器
+            indicator_series = self._get_indicator_series(stock_data, data)
             
             #  改进：包含最新数据用于当前选股！
             # v46.1的-5是为了计算未来收益，但我们要选当前的股票
@@ -4972,9 +5041,7 @@ class CompleteVolumePriceAnalyzer:
                         continue
                     
                     #  关键改进：即使indicators失败也继续评分！
-                    indicators = self._calculate_technical_indicators(
-                        tuple(close), tuple(volume)
-                    )
+                    indicators = indicator_series.row(i)
                     
                     #  移除这个限制！不再因为indicators失败就跳过
                     # if not indicators:
@@ -5267,27 +5334,62 @@ class CompleteVolumePriceAnalyzer:
                 limit=20,
                 columns="trade_date, close_price, pct_chg",
             )
-            
-            if len(index_data) < 20:
-                return 'oscillation'  # 默认震荡市
-            
-            # 计算指数涨跌幅
-            index_return_20 = (index_data['close_price'].iloc[0] - index_data['close_price'].iloc[-1]) / index_data['close_price'].iloc[-1]
-            
-            # 计算波动率
-            index_volatility = index_data['pct_chg'].std()
-            
-            # 判断市场环境
-            if index_return_20 > 0.10 and index_volatility < 2.0:
-                return 'bull'  # 牛市
-            elif index_return_20 < -0.10:
-                return 'bear'  # 熊市
-            else:
-                return 'oscillation'  # 震荡市
-                
+            return runtime_classify_market_environment(index_data)
         except Exception as e:
             logger.warning(f"获取市场环境失败: {e}，默认震荡市")
             return 'oscillation'
+
+    def get_market_context_snapshot(self) -> MarketContextSnapshot:
+        """
+        每个扫描日只构建一次的市场上下文：市场环境、动态权重、全行业热度。
+        数据库最新交易日变化时自动重建；最近刚确认过的快照直接复用，不再查询最新交易日。
+        指数或行业数据加载失败的快照不会被缓存。
+        """
+        recent = _MARKET_CONTEXT_CACHE.recent()
+        if recent is not None:
+            return recent
+        trade_date = _get_db_last_trade_date(PERMANENT_DB_PATH)
+        try:
+            return _MARKET_CONTEXT_CACHE.get(trade_date, lambda: self._build_market_context_snapshot(trade_date))
+        except Exception as e:
+            logger.warning(f"构建市场上下文失败: {e}，默认震荡市")
+            return MarketContextSnapshot(
+                trade_date="",
+                market_env='oscillation',
+                weights=self.get_dynamic_weights('oscillation'),
+                complete=False,
+            )
+
+    def _build_market_context_snapshot(self, trade_date: str) -> MarketContextSnapshot:
+        from data.dao import DataAccessError, detect_daily_table  # type: ignore
+
+        index_data = None
+        try:
+            from data.history import load_index_recent as _load_index_recent_v2  # type: ignore
+            index_data = _load_index_recent_v2(
+                db_path=PERMANENT_DB_PATH,
+                index_code="000001.SH",
+                limit=20,
+                columns="trade_date, close_price, pct_chg",
+            )
+        except Exception as e:
+            logger.warning(f"获取市场环境失败: {e}，默认震荡市")
+
+        conn = _connect_permanent_db()
+        try:
+            try:
+                daily_table = _safe_daily_table_name(detect_daily_table(conn))
+            except DataAccessError:
+                daily_table = ""
+            return runtime_build_market_context_snapshot(
+                conn=conn,
+                trade_date=trade_date,
+                daily_table=daily_table,
+                index_data=index_data,
+                dynamic_weights=self.get_dynamic_weights,
+            )
+        finally:
+            conn.close()
     
     def get_dynamic_weights(self, market_env: str) -> Dict:
         """
@@ -5396,53 +5498,14 @@ class CompleteVolumePriceAnalyzer:
             industry_data = pd.read_sql_query(query, conn, params=(industry, latest_trade))
             conn.close()
             
-            if len(industry_data) < 5:
-                return {'heat_score': 0, 'heat_level': '未知', 'industry_return': 0}
-            
-            heat_score = 0
-            
-            # 1. 行业平均涨幅（10分）
-            industry_avg_return = industry_data['pct_chg'].mean()
-            if industry_avg_return > 3:
-                heat_score += 10
-            elif industry_avg_return > 1:
-                heat_score += 7
-            elif industry_avg_return > 0:
-                heat_score += 4
-            
-            # 2. 行业涨停数量（5分）
-            limit_up_count = sum(1 for pct in industry_data['pct_chg'] if pct > 9.5)
-            limit_up_ratio = limit_up_count / len(industry_data)
-            if limit_up_ratio > 0.05:
-                heat_score += 5
-            elif limit_up_ratio > 0.02:
-                heat_score += 3
-            
-            # 3. 行业资金流入（5分）
-            # 使用成交量作为资金流入的代理指标
-            avg_volume = industry_data['vol'].mean()
-            if avg_volume > 100000:
-                heat_score += 5
-            elif avg_volume > 50000:
-                heat_score += 3
-            
-            # 确定热度等级
-            if heat_score >= 15:
-                heat_level = ' 高热'
-            elif heat_score >= 10:
-                heat_level = '⭐ 热门'
-            elif heat_score >= 5:
-                heat_level = ' 温和'
-            else:
-                heat_level = ' 冷门'
-            
-            return {
-                'heat_score': min(20, heat_score),
-                'heat_level': heat_level,
-                'industry_return': round(industry_avg_return, 2),
-                'limit_up_ratio': round(limit_up_ratio * 100, 1) if limit_up_count > 0 else 0
-            }
-            
+            # 平均涨幅（10分）+ 涨停占比（5分）+ 成交量代理资金流入（5分）
+            return runtime_score_industry_heat(
+                rows=len(industry_data),
+                avg_return=industry_data['pct_chg'].mean(),
+                limit_up_count=int((industry_data['pct_chg'] > 9.5).sum()),
+                avg_volume=industry_data['vol'].mean(),
+            )
+
         except Exception as e:
             logger.warning(f"行业热度计算失败: {e}")
             return {'heat_score': 0, 'heat_level': '未知', 'industry_return': 0}
@@ -5633,7 +5696,9 @@ class CompleteVolumePriceAnalyzer:
             logger.error(f"风险评分失败: {e}")
             return {'risk_score': 50, 'risk_level': ' 中等风险', 'details': {}}
     
-    def evaluate_stock_ultimate_fusion(self, stock_data: pd.DataFrame) -> Dict:
+    def evaluate_stock_ultimate_fusion(
+        self, stock_data: pd.DataFrame, market_context: Optional[MarketContextSnapshot] = None
+    ) -> Dict:
         """
          综合优选优化版：6维100分评分体系 + 7大优化
         
@@ -5960,8 +6025,11 @@ class CompleteVolumePriceAnalyzer:
             
             # ==========  优化1：动态权重调整 ==========
             # 获取市场环境
-            market_env = self.get_market_environment()
-            weights = self.get_dynamic_weights(market_env)
+            # 市场上下文每个扫描日只构建一次（调用方可直接传入）
+            if market_context is None:
+                market_context = self.get_market_context_snapshot()
+            market_env = market_context.market_env
+            weights = dict(market_context.weights)
             
             #  修复Bug：6维度分数已经按100分制设计好了（25+20+25+15+10+5=100）
             # 直接使用原始分数，不再乘以权重！
@@ -5990,13 +6058,13 @@ class CompleteVolumePriceAnalyzer:
             # ==========  优化4：行业热度加成 ==========
             industry = stock_data['industry'].iloc[0] if 'industry' in stock_data.columns else None
             if industry and not pd.isna(industry):
-                industry_result = self.calculate_industry_heat(industry)
+                industry_result = market_context.heat_for(industry)
                 industry_bonus = industry_result['heat_score']
                 industry_level = industry_result['heat_level']
             else:
                 industry_bonus = 0
                 industry_level = '未知'
-                industry_result = {'heat_score': 0, 'heat_level': '未知', 'industry_return': 0}
+                industry_result = dict(UNKNOWN_INDUSTRY_HEAT)
             
             # ==========  优化6：止损位置建议 ==========
             entry_price = close[-1]
@@ -6123,7 +6191,7 @@ class CompleteVolumePriceAnalyzer:
                 if 'ST' in stock_name or '*ST' in stock_name:
                     return self._empty_score_result()
             
-            data = stock_data[required_cols].copy()
+            data = stock_data[required_cols + (['trade_date'] if 'trade_date' in stock_data.columns else [])].copy()
             for col in required_cols:
                 data[col] = pd.to_numeric(data[col], errors='coerce')
             data = data.dropna()
@@ -6136,7 +6204,9 @@ class CompleteVolumePriceAnalyzer:
             pct_chg = data['pct_chg'].values
             
             # ========== 计算所有基础指标 ==========
-            indicators = self._calculate_all_indicators(close, volume, pct_chg)
+            indicators = self._calculate_all_indicators(
+                close, volume, pct_chg, series=self._get_indicator_series(stock_data, data)
+            )
             
             # ========== 【维度1】量价配合（25分）==========
             score_volume_price = self._score_volume_price(indicators)
@@ -6244,8 +6314,8 @@ class CompleteVolumePriceAnalyzer:
             'details': {}
         }
     
-    def _calculate_all_indicators(self, close, volume, pct_chg) -> Dict:
-        """计算所有基础指标"""
+    def _calculate_all_indicators(self, close, volume, pct_chg, series: Optional[IndicatorSeries] = None) -> Dict:
+        """计算所有基础指标（传入series时均线与MACD直接取缓存的滚动序列）"""
         # 价格指标
         price_min = np.min(close[-60:])
         price_max = np.max(close[-60:])
@@ -6262,17 +6332,28 @@ class CompleteVolumePriceAnalyzer:
         price_chg_10d = (close[-1] - close[-11]) / close[-11] if len(close) > 11 and close[-11] > 0 else 0
         price_chg_20d = (close[-1] - close[-21]) / close[-21] if len(close) > 21 and close[-21] > 0 else 0
         
-        # 均线
-        ma5 = np.mean(close[-5:])
-        ma10 = np.mean(close[-10:])
-        ma20 = np.mean(close[-20:])
-        ma60 = np.mean(close[-60:]) if len(close) >= 60 else ma20
-        
-        # MACD
-        ema12 = pd.Series(close).ewm(span=12, adjust=False).mean().values
-        ema26 = pd.Series(close).ewm(span=26, adjust=False).mean().values
-        dif = ema12 - ema26
-        dea = pd.Series(dif).ewm(span=9, adjust=False).mean().values
+        if series is not None and len(series) == len(close) and len(close) >= 60:
+            # 均线
+            ma5 = series.arrays['ma5'][-1]
+            ma10 = series.arrays['ma10'][-1]
+            ma20 = series.arrays['ma20'][-1]
+            ma60 = series.arrays['ma60'][-1]
+            
+            # MACD
+            dif = series.dif
+            dea = series.dea
+        else:
+            # 均线
+            ma5 = np.mean(close[-5:])
+            ma10 = np.mean(close[-10:])
+            ma20 = np.mean(close[-20:])
+            ma60 = np.mean(close[-60:]) if len(close) >= 60 else ma20
+            
+            # MACD
+            ema12 = pd.Series(close).ewm(span=12, adjust=False).mean().values
+            ema26 = pd.Series(close).ewm(span=26, adjust=False).mean().values
+            dif = ema12 - ema26
+            dea = pd.Series(dif).ewm(span=9, adjust=False).mean().values
         macd_hist = dif - dea
         
         # 其他指标
@@ -6658,63 +6739,31 @@ class CompleteVolumePriceAnalyzer:
                 df = df.rename(columns={'close': 'close_price', 'open': 'open_price', 
                                        'high': 'high_price', 'low': 'low_price'})
             
-            all_signals = []
-            analyzed_count = 0
-            
             unique_stocks = df['ts_code'].unique()
             if len(unique_stocks) > sample_size:
                 sample_stocks = np.random.choice(unique_stocks, sample_size, replace=False)
             else:
                 sample_stocks = unique_stocks
             
-            for ts_code in sample_stocks:
-                analyzed_count += 1
-                if analyzed_count % 50 == 0:
-                    logger.info(f"回测进度: {analyzed_count}/{len(sample_stocks)}, 已找到 {len(all_signals)} 个信号")
-                
-                try:
-                    stock_data = df[df['ts_code'] == ts_code].copy()
-                    
-                    if len(stock_data) < 60 + holding_days:
-                        continue
-                    
-                    # 遍历可能的买入点
-                    for i in range(30, len(stock_data) - holding_days - 1):
-                        current_data = stock_data.iloc[:i+1].copy()
-                        
-                        # 调用对应版本的评分方法（v6需要传递ts_code）
-                        if version == 'v6':
-                            eval_result = getattr(evaluator, eval_method)(current_data, ts_code)
-                        else:
-                            eval_result = getattr(evaluator, eval_method)(current_data)
-                        
-                        if not eval_result['success']:
-                            continue
-                        
-                        final_score = eval_result['final_score']
-                        
-                        # 检查是否在目标分数区间
-                        if min_score <= final_score <= max_score:
-                            close_col = 'close_price' if 'close_price' in stock_data.columns else 'close'
-                            buy_price = stock_data.iloc[i][close_col]
-                            sell_price = stock_data.iloc[i + holding_days][close_col]
-                            future_return = (sell_price - buy_price) / buy_price * 100
-                            
-                            all_signals.append({
-                                'ts_code': ts_code,
-                                'name': stock_data['name'].iloc[0] if 'name' in stock_data.columns else ts_code,
-                                'industry': stock_data['industry'].iloc[0] if 'industry' in stock_data.columns else '未知',
-                                'trade_date': stock_data.iloc[i]['trade_date'],
-                                'close': buy_price,
-                                'signal_strength': final_score,
-                                'grade': eval_result.get('grade', ''),
-                                'reasons': eval_result.get('signal_reasons', ''),
-                                'future_return': future_return
-                            })
-                            break  # 每只股票只取第一个信号
-                
-                except Exception as e:
-                    continue
+            # 调用对应版本的评分方法（v6需要传递ts_code）
+            score_method = getattr(evaluator, eval_method)
+            if version == 'v6':
+                evaluate = score_method
+            else:
+                evaluate = lambda window, _ts_code: score_method(window)
+            
+            # 分组一次取出样本股票历史，按股票并行评分，收益由平移收盘价得到
+            all_signals = runtime_evaluator_backtest_signals(
+                df,
+                sample_codes=sample_stocks,
+                holding_days=holding_days,
+                evaluate=evaluate,
+                min_score=min_score,
+                max_score=max_score,
+                workers=BACKTEST_WORKERS,
+                logger=logger,
+            )
+            analyzed_count = len(sample_stocks)
             
             if not all_signals:
                 return {
@@ -6782,10 +6831,6 @@ class CompleteVolumePriceAnalyzer:
                     'low': 'low_price'
                 })
             
-            all_signals = []
-            analyzed_count = 0
-            valid_signal_count = 0
-            
             unique_stocks = df['ts_code'].unique()
             if len(unique_stocks) > sample_size:
                 sample_stocks = np.random.choice(unique_stocks, sample_size, replace=False)
@@ -6794,65 +6839,29 @@ class CompleteVolumePriceAnalyzer:
             
             logger.info(f"将使用真实v4.0评分器回测 {len(sample_stocks)} 只股票")
             
-            for ts_code in sample_stocks:
-                analyzed_count += 1
-                if analyzed_count % 50 == 0:
-                    logger.info(f"回测进度: {analyzed_count}/{len(sample_stocks)}, 已找到 {valid_signal_count} 个有效信号")
-                
-                try:
-                    stock_data = df[df['ts_code'] == ts_code].copy()
-                    
-                    if len(stock_data) < 60 + holding_days:
-                        continue
-                    
-                    # 遍历可能的买入点
-                    for i in range(30, len(stock_data) - holding_days - 1):
-                        try:
-                            # 获取到当前时点的数据
-                            current_data = stock_data.iloc[:i+1].copy()
-                            
-                            # 使用真实的v4.0评分器评分
-                            eval_result = self.evaluator_v4.evaluate_stock_v4(current_data)
-                            
-                            if not eval_result['success']:
-                                continue
-                            
-                            final_score = eval_result['final_score']
-                            
-                            # 使用自定义阈值作为信号阈值（v4.0潜伏期特征）
-                            if min_score <= final_score <= max_score:
-                                # 计算未来收益
-                                close_col = 'close_price' if 'close_price' in stock_data.columns else 'close'
-                                buy_price = stock_data.iloc[i][close_col]
-                                sell_price = stock_data.iloc[i + holding_days][close_col]
-                                future_return = (sell_price - buy_price) / buy_price * 100
-                                
-                                signal = {
-                                    'ts_code': ts_code,
-                                    'name': stock_data['name'].iloc[0] if 'name' in stock_data.columns else ts_code,
-                                    'industry': stock_data['industry'].iloc[0] if 'industry' in stock_data.columns else '未知',
-                                    'trade_date': stock_data.iloc[i]['trade_date'],
-                                    'close': buy_price,
-                                    'signal_strength': final_score,
-                                    'grade': eval_result.get('grade', ''),
-                                    'reasons': eval_result.get('signal_reasons', ''),
-                                    'future_return': future_return,
-                                    # v4.0特有的维度得分
-                                    'lurking_value': eval_result.get('dimension_scores', {}).get('潜伏价值', 0),
-                                    'bottom_feature': eval_result.get('dimension_scores', {}).get('底部特征', 0),
-                                    'volume_price': eval_result.get('dimension_scores', {}).get('量价配合', 0),
-                                }
-                                
-                                all_signals.append(signal)
-                                valid_signal_count += 1
-                                break  # 每只股票只取第一个信号
-                        
-                        except Exception as e:
-                            continue
-                
-                except Exception as e:
-                    logger.debug(f"处理{ts_code}失败: {e}")
-                    continue
+            def dimension_fields(eval_result: dict) -> dict:
+                # v4.0特有的维度得分
+                dimension_scores = eval_result.get('dimension_scores', {})
+                return {
+                    'lurking_value': dimension_scores.get('潜伏价值', 0),
+                    'bottom_feature': dimension_scores.get('底部特征', 0),
+                    'volume_price': dimension_scores.get('量价配合', 0),
+                }
+            
+            # 使用自定义阈值作为信号阈值（v4.0潜伏期特征），每只股票只取第一个信号
+            all_signals = runtime_evaluator_backtest_signals(
+                df,
+                sample_codes=sample_stocks,
+                holding_days=holding_days,
+                evaluate=lambda window, _ts_code: self.evaluator_v4.evaluate_stock_v4(window),
+                min_score=min_score,
+                max_score=max_score,
+                extra_fields=dimension_fields,
+                skip_failed_days=True,
+                workers=BACKTEST_WORKERS,
+                logger=logger,
+            )
+            analyzed_count = len(sample_stocks)
             
             if not all_signals:
                 logger.warning(f"未找到有效信号（分析了{analyzed_count}只股票）")
@@ -7105,8 +7114,6 @@ class CompleteVolumePriceAnalyzer:
                 }
             
             all_signals = []
-            analyzed_count = 0
-            valid_signal_count = 0
             
             unique_stocks = df['ts_code'].unique()
             if len(unique_stocks) > sample_size:
@@ -7119,72 +7126,17 @@ class CompleteVolumePriceAnalyzer:
             # 将信号强度从0-1转换为0-100分制
             min_score = signal_strength * 100
             
-            for ts_code in sample_stocks:
-                analyzed_count += 1
-                if analyzed_count % 50 == 0:
-                    logger.info(f"回测进度: {analyzed_count}/{len(sample_stocks)}, 已找到 {valid_signal_count} 个有效信号")
-                
-                try:
-                    stock_data = df[df['ts_code'] == ts_code].copy()
-                    
-                    if len(stock_data) < 30:
-                        continue
-                    # 过滤新股高波动期（A股常见特性）
-                    if len(stock_data) < 120:
-                        continue
-                    
-                    # 需要额外的数据来计算未来收益
-                    if len(stock_data) < 30 + holding_days:
-                        continue
-                    
-                    # 使用新的信号识别方法
-                    signals = self._identify_volume_price_signals(stock_data, min_score)
-                    
-                    if not signals.empty:
-                        # 计算未来收益
-                        signals_with_return = []
-                        for idx, signal in signals.iterrows():
-                            signal_date = signal['trade_date']
-                            
-                            # 找到信号日期在stock_data中的位置
-                            signal_mask = stock_data['trade_date'] == signal_date
-                            if not signal_mask.any():
-                                continue
-                            
-                            signal_pos = stock_data[signal_mask].index[0]
-                            signal_loc = stock_data.index.get_loc(signal_pos)
-                            
-                            # 计算未来收益（持仓holding_days天后的收益）
-                            if signal_loc + holding_days < len(stock_data):
-                                buy_price = signal['close']
-                                sell_price = stock_data.iloc[signal_loc + holding_days]['close']
-                                future_return = (sell_price - buy_price) / buy_price * 100
-                                
-                                signal_dict = signal.to_dict()
-                                signal_dict['future_return'] = future_return
-                                signals_with_return.append(signal_dict)
-                                valid_signal_count += 1
-                        
-                        if signals_with_return:
-                            signals_df = pd.DataFrame(signals_with_return)
-                            signals_df['ts_code'] = ts_code
-                            
-                            # 安全地添加name和industry
-                            if 'name' in stock_data.columns:
-                                signals_df['name'] = stock_data['name'].iloc[0]
-                            else:
-                                signals_df['name'] = ts_code
-                            
-                            if 'industry' in stock_data.columns:
-                                signals_df['industry'] = stock_data['industry'].iloc[0]
-                            else:
-                                signals_df['industry'] = '未知'
-                            
-                            all_signals.append(signals_df)
-                
-                except Exception as e:
-                    logger.debug(f"处理{ts_code}时出错: {e}")
-                    continue
+            # 面板模式：一次分组、整段数组评分，持仓收益由平移收盘价得到
+            # （结果与逐日 _identify_volume_price_signals 循环一致）
+            panel_signals = runtime_volume_price_backtest_signals(
+                df,
+                sample_codes=sample_stocks,
+                min_score=min_score,
+                holding_days=holding_days,
+            )
+            analyzed_count = len(sample_stocks)
+            if not panel_signals.empty:
+                all_signals.append(panel_signals)
             
             if not all_signals:
                 logger.warning(f"回测未发现有效信号（分析了{analyzed_count}只股票，信号强度阈值={min_score}分）")
@@ -8852,399 +8804,8 @@ class CompleteVolumePriceAnalyzer:
             total_stocks = len(df['ts_code'].unique())
             logger.info(f"总股票数: {total_stocks}")
             
-            def _limit_up_threshold(ts_code: str) -> float:
-                code = ts_code.split('.')[0]
-                if code.startswith(("300", "301", "688")):
-                    return 0.195
-                return 0.095
-
-            def _run_selection(params: Dict) -> Dict:
-                results_local = []
-                processed_local = 0
-                candidates = []
-                sector_counts = {}
-                industry_stats = {}
-                industry_members = {}
-                stats = {
-                    'stage': params.get('stage_name', 'unknown'),
-                    'total_stocks': total_stocks,
-                    'skip_history': 0,
-                    'skip_st': 0,
-                    'skip_len_data': 0,
-                    'skip_limitup': 0,
-                    'skip_amount': 0,
-                    'skip_mcap': 0,
-                    'skip_turnover': 0,
-                    'skip_ret20_gate': 0,
-                    'skip_industry_weak': 0,
-                    'skip_vol_percentile': 0,
-                    'candidates': 0,
-                    'skip_drawdown': 0,
-                    'skip_volatility': 0,
-                    'skip_pullback': 0,
-                    'skip_bias': 0,
-                    'skip_score': 0,
-                    'results': 0
-                }
-                logger.info(f"V5.0筛选阶段: {params.get('stage_name', 'unknown')}")
-
-                # --- Step 2: 预筛选并统计板块强度 ---
-                for ts_code, stock_data in df.groupby('ts_code'):
-                    try:
-                        processed_local += 1
-                        if processed_local % 500 == 0:
-                            logger.info(f"处理进度: {processed_local}/{total_stocks}, 已选出: {len(results_local)}")
-                        
-                        if len(stock_data) < params['min_history_days']:
-                            stats['skip_history'] += 1
-                            continue
-                        
-                        name = stock_data['name'].iloc[-1] if 'name' in stock_data.columns else ts_code
-                        if isinstance(name, str) and any(tag in name for tag in ['ST', '退', '*']):
-                            stats['skip_st'] += 1
-                            continue
-                        
-                        industry = stock_data['industry'].iloc[-1] if 'industry' in stock_data.columns else '未知'
-                        
-                        close = pd.to_numeric(stock_data['close_price'], errors='coerce').dropna()
-                        vol = pd.to_numeric(stock_data['vol'], errors='coerce').dropna()
-                        amount = pd.to_numeric(stock_data['amount'], errors='coerce').dropna()
-                        pct = pd.to_numeric(stock_data['pct_chg'], errors='coerce').fillna(0) / 100
-                        
-                        if len(close) < 20 or len(vol) < 20 or len(amount) < 20:
-                            stats['skip_len_data'] += 1
-                            continue
-                        
-                        last_close = float(close.iloc[-1])
-                        today_pct = float(pct.iloc[-1])
-                        ret_20 = last_close / float(close.iloc[-21]) - 1 if len(close) >= 21 else 0
-                        avg_amount_20 = float(amount.iloc[-20:].mean())
-                        avg_amount_20_yi = avg_amount_20 / 1e5  # Tushare amount为千元，这里转换为亿元
-
-                        # 行业强度基础统计（非ST且有足够数据）
-                        if industry:
-                            stats_entry = industry_stats.setdefault(
-                                industry, {'rets': [], 'pos': 0, 'count': 0}
-                            )
-                            stats_entry['rets'].append(ret_20)
-                            stats_entry['count'] += 1
-                            if ret_20 > 0:
-                                stats_entry['pos'] += 1
-                            industry_members.setdefault(industry, []).append((ts_code, ret_20))
-                        
-                        # 回避涨停追高与连板博弈（A股特性）
-                        limit_up_pct = _limit_up_threshold(ts_code)
-                        limit_up_days = int((pct.iloc[-10:] >= limit_up_pct).sum())
-                        if today_pct >= limit_up_pct or limit_up_days >= params['limit_up_days_limit']:
-                            stats['skip_limitup'] += 1
-                            continue
-                        
-                        # 基础活跃度过滤
-                        if avg_amount_20_yi < min_amount * params['min_amount_factor']:
-                            stats['skip_amount'] += 1
-                            continue
-                        
-                        # 流通市值过滤（亿）
-                        avg_turnover = None
-                        if 'circ_mv' in stock_data.columns:
-                            circ_mv_value = pd.to_numeric(stock_data['circ_mv'].iloc[-1], errors='coerce')
-                            if pd.notna(circ_mv_value) and circ_mv_value > 0:
-                                circ_mv_yi = circ_mv_value / 10000
-                                if circ_mv_yi < min_market_cap or circ_mv_yi > max_market_cap:
-                                    stats['skip_mcap'] += 1
-                                    continue
-                                # amount为千元，circ_mv为万元 -> 统一为元
-                                avg_turnover = (avg_amount_20 * 1000) / (circ_mv_value * 10000)
-                                if avg_turnover < params['turnover_min'] or avg_turnover > params['turnover_max']:
-                                    stats['skip_turnover'] += 1
-                                    continue
-                        
-                        # 用于板块统计的宽松阈值（确保板块强度可计算）
-                        ret20_gate = max(target_return * params['ret20_factor'], params['ret20_floor'])
-                        if ret_20 >= ret20_gate:
-                            sector_counts[industry] = sector_counts.get(industry, 0) + 1
-                            candidates.append({
-                                'ts_code': ts_code,
-                                'stock_data': stock_data,
-                                'name': name,
-                                'industry': industry,
-                                'ret_20': ret_20,
-                                'avg_amount_20': avg_amount_20,
-                                'avg_amount_20_yi': avg_amount_20_yi,
-                                'avg_turnover': avg_turnover,
-                                'circ_mv_yi': circ_mv_yi
-                            })
-                        else:
-                            stats['skip_ret20_gate'] += 1
-                    except Exception:
-                        continue
-                
-                industry_metrics = {}
-                for ind, s in industry_stats.items():
-                    if s['rets']:
-                        industry_metrics[ind] = {
-                            'median_ret20': float(np.median(s['rets'])),
-                            'pos_ratio': s['pos'] / max(s['count'], 1),
-                            'count': s['count']
-                        }
-                industry_ranks = {}
-                for ind, members in industry_members.items():
-                    members_sorted = sorted(members, key=lambda x: x[1], reverse=True)
-                    for rank_idx, (ts_code, _) in enumerate(members_sorted, start=1):
-                        industry_ranks[ts_code] = rank_idx
-
-                # --- Step 3: 稳健评分与过滤 ---
-                stats['candidates'] = len(candidates)
-                for item in candidates:
-                    try:
-                        ts_code = item['ts_code']
-                        stock_data = item['stock_data']
-                        name = item['name']
-                        industry = item['industry']
-                        ret_20 = item['ret_20']
-                        avg_amount_20 = item['avg_amount_20']
-                        avg_amount_20_yi = item.get('avg_amount_20_yi', avg_amount_20 / 1e5)
-                        avg_turnover = item.get('avg_turnover')
-                        circ_mv_yi = item.get('circ_mv_yi')
-                        
-                        close = pd.to_numeric(stock_data['close_price'], errors='coerce').dropna()
-                        vol = pd.to_numeric(stock_data['vol'], errors='coerce').dropna()
-                        amount = pd.to_numeric(stock_data['amount'], errors='coerce').dropna()
-                        pct = pd.to_numeric(stock_data['pct_chg'], errors='coerce').fillna(0) / 100
-                        
-                        if len(close) < 20 or len(vol) < 20 or len(amount) < 20:
-                            continue
-                        
-                        last_close = float(close.iloc[-1])
-                        ret_5 = last_close / float(close.iloc[-6]) - 1 if len(close) >= 6 else 0
-                        today_pct = float(pct.iloc[-1])
-                        
-                        # 行业弱势过滤（弱市环境下更严格）
-                        industry_info = industry_metrics.get(industry, {})
-                        industry_median = industry_info.get('median_ret20', 0)
-                        industry_pos_ratio = industry_info.get('pos_ratio', 0)
-                        if market_status == " 弱势" and industry_median < -0.02:
-                            stats['skip_industry_weak'] += 1
-                            continue
-
-                        # 波动分位自适应（对极端波动进行过滤与扣分）
-                        vol_percentile = None
-                        if len(pct) >= 80:
-                            window = 20
-                            vol_samples = []
-                            for i in range(len(pct) - 120, len(pct) - window + 1):
-                                if i < 0:
-                                    continue
-                                window_std = float(pct.iloc[i:i + window].std())
-                                if window_std > 0:
-                                    vol_samples.append(window_std)
-                            if vol_samples:
-                                cur_vol = float(pct.iloc[-20:].std())
-                                vol_percentile = sum(v <= cur_vol for v in vol_samples) / len(vol_samples)
-                                if vol_percentile >= params['vol_percentile_max']:
-                                    stats['skip_vol_percentile'] += 1
-                                    continue
-
-                        # 回撤控制（20日内最大回撤）
-                        recent_close = close.iloc[-20:]
-                        drawdown = (recent_close / recent_close.cummax() - 1).min()
-                        max_drawdown = abs(drawdown)
-                        if max_drawdown > params['max_drawdown']:
-                            stats['skip_drawdown'] += 1
-                            continue
-                        
-                        # 波动率控制
-                        volatility = float(pct.iloc[-20:].std())
-                        vol_limit = max_volatility * params['volatility_factor']
-                        if volatility > vol_limit:
-                            stats['skip_volatility'] += 1
-                            continue
-                        
-                        # 回踩确认（靠近均线并出现企稳）
-                        ma10 = float(close.iloc[-10:].mean())
-                        ma20 = float(close.iloc[-20:].mean())
-                        bias = (last_close - ma20) / ma20 if ma20 > 0 else 0
-                        prev_close = float(close.iloc[-2])
-                        pullback_confirm = (prev_close < ma10 and last_close >= ma10) or (-0.03 <= bias <= 0.05)
-                        if params['require_pullback'] and not pullback_confirm:
-                            stats['skip_pullback'] += 1
-                            continue
-                        
-                        # 放量/活跃度
-                        recent_vol = float(vol.iloc[-3:].mean())
-                        hist_vol = float(vol.iloc[-10:].mean()) if len(vol) >= 10 else float(vol.mean())
-                        vol_ratio = recent_vol / hist_vol if hist_vol > 0 else 1.0
-                        
-                        # 评分体系（稳健优先）
-                        score = 0
-                        reasons = []
-                        
-                        # 市值分层（中盘 / 大盘）
-                        tier = None
-                        if circ_mv_yi is not None:
-                            if params['mid_cap_min'] <= circ_mv_yi <= params['mid_cap_max']:
-                                tier = 'mid'
-                            elif params['large_cap_min'] <= circ_mv_yi <= params['large_cap_max']:
-                                tier = 'large'
-
-                        # 适度动量
-                        if ret_20 >= target_return:
-                            score += 25
-                            reasons.append(f"20日达标{ret_20*100:.1f}%")
-                        elif ret_20 >= target_return * 0.6:
-                            score += 18
-                            reasons.append(f"20日稳健{ret_20*100:.1f}%")
-                        elif ret_20 >= 0.05:
-                            score += 12
-                            reasons.append(f"20日向上{ret_20*100:.1f}%")
-                        elif ret_20 >= 0:
-                            score += 6
-
-                        # 中盘适度加分，大盘强调稳定
-                        if tier == 'mid':
-                            score += 6
-                            reasons.append("中盘优势")
-                        elif tier == 'large':
-                            score += 4
-                            reasons.append("大盘稳健")
-                        
-                        # 回踩确认
-                        if pullback_confirm:
-                            score += 20
-                            reasons.append("回踩确认")
-                        
-                        # 回撤控制
-                        if max_drawdown <= params['drawdown_good']:
-                            score += 15
-                            reasons.append(f"回撤{max_drawdown*100:.1f}%")
-                        else:
-                            score += 8
-                        
-                        # 波动率
-                        if volatility <= vol_limit * 0.7:
-                            score += 10
-                            reasons.append("波动低")
-                        else:
-                            score += 6
-                        
-                        # 行业强度（行业中位数 + 上涨占比）- 加权增强
-                        if industry_median >= 0.08:
-                            score += 14
-                            reasons.append("行业强势")
-                        elif industry_median >= 0.03:
-                            score += 8
-                            reasons.append("行业偏强")
-                        elif industry_median <= -0.02:
-                            score -= 5
-
-                        if industry_pos_ratio >= 0.6:
-                            score += 7
-                        elif industry_pos_ratio <= 0.4:
-                            score -= 3
-
-                        # 龙头/次龙结构识别
-                        rank_in_industry = industry_ranks.get(ts_code)
-                        if rank_in_industry == 1:
-                            score += 10
-                            reasons.append("行业龙头")
-                        elif rank_in_industry == 2:
-                            score += 6
-                            reasons.append("行业次龙")
-
-                        # 波动分位得分（越低越稳）
-                        if vol_percentile is not None:
-                            if vol_percentile <= 0.35:
-                                score += 8
-                                reasons.append("波动低位")
-                            elif vol_percentile <= 0.55:
-                                score += 4
-                            elif vol_percentile >= 0.8:
-                                score -= 4
-
-                        # 板块强度
-                        sector_heat = min(sector_counts.get(industry, 0) * params['sector_weight'], params['sector_cap'])
-                        score += sector_heat
-                        if sector_heat >= params['sector_strong']:
-                            reasons.append("板块共振")
-                        
-                        # 成交活跃度
-                        if avg_amount_20_yi >= min_amount * 1.5:
-                            score += 8
-                            reasons.append("成交活跃")
-                        else:
-                            score += 4
-                        
-                        # 换手率（A股稳健性）
-                        if avg_turnover is not None:
-                            if 0.01 <= avg_turnover <= 0.08:
-                                score += 8
-                                reasons.append("换手健康")
-                            elif 0.005 <= avg_turnover <= 0.12:
-                                score += 4
-                        
-                        # 当日涨幅（避免追高）
-                        if -0.01 <= today_pct <= 0.04:
-                            score += 6
-                            reasons.append("温和走强")
-                        elif 0.04 < today_pct < _limit_up_threshold(ts_code):
-                            score += 3
-                        
-                        # 轻度趋势健康
-                        if params['bias_min'] <= bias <= params['bias_max']:
-                            score += 6
-                        elif abs(bias) <= params['bias_soft_max']:
-                            score += 3
-                        else:
-                            stats['skip_bias'] += 1
-                            continue
-                        
-                        # 应用大盘系数
-                        score = score * market_multiplier
-                        
-                        # 评分阈值（稳健版本更严格）
-                        if score < params['score_threshold']:
-                            stats['skip_score'] += 1
-                            continue
-                        
-                        predicted_return = max(ret_20 * 0.9, 0.05)
-                        
-                        if score >= 70:
-                            grade = " 强烈推荐"
-                        elif score >= 50:
-                            grade = " 推荐"
-                        elif score >= 35:
-                            grade = " 关注"
-                        else:
-                            grade = "观察"
-                        
-                        reasons.insert(0, grade)
-                        if market_status != "正常":
-                            reasons.append(market_status)
-                        
-                        results_local.append({
-                            '股票代码': ts_code,
-                            '股票名称': name,
-                            '行业': industry,
-                            '最新价格': f"{last_close:.2f}",
-                            '20日涨幅%': f"{ret_20*100:.2f}",
-                            '5日涨幅%': f"{ret_5*100:.2f}",
-                            '预测潜力%': f"{predicted_return*100:.1f}",
-                            '放量倍数': f"{vol_ratio:.2f}",
-                            '近20日成交额(亿)': f"{avg_amount_20_yi:.2f}",
-                            '换手率%': f"{avg_turnover*100:.2f}" if avg_turnover is not None else "-",
-                            '回撤%': f"{max_drawdown*100:.1f}",
-                            '波动率%': f"{volatility*100:.2f}",
-                            '行业强度%': f"{industry_median*100:.1f}",
-                            '市值层级': "中盘" if tier == 'mid' else ("大盘" if tier == 'large' else "-"),
-                            '评分': round(score, 1),
-                            '筛选理由': " · ".join(reasons),
-                            '流通市值(亿)': f"{stock_data['circ_mv'].iloc[-1]/10000:.1f}" if 'circ_mv' in stock_data.columns else "-"
-                        })
-                    except Exception:
-                        continue
-                
-                stats['results'] = len(results_local)
-                return {'results': results_local, 'stats': stats}
+            # 每只股票的特征只计算一次，各放宽阶段共用
+            features = runtime_build_monthly_features(df)
 
             strict_params = {
                 'stage_name': 'strict',
@@ -9273,72 +8834,75 @@ class CompleteVolumePriceAnalyzer:
                 'large_cap_max': 5000
             }
 
-            debug_runs = []
-            run_data = _run_selection(strict_params)
-            results = run_data['results']
-            debug_runs.append(run_data['stats'])
-            if not results:
-                logger.info("V5.0严格条件未命中，启用稳健放宽条件")
-                relaxed_params = {
-                    'stage_name': 'relaxed',
-                    'min_history_days': 40,
-                    'min_amount_factor': 0.6,
-                    'turnover_min': 0.002,
-                    'turnover_max': 0.25,
-                    'limit_up_days_limit': 3,
-                    'ret20_factor': 0.5,
-                    'ret20_floor': 0.02,
-                    'max_drawdown': 0.22,
-                    'drawdown_good': 0.15,
-                    'volatility_factor': 1.2,
-                    'vol_percentile_max': 0.90,
-                    'score_threshold': 30,
-                    'sector_weight': 3,
-                    'sector_cap': 15,
-                    'sector_strong': 8,
-                    'bias_min': -0.06,
-                    'bias_max': 0.15,
-                    'bias_soft_max': 0.22,
-                    'require_pullback': False,
-                    'mid_cap_min': 100,
-                    'mid_cap_max': 800,
-                    'large_cap_min': 800,
-                    'large_cap_max': 5000
-                }
-                run_data = _run_selection(relaxed_params)
-                results = run_data['results']
-                debug_runs.append(run_data['stats'])
-            if not results:
-                logger.info("V5.0稳健放宽仍未命中，启用救援筛选")
-                rescue_params = {
-                    'stage_name': 'rescue',
-                    'min_history_days': 30,
-                    'min_amount_factor': 0.4,
-                    'turnover_min': 0.001,
-                    'turnover_max': 0.35,
-                    'limit_up_days_limit': 4,
-                    'ret20_factor': 0.4,
-                    'ret20_floor': 0.01,
-                    'max_drawdown': 0.26,
-                    'drawdown_good': 0.18,
-                    'volatility_factor': 1.4,
-                    'vol_percentile_max': 0.95,
-                    'score_threshold': 22,
-                    'sector_weight': 2,
-                    'sector_cap': 12,
-                    'sector_strong': 6,
-                    'bias_min': -0.08,
-                    'bias_max': 0.20,
-                    'bias_soft_max': 0.28,
-                    'require_pullback': False,
-                    'mid_cap_min': 100,
-                    'mid_cap_max': 800,
-                    'large_cap_min': 800,
-                    'large_cap_max': 5000
-                }
-                run_data = _run_selection(rescue_params)
-                results = run_data['results']
-                debug_runs.append(run_data['stats'])
+            relaxed_params = {
+                'stage_name': 'relaxed',
+                'min_history_days': 40,
+                'min_amount_factor': 0.6,
+                'turnover_min': 0.002,
+                'turnover_max': 0.25,
+                'limit_up_days_limit': 3,
+                'ret20_factor': 0.5,
+                'ret20_floor': 0.02,
+                'max_drawdown': 0.22,
+                'drawdown_good': 0.15,
+                'volatility_factor': 1.2,
+                'vol_percentile_max': 0.90,
+                'score_threshold': 30,
+                'sector_weight': 3,
+                'sector_cap': 15,
+                'sector_strong': 8,
+                'bias_min': -0.06,
+                'bias_max': 0.15,
+                'bias_soft_max': 0.22,
+                'require_pullback': False,
+                'mid_cap_min': 100,
+                'mid_cap_max': 800,
+                'large_cap_min': 800,
+                'large_cap_max': 5000
+            }
+            rescue_params = {
+                'stage_name': 'rescue',
+                'min_history_days': 30,
+                'min_amount_factor': 0.4,
+                'turnover_min': 0.001,
+                'turnover_max': 0.35,
+                'limit_up_days_limit': 4,
+                'ret20_factor': 0.4,
+                'ret20_floor': 0.01,
+                'max_drawdown': 0.26,
+                'drawdown_good': 0.18,
+                'volatility_factor': 1.4,
+                'vol_percentile_max': 0.95,
+                'score_threshold': 22,
+                'sector_weight': 2,
+                'sector_cap': 12,
+                'sector_strong': 6,
+                'bias_min': -0.08,
+                'bias_max': 0.20,
+                'bias_soft_max': 0.28,
+                'require_pullback': False,
+                'mid_cap_min': 100,
+                'mid_cap_max': 800,
+                'large_cap_min': 800,
+                'large_cap_max': 5000
+            }
+            # 严格 → 稳健放宽 → 救援：各阶段并行评估，取第一个命中的阶段
+            stage_run = runtime_run_monthly_stages(
+                features,
+                [strict_params, relaxed_params, rescue_params],
+                workers=MONTHLY_SELECTION_WORKERS,
+                target_return=target_return,
+                min_amount=min_amount,
+                max_volatility=max_volatility,
+                min_market_cap=min_market_cap,
+                max_market_cap=max_market_cap,
+                market_status=market_status,
+                market_multiplier=market_multiplier,
+            )
+            results = stage_run['results']
+            debug_runs = stage_run['debug_runs']
+            if len(debug_runs) > 1:
+                logger.info(f"V5.0严格条件未命中，采用{debug_runs[-1]['stage']}阶段结果")
 
             self.last_v5_debug = debug_runs
 
@@ -9523,8 +9087,43 @@ class CompleteVolumePriceAnalyzer:
 class StrategyOptimizer:
     """策略优化器 - 增强版"""
     
+    HOLDING_DAYS_OPTIONS = [3, 5, 7, 10]
+
     def __init__(self, analyzer: CompleteVolumePriceAnalyzer):
         self.analyzer = analyzer
+
+    def prepare_volume_price_sweep(
+        self, df: pd.DataFrame, sample_size: int, holding_days_grid: List[int]
+    ) -> VolumePriceSweepPanel:
+        """
+        一次性计算抽样股票的量价信号强度与各持仓期远期收益，
+        所有阈值/持仓天数组合都从这份缓存中评估，不再逐个重跑回测。
+        """
+        price_col = 'close_price' if 'close_price' in df.columns else 'close'
+        missing_cols = [col for col in ['ts_code', 'trade_date', price_col, 'vol', 'pct_chg'] if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f'数据缺少必要的列: {missing_cols}')
+        unique_stocks = df['ts_code'].unique()
+        if len(unique_stocks) > sample_size:
+            sample_stocks = np.random.choice(unique_stocks, sample_size, replace=False)
+        else:
+            sample_stocks = unique_stocks
+        logger.info(f"预计算 {len(sample_stocks)} 只股票的量价信号（持仓期 {list(holding_days_grid)}）")
+        return runtime_build_volume_price_sweep(
+            df,
+            sample_codes=[str(code) for code in sample_stocks],
+            holding_days_grid=holding_days_grid,
+        )
+
+    def _volume_price_strength(self, strategy_name: str) -> Optional[float]:
+        """策略回测落在通用量价信号上时返回其信号强度阈值（评分器已加载时返回None）"""
+        if "强势猎手" in strategy_name:
+            return 0.60 if getattr(self.analyzer, 'evaluator_v4', None) is None else None
+        if "底部突破" in strategy_name:
+            return 0.65 if getattr(self.analyzer, 'evaluator_v5', None) is None else None
+        if "高级猎手" in strategy_name:
+            return 0.80
+        return None
     
     def optimize_parameters(self, df: pd.DataFrame, sample_size: int = 500) -> Dict:
         """旧版参数优化（兼容性保留）"""
@@ -9534,6 +9133,8 @@ class StrategyOptimizer:
             param_grid = {
                 'signal_strength': [0.4, 0.5, 0.6, 0.7]
             }
+            holding_days = 5
+            prepared = self.prepare_volume_price_sweep(df, sample_size, [holding_days])
             
             best_params = None
             best_score = -float('inf')
@@ -9543,22 +9144,15 @@ class StrategyOptimizer:
                 logger.info(f"参数优化进度: {i+1}/{len(param_grid['signal_strength'])}")
                 
                 try:
-                    result = self.analyzer.backtest_strategy_complete(
-                        df, 
-                        sample_size=sample_size, 
-                        signal_strength=strength
-                    )
+                    returns = prepared.returns_for(strength * 100, holding_days)
                     
-                    if result['success']:
-                        stats = result['stats']
-                        
-                        score = (
-                            stats['avg_return'] * 0.4 +
-                            stats['win_rate'] * 0.3 +
-                            stats['sharpe_ratio'] * 10 * 0.2 +
-                            min(stats['total_signals'] / 100, 1) * 10 * 0.1
+                    if len(returns) > 0:
+                        stats = runtime_sweep_return_stats(
+                            returns, analyzed_stocks=prepared.analyzed_stocks, holding_days=holding_days
                         )
                         
+                        score = runtime_optimizer_score(stats)
+                        
                         result_info = {
                             'params': {'signal_strength': strength},
                             'score': score,
@@ -9587,24 +9181,46 @@ class StrategyOptimizer:
             logger.error(f"参数优化失败: {e}")
             return {'success': False, 'error': str(e)}
     
-    def optimize_single_strategy(self, df: pd.DataFrame, strategy_name: str, sample_size: int = 300) -> Dict:
+    def optimize_single_strategy(
+        self,
+        df: pd.DataFrame,
+        strategy_name: str,
+        sample_size: int = 300,
+        prepared: Optional[VolumePriceSweepPanel] = None,
+    ) -> Dict:
         """
         优化单个策略的持仓天数
+        
+        回落到通用量价信号的策略只计算一次信号（可由调用方传入prepared共享），
+        各持仓天数直接从缓存的远期收益中评估。
         """
         logger.info(f"开始优化{strategy_name}的持仓天数...")
         
         try:
-            holding_days_options = [3, 5, 7, 10]
+            holding_days_options = list(self.HOLDING_DAYS_OPTIONS)
             best_params = None
             best_score = -float('inf')
             all_results = []
+            strength = self._volume_price_strength(strategy_name)
+            if strength is not None and prepared is None:
+                prepared = self.prepare_volume_price_sweep(df, sample_size, holding_days_options)
             
             for i, holding_days in enumerate(holding_days_options):
                 logger.info(f"测试持仓天数: {holding_days}天 ({i+1}/{len(holding_days_options)})")
                 
                 try:
                     # 根据策略选择对应的回测方法
-                    if "强势猎手" in strategy_name:
+                    if strength is not None:
+                        returns = prepared.returns_for(strength * 100, holding_days)
+                        result = {
+                            'success': len(returns) > 0,
+                            'strategy': strategy_name,
+                            'error': '回测期间未发现有效信号',
+                            'stats': runtime_sweep_return_stats(
+                                returns, analyzed_stocks=prepared.analyzed_stocks, holding_days=holding_days
+                            ),
+                        }
+                    elif "强势猎手" in strategy_name:
                         result = self.analyzer.backtest_explosive_hunter(df, sample_size, holding_days)
                     elif "底部突破" in strategy_name:
                         result = self.analyzer.backtest_bottom_breakthrough(df, sample_size, holding_days)
@@ -9627,12 +9243,7 @@ class StrategyOptimizer:
                         continue
                         
                     # 综合评分
-                    score = (
-                        stats.get('avg_return', 0) * 0.4 +
-                        stats.get('win_rate', 0) * 0.3 +
-                        stats.get('sharpe_ratio', 0) * 10 * 0.2 +
-                        min(stats.get('total_signals', 0) / 100, 1) * 10 * 0.1
-                    )
+                    score = runtime_optimizer_score(stats)
                     
                     result_info = {
                         'holding_days': holding_days,
@@ -9693,9 +9304,22 @@ class StrategyOptimizer:
             strategies = ["强势猎手", "底部突破猎手", "高级猎手"]
             best_strategies = []
             
+            # 量价信号策略共享一份预计算数据；依赖评分器的策略放到并行进程中回测
+            prepared = None
+            if any(self._volume_price_strength(strategy) is not None for strategy in strategies):
+                prepared = self.prepare_volume_price_sweep(df, sample_size, list(self.HOLDING_DAYS_OPTIONS))
+            evaluator_tasks = {
+                strategy: (lambda strategy=strategy: self.optimize_single_strategy(df, strategy, sample_size))
+                for strategy in strategies
+                if self._volume_price_strength(strategy) is None
+            }
+            results = runtime_run_sweeps_parallel(evaluator_tasks, workers=STRATEGY_OPTIMIZER_WORKERS, logger=logger)
+            
             for strategy in strategies:
                 logger.info(f"正在优化: {strategy}")
-                result = self.optimize_single_strategy(df, strategy, sample_size)
+                result = results.get(strategy)
+                if result is None:
+                    result = self.optimize_single_strategy(df, strategy, sample_size, prepared=prepared)
                 
                 if result['success']:
                     best = result['best_params']
@@ -9737,6 +9361,10 @@ class StrategyOptimizer:
 
 
 # ===================== 板块扫描器（v38功能）=====================
+# 行业×交易日面板按最新交易日缓存，板块资金流页面重复打开无需重新聚合
+_SECTOR_PANEL_CACHE = SectorPanelCache()
+
+
 class MarketScanner:
     """板块扫描器"""
     
@@ -9744,71 +9372,24 @@ class MarketScanner:
         self.db_path = db_path
     
     def scan_all_sectors(self, days: int = 60) -> Dict:
-        """扫描所有板块"""
+        """扫描所有板块（行业×交易日面板一次聚合，按最新交易日缓存）"""
         try:
             logger.info("开始全市场扫描...")
-            all_data = self._get_all_sectors_data(days)
+            panel = self._get_sector_panel(days)
             
-            if all_data.empty:
-                return {'emerging': [], 'launching': [], 'exploding': [], 'declining': [], 'transitioning': []}
+            if panel.empty:
+                return runtime_empty_sector_results()
             
-            sectors = all_data['industry'].unique()
-            results = {'emerging': [], 'launching': [], 'exploding': [], 'declining': [], 'transitioning': []}
-            
-            for sector in sectors:
-                try:
-                    sector_data = all_data[all_data['industry'] == sector]
-                    if len(sector_data) < 30:
-                        continue
-                    
-                    recent_5 = sector_data.tail(5)
-                    historical = sector_data.head(len(sector_data) - 10)
-                    
-                    price_change = recent_5['pct_chg'].mean()
-                    historical_vol_mean = historical['vol'].mean()
-                    
-                    if historical_vol_mean > 0:
-                        vol_ratio = recent_5['vol'].mean() / historical_vol_mean
-                    else:
-                        vol_ratio = 1.0
-                    
-                    if vol_ratio < 0.8 and -1 < price_change < 2:
-                        stage = '萌芽期'
-                        category = 'emerging'
-                    elif vol_ratio > 2.0 and price_change > 5:
-                        stage = '加速期'
-                        category = 'exploding'
-                    elif 1.3 < vol_ratio <= 2.0 and 2 < price_change <= 5:
-                        stage = '启动期'
-                        category = 'launching'
-                    elif vol_ratio < 1.0 and price_change < -2:
-                        stage = '衰退期'
-                        category = 'declining'
-                    else:
-                        stage = '过渡期'
-                        category = 'transitioning'
-                    
-                    results[category].append({
-                        'sector_name': sector,
-                        'stage': stage,
-                        'score': 75 if stage == '萌芽期' else 50,
-                        'signals': [f"成交量{vol_ratio:.1f}倍", f"涨幅{price_change:.1f}%"]
-                    })
-                
-                except Exception as e:
-                    continue
-            
-            for key in results:
-                results[key] = sorted(results[key], key=lambda x: x['score'], reverse=True)
+            results = runtime_classify_sector_lifecycle(panel)
             
             logger.info(f"扫描完成: 萌芽期{len(results['emerging'])}个")
             return results
             
         except Exception as e:
             logger.error(f"扫描失败: {e}")
-            return {'emerging': [], 'launching': [], 'exploding': [], 'declining': [], 'transitioning': []}
+            return runtime_empty_sector_results()
     
-    def _get_all_sectors_data(self, days: int) -> pd.DataFrame:
+    def _get_sector_panel(self, days: int) -> pd.DataFrame:
         try:
             if not os.path.exists(self.db_path):
                 return pd.DataFrame()
@@ -9819,23 +9400,18 @@ class MarketScanner:
             start_date = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
 
             try:
-                daily_table = detect_daily_table(conn)
-            except DataAccessError:
+                try:
+                    daily_table = detect_daily_table(conn)
+                except DataAccessError:
+                    return pd.DataFrame()
+                latest = conn.execute(f"SELECT MAX(trade_date) FROM {daily_table}").fetchone()[0]
+                return _SECTOR_PANEL_CACHE.get(
+                    (self.db_path, start_date),
+                    str(latest or ""),
+                    lambda: runtime_load_sector_panel(conn, daily_table=daily_table, start_date=start_date),
+                )
+            finally:
                 conn.close()
-                return pd.DataFrame()
-
-            query = f"""
-                SELECT dtd.ts_code, sb.name, sb.industry, dtd.trade_date, 
-                       dtd.close_price, dtd.vol, dtd.pct_chg
-                FROM {daily_table} dtd
-                INNER JOIN stock_basic sb ON dtd.ts_code = sb.ts_code
-                WHERE dtd.trade_date >= ? AND sb.industry IS NOT NULL
-                ORDER BY sb.industry, dtd.trade_date
-            """
-            
-            df = pd.read_sql_query(query, conn, params=(start_date,))
-            conn.close()
-            return df
             
         except Exception as e:
             logger.error(f"获取数据失败: {e}")
@@ -9943,30 +9519,40 @@ class DatabaseManager:
             except:
                 status['total_industries'] = 0
             
-            try:
-                if daily_table:
-                    cursor.execute(f"SELECT COUNT(*) FROM {daily_table}")
-                    status['total_records'] = cursor.fetchone()[0]
-                else:
+            summary = self._read_daily_summary(daily_table) if daily_table else None
+            if summary:
+                status['total_records'] = summary['total_records']
+                status['min_date'] = summary['min_date'] or 'N/A'
+                status['max_date'] = summary['max_date'] or 'N/A'
+                status["records_last_trade_date"] = summary['records_last_trade_date']
+                status['table_counts'] = summary['table_counts']
+                status['metadata_updated_at'] = summary['metadata_updated_at']
+                status['metadata_stale'] = summary['stale']
+            else:
+                try:
+                    if daily_table:
+                        cursor.execute(f"SELECT COUNT(*) FROM {daily_table}")
+                        status['total_records'] = cursor.fetchone()[0]
+                    else:
+                        status['total_records'] = 0
+                except:
                     status['total_records'] = 0
-            except:
-                status['total_records'] = 0
-            
-            try:
-                if daily_table:
-                    cursor.execute(f"SELECT MIN(trade_date), MAX(trade_date) FROM {daily_table}")
-                    date_range = cursor.fetchone()
-                    status['min_date'] = date_range[0] if date_range and date_range[0] else 'N/A'
-                    status['max_date'] = date_range[1] if date_range and date_range[1] else 'N/A'
-                    profile = recent_trade_profile(conn, date_limit=10, recent_window=3)
-                    status["records_last_trade_date"] = int(profile.get("records_last_trade_date", 0) or 0)
-                else:
+                
+                try:
+                    if daily_table:
+                        cursor.execute(f"SELECT MIN(trade_date), MAX(trade_date) FROM {daily_table}")
+                        date_range = cursor.fetchone()
+                        status['min_date'] = date_range[0] if date_range and date_range[0] else 'N/A'
+                        status['max_date'] = date_range[1] if date_range and date_range[1] else 'N/A'
+                        profile = recent_trade_profile(conn, date_limit=10, recent_window=3)
+                        status["records_last_trade_date"] = int(profile.get("records_last_trade_date", 0) or 0)
+                    else:
+                        status['min_date'] = 'N/A'
+                        status['max_date'] = 'N/A'
+                except:
                     status['min_date'] = 'N/A'
                     status['max_date'] = 'N/A'
-            except:
-                status['min_date'] = 'N/A'
-                status['max_date'] = 'N/A'
-                status["records_last_trade_date"] = 0
+                    status["records_last_trade_date"] = 0
             
             if os.path.exists(self.db_path):
                 size_bytes = os.path.getsize(self.db_path)
@@ -9992,6 +9578,40 @@ class DatabaseManager:
             logger.error(f"获取数据库状态失败: {e}")
             return {'error': str(e)}
     
+    def _read_daily_summary(self, daily_table: str) -> Optional[Dict[str, Any]]:
+        """
+        从元数据表读取统计（日线总行数/日期范围/最新交易日行数/各表行数），只读不写。
+        摘要缺失或任一表的MAX(rowid)已变化（其他写入方写过库）时，在后台线程同步元数据；
+        本次返回旧摘要（stale=True）或None（由调用方回退到全表统计）。
+        """
+        summary = None
+        try:
+            conn = self._connect_readonly()
+            try:
+                summary = runtime_read_db_summary(conn, daily_table=daily_table)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"读取数据库元数据失败，回退全表统计: {e}")
+        if summary is None or summary.get('stale'):
+            runtime_start_db_metadata_sync(self.db_path, self._connect)
+        return summary
+
+    def verify_database_metadata(self, background: bool = True) -> Dict:
+        """全量校验并重建所有表的元数据（默认后台线程执行，不阻塞页面）"""
+        try:
+            if not background:
+                conn = self._connect()
+                try:
+                    return {'success': True, 'started': False, 'tables': runtime_rebuild_db_metadata(conn)}
+                finally:
+                    conn.close()
+            started = runtime_start_db_metadata_sync(self.db_path, self._connect, full=True)
+            return {'success': True, 'started': started}
+        except Exception as e:
+            logger.error(f"数据库元数据校验失败: {e}")
+            return {'success': False, 'error': str(e)}
+    
     def update_stock_data_from_tushare(self, stock_codes: List[str] = None, days: int = 30) -> Dict:
         """更新股票数据"""
         try:
@@ -10118,6 +9738,10 @@ class DatabaseManager:
                     continue
             
             conn.commit()
+            try:
+                runtime_sync_db_metadata(conn, tables=[daily_table])
+            except sqlite3.Error as e:
+                logger.warning(f"更新数据库元数据失败: {e}")
             conn.close()
             
             logger.info(f"数据更新完成：成功{updated_count}天，失败{failed_count}天")
@@ -10135,8 +9759,16 @@ class DatabaseManager:
             logger.error(f"数据更新失败: {e}")
             return {'success': False, 'error': str(e)}
     
-    def optimize_database(self) -> Dict:
-        """优化数据库"""
+    def optimize_database(self, mode: str = "online") -> Dict:
+        """
+        优化数据库
+        
+        mode="online"（默认）：增量回收空间 + 热点表ANALYZE + PRAGMA optimize，
+        按时间片执行并被动checkpoint，不阻塞看板和扫描的读取；
+        mode="full"：旧版流程（清理重复数据、重建索引、VACUUM），会锁库。
+        """
+        if mode != "full":
+            return self._optimize_database_online()
         try:
             conn = self._connect()
             cursor = conn.cursor()
@@ -10168,10 +9800,17 @@ class DatabaseManager:
             cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_trade_date ON {daily_table}(trade_date)")
             cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_ts_date ON {daily_table}(ts_code, trade_date)")
             
-            # 3. VACUUM优化
+            conn.commit()
+            
+            # 3. VACUUM优化（顺带切换为增量auto_vacuum，之后在线维护可按页回收）
+            runtime_enable_incremental_auto_vacuum(conn)
             cursor.execute("VACUUM")
             
-            conn.commit()
+            if deleted_duplicates:
+                try:
+                    runtime_rebuild_db_metadata(conn, tables=[daily_table])
+                except sqlite3.Error as e:
+                    logger.warning(f"重建数据库元数据失败: {e}")
             conn.close()
             
             logger.info("数据库优化完成")
@@ -10186,115 +9825,95 @@ class DatabaseManager:
             logger.error(f"数据库优化失败: {e}")
             return {'success': False, 'error': str(e)}
     
-    def update_market_cap(self) -> Dict:
-        """更新流通市值数据"""
+    def _optimize_database_online(self) -> Dict:
         try:
-            if not self.pro:
-                return {'success': False, 'error': 'Tushare未初始化'}
-            
-            logger.info("开始更新流通市值数据...")
-            
             conn = self._connect()
-            cursor = conn.cursor()
-            
-            # 1. 添加circ_mv和total_mv列（如果不存在）
-            cursor.execute("PRAGMA table_info(stock_basic)")
-            columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'circ_mv' not in columns:
-                logger.info("添加circ_mv列...")
-                cursor.execute("ALTER TABLE stock_basic ADD COLUMN circ_mv REAL DEFAULT 0")
-                conn.commit()
-            
-            if 'total_mv' not in columns:
-                logger.info("添加total_mv列...")
-                cursor.execute("ALTER TABLE stock_basic ADD COLUMN total_mv REAL DEFAULT 0")
-                conn.commit()
-            
-            # 2. 获取本地股票列表
-            cursor.execute("SELECT ts_code FROM stock_basic")
-            local_stocks = set([row[0] for row in cursor.fetchall()])
-            
-            logger.info(f"本地有 {len(local_stocks)} 只股票")
-            
-            # 3. 从Tushare获取市值数据
-            today = datetime.now().strftime('%Y%m%d')
-            
-            # 尝试获取最近几天的数据
-            market_data = None
-            for i in range(8):
-                check_date = (datetime.now() - timedelta(days=i)).strftime('%Y%m%d')
+            try:
                 try:
-                    market_data = self.pro.daily_basic(
-                        trade_date=check_date,
-                        fields='ts_code,trade_date,close,circ_mv,total_mv'
-                    )
-                    if market_data is not None and not market_data.empty:
-                        logger.info(f"使用 {check_date} 的市值数据")
-                        break
-                    time.sleep(0.1)
-                except:
-                    continue
-            
-            if market_data is None or market_data.empty:
-                return {'success': False, 'error': '无法从Tushare获取市值数据'}
-            
-            # 4. 更新数据库
-            updated_count = 0
-            for _, row in market_data.iterrows():
-                ts_code = row['ts_code']
-                if ts_code in local_stocks:
-                    circ_mv = row.get('circ_mv', 0) if pd.notna(row.get('circ_mv')) else 0
-                    total_mv = row.get('total_mv', 0) if pd.notna(row.get('total_mv')) else 0
-                    
-                    cursor.execute("""
-                        UPDATE stock_basic
-                        SET circ_mv = ?, total_mv = ?
-                        WHERE ts_code = ?
-                    """, (circ_mv, total_mv, ts_code))
-                    updated_count += 1
-                    
-                    if updated_count % 500 == 0:
-                        conn.commit()
+                    from data.dao import detect_daily_table  # type: ignore
+
+                    daily_table = _safe_daily_table_name(detect_daily_table(conn))
+                except Exception:
+                    daily_table = "daily_trading_data"
+                logger.info("开始在线维护数据库...")
+                report = runtime_run_online_maintenance(
+                    conn,
+                    hot_tables=[daily_table, "stock_basic"],
+                    db_path=self.db_path,
+                    budget_seconds=DB_MAINTENANCE_BUDGET_SECONDS,
+                )
+            finally:
+                conn.close()
             
-            conn.commit()
+            reclaimed_mb = report['reclaimed_bytes'] / (1024 * 1024)
+            message = (
+                f"在线维护完成：耗时{report['duration_seconds']:.1f}秒，回收{reclaimed_mb:.1f}MB，"
+                f"更新统计信息{len(report['analyzed_tables'])}张表"
+            )
+            if report['timed_out']:
+                message += "（已达时间片上限，剩余空间下次继续回收）"
+            if report['needs_full_vacuum']:
+                message += "（当前库未启用增量回收，需执行一次完整优化后生效）"
+            logger.info(message)
+            return {'success': True, 'mode': 'online', 'message': message, **report}
             
-            # 5. 统计市值分布
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 >= 100 AND circ_mv/10000 <= 500 THEN 1 ELSE 0 END) as count_100_500,
-                    SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 >= 50 AND circ_mv/10000 < 100 THEN 1 ELSE 0 END) as count_50_100,
-                    SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 < 50 THEN 1 ELSE 0 END) as count_below_50,
-                    SUM(CASE WHEN circ_mv > 0 AND circ_mv/10000 > 500 THEN 1 ELSE 0 END) as count_above_500
-                FROM stock_basic
-                WHERE circ_mv > 0
-            """)
+        except Exception as e:
+            logger.error(f"数据库在线维护失败: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def update_market_cap(self, provider: Optional[MarketCapProvider] = None) -> Dict:
+        """增量更新流通市值数据（只拉取比已存最新日期更新的daily_basic，只改市值过期的股票）"""
+        try:
+            if provider is None:
+                if not self.pro:
+                    return {'success': False, 'error': 'Tushare未初始化'}
+                provider = runtime_TushareMarketCapProvider(self.pro)
             
-            stats = cursor.fetchone()
+            logger.info("开始更新流通市值数据...")
             
-            conn.close()
+            conn = self._connect()
+            try:
+                try:
+                    from data.dao import detect_daily_table  # type: ignore
+
+                    daily_table = _safe_daily_table_name(detect_daily_table(conn))
+                    candidate_dates = [
+                        str(row[0])
+                        for row in conn.execute(
+                            f"SELECT DISTINCT trade_date FROM {daily_table} ORDER BY trade_date DESC LIMIT 8"
+                        ).fetchall()
+                    ]
+                except Exception:
+                    candidate_dates = []
+                if not candidate_dates:
+                    # 本地日线缺失时按自然日回溯（与旧版一致）
+                    candidate_dates = [(datetime.now() - timedelta(days=i)).strftime('%Y%m%d') for i in range(8)]
+                
+                result = runtime_update_market_cap_incremental(conn, provider, candidate_dates=candidate_dates)
+                if not result['latest_date']:
+                    return {'success': False, 'error': '无法从Tushare获取市值数据'}
+                stats = runtime_market_cap_distribution(conn)
+            finally:
+                conn.close()
             
-            logger.info(f"市值数据更新完成：更新 {updated_count} 只股票")
+            logger.info(
+                f"市值数据更新完成：拉取 {len(result['fetched_dates'])} 个交易日，更新 {result['updated_count']} 只股票"
+            )
             
             return {
                 'success': True,
-                'updated_count': updated_count,
-                'stats': {
-                    'total': stats[0],
-                    'count_100_500': stats[1],  # 黄金区间
-                    'count_50_100': stats[2],
-                    'count_below_50': stats[3],
-                    'count_above_500': stats[4]
-                }
+                'updated_count': result['updated_count'],
+                'latest_date': result['latest_date'],
+                'fetched_dates': result['fetched_dates'],
+                'stats': stats,
             }
             
         except Exception as e:
             logger.error(f"更新市值数据失败: {e}")
             return {'success': False, 'error': str(e)}
     
-    def check_database_health(self) -> Dict:
-        """检查数据库健康状态"""
+    def check_database_health(self, full_verify: bool = False) -> Dict:
+        """检查数据库健康状态（行数/最新日期取自元数据表；full_verify=True时后台全量校验）"""
         try:
             from data.dao import DataAccessError, detect_daily_table, recent_trade_profile, table_exists  # type: ignore
 
@@ -10319,11 +9938,21 @@ class DatabaseManager:
                 health['stock_count'] = cursor.fetchone()[0]
             
             if health['has_daily_data'] and daily_table:
-                cursor.execute(f"SELECT COUNT(*) FROM {daily_table}")
-                health['data_count'] = cursor.fetchone()[0]
-
-                profile = recent_trade_profile(conn, date_limit=10, recent_window=3)
-                latest_date = profile.get("last_trade_date", "")
+                summary = self._read_daily_summary(daily_table)
+                if summary:
+                    health['data_count'] = summary['total_records']
+                    latest_date = summary['max_date']
+                    health['metadata_verified_at'] = summary['metadata_verified_at']
+                    health['metadata_stale'] = summary['stale']
+                    health['table_counts'] = summary['table_counts']
+                else:
+                    cursor.execute(f"SELECT COUNT(*) FROM {daily_table}")
+                    health['data_count'] = cursor.fetchone()[0]
+                    
+                    profile = recent_trade_profile(conn, date_limit=10, recent_window=3)
+                    latest_date = profile.get("last_trade_date", "")
+                if full_verify:
+                    health['metadata_verification'] = self.verify_database_metadata(background=True)
                 if latest_date:
                     health['latest_date'] = latest_date
                     try: